@@ -51,6 +51,41 @@ class Node:
         self.column = column
 
 
+class SourceLocation:
+    """Immutable source location (line, position) of a variable access
+
+    Passed to Runtime as the token of get_variable()/set_variable()/
+    array accesses for access tracking. Use source_location(node) to get
+    the location of an AST node: it is created once and cached on the node,
+    so repeated accesses share it instead of allocating a new object.
+    """
+    __slots__ = ('line', 'position')
+
+    def __init__(self, line: int, position: Optional[int]):
+        object.__setattr__(self, 'line', line)
+        object.__setattr__(self, 'position', position)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("SourceLocation is immutable")
+
+    def __reduce__(self):
+        # Slot state cannot be restored through __setattr__
+        return (SourceLocation, (self.line, self.position))
+
+    def __repr__(self):
+        return f"SourceLocation(line={self.line}, position={self.position})"
+
+
+def source_location(node) -> SourceLocation:
+    """Get the (cached) SourceLocation of an AST node's line_num/column"""
+    try:
+        return node._source_location
+    except AttributeError:
+        location = SourceLocation(getattr(node, 'line_num', 0), getattr(node, 'column', 0))
+        node._source_location = location
+        return location
+
+
 # ============================================================================
 # Program Structure
 # ============================================================================
@@ -149,6 +184,8 @@ class PrintStatementNode:
     file_number: Optional['ExpressionNode'] = None  # For PRINT #n, ...
     line_num: int = 0
     column: int = 0
+    # Formatting plan, built by PrintPlan.for_statement() on first use
+    plan: Any = field(default=None, repr=False, compare=False)
 
 
 @dataclass
@@ -1231,6 +1268,9 @@ class VariableNode:
     explicit_type_suffix: bool = False  # True if type_suffix was in original source, False if inferred from DEF
     line_num: int = 0
     column: int = 0
+    # Scalar storage slot, bound by Runtime.resolve_variable() (valid only while slot_store is that runtime's store)
+    slot: Optional[int] = field(default=None, repr=False, compare=False)
+    slot_store: Any = field(default=None, repr=False, compare=False)
 
 
 @dataclass
@@ -8,6 +8,7 @@ Microsoft BASIC-80 as implemented for CP/M systems. This version was chosen as t
 reference implementation for maximum compatibility with classic BASIC programs.
 """
 
+import functools
 import math
 import random
 import sys
@@ -438,11 +439,96 @@ class UsingFormatter:
         return ''.join(reversed(result))
 
 
+@functools.lru_cache(maxsize=256)
+def using_formatter(format_string):
+    """Get the parsed UsingFormatter for a PRINT USING format string.
+
+    Formatters are not modified by formatting, so one instance per format
+    string is shared; the most recently used 256 are kept.
+    """
+    return UsingFormatter(format_string)
+
+
+def format_print_number(value):
+    """Format a float PRINT item: integral values without ".0", a space for
+    the sign of non-negative values, and a trailing space."""
+    s = str(int(value)) if value == int(value) else str(value)
+    if value >= 0:
+        return " " + s + " "
+    return s + " "
+
+
+class PrintPlan:
+    """Formatting plan of one PRINT statement.
+
+    Built once per statement from its separators (see for_statement()):
+    the separator following each item and whether the output ends with a
+    newline are known up front, so formatting is a single pass over the
+    values that joins the pieces at the end.
+    """
+
+    __slots__ = ('separators', 'newline')
+
+    # Width of a PRINT zone (comma separator)
+    ZONE_WIDTH = 14
+
+    def __init__(self, separators, item_count):
+        # Separator after each item: ',', ';', '\n' or None
+        self.separators = [separators[i] if i < len(separators) else None for i in range(item_count)]
+        # No newline after a trailing ; , or explicit newline separator
+        self.newline = not (separators and separators[-1] in (';', ',', '\n'))
+
+    @classmethod
+    def for_statement(cls, stmt):
+        """Get the plan of a PrintStatementNode (built on first use, then kept on the node)."""
+        plan = stmt.plan
+        if plan is None:
+            plan = stmt.plan = cls(stmt.separators, len(stmt.expressions))
+        return plan
+
+    def format(self, values):
+        """Format evaluated PRINT items (numbers, strings, TAB()/SPC() markers).
+
+        Returns:
+            Output text, without the final newline (see self.newline)
+        """
+        pieces = []
+        column = 0      # Length of the output so far
+        zone = self.ZONE_WIDTH
+        for value, sep in zip(values, self.separators):
+            if isinstance(value, float):
+                text = format_print_number(value)
+            elif isinstance(value, TabMarker):
+                # TAB(n) - move to column n (1-based), never backwards
+                text = " " * (value.column - 1 - column) if column + 1 < value.column else ""
+            elif isinstance(value, SpcMarker):
+                text = " " * value.count
+            else:
+                text = str(value)
+            column += len(text)
+            pieces.append(text)
+            if sep == ',':
+                # Tab to next zone
+                pad = zone - column % zone
+                pieces.append(" " * pad)
+                column += pad
+            elif sep == '\n':
+                pieces.append('\n')
+                column += 1
+        return "".join(pieces)
+
+
 class BuiltinFunctions:
     """MBASIC 5.21 built-in functions"""
 
     def __init__(self, runtime):
         self.runtime = runtime
+        # Callable returning a pressed key or '' for INKEY$ (UIs without a
+        # terminal, e.g. the web UI); None reads the terminal
+        self.key_source = None
+        # INKEY$ calls in a row that found no key (a UI can tell that a
+        # program is only waiting for a key)
+        self.inkey_misses = 0
 
     # ========================================================================
     # Numeric Functions
@@ -855,34 +941,10 @@ class BuiltinFunctions:
 
         file_info = self.runtime.files[file_num]
 
-        # Check EOF flag (set by input operations or ^Z detection)
-        if file_info['eof']:
-            return -1
-
-        # For mode 'I' files (binary input), check for EOF or ^Z
-        # Mode 'I' files are opened in binary mode ('rb' - see execute_open() in interpreter.py)
-        # which allows ^Z checking for CP/M-style EOF detection
+        # Mode 'I' files are read through a BufferedLineReader, which tests
+        # for the physical end of file or ^Z from its buffer
         if file_info['mode'] == 'I':
-            file_handle = file_info['handle']
-            current_pos = file_handle.tell()
-
-            # Peek at next byte to check for ^Z or EOF
-            # Binary mode files ('rb'): read(1) returns bytes object
-            # next_byte[0] accesses the first byte value as integer (0-255)
-            next_byte = file_handle.read(1)
-            if not next_byte:
-                # Physical EOF
-                file_info['eof'] = True
-                return -1
-            elif next_byte[0] == 26:  # ^Z (ASCII 26)
-                # CP/M EOF marker - only checked in binary input mode
-                file_info['eof'] = True
-                file_handle.seek(current_pos)  # Restore position
-                return -1
-            else:
-                # Not at EOF, restore position
-                file_handle.seek(current_pos)
-                return 0
+            return -1 if file_info['reader'].at_eof() else 0
 
         # For output/append files, never at EOF
         return 0
@@ -900,12 +962,12 @@ class BuiltinFunctions:
 
         # For random access files, return current record number
         if file_num in self.runtime.field_buffers:
-            return self.runtime.field_buffers[file_num]['current_record']
+            return self.runtime.field_buffers[file_num].current_record
 
         # For sequential files, return approximate block number (byte position / 128)
         file_info = self.runtime.files[file_num]
-        file_handle = file_info['handle']
-        pos = file_handle.tell()
+        reader = file_info.get('reader')
+        pos = reader.tell() if reader is not None else file_info['handle'].tell()
         return pos // 128
 
     def LOF(self, file_num):
@@ -921,6 +983,11 @@ class BuiltinFunctions:
         file_info = self.runtime.files[file_num]
         file_handle = file_info['handle']
 
+        # PUT records not written yet count towards the size
+        record_file = self.runtime.field_buffers.get(file_num)
+        if record_file is not None:
+            record_file.flush()
+
         # Save current position
         current_pos = file_handle.tell()
 
@@ -952,7 +1019,14 @@ class BuiltinFunctions:
         (Method name is INKEY since Python doesn't allow $ in names)
 
         Returns a single character if a key is pressed, or empty string if not.
+        Keys come from key_source when a UI sets one, else from the terminal.
         """
+        key = self.key_source() if self.key_source is not None else self._read_terminal_key()
+        self.inkey_misses = 0 if key else self.inkey_misses + 1
+        return key
+
+    def _read_terminal_key(self):
+        """Read a key from the terminal without waiting ('' if none)."""
         # Platform-specific implementation
         if sys.platform == 'win32':
             # Windows implementation
@@ -1033,5 +1107,7 @@ class BuiltinFunctions:
                 raise ValueError(f"File #{file_num} not open")
 
             file_info = self.runtime.files[file_num]
-            file_handle = file_info['handle']
-            return file_handle.read(num)
+            reader = file_info.get('reader')
+            if reader is not None:
+                return reader.read(num)
+            return file_info['handle'].read(num)
@@ -0,0 +1,472 @@
+"""
+Closure-compiled execution engine for the MBASIC interpreter.
+
+The default ("ast") engine walks the AST on every execution: each statement
+and expression goes through execute_statement() / evaluate_expression(),
+which build a handler name from the node's class name and look it up with
+getattr().
+
+This engine compiles every statement once into a nested Python closure with
+its operands and handlers pre-bound, so the tick loop just calls one
+callable per PC:
+
+    compiler = ClosureCompiler(interpreter)
+    compiler.compile_program()          # after runtime.setup()
+    compiler.execute(pc, stmt)          # from tick_pc()
+
+Design notes:
+- Semantics are shared with the AST engine wherever possible: compiled
+  closures call the same Interpreter/Runtime helpers (_print_values,
+  _begin_for_loop, _execute_next_single, _while_condition,
+  _call_user_function, get_variable_node, set_array_element, ...).
+- Statements without a specialised compiler fall back to their bound
+  execute_* handler, resolved once at compile time.
+- Compiled code is cached per PC together with the statement it was built
+  from. If the program is edited (statement object replaced), the entry is
+  recompiled lazily on the next execution.
+- interpreter.io, interpreter.limits and interpreter.state are read at call
+  time because UIs replace them after the interpreter is constructed.
+- Optional constant folding (fold_constants=True): expressions built only
+  from literals, operators and pure builtins (SemanticAnalyzer's purity
+  table) are evaluated once at compile time by their own compiled closure,
+  so folded values have exactly the type and value the unfolded code would
+  produce. Expressions that raise (1/0, overflow, ...) are left unfolded and
+  raise at run time. Only the compiled form changes; the AST is untouched.
+"""
+
+from src.ast_nodes import NumberNode, StringNode, UnaryOpNode, BinaryOpNode, FunctionCallNode
+from src.basic_builtins import PrintPlan, using_formatter
+from src.semantic_analyzer import SemanticAnalyzer
+from src.tokens import TokenType
+
+
+class ClosureCompiler:
+    """Compile MBASIC statements and expressions into Python closures."""
+
+    def __init__(self, interpreter, fold_constants=False):
+        self.interpreter = interpreter
+        self.runtime = interpreter.runtime
+        self._table = self.runtime.statement_table
+        # PC -> (statement node, compiled callable)
+        self._compiled = {}
+        # id(DefFnStatementNode) -> (node, compiled body)
+        self._function_bodies = {}
+        self.statements_compiled = 0
+        self.fold_constants = fold_constants
+        self.constants_folded = 0
+
+    def invalidate(self):
+        """Drop all compiled code (e.g. after RENUM rewrites AST nodes in place)."""
+        self._compiled.clear()
+        self._function_bodies.clear()
+
+    def compile_program(self):
+        """Compile every statement in the runtime's statement table.
+
+        Called by Interpreter.start() right after Runtime.setup().
+        """
+        self.runtime = self.interpreter.runtime
+        self._table = self.runtime.statement_table
+        self.invalidate()
+        for pc, stmt in self.runtime.statement_table.statements.items():
+            self._compiled[pc] = (stmt, self.compile_statement(stmt))
+
+    def execute(self, pc, stmt):
+        """Execute the statement at pc, compiling it first if needed.
+
+        Args:
+            pc: PC of the statement
+            stmt: Statement node currently stored at pc
+        """
+        if self.runtime.statement_table is not self._table:
+            # Statement table was rebuilt (e.g. reset_for_run) - link slots are stale
+            self.runtime = self.interpreter.runtime
+            self._table = self.runtime.statement_table
+            self.invalidate()
+        entry = self._compiled.get(pc)
+        if entry is None or entry[0] is not stmt:
+            entry = (stmt, self.compile_statement(stmt))
+            self._compiled[pc] = entry
+        entry[1]()
+
+    # ========================================================================
+    # Statements
+    # ========================================================================
+
+    def compile_statement(self, stmt):
+        """Compile a statement node into a zero-argument callable."""
+        self.statements_compiled += 1
+        stmt_type = type(stmt).__name__
+        compiler = getattr(self, f"_compile_{stmt_type.replace('Node', '').replace('Statement', '').lower()}", None)
+        if compiler is not None:
+            return compiler(stmt)
+        return self._compile_fallback(stmt)
+
+    def _compile_fallback(self, stmt):
+        """Bind the interpreter's execute_* handler for stmt once."""
+        stmt_type = type(stmt).__name__
+        handler_name = f"execute_{stmt_type.replace('Node', '').replace('Statement', '').lower()}"
+        handler = getattr(self.interpreter, handler_name, None)
+        if handler is None:
+            def not_implemented():
+                raise NotImplementedError(f"Statement not implemented: {stmt_type}")
+            return not_implemented
+        return lambda: handler(stmt)
+
+    def _compile_block(self, statements):
+        """Compile a THEN/ELSE statement list; stops early once NPC is set."""
+        runtime = self.runtime
+        fns = [self.compile_statement(s) for s in statements]
+        if len(fns) == 1:
+            return fns[0]
+
+        def block():
+            for fn in fns:
+                fn()
+                if runtime.npc is not None:
+                    break
+        return block
+
+    def _compile_remark(self, stmt):
+        return lambda: None
+
+    def _compile_let(self, stmt):
+        interp = self.interpreter
+        runtime = self.runtime
+        var = stmt.variable
+        name = var.name
+        suffix = var.type_suffix
+        token = interp._make_token_info(var)
+        value_fn = self.compile_expression(stmt.expression)
+
+        # Type coercion based on type suffix (see Interpreter.execute_let)
+        if suffix == '%':
+            coerced = lambda: int(value_fn())
+        elif suffix == '$':
+            coerced = lambda: str(value_fn())
+        elif suffix in ('!', '#', None):
+            def coerced():
+                value = value_fn()
+                if not isinstance(value, (int, float)):
+                    value = float(value) if value else 0
+                return value
+        else:
+            coerced = value_fn
+
+        if var.subscripts:
+            set_element = runtime.set_array_element
+            subscripts_fn = self._compile_subscripts(var.subscripts)
+
+            def let_array():
+                value = coerced()
+                set_element(name, suffix, subscripts_fn(), value, token=token)
+            return let_array
+
+        set_variable_node = runtime.set_variable_node
+        settings_manager = interp.settings_manager
+
+        def let():
+            set_variable_node(var, coerced(), interp.limits, settings_manager)
+        return let
+
+    def _compile_print(self, stmt):
+        if stmt.file_number is not None:
+            # File output also validates the file mode - keep the shared path
+            return self._compile_fallback(stmt)
+        plan = PrintPlan.for_statement(stmt)
+        fns = [self.compile_expression(e) for e in stmt.expressions]
+        interp = self.interpreter    # interp.io can be replaced by the UI
+
+        if plan.newline:
+            def print_():
+                interp.io.output(plan.format([fn() for fn in fns]))
+        else:
+            def print_():
+                interp.io.output(plan.format([fn() for fn in fns]), end='')
+        return print_
+
+    def _compile_printusing(self, stmt):
+        if stmt.file_number is not None or not isinstance(stmt.format_string, StringNode) \
+                or not stmt.format_string.value:
+            # File output and computed formats keep the shared path
+            return self._compile_fallback(stmt)
+        formatter = using_formatter(stmt.format_string.value)
+        fns = [self.compile_expression(e) for e in stmt.expressions]
+        interp = self.interpreter
+
+        def print_using():
+            interp.io.output(formatter.format_values([fn() for fn in fns]))
+        return print_using
+
+    def _compile_jump(self, line_number):
+        """Compile a jump to a line through its statement-table link slot."""
+        runtime = self.runtime
+        slot = runtime.statement_table.line_slot(line_number)
+
+        def jump():
+            target = slot.pc
+            if target is None:
+                raise RuntimeError(f"Undefined line {line_number}")
+            runtime.npc = target
+        return jump
+
+    def _compile_if(self, stmt):
+        runtime = self.runtime
+        condition = self.compile_expression(stmt.condition)
+
+        if stmt.then_line_number is not None:
+            then_branch = self._compile_jump(stmt.then_line_number)
+        elif stmt.then_statements:
+            then_branch = self._compile_block(stmt.then_statements)
+        else:
+            then_branch = None
+
+        if stmt.else_line_number is not None:
+            else_branch = self._compile_jump(stmt.else_line_number)
+        elif stmt.else_statements:
+            else_branch = self._compile_block(stmt.else_statements)
+        else:
+            else_branch = None
+
+        def if_():
+            if condition():
+                if then_branch is not None:
+                    then_branch()
+            elif else_branch is not None:
+                else_branch()
+        return if_
+
+    def _compile_goto(self, stmt):
+        interp = self.interpreter
+        runtime = self.runtime
+        line_number = stmt.line_number
+        slot = runtime.statement_table.line_slot(line_number)
+
+        def goto():
+            target = slot.pc
+            if target is None:
+                raise RuntimeError(f"Undefined line {line_number}")
+            # Leaving an error handler with GOTO clears the error state
+            if interp.state.error_info is not None:
+                interp.state.error_info = None
+                runtime.set_variable_raw('err%', 0)
+            runtime.npc = target
+        return goto
+
+    def _compile_for(self, stmt):
+        begin = self.interpreter._begin_for_loop
+        start_fn = self.compile_expression(stmt.start_expr)
+        end_fn = self.compile_expression(stmt.end_expr)
+        step_fn = self.compile_expression(stmt.step_expr) if stmt.step_expr else (lambda: 1)
+
+        def for_():
+            start = start_fn()
+            end = end_fn()
+            begin(stmt, start, end, step_fn())
+        return for_
+
+    def _compile_next(self, stmt):
+        if not stmt.variables:
+            # Bare NEXT looks up the loop variable at run time
+            return self._compile_fallback(stmt)
+        entries = [(v.name + (v.type_suffix or ""), v) for v in stmt.variables]
+        next_single = self.interpreter._execute_next_single
+
+        def next_():
+            for var_name, var_node in entries:
+                if next_single(var_name, var_node):
+                    return
+        return next_
+
+    def _compile_while(self, stmt):
+        condition = self.compile_expression(stmt.condition)
+        while_condition = self.interpreter._while_condition
+        return lambda: while_condition(condition())
+
+    # ========================================================================
+    # Expressions
+    # ========================================================================
+
+    def compile_expression(self, expr):
+        """Compile an expression node into a zero-argument callable."""
+        expr_type = type(expr).__name__
+        compiler = getattr(self, f"_compile_expr_{expr_type.replace('Node', '').lower()}", None)
+        if compiler is None:
+            evaluate = self.interpreter.evaluate_expression
+            return lambda: evaluate(expr)
+        fn = compiler(expr)
+        if self.fold_constants and not isinstance(expr, (NumberNode, StringNode)) and self._is_constant(expr):
+            try:
+                value = fn()
+            except Exception:
+                # Leave the error to run time (ON ERROR, ERL, ...)
+                return fn
+            self.constants_folded += 1
+            return lambda: value
+        return fn
+
+    def _is_constant(self, expr):
+        """True if expr only uses literals, operators and pure builtin functions."""
+        if isinstance(expr, (NumberNode, StringNode)):
+            return True
+        if isinstance(expr, UnaryOpNode):
+            return self._is_constant(expr.operand)
+        if isinstance(expr, BinaryOpNode):
+            return self._is_constant(expr.left) and self._is_constant(expr.right)
+        if isinstance(expr, FunctionCallNode):
+            name = expr.name.rstrip('$')
+            if getattr(self.interpreter.builtins, name, None) is None:
+                return False  # DEF FN
+            return (SemanticAnalyzer._is_pure_builtin_function(name)[0]
+                    and all(self._is_constant(arg) for arg in expr.arguments))
+        return False
+
+    def _compile_subscripts(self, subscripts):
+        fns = [self.compile_expression(s) for s in subscripts]
+        if len(fns) == 1:
+            f0 = fns[0]
+            return lambda: [int(f0())]
+        if len(fns) == 2:
+            f0, f1 = fns
+            return lambda: [int(f0()), int(f1())]
+        return lambda: [int(fn()) for fn in fns]
+
+    def _compile_expr_number(self, expr):
+        value = expr.value
+        return lambda: value
+
+    def _compile_expr_string(self, expr):
+        value = expr.value
+        return lambda: value
+
+    def _compile_expr_variable(self, expr):
+        interp = self.interpreter
+        runtime = self.runtime
+        name = expr.name
+        suffix = expr.type_suffix
+        token = interp._make_token_info(expr)
+
+        if expr.subscripts:
+            get_element = runtime.get_array_element
+            subscripts_fn = self._compile_subscripts(expr.subscripts)
+            return lambda: get_element(name, suffix, subscripts_fn(), token=token)
+
+        get_variable_node = runtime.get_variable_node
+        settings_manager = interp.settings_manager
+        return lambda: get_variable_node(expr, settings_manager)
+
+    def _compile_expr_unaryop(self, expr):
+        operand = self.compile_expression(expr.operand)
+        op = expr.operator
+        if op == TokenType.MINUS:
+            return lambda: -operand()
+        if op == TokenType.NOT:
+            return lambda: ~int(operand())
+        if op == TokenType.PLUS:
+            return operand
+        evaluate = self.interpreter.evaluate_unaryop
+        return lambda: evaluate(expr)
+
+    def _compile_expr_binaryop(self, expr):
+        op = expr.operator
+        left = self.compile_expression(expr.left)
+        right = self.compile_expression(expr.right)
+
+        if op == TokenType.PLUS:
+            def plus():
+                result = left() + right()
+                # 255 character limit for string concatenation
+                if isinstance(result, str) and len(result) > 255:
+                    raise RuntimeError("String too long")
+                return result
+            return plus
+        if op == TokenType.MINUS:
+            return lambda: left() - right()
+        if op == TokenType.MULTIPLY:
+            return lambda: left() * right()
+        if op == TokenType.DIVIDE:
+            def divide():
+                a = left()
+                b = right()
+                if b == 0:
+                    raise RuntimeError("Division by zero")
+                return a / b
+            return divide
+        if op == TokenType.BACKSLASH:
+            def int_divide():
+                a = left()
+                b = right()
+                if b == 0:
+                    raise RuntimeError("Division by zero")
+                return int(a // b)
+            return int_divide
+        if op == TokenType.POWER:
+            return lambda: left() ** right()
+        if op == TokenType.MOD:
+            return lambda: left() % right()
+
+        # Relational (-1 = true, 0 = false)
+        if op == TokenType.EQUAL:
+            return lambda: -1 if left() == right() else 0
+        if op == TokenType.NOT_EQUAL:
+            return lambda: -1 if left() != right() else 0
+        if op == TokenType.LESS_THAN:
+            return lambda: -1 if left() < right() else 0
+        if op == TokenType.GREATER_THAN:
+            return lambda: -1 if left() > right() else 0
+        if op == TokenType.LESS_EQUAL:
+            return lambda: -1 if left() <= right() else 0
+        if op == TokenType.GREATER_EQUAL:
+            return lambda: -1 if left() >= right() else 0
+
+        # Logical (bitwise in BASIC)
+        if op == TokenType.AND:
+            return lambda: int(left()) & int(right())
+        if op == TokenType.OR:
+            return lambda: int(left()) | int(right())
+        if op == TokenType.XOR:
+            return lambda: int(left()) ^ int(right())
+        if op == TokenType.EQV:
+            return lambda: ~(int(left()) ^ int(right()))
+        if op == TokenType.IMP:
+            return lambda: (~int(left())) | int(right())
+
+        evaluate = self.interpreter.evaluate_binaryop
+        return lambda: evaluate(expr)
+
+    def _compile_expr_functioncall(self, expr):
+        interp = self.interpreter
+        args = [self.compile_expression(a) for a in expr.arguments]
+
+        # Built-in function (CHR$ -> CHR, INPUT$ -> INPUT, ...)
+        builtin = getattr(interp.builtins, expr.name.rstrip('$'), None)
+        if builtin is not None:
+            if not args:
+                return builtin
+            if len(args) == 1:
+                a0 = args[0]
+                return lambda: builtin(a0())
+            return lambda: builtin(*[a() for a in args])
+
+        # User-defined function - looked up at call time since DEF FN can be
+        # (re)executed after this expression was compiled
+        runtime = self.runtime
+        fn_name = expr.name
+        call_user_function = interp._call_user_function
+        function_body = self._function_body
+
+        def call():
+            func_def = runtime.user_functions.get(fn_name)
+            if not func_def:
+                raise RuntimeError(f"Undefined function: {fn_name}")
+            values = [a() for a in args]
+            return call_user_function(func_def, values, function_body(func_def))
+        return call
+
+    def _function_body(self, func_def):
+        """Return the compiled body of a DEF FN definition (cached)."""
+        entry = self._function_bodies.get(id(func_def))
+        if entry is None or entry[0] is not func_def:
+            entry = (func_def, self.compile_expression(func_def.expression))
+            self._function_bodies[id(func_def)] = entry
+        return entry[1]
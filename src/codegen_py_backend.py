@@ -0,0 +1,1187 @@
+#!/usr/bin/env python3
+"""
+Python Code Generation Backend
+
+Generates a standalone Python script from a BASIC program. The script runs
+with plain `python` and is several times faster than the Interpreter on
+CPU-bound programs, because each statement becomes inline Python code:
+
+- Control flow is a dispatch loop over basic blocks. A block starts at every
+  line that is jumped to, after every statement containing GOSUB or FOR, at
+  every WHILE and after every WEND; blocks that jump back to themselves run
+  as an inner `while True` loop.
+- Scalar variables, arrays, FOR loop records and the GOSUB/WHILE stack are
+  locals of main(); DEF FN functions are nested functions.
+- PRINT formatting, INPUT, arrays and error reporting come from the small
+  support module src/codegen_py_runtime.py.
+
+The generated code follows the Interpreter's semantics, including the values
+it keeps as Python ints or floats, so both print the same output. Statements
+that the generated code does not support (file I/O, error trapping, CHAIN,
+...) are reported in self.errors instead.
+"""
+
+import os
+import re
+from typing import List, Dict, Set, Optional, Any, Tuple
+from src.ast_nodes import *
+from src.semantic_analyzer import SymbolTable, VarType
+from src.codegen_backend import CodeGenBackend
+from src.tokens import TokenType
+from src.basic_builtins import BuiltinFunctions
+from src.runtime import Runtime
+
+
+# Statements the generated code cannot express
+UNSUPPORTED_STATEMENTS = {
+    LprintStatementNode: 'LPRINT', OpenStatementNode: 'OPEN', CloseStatementNode: 'CLOSE',
+    ResetStatementNode: 'RESET', KillStatementNode: 'KILL', NameStatementNode: 'NAME',
+    FilesStatementNode: 'FILES', FieldStatementNode: 'FIELD', GetStatementNode: 'GET',
+    PutStatementNode: 'PUT', LsetStatementNode: 'LSET', RsetStatementNode: 'RSET',
+    WriteStatementNode: 'WRITE', ChainStatementNode: 'CHAIN', CommonStatementNode: 'COMMON',
+    OnErrorStatementNode: 'ON ERROR', ResumeStatementNode: 'RESUME', ErrorStatementNode: 'ERROR',
+    TronStatementNode: 'TRON', TroffStatementNode: 'TROFF', RunStatementNode: 'RUN',
+    LoadStatementNode: 'LOAD', SaveStatementNode: 'SAVE', MergeStatementNode: 'MERGE',
+    NewStatementNode: 'NEW', DeleteStatementNode: 'DELETE', RenumStatementNode: 'RENUM',
+    ListStatementNode: 'LIST', ContStatementNode: 'CONT', StepStatementNode: 'STEP',
+    LimitsStatementNode: 'LIMITS', SetSettingStatementNode: 'SET',
+    ShowSettingsStatementNode: 'SHOW SETTINGS', HelpSettingStatementNode: 'HELP SET',
+}
+
+# Statements that are supported only for the console, not with #filenum
+FILE_STATEMENTS = {
+    PrintStatementNode: 'PRINT #', PrintUsingStatementNode: 'PRINT #...USING',
+    InputStatementNode: 'INPUT #', LineInputStatementNode: 'LINE INPUT #',
+}
+
+# Statements that do nothing at run time
+NO_OP_STATEMENTS = (RemarkStatementNode, DataStatementNode, DefTypeStatementNode,
+                    DefFnStatementNode, PokeStatementNode, WidthStatementNode)
+
+# Statements the Interpreter has no handler for (they raise when executed)
+NOT_IMPLEMENTED_STATEMENTS = (OutStatementNode, WaitStatementNode, CallStatementNode)
+
+# Builtins with a Python equivalent that behaves the same
+INLINE_BUILTINS = {
+    'ABS': 'abs', 'FIX': 'int', 'INT': 'floor', 'LEN': 'len', 'CSNG': 'float', 'CDBL': 'float',
+    'SIN': 'sin', 'COS': 'cos', 'ATN': 'atan', 'TAN': 'tan', 'EXP': 'exp',
+}
+STRING_BUILTINS = {'CHR', 'HEX', 'LEFT', 'MID', 'OCT', 'RIGHT', 'SPACE', 'STR', 'STRING',
+                   'INKEY', 'INPUT', 'MKI', 'MKS', 'MKD'}
+INT_BUILTINS = {'INT', 'FIX', 'LEN', 'ASC', 'INSTR', 'SGN', 'CINT'}
+MARKER_BUILTINS = {'TAB', 'SPC'}
+
+RELATIONAL_OPERATORS = {
+    TokenType.EQUAL: '==', TokenType.NOT_EQUAL: '!=', TokenType.LESS_THAN: '<',
+    TokenType.GREATER_THAN: '>', TokenType.LESS_EQUAL: '<=', TokenType.GREATER_EQUAL: '>=',
+}
+ARITHMETIC_OPERATORS = {
+    TokenType.MINUS: '-', TokenType.MULTIPLY: '*', TokenType.DIVIDE: '/',
+    TokenType.POWER: '**', TokenType.MOD: '%',
+}
+LOGICAL_OPERATORS = {TokenType.AND: '&', TokenType.OR: '|', TokenType.XOR: '^'}
+
+# Suffix part of generated names
+SUFFIX_NAMES = {'!': '', '%': '_i', '#': '_d', '$': '_s'}
+
+
+def _walk(node):
+    """Yield node and every AST node inside it, including IF branch statements."""
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, (list, tuple)):
+            stack.extend(reversed(item))
+            continue
+        if not hasattr(item, '__dataclass_fields__'):
+            continue
+        yield item
+        for name in reversed(list(item.__dataclass_fields__)):
+            value = getattr(item, name)
+            if isinstance(value, (list, tuple)) or hasattr(value, '__dataclass_fields__'):
+                stack.append(value)
+
+
+def _full_name(name, type_suffix):
+    """Storage name of a variable, as Runtime._resolve_variable_name() without DEF types."""
+    return name.lower() + (type_suffix or '!')
+
+
+class PythonBackend(CodeGenBackend):
+    """
+    Python code generator producing a standalone script.
+
+    Features:
+    - Basic-block dispatch with inner loops for self-jumping blocks
+    - Variables, arrays and loop records as function locals
+    - Variable-indexed FOR loops with constant-step specialisation
+    - DEF FN as nested functions (plain parameters when the body calls no FN)
+    - Error messages and line numbers as printed by the interpreter
+    """
+
+    def __init__(self, symbols: SymbolTable, config: Optional[Dict[str, Any]] = None):
+        super().__init__(symbols)
+        self.config = config or {}
+        self.indent_level = 0
+
+        # Program structure (built by _index_program)
+        self.statements: List[Any] = []        # top-level statements in execution order
+        self.statement_lines: List[int] = []   # BASIC line of each statement
+        self.line_starts: Dict[int, int] = {}  # line number -> index of its first statement
+        self.block_starts: List[int] = []      # statement index where each block starts
+        self.block_of: Dict[int, int] = {}     # block start index -> block id
+        self.while_wend: Dict[int, Optional[int]] = {}  # WHILE index -> WEND index
+        self.next_for: Dict[int, str] = {}     # bare NEXT index -> variable of its FOR
+        self.data_items: List[Any] = []
+        self.data_line_map: Dict[int, int] = {}
+        self.base = 0                          # OPTION BASE
+        self.has_option_base = False
+
+        # Names (built by _collect_names)
+        self.scalars: Dict[str, str] = {}      # full name -> kind ('$' or 'n')
+        self.arrays: Dict[str, int] = {}       # full name -> number of dimensions
+        self.for_bodies: Dict[str, Set[int]] = {}   # FOR variable -> body block ids
+        self.for_steps: Dict[str, Set[str]] = {}    # FOR variable -> step code of each FOR
+        self.functions: Dict[str, DefFnStatementNode] = {}
+        self.builtins_used: Set[str] = set()
+        self.return_blocks: Set[int] = set()   # blocks GOSUB returns to
+        self.while_blocks: Set[int] = set()    # blocks starting with a WHILE
+
+        # Emission state
+        self.code: List[str] = []
+        self.code_lines: List[Optional[int]] = []  # BASIC line of each generated line
+        self.current_line: Optional[int] = None
+        self.current_index = 0                 # top-level statement being generated
+        self.current_block = 0
+        self.wrapped = False                   # block body runs inside `while True`
+        self.self_jump = False                 # block jumped to itself
+        self.temp_count = 0
+
+    def get_file_extension(self) -> str:
+        """Python files use .py extension"""
+        return '.py'
+
+    def get_compiler_command(self, source_file: str, output_file: str) -> List[str]:
+        """
+        No compilation needed - the generated script runs with python.
+        """
+        return []  # No compilation step
+
+    def indent(self) -> str:
+        """Return current indentation"""
+        return '    ' * self.indent_level
+
+    def _emit(self, text: str):
+        """Append a line of generated code at the current indentation"""
+        self.code.append(self.indent() + text)
+        self.code_lines.append(self.current_line)
+
+    # ========================================================================
+    # Program analysis
+    # ========================================================================
+
+    def generate(self, program: ProgramNode) -> str:
+        """Generate the Python script, or '' if self.errors lists unsupported statements"""
+        self._index_program(program)
+        self._check_supported()
+        if self.errors:
+            return ''
+        self._collect_names()
+        if self.errors:
+            return ''
+        self._find_blocks()
+
+        self.indent_level = 1
+        self._generate_setup()
+        self._generate_def_fn_functions()
+        self._generate_dispatch()
+        return self._assemble()
+
+    def _index_program(self, program: ProgramNode):
+        """Build the statement table, DATA list and loop pairing (shared with the Runtime)"""
+        runtime = Runtime({line.line_number: line for line in program.lines}).setup()
+        index_of = {}
+        for pc, stmt in runtime.statement_table.items():
+            index_of[pc] = len(self.statements)
+            self.statements.append(stmt)
+            self.statement_lines.append(pc.line_num)
+        for line in sorted(program.lines, key=lambda line: line.line_number):
+            # A line without statements continues at the next one
+            self.line_starts[line.line_number] = next(
+                (i for i, line_num in enumerate(self.statement_lines) if line_num >= line.line_number),
+                len(self.statements))
+
+        while_wend, next_for = runtime.loop_pairs()
+        for while_pc, wend_pc in while_wend.items():
+            self.while_wend[index_of[while_pc]] = index_of[wend_pc] if wend_pc is not None else None
+        for next_pc, var in next_for.items():
+            self.next_for[index_of[next_pc]] = _full_name(var.name, var.type_suffix)
+
+        self.data_items = runtime.data_items
+        self.data_line_map = runtime.data_line_map
+
+    def _check_supported(self):
+        """Record every statement the generated code cannot express in self.errors"""
+        unsupported = {}
+        bases = set()
+        arrays_used = False
+        for index, stmt in enumerate(self.statements):
+            line = self.statement_lines[index]
+            for node in _walk(stmt):
+                if isinstance(node, ArrayDeclNode) or (isinstance(node, VariableNode) and node.subscripts):
+                    arrays_used = True
+                elif isinstance(node, OptionBaseStatementNode) and arrays_used and not bases:
+                    # The base is fixed at compile time, so it must come before any array
+                    unsupported.setdefault('OPTION BASE after arrays are used', []).append(line)
+                name = UNSUPPORTED_STATEMENTS.get(type(node))
+                if name is None:
+                    if getattr(node, 'file_number', None) is not None:
+                        name = FILE_STATEMENTS.get(type(node), type(node).__name__)
+                    elif isinstance(node, (WhileStatementNode, DefFnStatementNode)) and node is not stmt:
+                        name = 'WHILE inside IF' if isinstance(node, WhileStatementNode) else 'DEF FN inside IF'
+                    elif isinstance(node, OptionBaseStatementNode):
+                        bases.add(node.base)
+                if name is not None:
+                    unsupported.setdefault(name, []).append(line)
+        if len(bases) > 1:
+            unsupported['OPTION BASE with different values'] = []
+        for index, item in enumerate(self.data_items):
+            if not self._is_literal(item):
+                unsupported.setdefault('DATA expression', []).append(self.data_line_map.get(index))
+        self.has_option_base = bool(bases)
+        self.base = bases.pop() if bases else 0
+
+        for name, lines in unsupported.items():
+            where = f" (line {', '.join(str(line) for line in sorted(set(lines)))})" if lines else ""
+            self.errors.append(f"{name} is not supported by the Python backend{where}")
+
+    @staticmethod
+    def _is_literal(item) -> bool:
+        """Whether a DATA item is a constant the script can store in its DATA tuple"""
+        if (isinstance(item, UnaryOpNode) and item.operator in (TokenType.MINUS, TokenType.PLUS)):
+            item = item.operand
+        return isinstance(item, (NumberNode, StringNode))
+
+    def _collect_names(self):
+        """Collect variables, arrays, DEF FN functions and FOR loops"""
+        # Types of scalar variables from the semantic analyzer; names it missed
+        # (e.g. DEF FN parameters) are added from the program below
+        for info in self.symbols.variables.values():
+            if not info.is_array:
+                full_name = info.name.lower()
+                if full_name[-1:] not in SUFFIX_NAMES:
+                    continue
+                self.scalars[full_name] = '$' if info.var_type == VarType.STRING else 'n'
+
+        array_ranks: Dict[str, Set[int]] = {}
+        dim_ranks: Dict[str, Set[int]] = {}
+        for index, stmt in enumerate(self.statements):
+            if isinstance(stmt, DefFnStatementNode):
+                if stmt.name in self.functions:
+                    self.errors.append(f"DEF {stmt.name.upper()} defined more than once is not supported "
+                                       f"by the Python backend (line {self.statement_lines[index]})")
+                self.functions[stmt.name] = stmt
+            for node in _walk(stmt):
+                if isinstance(node, VariableNode):
+                    full_name = _full_name(node.name, node.type_suffix)
+                    if node.subscripts:
+                        array_ranks.setdefault(full_name, set()).add(len(node.subscripts))
+                    else:
+                        self.scalars.setdefault(full_name, '$' if full_name[-1] == '$' else 'n')
+                elif isinstance(node, ArrayDeclNode):
+                    full_name = node.name if node.name[-1] in '$%!#' else node.name + '!'
+                    dim_ranks.setdefault(full_name.lower(), set()).add(len(node.dimensions))
+                elif isinstance(node, ForStatementNode):
+                    var = node.variable
+                    full_name = _full_name(var.name, var.type_suffix)
+                    self.for_steps.setdefault(full_name, set()).add(self._step_code(node))
+                elif isinstance(node, FunctionCallNode):
+                    name = node.name.rstrip('$')
+                    if name not in INLINE_BUILTINS and hasattr(BuiltinFunctions, name):
+                        self.builtins_used.add(name)
+
+        for full_name in set(array_ranks) | set(dim_ranks):
+            ranks = dim_ranks.get(full_name) or array_ranks[full_name]
+            if len(ranks) > 1:
+                self.errors.append(f"Array {full_name} is dimensioned with different numbers of "
+                                   f"subscripts; not supported by the Python backend")
+            # Accesses with another number of subscripts raise at run time
+            self.arrays[full_name] = min(ranks)
+
+        for node in _walk(self.statements):
+            if isinstance(node, FunctionCallNode) and node.name in self.functions:
+                if len(node.arguments) != len(self.functions[node.name].parameters):
+                    self.errors.append(f"{node.name.upper()} called with {len(node.arguments)} arguments "
+                                       f"(defined with {len(self.functions[node.name].parameters)}); "
+                                       f"not supported by the Python backend (line {node.line_num})")
+        for fn in self.functions.values():
+            for param in fn.parameters:
+                self.scalars.setdefault(_full_name(param.name, param.type_suffix),
+                                        '$' if param.type_suffix == '$' else 'n')
+            names = [_full_name(param.name, param.type_suffix) for param in fn.parameters]
+            if len(set(names)) != len(names):
+                self.errors.append(f"{fn.name.upper()} has a repeated parameter; "
+                                   f"not supported by the Python backend")
+
+    @staticmethod
+    def _step_code(stmt: ForStatementNode) -> Optional[str]:
+        """Python literal of a FOR statement's STEP if it is a constant, else None"""
+        step = stmt.step_expr
+        if step is None:
+            return '1'  # The Interpreter's default step is the int 1
+        if isinstance(step, NumberNode):
+            return repr(step.value)
+        if (isinstance(step, UnaryOpNode) and step.operator == TokenType.MINUS
+                and isinstance(step.operand, NumberNode)):
+            return repr(-step.operand.value)
+        return None
+
+    def _find_blocks(self):
+        """Split the statements into basic blocks"""
+        count = len(self.statements)
+        starts = {0, count}
+        for index, stmt in enumerate(self.statements):
+            for node in _walk(stmt):
+                for line in self._line_targets(node):
+                    if line in self.line_starts:
+                        starts.add(self.line_starts[line])
+                if isinstance(node, (GosubStatementNode, OnGosubStatementNode, ForStatementNode)):
+                    # GOSUB returns and NEXT loops back to the statement after this one
+                    starts.add(index + 1)
+            if isinstance(stmt, WhileStatementNode):
+                starts.add(index)
+                if self.while_wend.get(index) is not None:
+                    starts.add(self.while_wend[index] + 1)
+        self.block_starts = sorted(starts)
+        self.block_of = {start: block for block, start in enumerate(self.block_starts)}
+
+        for index, stmt in enumerate(self.statements):
+            for node in _walk(stmt):
+                if isinstance(node, (GosubStatementNode, OnGosubStatementNode)):
+                    self.return_blocks.add(self.block_of[index + 1])
+                elif isinstance(node, ForStatementNode):
+                    var = node.variable
+                    self.for_bodies.setdefault(_full_name(var.name, var.type_suffix), set()).add(
+                        self.block_of[index + 1])
+            if isinstance(stmt, WhileStatementNode):
+                self.while_blocks.add(self.block_of[index])
+
+    @staticmethod
+    def _line_targets(node) -> List[int]:
+        """Line numbers a statement can jump to"""
+        if isinstance(node, (GotoStatementNode, GosubStatementNode)):
+            return [node.line_number]
+        if isinstance(node, (OnGotoStatementNode, OnGosubStatementNode)):
+            return list(node.line_numbers)
+        if isinstance(node, IfStatementNode):
+            return [line for line in (node.then_line_number, node.else_line_number) if line is not None]
+        return []
+
+    # ========================================================================
+    # Names
+    # ========================================================================
+
+    @staticmethod
+    def _mangle(full_name: str) -> str:
+        """Python identifier part for a variable name with suffix"""
+        name, suffix = full_name[:-1], full_name[-1]
+        name = re.sub(r'[^a-z0-9]', lambda m: f'_{ord(m.group()):x}_', name)
+        return name + SUFFIX_NAMES[suffix]
+
+    def _scalar(self, full_name: str) -> str:
+        return 'v_' + self._mangle(full_name)
+
+    def _array_data(self, full_name: str) -> str:
+        return 'a_' + self._mangle(full_name)
+
+    def _array_extents(self, full_name: str) -> List[str]:
+        """Names holding the dimension sizes (one tuple for 3+ dimensions)"""
+        data = self._array_data(full_name)
+        rank = self.arrays[full_name]
+        if rank > 2:
+            return [f'{data}_ext']
+        return [f'{data}_n{i}' for i in range(rank)]
+
+    @staticmethod
+    def _function(name: str) -> str:
+        """Python name of a DEF FN function"""
+        return 'fn_' + re.sub(r'[^a-z0-9]', lambda m: f'_{ord(m.group()):x}_', name[2:].lower())
+
+    def _temp(self) -> str:
+        self.temp_count += 1
+        return f'_t{self.temp_count}'
+
+    def _line_block(self, line: int) -> Optional[int]:
+        """Block id of a line, or None if the line does not exist"""
+        start = self.line_starts.get(line)
+        return None if start is None else self.block_of[start]
+
+    # ========================================================================
+    # Expressions
+    # ========================================================================
+
+    def _is_string(self, expr, seen=None) -> bool:
+        """Whether an expression has a string value"""
+        if isinstance(expr, StringNode):
+            return True
+        if isinstance(expr, VariableNode):
+            return expr.type_suffix == '$'
+        if isinstance(expr, BinaryOpNode) and expr.operator == TokenType.PLUS:
+            return self._is_string(expr.left, seen) or self._is_string(expr.right, seen)
+        if isinstance(expr, FunctionCallNode):
+            fn = self.functions.get(expr.name)
+            if fn is not None:
+                seen = seen or set()
+                if expr.name in seen:
+                    return False
+                return self._is_string(fn.expression, seen | {expr.name})
+            return expr.name.rstrip('$') in STRING_BUILTINS
+        return False
+
+    def _expr(self, expr) -> Tuple[str, str]:
+        """Compile an expression.
+
+        Returns:
+            (code, kind): kind is '$' (string), 'n' (number), 'i' (Python int),
+            'b' (Python bool of a relation, -1/0 in BASIC) or 'm' (TAB/SPC marker)
+        """
+        if isinstance(expr, NumberNode):
+            value = expr.value
+            if isinstance(value, float) and (value != value or value in (float('inf'), float('-inf'))):
+                return f"float('{value}')", 'n'
+            code = repr(value)
+            if code.startswith('-'):
+                code = f'({code})'
+            return code, 'i' if isinstance(value, int) else 'n'
+        if isinstance(expr, StringNode):
+            return repr(expr.value), '$'
+        if isinstance(expr, VariableNode):
+            full_name = _full_name(expr.name, expr.type_suffix)
+            kind = '$' if full_name[-1] == '$' else 'n'
+            if expr.subscripts:
+                return f'{self._array_data(full_name)}[{self._index(expr)}]', kind
+            return self._scalar(full_name), kind
+        if isinstance(expr, BinaryOpNode):
+            return self._binary(expr)
+        if isinstance(expr, UnaryOpNode):
+            operand, kind = self._value(expr.operand)
+            if expr.operator == TokenType.MINUS:
+                return f'(-{operand})', 'i' if kind == 'i' else 'n'
+            if expr.operator == TokenType.NOT:
+                return f'(~{self._int(operand, kind)})', 'i'
+            return operand, kind
+        if isinstance(expr, FunctionCallNode):
+            return self._function_call(expr)
+        raise NotImplementedError(f"Expression not implemented: {type(expr).__name__}")
+
+    def _value(self, expr) -> Tuple[str, str]:
+        """Compile an expression for its BASIC value (relations give -1/0)"""
+        code, kind = self._expr(expr)
+        if kind == 'b':
+            return f'(-1 if {code} else 0)', 'i'
+        return code, kind
+
+    def _is_relation(self, expr) -> bool:
+        """Whether the truth of an expression can be computed as a Python bool"""
+        if isinstance(expr, BinaryOpNode):
+            if expr.operator in RELATIONAL_OPERATORS:
+                return True
+            if expr.operator in (TokenType.AND, TokenType.OR):
+                return self._is_relation(expr.left) and self._is_relation(expr.right)
+        if isinstance(expr, UnaryOpNode) and expr.operator == TokenType.NOT:
+            return self._is_relation(expr.operand)
+        return False
+
+    def _cond(self, expr) -> str:
+        """Compile an expression used for its truth value (IF, WHILE)"""
+        if self._is_relation(expr):
+            if isinstance(expr, UnaryOpNode):
+                return f'(not {self._cond(expr.operand)})'
+            if expr.operator in (TokenType.AND, TokenType.OR):
+                # & and | evaluate both sides, like the interpreter
+                op = '&' if expr.operator == TokenType.AND else '|'
+                return f'({self._cond(expr.left)} {op} {self._cond(expr.right)})'
+            return self._expr(expr)[0]
+        return self._value(expr)[0]
+
+    @staticmethod
+    def _int(code: str, kind: str) -> str:
+        """Code converting a value to int (done at compile time for literals)"""
+        if kind == 'i':
+            return code
+        try:
+            value = int(float(code.strip('()')))
+        except (ValueError, OverflowError):
+            return f'int({code})'
+        return repr(value) if value >= 0 else f'({value})'
+
+    def _binary(self, expr: BinaryOpNode) -> Tuple[str, str]:
+        op = expr.operator
+        left, left_kind = self._value(expr.left)
+        right, right_kind = self._value(expr.right)
+        both_int = 'i' if left_kind == right_kind == 'i' else 'n'
+        if op == TokenType.PLUS:
+            if left_kind == '$' or right_kind == '$':
+                # Concatenation enforces the 255 character limit
+                return f'(_s if len(_s := {left} + {right}) <= 255 else too_long())', '$'
+            return f'({left} + {right})', both_int
+        if op in RELATIONAL_OPERATORS:
+            return f'({left} {RELATIONAL_OPERATORS[op]} {right})', 'b'
+        if op == TokenType.BACKSLASH:
+            return f'int({left} // {right})', 'i'
+        if op in ARITHMETIC_OPERATORS:
+            kind = both_int if op in (TokenType.MINUS, TokenType.MULTIPLY, TokenType.MOD) else 'n'
+            return f'({left} {ARITHMETIC_OPERATORS[op]} {right})', kind
+        left, right = self._int(left, left_kind), self._int(right, right_kind)
+        if op in LOGICAL_OPERATORS:
+            return f'({left} {LOGICAL_OPERATORS[op]} {right})', 'i'
+        if op == TokenType.EQV:
+            return f'(~({left} ^ {right}))', 'i'
+        if op == TokenType.IMP:
+            return f'((~{left}) | {right})', 'i'
+        raise NotImplementedError(f"Binary operator not implemented: {op}")
+
+    def _function_call(self, expr: FunctionCallNode) -> Tuple[str, str]:
+        name = expr.name.rstrip('$')
+        args = ', '.join(self._value(arg)[0] for arg in expr.arguments)
+        if name in INLINE_BUILTINS:
+            kind = 'i' if name in INT_BUILTINS else 'n'
+            return f'{INLINE_BUILTINS[name]}({args})', kind
+        if hasattr(BuiltinFunctions, name):
+            if name in STRING_BUILTINS:
+                kind = '$'
+            elif name in MARKER_BUILTINS:
+                kind = 'm'
+            else:
+                kind = 'i' if name in INT_BUILTINS else 'n'
+            return f'bi_{name}({args})', kind
+        if expr.name in self.functions:
+            return f'{self._function(expr.name)}({args})', '$' if self._is_string(expr) else 'n'
+        # Raised before the arguments are evaluated, like the interpreter
+        return f'undefined_function({expr.name!r})', 'n'
+
+    def _subscript(self, expr) -> str:
+        if isinstance(expr, NumberNode) and isinstance(expr.value, (int, float)):
+            return repr(int(expr.value))
+        return self._int(*self._value(expr))
+
+    def _index(self, var: VariableNode) -> str:
+        """Code of the flat element index of an array access (raising if out of range)"""
+        full_name = _full_name(var.name, var.type_suffix)
+        rank = self.arrays[full_name]
+        subscripts = [self._subscript(sub) for sub in var.subscripts]
+        if len(subscripts) != rank:
+            return f'subscript_count_error({len(subscripts)}, {rank})'
+        extents = self._array_extents(full_name)
+        shift = f' - {self.base}' if self.base else ''
+        unshift = f' + {self.base}' if self.base else ''
+        if rank == 1:
+            t = self._temp()
+            return (f'({t} if 0 <= ({t} := {subscripts[0]}{shift}) < {extents[0]} '
+                    f'else subscript_error({full_name!r}, {t}{unshift}))')
+        if rank == 2:
+            t, u = self._temp(), self._temp()
+            return (f'({t} * {extents[1]} + {u} if (0 <= ({t} := {subscripts[0]}{shift}) < {extents[0]}) '
+                    f'& (0 <= ({u} := {subscripts[1]}{shift}) < {extents[1]}) '
+                    f'else subscript_error({full_name!r}, {t}{unshift}, {u}{unshift}))')
+        return f"element_index({full_name!r}, {extents[0]}, {self.base}, ({', '.join(subscripts)}))"
+
+    # ========================================================================
+    # Setup and DEF FN
+    # ========================================================================
+
+    def _generate_setup(self):
+        """Locals of main(): builtins, variables, arrays, loop records and stacks"""
+        if self.builtins_used:
+            self._emit('bi = make_builtins()')
+            for name in sorted(self.builtins_used):
+                self._emit(f'bi_{name} = bi.{name}')
+        self._generate_clear_all()
+        for full_name in sorted(self.for_steps):
+            var = self._mangle(full_name)
+            self._emit(f'loop_{var} = None')
+            self._emit(f'end_{var} = step_{var} = 0')
+        self._emit('cs = []')
+        self._emit('dp = 0')
+        if self.has_option_base:
+            self._emit('option_base = False')
+
+    def _generate_clear_all(self):
+        """(Re)initialise every variable and array (program start and CLEAR)"""
+        for full_name in sorted(self.scalars):
+            self._emit(f"{self._scalar(full_name)} = {repr('') if full_name[-1] == '$' else 0}")
+        for full_name in sorted(self.arrays):
+            self._generate_new_array(full_name, [10] * self.arrays[full_name])
+
+    def _generate_new_array(self, full_name: str, dimensions: List[str]):
+        extents = self._array_extents(full_name)
+        target = extents[0] if len(extents) == 1 and self.arrays[full_name] > 2 else f"({', '.join(extents)},)"
+        dims = ', '.join(str(dim) for dim in dimensions)
+        self._emit(f"{self._array_data(full_name)}, {target} = "
+                   f"new_array({full_name[-1]!r}, ({dims},), {self.base})")
+
+    def _calls_functions(self, expr) -> bool:
+        """Whether evaluating an expression calls a DEF FN function"""
+        return any(isinstance(node, FunctionCallNode) and node.name in self.functions
+                   for node in _walk(expr))
+
+    def _generate_def_fn_functions(self):
+        """DEF FN functions as nested functions of main()
+
+        Parameters shadow the variables of the same name while the body runs.
+        A body that calls no other function sees only its own parameters, so
+        they are plain Python parameters; otherwise the variables are saved,
+        bound and restored around the body, so that called functions see them.
+        """
+        for name in sorted(self.functions):
+            fn = self.functions[name]
+            self.current_line = self._definition_line(fn)
+            names = [self._scalar(_full_name(p.name, p.type_suffix)) for p in fn.parameters]
+            string_params = [n for n, p in zip(names, fn.parameters) if p.type_suffix == '$']
+            self.temp_count = 0
+            if not self._calls_functions(fn.expression):
+                self._emit(f"def {self._function(name)}({', '.join(names)}):")
+                self.indent_level += 1
+                for param in string_params:
+                    self._emit(f'check_string({param})')
+                self._emit(f'return {self._value(fn.expression)[0]}')
+                self.indent_level -= 1
+                continue
+            args = [f'p{i}' for i in range(len(names))]
+            self._emit(f"def {self._function(name)}({', '.join(args)}):")
+            self.indent_level += 1
+            if names:
+                saved = [f's{i}' for i in range(len(names))]
+                self._emit(f"nonlocal {', '.join(names)}")
+                for param, arg in zip(names, args):
+                    if param in string_params:
+                        self._emit(f'check_string({arg})')
+                self._emit(f"{', '.join(saved)}, = {', '.join(names)},")
+                self._emit(f"{', '.join(names)}, = {', '.join(args)},")
+                self._emit('try:')
+                self._emit(f'    return {self._value(fn.expression)[0]}')
+                self._emit('finally:')
+                self._emit(f"    {', '.join(names)}, = {', '.join(saved)},")
+            else:
+                self._emit(f'return {self._value(fn.expression)[0]}')
+            self.indent_level -= 1
+        self.current_line = None
+
+    def _definition_line(self, fn) -> Optional[int]:
+        for index, stmt in enumerate(self.statements):
+            if stmt is fn:
+                return self.statement_lines[index]
+        return None
+
+    # ========================================================================
+    # Blocks and jumps
+    # ========================================================================
+
+    def _generate_dispatch(self):
+        """The block dispatch loop: a binary search on the block id `b`"""
+        self._emit('b = 0')
+        self._emit('while True:')
+        self.indent_level += 1
+        self._generate_tree(0, len(self.block_starts))
+        self.indent_level -= 1
+
+    def _generate_tree(self, low: int, high: int):
+        if high - low == 1:
+            self._generate_block(low)
+            return
+        middle = (low + high) // 2
+        self._emit(f'if b < {middle}:')
+        self.indent_level += 1
+        self._generate_tree(low, middle)
+        self.indent_level -= 1
+        self._emit('else:')
+        self.indent_level += 1
+        self._generate_tree(middle, high)
+        self.indent_level -= 1
+
+    def _generate_block(self, block: int):
+        """Generate one block, as an inner loop if it jumps back to itself"""
+        if block == len(self.block_starts) - 1:
+            self.current_line = None
+            self._emit('return')  # End of program
+            return
+        start, end = self.block_starts[block], self.block_starts[block + 1]
+        mark = len(self.code)
+        for wrapped in (False, True):
+            self.current_block = block
+            self.wrapped = wrapped
+            self.self_jump = False
+            if wrapped:
+                self._emit('while True:')
+                self.indent_level += 1
+            terminated = False
+            for index in range(start, end):
+                self.current_index = index
+                self.current_line = self.statement_lines[index]
+                self.temp_count = 0
+                if self._generate_statement(self.statements[index]):
+                    terminated = True
+                    break
+            if not terminated:
+                self._emit(f'b = {block + 1}')
+                if wrapped:
+                    self._emit('break')
+            if wrapped:
+                self.indent_level -= 1
+            if wrapped or not self.self_jump:
+                return
+            del self.code[mark:]
+            del self.code_lines[mark:]
+
+    def _jump(self, block: int):
+        """Transfer control to a block"""
+        if block == self.current_block:
+            self.self_jump = True
+            if self.wrapped:
+                self._emit('continue')
+                return
+        self._emit(f'b = {block}')
+        self._emit('break' if self.wrapped else 'continue')
+
+    def _jump_dynamic(self, target: str, may_loop: bool):
+        """Transfer control to a block computed at run time"""
+        self._emit(f'b = {target}')
+        if self.wrapped:
+            if may_loop:
+                self._emit(f'if b == {self.current_block}: continue')
+            self._emit('break')
+            return
+        if may_loop:
+            self.self_jump = True
+        self._emit('continue')
+
+    def _goto(self, line: int):
+        block = self._line_block(line)
+        if block is None:
+            self._emit(f"raise RuntimeError('Undefined line {line}')")
+        else:
+            self._jump(block)
+
+    def _return_block(self) -> int:
+        """Block after the current top-level statement (GOSUB return, FOR body)"""
+        return self.block_of[self.current_index + 1]
+
+    # ========================================================================
+    # Statements
+    # ========================================================================
+
+    def _generate_statements(self, statements) -> bool:
+        """Generate statements of an IF branch; True if they always jump away"""
+        for stmt in statements:
+            if self._generate_statement(stmt):
+                return True
+        return False
+
+    def _generate_statement(self, stmt) -> bool:
+        """Generate one statement; True if control never continues after it"""
+        if isinstance(stmt, NO_OP_STATEMENTS):
+            return False
+        if isinstance(stmt, NOT_IMPLEMENTED_STATEMENTS):
+            self._emit(f"raise NotImplementedError('Statement not implemented: {type(stmt).__name__}')")
+            return True
+        handler = getattr(self, f"_generate_{type(stmt).__name__.replace('StatementNode', '').lower()}")
+        return bool(handler(stmt))
+
+    def _generate_print(self, stmt: PrintStatementNode):
+        items = [self._value(expr) for expr in stmt.expressions]
+        literals = [expr.value if isinstance(expr, StringNode) else None for expr in stmt.expressions]
+        separators = stmt.separators
+        if any(kind == 'm' for _, kind in items) or ',' in separators[:len(items)]:
+            values = ''.join(f'{code}, ' for code, _ in items)
+            self._emit(f'print_items(({values.rstrip()}), {tuple(separators)!r})')
+            return
+        pieces = []  # (is_literal, text)
+        for i, (code, kind) in enumerate(items):
+            if literals[i] is not None:
+                pieces.append((True, literals[i]))
+            elif kind == '$':
+                pieces.append((False, code))
+            else:
+                pieces.append((False, f'str({code})' if kind == 'i' else f'fmt({code})'))
+            if i < len(separators) and separators[i] == '\n':
+                pieces.append((True, '\n'))
+        if not (separators and separators[-1] in (';', ',', '\n')):
+            pieces.append((True, '\n'))
+        merged = []
+        for literal, text in pieces:
+            if literal and merged and merged[-1][0]:
+                merged[-1] = (True, merged[-1][1] + text)
+            else:
+                merged.append((literal, text))
+        if merged:
+            self._emit(f"write({' + '.join(repr(text) if literal else text for literal, text in merged)})")
+
+    def _generate_printusing(self, stmt: PrintUsingStatementNode):
+        values = ''.join(f'{self._value(expr)[0]}, ' for expr in stmt.expressions)
+        self._emit(f'print_using({self._value(stmt.format_string)[0]}, ({values.rstrip()}))')
+
+    def _generate_let(self, stmt: LetStatementNode):
+        var = stmt.variable
+        code, kind = self._value(stmt.expression)
+        suffix = var.type_suffix
+        if suffix == '%':
+            code = self._int(code, kind)
+        elif suffix == '$':
+            if kind != '$':
+                code = f'str({code})'
+            elif not var.subscripts and not self._string_checked(stmt.expression):
+                code = f'check_string({code})'
+        elif kind not in ('n', 'i'):
+            code = f'let_number({code})'
+        if not var.subscripts:
+            self._emit(f'{self._scalar(_full_name(var.name, suffix))} = {code}')
+        elif suffix == '%':
+            self._store_int_element(var, code)
+        else:
+            self._emit(f'{self._element(var)} = {code}')
+
+    @staticmethod
+    def _string_checked(expr) -> bool:
+        """Whether a string value is known to be at most 255 characters long"""
+        if isinstance(expr, StringNode):
+            return len(expr.value) <= 255
+        if isinstance(expr, VariableNode):
+            return not expr.subscripts
+        return isinstance(expr, BinaryOpNode) and expr.operator == TokenType.PLUS
+
+    def _element(self, var: VariableNode) -> str:
+        full_name = _full_name(var.name, var.type_suffix)
+        return f'{self._array_data(full_name)}[{self._index(var)}]'
+
+    def _store_int_element(self, var: VariableNode, code: str):
+        """Store an int in an integer array element (which holds 16-bit values)"""
+        self._emit('try:')
+        self._emit(f'    {self._element(var)} = {code}')
+        self._emit('except OverflowError:')
+        self._emit("    raise OverflowError('Overflow') from None")
+
+    def _assign(self, var: VariableNode, code: str):
+        """Store a value in a variable without LET coercion (INPUT, READ, SWAP, ...)"""
+        full_name = _full_name(var.name, var.type_suffix)
+        if not var.subscripts:
+            if full_name[-1] == '$':
+                code = f'check_string({code})'
+            self._emit(f'{self._scalar(full_name)} = {code}')
+        elif full_name[-1] == '$':
+            self._emit(f'{self._element(var)} = {code}')
+        else:
+            self._emit(f'store({self._array_data(full_name)}, {self._index(var)}, {code})')
+
+    def _generate_if(self, stmt: IfStatementNode):
+        self._emit(f'if {self._cond(stmt.condition)}:')
+        self.indent_level += 1
+        then_jumps = self._generate_branch(stmt.then_line_number, stmt.then_statements)
+        self.indent_level -= 1
+        if stmt.else_line_number is None and not stmt.else_statements:
+            return False
+        self._emit('else:')
+        self.indent_level += 1
+        else_jumps = self._generate_branch(stmt.else_line_number, stmt.else_statements)
+        self.indent_level -= 1
+        return then_jumps and else_jumps
+
+    def _generate_branch(self, line: Optional[int], statements) -> bool:
+        mark = len(self.code)
+        if line is not None:
+            self._goto(line)
+            return True
+        jumps = self._generate_statements(statements or [])
+        if len(self.code) == mark:
+            self._emit('pass')
+        return jumps
+
+    def _generate_goto(self, stmt: GotoStatementNode):
+        self._goto(stmt.line_number)
+        return True
+
+    def _generate_gosub(self, stmt: GosubStatementNode):
+        block = self._line_block(stmt.line_number)
+        if block is None:
+            self._emit(f"raise RuntimeError('Undefined line {stmt.line_number}')")
+        else:
+            self._emit(f'cs.append({self._return_block()})')
+            self._jump(block)
+        return True
+
+    def _generate_ongoto(self, stmt, gosub=False):
+        k = self._temp()
+        self._emit(f'{k} = {self._int(*self._value(stmt.expression))}')
+        for i, line in enumerate(stmt.line_numbers, 1):
+            self._emit(f"{'if' if i == 1 else 'elif'} {k} == {i}:")
+            self.indent_level += 1
+            if gosub and self._line_block(line) is not None:
+                self._emit(f'cs.append({self._return_block()})')
+            self._goto(line)
+            self.indent_level -= 1
+
+    def _generate_ongosub(self, stmt: OnGosubStatementNode):
+        self._generate_ongoto(stmt, gosub=True)
+
+    def _generate_return(self, stmt: ReturnStatementNode):
+        self._emit('if not cs or cs[-1] < 0: return_error(cs)')
+        self._jump_dynamic('cs.pop()', self.current_block in self.return_blocks)
+        return True
+
+    def _generate_for(self, stmt: ForStatementNode):
+        var = stmt.variable
+        full_name = _full_name(var.name, var.type_suffix)
+        name = self._mangle(full_name)
+        start = self._value(stmt.start_expr)[0]
+        end = self._value(stmt.end_expr)[0]
+        if self._constant_step(full_name) is None:
+            step = self._value(stmt.step_expr)[0] if stmt.step_expr else '1'
+            self._emit(f'{self._scalar(full_name)}, end_{name}, step_{name} = {start}, {end}, {step}')
+        else:
+            self._emit(f'{self._scalar(full_name)}, end_{name} = {start}, {end}')
+        self._emit(f'loop_{name} = {self._return_block()}')
+
+    def _constant_step(self, full_name: str) -> Optional[str]:
+        """STEP literal shared by every FOR of a variable, or None"""
+        steps = self.for_steps.get(full_name, set())
+        if len(steps) == 1 and None not in steps:
+            return next(iter(steps))
+        return None
+
+    def _generate_next(self, stmt: NextStatementNode):
+        if stmt.variables:
+            for var in stmt.variables:
+                self._generate_next_variable(_full_name(var.name, var.type_suffix),
+                                             var.name + (var.type_suffix or ''))
+            return False
+        # Bare NEXT: the FOR it was paired with, else the nearest active FOR before it
+        candidates = []
+        if self.current_index in self.next_for:
+            candidates.append(self.next_for[self.current_index])
+        for index in range(self.current_index - 1, -1, -1):
+            stmt_before = self.statements[index]
+            if isinstance(stmt_before, ForStatementNode):
+                var = stmt_before.variable
+                full_name = _full_name(var.name, var.type_suffix)
+                if full_name not in candidates:
+                    candidates.append(full_name)
+        for i, full_name in enumerate(candidates):
+            self._emit(f"{'if' if i == 0 else 'elif'} loop_{self._mangle(full_name)} is not None:")
+            self.indent_level += 1
+            self._generate_next_variable(full_name, None)
+            self.indent_level -= 1
+        if candidates:
+            self._emit('else:')
+            self.indent_level += 1
+        self._emit("raise RuntimeError('NEXT without FOR')")
+        if candidates:
+            self.indent_level -= 1
+        return not candidates
+
+    def _generate_next_variable(self, full_name: str, error_name: Optional[str]):
+        """Step one loop variable; jump back to the loop body or end the loop"""
+        name = self._mangle(full_name)
+        var = self._scalar(full_name)
+        if full_name not in self.for_steps:
+            self._emit(f"raise RuntimeError('NEXT without FOR: {error_name}')")
+            return
+        if error_name is not None:
+            self._emit(f"if loop_{name} is None: raise RuntimeError('NEXT without FOR: {error_name}')")
+        step = self._constant_step(full_name)
+        if step is None:
+            self._emit(f'_n = {var} + step_{name}')
+            self._emit(f'if (_n <= end_{name}) if step_{name} > 0 else (step_{name} < 0 and _n >= end_{name}):')
+        else:
+            self._emit(f'_n = {var} + {step}')
+            if float(step) > 0:
+                self._emit(f'if _n <= end_{name}:')
+            elif float(step) < 0:
+                self._emit(f'if _n >= end_{name}:')
+            else:
+                self._emit('if False:')  # STEP 0 ends the loop
+        self.indent_level += 1
+        self._emit(f'{var} = _n')
+        bodies = self.for_bodies[full_name]
+        if len(bodies) == 1:
+            self._jump(next(iter(bodies)))
+        else:
+            self._jump_dynamic(f'loop_{name}', self.current_block in bodies)
+        self.indent_level -= 1
+        self._emit(f'loop_{name} = None')
+
+    def _generate_while(self, stmt: WhileStatementNode):
+        self._emit(f'if {self._cond(stmt.condition)}:')
+        self.indent_level += 1
+        self._emit(f'cs.append(~{self.current_block})')
+        self.indent_level -= 1
+        self._emit('else:')
+        self.indent_level += 1
+        wend = self.while_wend.get(self.current_index)
+        if wend is None:
+            self._emit(f"raise RuntimeError('WHILE without matching WEND at line {self.current_line}')")
+        else:
+            self._jump(self.block_of[wend + 1])
+        self.indent_level -= 1
+
+    def _generate_wend(self, stmt: WendStatementNode):
+        self._emit(f'if not cs or cs[-1] >= 0: wend_error(cs, {self.current_line})')
+        self._jump_dynamic('~cs.pop()', self.current_block in self.while_blocks)
+        return True
+
+    def _generate_end(self, stmt: EndStatementNode):
+        self._emit('return')
+        return True
+
+    def _generate_stop(self, stmt: StopStatementNode):
+        self._emit(f"write('Break in {self.current_line}\\n')")
+        self._emit('return')
+        return True
+
+    def _generate_system(self, stmt: SystemStatementNode):
+        self._emit("write('Goodbye\\n')")
+        self._emit('return')
+        return True
+
+    def _generate_input(self, stmt: InputStatementNode):
+        prompt = self._value(stmt.prompt)[0] if stmt.prompt else 'None'
+        fields = self._temp()
+        self._emit(f'{fields} = input_fields({prompt}, {not stmt.suppress_question}, {len(stmt.variables)})')
+        for i, var in enumerate(stmt.variables):
+            value = f'input_field({fields}, {i})'
+            if var.type_suffix != '$':
+                value = f'to_number({value})'
+            self._assign(var, value)
+
+    def _generate_lineinput(self, stmt: LineInputStatementNode):
+        prompt = self._value(stmt.prompt)[0] if stmt.prompt else "''"
+        self._assign(stmt.variable, f'input_line({prompt})')
+
+    def _generate_read(self, stmt: ReadStatementNode):
+        numbers_only = not any(isinstance(item, StringNode) for item in self.data_items)
+        for var in stmt.variables:
+            self._emit(f'_d = DATA[dp] if dp < {len(self.data_items)} else out_of_data()')
+            self._emit('dp += 1')
+            if var.type_suffix == '$':
+                value = 'str(_d)'
+            elif var.type_suffix == '%':
+                value = 'int(_d)'
+            else:
+                value = '_d' if numbers_only else 'to_number(_d)'
+            if var.subscripts and var.type_suffix == '%':
+                self._emit(f'store({self._array_data(_full_name(var.name, "%"))}, {self._index(var)}, {value})')
+            else:
+                self._assign(var, value)
+
+    def _generate_restore(self, stmt: RestoreStatementNode):
+        if stmt.line_number is None:
+            self._emit('dp = 0')
+            return
+        pointer = next((index for index in sorted(self.data_line_map)
+                        if self.data_line_map[index] >= stmt.line_number), len(self.data_items))
+        self._emit(f'dp = {pointer}')
+
+    def _generate_dim(self, stmt: DimStatementNode):
+        for decl in stmt.arrays:
+            full_name = (decl.name if decl.name[-1] in '$%!#' else decl.name + '!').lower()
+            self._generate_new_array(full_name, [self._subscript(dim) for dim in decl.dimensions])
+
+    def _generate_erase(self, stmt: EraseStatementNode):
+        # The next access dimensions the array again (to 10)
+        for name in stmt.array_names:
+            full_name = name.lower()
+            if full_name in self.arrays:
+                self._generate_new_array(full_name, [10] * self.arrays[full_name])
+
+    def _generate_clear(self, stmt: ClearStatementNode):
+        self._generate_clear_all()
+
+    def _generate_optionbase(self, stmt: OptionBaseStatementNode):
+        # The base itself is a constant of the generated code (see _check_supported)
+        self._emit("if option_base: raise RuntimeError('Duplicate Definition')")
+        self._emit('option_base = True')
+
+    def _generate_randomize(self, stmt: RandomizeStatementNode):
+        if stmt.seed:
+            self._emit(f'seed(int({self._value(stmt.seed)[0]}))')
+        else:
+            self._emit('seed(time())')
+
+    def _generate_swap(self, stmt: SwapStatementNode):
+        values = []
+        for var in (stmt.var1, stmt.var2):
+            full_name = _full_name(var.name, var.type_suffix)
+            if var.subscripts:
+                index = self._temp()
+                self._emit(f'{index} = {self._index(var)}')
+                values.append((var, f'{self._array_data(full_name)}[{index}]', index))
+            else:
+                values.append((var, self._scalar(full_name), None))
+        self._emit(f'_a, _b = {values[0][1]}, {values[1][1]}')
+        for (var, ref, index), value in zip(values, ('_b', '_a')):
+            full_name = _full_name(var.name, var.type_suffix)
+            if index is None:
+                self._emit(f"{ref} = {f'check_string({value})' if full_name[-1] == '$' else value}")
+            elif full_name[-1] == '$':
+                self._emit(f'{ref} = {value}')
+            else:
+                self._emit(f'store({self._array_data(full_name)}, {index}, {value})')
+
+    def _generate_midassignment(self, stmt: MidAssignmentStatementNode):
+        var = stmt.string_var
+        current = self._value(var)[0]
+        start = self._int(*self._value(stmt.start))
+        value = self._value(stmt.value)[0]
+        length = self._int(*self._value(stmt.length)) if stmt.length else 'None'
+        code = f'mid_assign({current}, {start}, {value}, {length})'
+        full_name = _full_name(var.name, var.type_suffix)
+        if var.subscripts and full_name[-1] != '$':
+            self._emit(f'store({self._array_data(full_name)}, {self._index(var)}, {code})')
+        elif var.subscripts:
+            self._emit(f'{self._element(var)} = {code}')
+        else:
+            self._emit(f'{self._scalar(full_name)} = {code}')
+
+    # ========================================================================
+    # Output
+    # ========================================================================
+
+    def _assemble(self) -> str:
+        """Put the script together and map generated lines to BASIC lines"""
+        source = self.config.get('source_file', 'program.bas')
+        project_root = self.config.get('project_root',
+                                       os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        header = [
+            '#!/usr/bin/env python3',
+            f'# Generated by the MBASIC Python backend from {source}',
+            '# Needs the MBASIC source tree (set MBASIC_HOME if it has moved)',
+            '',
+            'import os',
+            'import sys',
+            '',
+            f"sys.path.insert(0, os.environ.get('MBASIC_HOME', {project_root!r}))",
+            'from src.codegen_py_runtime import *  # noqa: E402,F403',
+            '',
+        ]
+        data = [self._data_literal(item) for item in self.data_items]
+        header.append('DATA = (' + ''.join(f'{item}, ' for item in data).rstrip() + ')')
+        header += ['', '', 'def main():']
+
+        # First generated line of each run of lines from one BASIC line
+        # (None for setup code), for the line numbers in error messages
+        line_starts, line_numbers = [], []
+        for offset, basic_line in enumerate(self.code_lines):
+            if not line_numbers or line_numbers[-1] != basic_line:
+                line_starts.append(len(header) + offset + 1)
+                line_numbers.append(basic_line)
+        footer = [
+            '',
+            '',
+            f'LINE_STARTS = {tuple(line_starts)!r}',
+            f'LINE_NUMBERS = {tuple(line_numbers)!r}',
+            '',
+            "if __name__ == '__main__':",
+            '    run(main, LINE_STARTS, LINE_NUMBERS)',
+        ]
+        return '\n'.join(header + self.code + footer) + '\n'
+
+    def _data_literal(self, item) -> str:
+        return self._expr(item)[0]
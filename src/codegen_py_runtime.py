@@ -0,0 +1,316 @@
+"""
+Runtime support for programs compiled by the Python backend (--compile-py).
+
+Scripts generated by PythonBackend do `from src.codegen_py_runtime import *`
+and call these helpers for the parts of MBASIC semantics that are too long
+to inline: PRINT formatting, INPUT, arrays, string limits and error reporting.
+Every helper behaves like the Interpreter statement or Runtime method it is
+named after, so compiled programs print exactly what the interpreter prints.
+
+Only basic_builtins and error_codes are imported, so a compiled program
+starts without loading the interpreter, runtime or UI modules.
+"""
+
+import array
+import sys
+import traceback
+from bisect import bisect_right
+from math import atan, cos, exp, floor, sin, tan
+from random import seed
+from time import time
+
+from src.basic_builtins import BuiltinFunctions, TabMarker, SpcMarker, using_formatter
+from src.error_codes import exception_to_error_code
+
+write = sys.stdout.write
+
+# array.array typecodes of numeric arrays (same as the Runtime's)
+_ARRAY_TYPECODES = {'%': 'h', '!': 'd', '#': 'd'}
+
+
+class BuiltinState:
+    """The parts of Runtime that BuiltinFunctions uses."""
+
+    def __init__(self):
+        self.rnd_last = 0.5
+        self.files = {}
+        self.field_buffers = {}
+
+
+def make_builtins():
+    """Create the BuiltinFunctions instance of a compiled program."""
+    return BuiltinFunctions(BuiltinState())
+
+
+# ============================================================================
+# PRINT
+# ============================================================================
+
+def fmt(value):
+    """Format one PRINT item like Interpreter._print_values()."""
+    if isinstance(value, float):
+        s = str(int(value)) if value == int(value) else str(value)
+        if value >= 0:
+            return " " + s + " "
+        return s + " "
+    return str(value)
+
+
+def print_items(values, separators):
+    """PRINT with zones, TAB() and SPC() (Interpreter._print_values())."""
+    parts = [value if isinstance(value, (TabMarker, SpcMarker)) else fmt(value) for value in values]
+    output = ""
+    for i, part in enumerate(parts):
+        if isinstance(part, TabMarker):
+            current_col = len(output) + 1
+            if current_col < part.column:
+                output += " " * (part.column - current_col)
+        elif isinstance(part, SpcMarker):
+            output += " " * part.count
+        else:
+            output += part
+        if i < len(separators):
+            sep = separators[i]
+            if sep == ',':
+                current_len = len(output)
+                output += " " * (((current_len // 14) + 1) * 14 - current_len)
+            elif sep == '\n':
+                output += '\n'
+    if separators and separators[-1] in (';', ',', '\n'):
+        write(output)
+    else:
+        write(output + '\n')
+
+
+def print_using(format_str, values):
+    """PRINT USING (Interpreter.execute_printusing())."""
+    format_str = str(format_str)
+    if not format_str:
+        raise RuntimeError("Illegal function call")
+    write(using_formatter(format_str).format_values(values) + '\n')
+
+
+# ============================================================================
+# INPUT / LINE INPUT
+# ============================================================================
+
+def input_line(prompt):
+    """Show a prompt and read one line from standard input.
+
+    Raises:
+        EOFError: No more input; run() ends the program quietly
+    """
+    if prompt:
+        write(prompt)
+    sys.stdout.flush()
+    return input()
+
+
+def input_fields(prompt, question, count):
+    """Read an INPUT line and split it into comma-separated fields.
+
+    Args:
+        prompt: Prompt value, or None
+        question: Whether "? " follows the prompt (INPUT; suppresses it)
+        count: Number of variables to assign (fields beyond it are ignored)
+    """
+    text = "" if prompt is None else str(prompt)
+    if question:
+        text += "? "
+    return [v.strip() for v in input_line(text).split(',')]
+
+
+def input_field(fields, i):
+    """The i-th INPUT field ("Input past end of file" if the line had fewer)."""
+    if i >= len(fields):
+        raise RuntimeError("Input past end of file")
+    return fields[i]
+
+
+def to_number(value):
+    """Numeric value of an INPUT field or DATA item (0 if it is not a number)."""
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return 0
+
+
+def let_number(value):
+    """LET coercion of a non-numeric value assigned to a numeric variable."""
+    if not isinstance(value, (int, float)):
+        return float(value) if value else 0
+    return value
+
+
+# ============================================================================
+# Strings
+# ============================================================================
+
+def too_long():
+    """Raise the MBASIC 255 character string limit error."""
+    raise RuntimeError("String too long")
+
+
+def check_string(value):
+    """Enforce the 255 character limit on a string variable assignment."""
+    if isinstance(value, str) and len(value) > 255:
+        raise RuntimeError("String too long")
+    return value
+
+
+def mid_assign(current, start, value, length):
+    """Result of MID$(current, start[, length]) = value.
+
+    Args:
+        length: Replacement length, or None to use len(value)
+    """
+    if not isinstance(current, str):
+        current = str(current)
+    value = str(value)
+    if length is None:
+        length = len(value)
+    start_idx = start - 1
+    if start_idx < 0 or start_idx >= len(current):
+        return current
+    count = min(length, len(value), len(current) - start_idx)
+    return current[:start_idx] + value[:count] + current[start_idx + count:]
+
+
+# ============================================================================
+# Arrays
+# ============================================================================
+
+def new_array(suffix, dimensions, base):
+    """Create array storage like Runtime._new_array().
+
+    Returns:
+        (data, extents) - flat row-major storage and the size of each dimension
+    """
+    extents = tuple(dim + 1 - base for dim in dimensions)
+    total_size = 0
+    if all(extent > 0 for extent in extents):
+        total_size = 1
+        for extent in extents:
+            total_size *= extent
+    typecode = _ARRAY_TYPECODES.get(suffix)
+    if typecode is None:
+        return [""] * total_size, extents
+    return array.array(typecode, bytes(array.array(typecode).itemsize * total_size)), extents
+
+
+def subscript_error(full_name, *subscripts):
+    """Raise the error for a subscript outside its dimension."""
+    raise RuntimeError(f"Array subscript out of range: {full_name}{list(subscripts)}")
+
+
+def subscript_count_error(got, expected):
+    """Raise the error for an access with the wrong number of subscripts."""
+    raise RuntimeError(f"Wrong number of subscripts: got {got}, expected {expected}")
+
+
+def element_index(full_name, extents, base, subscripts):
+    """Flat index of an element of an array with three or more dimensions."""
+    index = 0
+    for subscript, extent in zip(subscripts, extents):
+        i = subscript - base
+        if not 0 <= i < extent:
+            subscript_error(full_name, *subscripts)
+        index = index * extent + i
+    return index
+
+
+def store(data, index, value):
+    """Store an array element, converting like Runtime.set_array_element()."""
+    try:
+        data[index] = value
+    except (TypeError, OverflowError):
+        if isinstance(value, str):
+            raise TypeError("Type mismatch")
+        if data.typecode == 'h':
+            value = int(value)
+            if -32768 <= value <= 32767:
+                data[index] = value
+                return
+        raise OverflowError("Overflow")
+
+
+# ============================================================================
+# Errors and program entry
+# ============================================================================
+
+def return_error(stack):
+    """Raise the error for RETURN with no GOSUB on top of the control stack.
+
+    GOSUB return blocks and WHILE loops (stored as ~block) share one stack,
+    like the Runtime's execution stack.
+    """
+    if not stack:
+        raise RuntimeError("RETURN without GOSUB")
+    raise RuntimeError("RETURN without GOSUB - found WHILE loop instead")
+
+
+def wend_error(stack, line):
+    """Raise the error for WEND with no WHILE on top of the control stack."""
+    if not any(entry < 0 for entry in stack):
+        raise RuntimeError(f"WEND without matching WHILE at line {line}")
+    raise RuntimeError("WEND without WHILE - found GOSUB instead")
+
+
+def out_of_data():
+    """Raise the error for READ past the last DATA item."""
+    raise RuntimeError("Out of DATA")
+
+
+def undefined_function(name):
+    """Raise the error for a call of a function that is neither builtin nor DEF FN."""
+    raise RuntimeError(f"Undefined function: {name}")
+
+
+def _error_message(e):
+    """Message printed for an exception, as the interpreter words it."""
+    if isinstance(e, ZeroDivisionError) and "division" in str(e):
+        return "Division by zero"
+    return str(e)
+
+
+def _basic_line(tb, code, line_starts, line_numbers):
+    """BASIC line of the innermost frame of `code` in a traceback, or None."""
+    lineno = None
+    while tb is not None:
+        if tb.tb_frame.f_code is code:
+            lineno = tb.tb_lineno
+        tb = tb.tb_next
+    if lineno is None:
+        return None
+    i = bisect_right(line_starts, lineno) - 1
+    return line_numbers[i] if i >= 0 else None
+
+
+def run(main, line_starts, line_numbers):
+    """Run a compiled program's main(), reporting errors like the interpreter.
+
+    Args:
+        main: The program's main function
+        line_starts: Sorted first Python line of each BASIC line's code in main
+        line_numbers: BASIC line number for each entry of line_starts
+    """
+    try:
+        main()
+    except EOFError:
+        write("\n")
+    except KeyboardInterrupt as e:
+        line = _basic_line(e.__traceback__, main.__code__, line_starts, line_numbers)
+        write(f"\nBreak in {line if line is not None else '?'}\n")
+    except Exception as e:
+        line = _basic_line(e.__traceback__, main.__code__, line_starts, line_numbers)
+        message = f"?{exception_to_error_code(e)} Error"
+        if line is not None:
+            message += f" in {line}"
+        write(f"{message}: {_error_message(e)}\n")
+        if '--traceback' in sys.argv:
+            traceback.print_exc()
+        sys.stdout.flush()
+        sys.exit(1)
+    sys.stdout.flush()
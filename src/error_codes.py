@@ -105,3 +105,55 @@ def format_error(error_code, line_number=None):
         return f"?{two_letter} Error in {line_number}"
     else:
         return f"?{two_letter} Error"
+
+
+def exception_to_error_code(exception):
+    """Map a Python exception raised while running a program to an error code.
+
+    Args:
+        exception: Exception raised by a statement
+
+    Returns:
+        Integer error code (5, "Illegal function call", if nothing more specific applies)
+    """
+    error_msg = str(exception).lower()
+
+    # Division by zero
+    if isinstance(exception, ZeroDivisionError) or "division by zero" in error_msg:
+        return 11  # Division by zero
+
+    # Type mismatch
+    if isinstance(exception, (TypeError, ValueError)):
+        # Check for specific type mismatch messages
+        if "type mismatch" in error_msg or "invalid literal" in error_msg:
+            return 13  # Type mismatch
+        return 5  # Illegal function call
+
+    # Out of range
+    if isinstance(exception, IndexError) or "subscript out of range" in error_msg:
+        return 9  # Subscript out of range
+
+    # Key errors (undefined variable/function)
+    if isinstance(exception, KeyError) or "undefined" in error_msg:
+        if "function" in error_msg:
+            return 18  # Undefined user function
+        return 8  # Undefined line number
+
+    # Out of data
+    if "out of data" in error_msg:
+        return 4  # Out of DATA
+
+    # NEXT without FOR
+    if "next without for" in error_msg:
+        return 1  # NEXT without FOR
+
+    # RETURN without GOSUB
+    if "return without gosub" in error_msg:
+        return 3  # RETURN without GOSUB
+
+    # Overflow
+    if isinstance(exception, OverflowError):
+        return 6  # Overflow
+
+    # Default to illegal function call
+    return 5  # Illegal function call
@@ -7,10 +7,14 @@ Provides pluggable filesystem implementations for different UI backends.
 from .base import FileHandle, FileSystemProvider
 from .real_fs import RealFileSystemProvider
 from .sandboxed_fs import SandboxedFileSystemProvider
+from .line_reader import BufferedLineReader
+from .record_file import RecordFile
 
 __all__ = [
     'FileHandle',
     'FileSystemProvider',
     'RealFileSystemProvider',
     'SandboxedFileSystemProvider',
+    'BufferedLineReader',
+    'RecordFile',
 ]
@@ -83,14 +83,19 @@ class FileSystemProvider(ABC):
     """
 
     @abstractmethod
-    def open(self, filename: str, mode: str, binary: bool = False) -> FileHandle:
+    def open(self, filename: str, mode: str, binary: bool = False,
+             buffer_size: Optional[int] = None) -> FileHandle:
         """
         Open a file.
 
+        Writes are buffered: data reaches the file when the handle is
+        flushed or closed, not necessarily on every write().
+
         Args:
             filename: Name/path of file
             mode: "r" (read), "w" (write), "a" (append), "r+" (read/write)
             binary: If True, open in binary mode
+            buffer_size: Write buffer size in bytes (None: provider default)
 
         Returns:
             FileHandle instance
@@ -0,0 +1,104 @@
+"""
+Buffered reader for sequential input files (OPEN "I").
+
+INPUT#, LINE INPUT#, INPUT$ and EOF() all read through one
+BufferedLineReader per open input file, so a data file is read from the
+FileHandle in large chunks instead of one byte per read() call.
+
+CP/M semantics:
+- Lines end with LF, CR+LF or a lone CR (old Mac format).
+- ^Z (ASCII 26) marks the end of file, as on CP/M where text files were
+  padded to 128-byte sectors. Bytes after it are never returned as lines.
+- Bytes are decoded as latin-1, which keeps byte values 128-255 unchanged.
+"""
+
+import re
+
+from .base import FileHandle
+
+
+# First line ending or ^Z in the buffer
+_LINE_END = re.compile(rb'[\n\r\x1a]')
+
+
+class BufferedLineReader:
+    """Chunked line reader over a binary-mode FileHandle."""
+
+    CHUNK_SIZE = 65536
+
+    def __init__(self, handle: FileHandle, chunk_size: int = CHUNK_SIZE):
+        self.handle = handle
+        self.chunk_size = chunk_size
+        self._buffer = b''
+        self._pos = 0           # Next unread byte in _buffer
+        self._eof = False       # Physical end of file or ^Z reached
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the unread part of the buffer.
+
+        Returns:
+            False at physical end of file (nothing was read)
+        """
+        chunk = self.handle.read(self.chunk_size)
+        if not chunk:
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def readline(self):
+        """Read the next line (without its line ending).
+
+        Returns:
+            The line as a string, or None at end of file (physical or ^Z).
+            A last line without a line ending is returned before that.
+        """
+        if self._eof:
+            return None
+        while True:
+            buffer, pos = self._buffer, self._pos
+            match = _LINE_END.search(buffer, pos)
+            if match is None:
+                if self._fill():
+                    continue
+                # Physical end of file
+                self._eof = True
+                self._pos = len(buffer)
+                return buffer[pos:].decode('latin-1') if pos < len(buffer) else None
+
+            end = match.start()
+            byte = buffer[end]
+            if byte == 10:      # LF
+                self._pos = end + 1
+            elif byte == 13:    # CR, CR+LF
+                if end + 1 == len(buffer) and self._fill():
+                    continue    # Rescan with the byte after the CR in the buffer
+                self._pos = end + 2 if end + 1 < len(buffer) and buffer[end + 1] == 10 else end + 1
+            else:               # ^Z
+                self._eof = True
+                self._pos = end
+                if end == pos:
+                    return None
+            return buffer[pos:end].decode('latin-1')
+
+    def read(self, size: int) -> str:
+        """Read up to size raw bytes (line endings and ^Z included), for INPUT$."""
+        while len(self._buffer) - self._pos < size and self._fill():
+            pass
+        data = self._buffer[self._pos:self._pos + size]
+        self._pos += len(data)
+        return data.decode('latin-1')
+
+    def at_eof(self) -> bool:
+        """True at physical end of file or when the next byte is ^Z (EOF())."""
+        if self._eof:
+            return True
+        if self._pos == len(self._buffer) and not self._fill():
+            self._eof = True
+        elif self._buffer[self._pos] == 26:
+            self._eof = True
+        return self._eof
+
+    def tell(self) -> int:
+        """Byte position of the next unread byte in the file (LOC)."""
+        return self.handle.tell() - (len(self._buffer) - self._pos)
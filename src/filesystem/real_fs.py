@@ -104,7 +104,8 @@ class RealFileSystemProvider(FileSystemProvider):
             # No restriction, use as-is
             return filename
 
-    def open(self, filename: str, mode: str, binary: bool = False) -> FileHandle:
+    def open(self, filename: str, mode: str, binary: bool = False,
+             buffer_size: Optional[int] = None) -> FileHandle:
         """
         Open a file.
 
@@ -112,6 +113,8 @@ class RealFileSystemProvider(FileSystemProvider):
             filename: Name/path of file
             mode: "r" (read), "w" (write), "a" (append), "r+" (read/write)
             binary: If True, open in binary mode
+            buffer_size: Buffer size in bytes passed to open() (None or
+                        values below 2: Python's default buffering)
 
         Returns:
             RealFileHandle instance
@@ -129,7 +132,10 @@ class RealFileSystemProvider(FileSystemProvider):
 
         # Open file
         try:
-            file_obj = open(path, file_mode)
+            if buffer_size is not None and buffer_size > 1:
+                file_obj = open(path, file_mode, buffering=buffer_size)
+            else:
+                file_obj = open(path, file_mode)
             handle = RealFileHandle(file_obj, binary)
             # Track for reset()
             self.open_files[id(handle)] = handle
@@ -0,0 +1,229 @@
+"""
+Record I/O for random-access files (OPEN "R", FIELD, GET, PUT, LSET, RSET).
+
+A RecordFile holds the record buffer of one open random-access file.
+FIELD compiles its fields into memoryview slices of that buffer, so GET
+reads a record straight into the buffer, LSET/RSET store into their
+field in place and PUT writes the buffer out; records are never copied
+into new buffers.
+
+    record_file = RecordFile(handle)
+    record_file.define_fields([('n$', 20), ('a$', 30)])   # FIELD
+    record_file.get(3)                                    # GET #1, 3
+    record_file.field('n$')[:] = b'...'                   # LSET/RSET
+    record_file.put(3)                                    # PUT #1, 3
+
+Design notes:
+- The most recently read or written records are cached (CACHE_RECORDS),
+  so repeated GETs of the same records need no I/O. Only this file
+  number's GETs and PUTs go through the cache; when another file number
+  open on the same file PUTs a record, the interpreter writes it at once
+  and calls invalidate() on the others.
+- PUT records are written behind: up to DIRTY_RECORDS of them are kept
+  and written (runs of consecutive records with a single write) when
+  there are that many, on flush() (Interpreter.flush_files(), LOF) and on
+  close(). put(..., flush=True) writes and flushes at once.
+- With use_mmap=True, a real file (a handle whose file object has a
+  fileno()) is memory mapped once it is not empty: GET copies records
+  from the map and PUT writes into it. Records past the mapped size go
+  through the handle, and the map is extended when such a record is read.
+"""
+
+import mmap
+from collections import OrderedDict
+
+from .base import FileHandle
+
+
+class RecordFile:
+    """Record buffer, FIELD layout and record I/O of a random-access file."""
+
+    CACHE_RECORDS = 64
+    DIRTY_RECORDS = 64
+
+    def __init__(self, handle: FileHandle, use_mmap: bool = False):
+        self.handle = handle
+        self.use_mmap = use_mmap
+        self.buffer = bytearray()
+        self.view = memoryview(self.buffer)
+        self.fields = {}            # var_name -> (offset, width)
+        self.field_views = {}       # var_name -> memoryview slice of buffer
+        self.current_record = 0
+        self._cache = OrderedDict()  # record number -> bytes
+        self._dirty = {}            # record number -> bytes not written yet
+        self._map = None
+        self._map_view = None
+
+    def define_fields(self, fields):
+        """Lay out fields from a FIELD statement over a new record buffer.
+
+        Args:
+            fields: (var_name, width) pairs in record order
+
+        Fields of earlier FIELD statements stay defined while they fit in
+        the new record.
+        """
+        offset = 0
+        for var_name, width in fields:
+            self.fields[var_name] = (offset, width)
+            offset += width
+        self.view.release()
+        self.buffer = bytearray(offset)
+        self.view = memoryview(self.buffer)
+        self.fields = {name: (start, width) for name, (start, width) in self.fields.items()
+                       if start + width <= offset}
+        self.field_views = {name: self.view[start:start + width]
+                            for name, (start, width) in self.fields.items()}
+        self._write_dirty()
+        self._cache.clear()
+
+    def layout(self):
+        """The FIELD layout and record buffer as JSON-serializable data.
+
+        Used to save web sessions; restore_layout() applies it to the
+        RecordFile of the reopened file.
+        """
+        return {
+            'fields': [[name, start, width] for name, (start, width) in self.fields.items()],
+            'record': self.buffer.hex(),
+            'current_record': self.current_record,
+        }
+
+    def restore_layout(self, layout):
+        """Lay out fields and fill the record buffer from layout() data."""
+        self.view.release()
+        self.buffer = bytearray.fromhex(layout['record'])
+        self.view = memoryview(self.buffer)
+        self.fields = {name: (start, width) for name, start, width in layout['fields']}
+        self.field_views = {name: self.view[start:start + width]
+                            for name, (start, width) in self.fields.items()}
+        self.current_record = layout['current_record']
+        self._cache.clear()
+
+    def field(self, var_name):
+        """The buffer slice of a field variable (None if it is not a field)."""
+        return self.field_views.get(var_name)
+
+    def field_values(self):
+        """(var_name, string) for every field, decoded from the buffer as latin-1."""
+        return [(name, str(view, 'latin-1')) for name, view in self.field_views.items()]
+
+    def get(self, record_num):
+        """Read a record (1-based) into the buffer; past the end of file it reads as spaces."""
+        size = len(self.buffer)
+        view = self.view
+        data = self._cache.get(record_num)
+        if data is not None:
+            self._cache.move_to_end(record_num)
+            view[:] = data
+        elif record_num in self._dirty:
+            view[:] = self._dirty[record_num]
+            self._remember(record_num)
+        else:
+            # Pending records first, so the file has its final size and content
+            self._write_dirty()
+            start = (record_num - 1) * size
+            if self.use_mmap and (self._map is None or start + size > len(self._map)):
+                self._remap()
+            if self._map is not None and start + size <= len(self._map):
+                view[:] = self._map_view[start:start + size]
+            else:
+                self.handle.seek(start)
+                data = self.handle.read(size)
+                view[:len(data)] = data
+                if len(data) < size:
+                    # Past the end of file: not cached, a later PUT may extend the file over it
+                    view[len(data):] = b' ' * (size - len(data))
+                    self.current_record = record_num
+                    return
+            self._remember(record_num)
+        self.current_record = record_num
+
+    def put(self, record_num, flush=False):
+        """Write the buffer as a record (1-based)."""
+        size = len(self.buffer)
+        start = (record_num - 1) * size
+        if self._map is not None and start + size <= len(self._map):
+            self._map_view[start:start + size] = self.view
+        else:
+            self._dirty[record_num] = bytes(self.buffer)
+            if flush or len(self._dirty) >= self.DIRTY_RECORDS:
+                self._write_dirty()
+        if flush:
+            self.handle.flush()
+        self._remember(record_num)
+        self.current_record = record_num
+
+    def flush(self):
+        """Write the pending records and flush the handle."""
+        self._write_dirty()
+        self.handle.flush()
+
+    def invalidate(self):
+        """Forget cached records after another file number wrote to the file.
+
+        Flushing the handle also drops its read buffer, so the next GET
+        reads the file as it is now.
+        """
+        self._write_dirty()
+        self._cache.clear()
+        self.handle.flush()
+
+    def close(self):
+        """Write pending records and release the buffer views and the map.
+
+        The handle itself is closed by its owner.
+        """
+        self._write_dirty()
+        self._unmap()
+        for view in self.field_views.values():
+            view.release()
+        self.field_views = {}
+        self.view.release()
+        self._cache.clear()
+
+    def _write_dirty(self):
+        """Write the pending PUT records, one write per run of consecutive records."""
+        if not self._dirty:
+            return
+        size = len(next(iter(self._dirty.values())))
+        numbers = sorted(self._dirty)
+        run_start = 0
+        for i in range(1, len(numbers) + 1):
+            if i == len(numbers) or numbers[i] != numbers[i - 1] + 1:
+                self.handle.seek((numbers[run_start] - 1) * size)
+                self.handle.write(b''.join(self._dirty[n] for n in numbers[run_start:i]))
+                run_start = i
+        self._dirty.clear()
+
+    def _remember(self, record_num):
+        """Cache the buffer as the content of a record."""
+        cache = self._cache
+        cache[record_num] = bytes(self.buffer)
+        cache.move_to_end(record_num)
+        if len(cache) > self.CACHE_RECORDS:
+            cache.popitem(last=False)
+
+    def _remap(self):
+        """Map the whole file as it is now (records written past the old map included)."""
+        file_obj = getattr(self.handle, 'file_obj', None)
+        try:
+            fileno = file_obj.fileno()
+        except (AttributeError, OSError, ValueError):
+            self.use_mmap = False   # In-memory or unmappable file: use the handle
+            return
+        self._write_dirty()
+        self.handle.flush()
+        self._unmap()
+        try:
+            self._map = mmap.mmap(fileno, 0)
+        except (OSError, ValueError):
+            return                  # Empty file: nothing to map yet
+        self._map_view = memoryview(self._map)
+
+    def _unmap(self):
+        if self._map is not None:
+            self._map_view.release()
+            self._map.close()
+            self._map = None
+            self._map_view = None
@@ -34,14 +34,16 @@ class InMemoryFileHandle(FileHandle):
         return self.file_obj.write(data)
 
     def flush(self):
-        """Flush write buffers (no-op for in-memory files).
+        """Flush write buffers.
 
-        Calls the underlying StringIO/BytesIO flush() method, which is a no-op.
-        In-memory file writes are already in memory, so flush() has no practical effect.
-        Content is only logically "saved" to the virtual filesystem on close().
+        Writes already live in the StringIO/BytesIO, so nothing is copied
+        here: the handle is only queued with the provider, which saves its
+        content to the virtual filesystem the next time the filesystem is
+        looked at (open, exists, list_files, ...) and on close(). Flushing
+        after every write therefore stays cheap for large files.
         """
-        # StringIO and BytesIO always have flush() methods (no-ops)
-        self.file_obj.flush()
+        if not self.closed and self.mode != 'r':
+            self.fs_provider._unsaved[id(self)] = self
 
     def close(self):
         """Close the file and save to virtual filesystem."""
@@ -54,6 +56,7 @@ class InMemoryFileHandle(FileHandle):
 
             self.file_obj.close()
             self.closed = True
+            self.fs_provider._unsaved.pop(id(self), None)
             # Remove from open files tracking
             if id(self) in self.fs_provider.open_files:
                 del self.fs_provider.open_files[id(self)]
@@ -124,6 +127,7 @@ class SandboxedFileSystemProvider(FileSystemProvider):
         self.max_files = max_files
         self.max_file_size = max_file_size
         self.open_files = {}  # Track open file handles
+        self._unsaved = {}  # Flushed handles whose content is not saved yet
 
         # Initialize user's filesystem if not exists
         if user_id not in self._user_filesystems:
@@ -187,7 +191,20 @@ class SandboxedFileSystemProvider(FileSystemProvider):
 
         self._files[filename] = content
 
-    def open(self, filename: str, mode: str, binary: bool = False) -> FileHandle:
+    def _save_unsaved(self):
+        """Save the content of flushed, still open files to the virtual filesystem.
+
+        A file over the size limit is skipped here; close() reports it.
+        """
+        for handle in list(self._unsaved.values()):
+            try:
+                self._save_file_content(handle.filename, handle.file_obj.getvalue())
+            except OSError:
+                pass
+        self._unsaved.clear()
+
+    def open(self, filename: str, mode: str, binary: bool = False,
+             buffer_size: Optional[int] = None) -> FileHandle:
         """
         Open a file in the virtual filesystem.
 
@@ -195,6 +212,8 @@ class SandboxedFileSystemProvider(FileSystemProvider):
             filename: Name of file
             mode: "r" (read), "w" (write), "a" (append), "r+" (read/write)
             binary: If True, use binary mode
+            buffer_size: Accepted for compatibility; in-memory files need
+                        no write buffer (see InMemoryFileHandle.flush())
 
         Returns:
             InMemoryFileHandle instance
@@ -204,6 +223,7 @@ class SandboxedFileSystemProvider(FileSystemProvider):
             PermissionError: If file limits exceeded
         """
         filename = self._normalize_filename(filename)
+        self._save_unsaved()
 
         # Check file count limit for new files
         if mode in ('w', 'a', 'r+') and filename not in self._files:
@@ -288,6 +308,7 @@ class SandboxedFileSystemProvider(FileSystemProvider):
         """Check if file exists."""
         try:
             filename = self._normalize_filename(filename)
+            self._save_unsaved()
             return filename in self._files or filename in self._example_files
         except PermissionError:
             return False
@@ -295,6 +316,7 @@ class SandboxedFileSystemProvider(FileSystemProvider):
     def delete(self, filename: str):
         """Delete a file (only user's files, not examples)."""
         filename = self._normalize_filename(filename)
+        self._save_unsaved()
 
         # Can only delete user's own files
         if filename in self._files:
@@ -313,6 +335,7 @@ class SandboxedFileSystemProvider(FileSystemProvider):
             List of filenames (user's files + examples)
         """
         # Combine user files and examples
+        self._save_unsaved()
         all_files = set(self._files.keys()) | set(self._example_files.keys())
 
         if pattern:
@@ -325,6 +348,7 @@ class SandboxedFileSystemProvider(FileSystemProvider):
     def get_size(self, filename: str) -> int:
         """Get file size in bytes."""
         filename = self._normalize_filename(filename)
+        self._save_unsaved()
 
         content = self._files.get(filename) or self._example_files.get(filename)
         if content is None:
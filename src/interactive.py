@@ -415,6 +415,8 @@ class InteractiveMode:
             # Pass line text map for better error messages
             from resource_limits import create_unlimited_limits
             runtime = Runtime(self.line_asts, self.lines)
+            # Nothing in the CLI displays variable access history - don't record it
+            runtime.set_tracking_mode('off')
             interpreter = Interpreter(runtime, self.io, limits=create_unlimited_limits(), file_io=self.file_io)
             # Pass reference to interactive mode so statements like LIST can access the line editor
             interpreter.interactive_mode = self
@@ -446,6 +448,7 @@ class InteractiveMode:
                 # Run the tick loop manually (same as interpreter.run())
                 while runtime.pc.is_running() and not state.error_info:
                     state = interpreter.tick(mode='run', max_statements=10000)
+                    interpreter.wait_for_delay()
 
                     # Handle input synchronously for CLI
                     if state.input_prompt:
@@ -498,6 +501,7 @@ class InteractiveMode:
             state = self.program_interpreter.state
             while self.program_runtime.pc.is_running() and not state.error_info:
                 state = self.program_interpreter.tick(mode='run', max_statements=10000)
+                self.program_interpreter.wait_for_delay()
 
                 # Handle input synchronously for CLI
                 if state.input_prompt:
@@ -830,6 +834,7 @@ class InteractiveMode:
                 # First time running (from command line, not during execution) - create new objects
                 from resource_limits import create_unlimited_limits
                 runtime = Runtime(self.line_asts, self.lines)
+                runtime.set_tracking_mode('off')
                 interpreter = Interpreter(runtime, self.io, limits=create_unlimited_limits(), file_io=self.file_io)
                 interpreter.interactive_mode = self
 
@@ -1474,6 +1479,7 @@ class InteractiveMode:
                     # mode errors typically reference the statement the user just typed (visible on screen),
                     # so line_text_map provides minimal benefit. Future enhancement if needed.
                     self.runtime = Runtime(ast, {})
+                    self.runtime.set_tracking_mode('off')
                     self.runtime.setup()
                     self.interpreter = Interpreter(self.runtime, self.io, limits=create_unlimited_limits())
                     # Pass reference to interactive mode for commands like LOAD/SAVE
@@ -6,12 +6,17 @@ Executes BASIC programs from AST.
 
 import sys
 import signal
+import threading
+import time
 from dataclasses import dataclass, field
 from typing import Literal, Optional, Callable, Any, Union
 from src.runtime import Runtime
-from src.basic_builtins import BuiltinFunctions, TabMarker, SpcMarker, UsingFormatter
+from src.basic_builtins import BuiltinFunctions, PrintPlan, using_formatter
 from src.tokens import TokenType
 from src.pc import PC
+from src.error_codes import exception_to_error_code
+from src.filesystem.line_reader import BufferedLineReader
+from src.filesystem.record_file import RecordFile
 import src.ast_nodes as ast_nodes
 
 
@@ -71,6 +76,9 @@ class InterpreterState:
                                                # Prevents re-halting on same breakpoint.
     pause_requested: bool = False  # Set by pause() method
 
+    # Delay loops (delay_loop_us setting, see src/loop_idioms.py)
+    delay_until: float = 0.0  # time.perf_counter() before which tick() runs no statements (0: no delay)
+
     # Error handling
     error_info: Optional[ErrorInfo] = None
 
@@ -78,6 +86,11 @@ class InterpreterState:
     statements_executed: int = 0
     execution_time_ms: float = 0.0
 
+    # Loop JIT statistics (Interpreter(jit=True))
+    jit_loops_compiled: int = 0  # Loops compiled into Python functions (including recompiles)
+    jit_statements: int = 0  # Statements executed inside compiled loops (included in statements_executed)
+    jit_bailouts: int = 0  # Compiled loops left early: failed guards, errors, pause/break/breakpoints
+
     # First line flag (for CONT support)
     is_first_line: bool = True
 
@@ -141,7 +154,12 @@ class InterpreterState:
 class Interpreter:
     """Execute MBASIC AST with tick-based execution for UI integration"""
 
-    def __init__(self, runtime, io_handler=None, breakpoint_callback=None, filesystem_provider=None, limits=None, settings_manager=None, file_io=None):
+    ENGINES = ('ast', 'closure')
+
+    # Statements run between pause/Ctrl+C polls on the tick fast path
+    BREAK_POLL_INTERVAL = 64
+
+    def __init__(self, runtime, io_handler=None, breakpoint_callback=None, filesystem_provider=None, limits=None, settings_manager=None, file_io=None, engine='ast', fold_constants=False, jit=False, loop_idioms=False):
         self.runtime = runtime
         self.builtins = BuiltinFunctions(runtime)
 
@@ -177,6 +195,12 @@ class Interpreter:
             settings_manager = get_settings_manager()
         self.settings_manager = settings_manager
 
+        # File output buffering (re-read on start(), see _read_file_settings())
+        self.file_buffer_size = None
+        self.flush_file_writes = False
+        self.random_file_mmap = False
+        self._read_file_settings()
+
         # Breakpoint callback - called when a breakpoint is hit
         # Callback should take (line_number, statement_index) and return True to continue, False to stop
         self.breakpoint_callback = breakpoint_callback
@@ -184,31 +208,57 @@ class Interpreter:
         # Execution state for tick-based execution
         self.state = InterpreterState(_interpreter=self)
 
+        # Execution engine:
+        # - 'ast': dispatch on AST node type for every statement/expression
+        # - 'closure': compile statements into closures once at start()
+        #   (fold_constants=True also precomputes constant expressions)
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown engine: {engine!r} (expected one of {', '.join(self.ENGINES)})")
+        if fold_constants and engine != 'closure':
+            raise ValueError("fold_constants requires the 'closure' engine")
+        self.engine = engine
+        self.compiled_program = None
+        if engine == 'closure':
+            from src.closure_engine import ClosureCompiler
+            self.compiled_program = ClosureCompiler(self, fold_constants=fold_constants)
+
+        # Loop JIT (jit=True): hot loops run as compiled Python functions (see src/loop_jit.py)
+        self.loop_jit = None
+        if jit:
+            from src.loop_jit import LoopJIT
+            self.loop_jit = LoopJIT(self)
+
+        # Loop idioms (loop_idioms=True): delay loops, array fills and accumulations
+        # are fast-forwarded when their FOR runs (see src/loop_idioms.py)
+        self.loop_idioms = None
+        if loop_idioms:
+            from src.loop_idioms import LoopIdioms
+            self.loop_idioms = LoopIdioms(self)
+
     @staticmethod
     def _make_token_info(node):
-        """Create a token info object from an AST node for variable tracking.
+        """Get the token info (source location) of an AST node for variable tracking.
 
         Args:
             node: AST node with line_num and column attributes
 
         Returns:
-            Object with line and position attributes, or None if node is None
+            The node's cached ast_nodes.SourceLocation (line, position), or
+            None if node is None
         """
         if node is None:
             return None
+        return ast_nodes.source_location(node)
 
-        class TokenInfo:
-            def __init__(self, line, position):
-                self.line = line
-                self.position = position
+    def _setup_break_handler(self):
+        """Setup Ctrl+C handler to set break flag
 
-        return TokenInfo(
-            getattr(node, 'line_num', 0),
-            getattr(node, 'column', 0)
-        )
+        Signal handlers can only be set on the main thread; programs
+        started on other threads run without one.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return
 
-    def _setup_break_handler(self):
-        """Setup Ctrl+C handler to set break flag"""
         def signal_handler(_sig, _frame):
             self.runtime.break_requested = True
 
@@ -216,8 +266,13 @@ class Interpreter:
         self.old_signal_handler = signal.signal(signal.SIGINT, signal_handler)
 
     def _restore_break_handler(self):
-        """Restore original Ctrl+C handler"""
-        if hasattr(self, 'old_signal_handler'):
+        """Restore original Ctrl+C handler
+
+        Off the main thread (a program run by a web UI ProgramWorker) this
+        does nothing: the handler is restored by the next call on the main
+        thread (ProgramWorker.result() makes one when the program stops).
+        """
+        if hasattr(self, 'old_signal_handler') and threading.current_thread() is threading.main_thread():
             signal.signal(signal.SIGINT, self.old_signal_handler)
 
     # ========================================================================
@@ -236,6 +291,17 @@ class Interpreter:
             # Setup runtime tables
             self.runtime.setup()
 
+            # Compile the program for the closure engine
+            if self.compiled_program is not None:
+                self.compiled_program.compile_program()
+
+            # Compiled loops belong to the previous run
+            if self.loop_jit is not None:
+                self.loop_jit.reset()
+            if self.loop_idioms is not None:
+                self.loop_idioms.reset()
+            self._read_file_settings()
+
             # Initialize state
             self.state = InterpreterState(_interpreter=self)
             # PC is already set to running state by setup(), no need to set halted flag
@@ -256,6 +322,44 @@ class Interpreter:
             )
             return self.state
 
+    def _read_file_settings(self):
+        """Read the file_buffer_size, flush_file_writes and random_file_mmap settings."""
+        settings_manager = self.settings_manager
+        if settings_manager is None:
+            return
+        self.file_buffer_size = settings_manager.get('file_buffer_size', 65536) or None
+        self.flush_file_writes = bool(settings_manager.get('flush_file_writes', False))
+        self.random_file_mmap = bool(settings_manager.get('random_file_mmap', False))
+
+    def flush_files(self, filename=None):
+        """Flush the write buffers of all open files, or of those open as filename.
+
+        Called when the program stops running (END, STOP, errors, falling
+        off the end), before CHAIN and on SYSTEM, so buffered PRINT#/WRITE#
+        output is on disk even if the program never closes its files.
+        OPEN flushes the files already open under the name it opens, so
+        the new file number sees their output.
+        A failed flush is ignored here; the error is raised again when the
+        file is closed.
+        """
+        for file_num, file_info in self.runtime.files.items():
+            if filename is not None and file_info['filename'].upper() != filename.upper():
+                continue
+            try:
+                record_file = self.runtime.field_buffers.get(file_num)
+                if record_file is not None:
+                    record_file.flush()
+                else:
+                    file_info['handle'].flush()
+            except (OSError, ValueError):
+                pass
+
+    def _write_file(self, file_handle, text):
+        """Write PRINT#/WRITE# output, flushing only if flush_file_writes is set."""
+        file_handle.write(text)
+        if self.flush_file_writes:
+            file_handle.flush()
+
     def has_work(self):
         """Check if interpreter has work to do (should execution continue?).
 
@@ -264,7 +368,7 @@ class Interpreter:
         """
         return self.runtime.pc.is_running()
 
-    def tick(self, mode='run', max_statements=100):
+    def tick(self, mode='run', max_statements=100, max_ms=None):
         """Execute a quantum of work and return updated state.
 
         Args:
@@ -273,195 +377,57 @@ class Interpreter:
                 - 'step_line': Execute next line, then pause
                 - 'step_statement': Execute next statement, then pause
             max_statements: Maximum statements to execute before yielding (for 'run' mode)
+            max_ms: Time budget in milliseconds (for 'run' mode); the quantum
+                also ends once it has run this long (see tick_pc())
 
         Returns:
             InterpreterState: Updated state after execution quantum
         """
         # Use new PC-based execution
-        return self.tick_pc(mode, max_statements)
+        return self.tick_pc(mode, max_statements, max_ms)
 
-    def tick_pc(self, mode='run', max_statements=100):
+    def tick_pc(self, mode='run', max_statements=100, max_ms=None):
         """Execute a quantum of work using PC-based execution (NEW).
 
         This is the new PC-based execution loop that replaces the old
         line_index/line_table iteration with direct PC navigation.
 
+        Plain 'run' quanta with no breakpoints and TRON off go through
+        _tick_fast(); everything else uses the full debug loop.
+
+        The max_ms budget is checked where _tick_fast() polls for Ctrl+C
+        (every BREAK_POLL_INTERVAL statements) and before each statement
+        in the debug loop, so a quantum can overrun it by that many
+        statements; AdaptiveQuantum (src/tick_quantum.py) sizes
+        max_statements to keep the overrun small.
+
         Args:
             mode: Execution mode:
                 - 'run': Execute up to max_statements
                 - 'step_line': Execute next line, then pause
                 - 'step_statement': Execute next statement, then pause
             max_statements: Maximum statements to execute before yielding (for 'run' mode)
+            max_ms: Time budget in milliseconds for 'run' mode (None: no budget)
 
         Returns:
             InterpreterState: Updated state after execution quantum
         """
         import time
         start_time = time.time()
-        statements_in_tick = 0
-        last_traced_line = None
+        deadline = time.perf_counter() + max_ms / 1000 if max_ms is not None and mode == 'run' else None
 
         try:
-            while statements_in_tick < max_statements:
-                # Check for pause request
-                if self.state.pause_requested:
-                    self.runtime.pc = self.runtime.pc.stop("USER")
-                    self.state.pause_requested = False
-                    return self.state
-
-                # Get current PC
-                pc = self.runtime.pc
-
-                import sys
-                if mode in ('step_statement', 'step_line'):
-                    print(f"DEBUG tick: Starting tick() with PC={pc}, is_running={pc.is_running()}, stop_reason={pc.stop_reason}", file=sys.stderr)
-
-                # Check if not running (stopped/halted/error)
-                # Allow execution to continue in step mode even if stopped at BREAK/USER
-                if not pc.is_running() and not (mode in ('step_statement', 'step_line') and pc.stop_reason in ('BREAK', 'USER')):
-                    # Already stopped - PC has stop_reason set
-                    self._restore_break_handler()
-                    return self.state
-
-                # In step mode from breakpoint: clear stop_reason without messing with flags
-                if mode in ('step_statement', 'step_line') and not pc.is_running():
-                    print(f"DEBUG tick: Step from stopped PC {pc}, resuming", file=sys.stderr)
-                    # Just clear the stop_reason to allow execution, don't touch flags
-                    pc = pc.resume()
-                    self.runtime.pc = pc
-                    print(f"DEBUG tick: After resume, PC={pc}", file=sys.stderr)
-
-                # Check for Ctrl+C break
-                if self.runtime.break_requested:
-                    self.runtime.break_requested = False
-                    self.runtime.pc = pc.stop("BREAK")
-                    self.io.output("")
-                    self.io.output(f"Break in {pc}")
-                    # PC keeps current position for resume via CONT
-                    return self.state
-
-                # Check for breakpoint (supports both line-level and statement-level)
-                # Check exact PC first (statement-level), then line-level
-                at_breakpoint = False
-                if mode == 'run':
-                    if pc in self.runtime.breakpoints:
-                        # Exact PC match (statement-level breakpoint)
-                        at_breakpoint = True
-                    else:
-                        # Check if any breakpoint is set at this line (line-level match)
-                        for bp in self.runtime.breakpoints:
-                            if bp.line == pc.line_num:
-                                at_breakpoint = True
-                                break
-
-                if at_breakpoint:
-                    if not self.state.skip_next_breakpoint_check:
-                        self.runtime.pc = pc.stop("BREAK")
-                        self.state.skip_next_breakpoint_check = True
-                        return self.state
-                    else:
-                        self.state.skip_next_breakpoint_check = False
-
-                # Trace output
-                if self.runtime.trace_on:
-                    if self.runtime.trace_detail == 'statement':
-                        # Statement-level trace: show [10.0], [10.1], [10.2]
-                        self.io.output(f"[{pc}]")
-                    elif pc.line_num != last_traced_line:
-                        # Line-level trace: show [10] only once per line
-                        self.io.output(f"[{pc.line_num}]")
-                        last_traced_line = pc.line_num
-
-                # Get statement
-                stmt = self.runtime.statement_table.get(pc)
-                if stmt is None:
-                    raise RuntimeError(f"Invalid PC: {pc}")
-
-                # Execute statement
-                try:
-                    import sys
-                    if mode in ('step_statement', 'step_line'):
-                        print(f"DEBUG tick: Executing statement at {pc}: {type(stmt).__name__}", file=sys.stderr)
-                    self.execute_statement(stmt)
-                    statements_in_tick += 1
-                    self.state.statements_executed += 1
-
-                except BreakException:
-                    # User pressed Ctrl+C during INPUT
-                    self.runtime.pc = pc.stop("BREAK")
-                    self.io.output(f"Break in {pc}")
-                    return self.state
-
-                except Exception as e:
-                    # Check if we're already in an error handler (prevent recursive errors)
-                    already_in_error_handler = (self.state.error_info is not None)
-
-                    # Set ErrorInfo for both handler and no-handler cases (needed by RESUME)
-                    error_code = self._map_exception_to_error_code(e)
-                    self.state.error_info = ErrorInfo(
-                        error_code=error_code,
-                        pc=pc,
-                        error_message=str(e)
-                    )
-
-                    # Check if we have an error handler and not already handling an error
-                    if self.runtime.has_error_handler() and not already_in_error_handler:
-                        self._invoke_error_handler(error_code, pc)
-                        # Error handler set npc - apply it and continue execution
-                        # (don't use continue here - we need to let normal flow handle NPC)
-                        statements_in_tick += 1
-                        self.state.statements_executed += 1
-                        # Fall through to NPC handling below
-                    else:
-                        # No error handler (or recursive error) - set PC to error state and raise
-                        self.runtime.pc = pc.with_error(
-                            error_code,
-                            str(e),
-                            self.runtime.on_error_goto if self.runtime.has_error_handler() else None
-                        )
-                        self._restore_break_handler()
-                        raise
-
-                # Check if we're waiting for input
-                if self.state.input_prompt is not None:
-                    return self.state
-
-                # Advance PC: if NPC was set by statement (GOTO/GOSUB/RETURN/etc.), use it;
-                # otherwise advance to next sequential statement
-                if self.runtime.npc is not None:
-                    next_pc = self.runtime.npc
-                    self.runtime.npc = None
-                    import sys
-                    if mode in ('step_statement', 'step_line'):
-                        print(f"DEBUG tick: NPC was set to {next_pc}", file=sys.stderr)
-                else:
-                    next_pc = self.runtime.statement_table.next_pc(pc)
-                    import sys
-                    if mode in ('step_statement', 'step_line'):
-                        print(f"DEBUG tick: next_pc from statement_table: {next_pc}", file=sys.stderr)
-
-                # Check for step mode before updating PC
-                if mode == 'step_statement':
-                    # Stop at next PC for stepping
-                    import sys
-                    print(f"DEBUG tick: Step mode, stopping at next_pc={next_pc}, is_running={next_pc.is_running()}", file=sys.stderr)
-                    self.runtime.pc = next_pc.stop("BREAK") if next_pc.is_running() else next_pc
-                    print(f"DEBUG tick: Final PC set to {self.runtime.pc}", file=sys.stderr)
-                    return self.state
-                elif mode == 'step_line' and pc.is_step_point(next_pc, 'step_line'):
-                    # Stop at next line for stepping
-                    self.runtime.pc = next_pc.stop("BREAK") if next_pc.is_running() else next_pc
-                    return self.state
-
-                # Update PC for next iteration (unless already stopped by END/STOP)
-                if self.runtime.pc.is_running():
-                    self.runtime.pc = next_pc
-
-                # Yield control periodically
-                if mode == 'run' and statements_in_tick >= max_statements:
-                    return self.state
+            if mode == 'run' and not self.runtime.breakpoints and not self.runtime.trace_on:
+                state = self._tick_fast(max_statements, deadline)
+            else:
+                state = self._tick_debug(mode, max_statements, deadline)
+            if not self.runtime.pc.is_running() and self.runtime.files:
+                # Program stopped: write out buffered file output
+                self.flush_files()
+            return state
 
         except Exception as e:
+            self.flush_files()
             # Unhandled error
             if self.state.error_info is None:
                 pc = self.runtime.pc
@@ -477,6 +443,322 @@ class Interpreter:
             elapsed = (time.time() - start_time) * 1000
             self.state.execution_time_ms += elapsed
 
+    def _tick_fast(self, max_statements, deadline=None):
+        """Run-mode quantum without the per-statement debugger checks.
+
+        Pause, Ctrl+C and newly added breakpoints are polled every
+        BREAK_POLL_INTERVAL statements instead of before each one; when one
+        is seen, the rest of the quantum runs in _tick_debug(). The
+        quantum's deadline (time.perf_counter() value) is checked at the
+        same points. Executing
+        TRON ends the quantum so the next tick() traces from the next
+        statement.
+
+        With the loop JIT, every back-edge (jump to the same or an earlier
+        statement) is passed to _run_loop_trace(), which runs the loop as a
+        compiled function once it is hot.
+
+        After a FOR statement, loop idioms skip all iterations of the loop
+        but the last one (counted as executed). While a delay loop's real
+        time (state.delay_until) has not passed, the quantum does nothing.
+
+        The loop tracks its position as an index into
+        StatementTable.order(): sequential statements are list steps, and
+        only a jump (runtime.pc changed to another PC object) costs a
+        lookup of its packed position. runtime.pc is always the table's own
+        PC for the statement, so no PC objects are created.
+        """
+        runtime = self.runtime
+        state = self.state
+        compiled = self.compiled_program
+        jit = self.loop_jit
+        idioms = self.loop_idioms
+        for_statement = ast_nodes.ForStatementNode
+        table = runtime.statement_table
+        program = table.statements      # program.version is table.version, without the property
+        version = program.version
+        pcs, statements, index_of = table.order()
+        current = None      # PC at statement index i
+        i = 0
+        statements_in_tick = 0
+        poll_countdown = 0
+
+        if state.delay_until:
+            if time.perf_counter() < state.delay_until and not (state.pause_requested or runtime.break_requested):
+                return state
+            state.delay_until = 0.0
+
+        while statements_in_tick < max_statements:
+            if poll_countdown == 0:
+                poll_countdown = self.BREAK_POLL_INTERVAL
+                if state.pause_requested or runtime.break_requested or runtime.breakpoints:
+                    # Let the debug loop handle the request at this PC
+                    return self._tick_debug('run', max_statements - statements_in_tick, deadline)
+                if deadline is not None and statements_in_tick and time.perf_counter() >= deadline:
+                    return state
+            poll_countdown -= 1
+
+            pc = runtime.pc
+            if not pc.is_running():
+                self._restore_break_handler()
+                return state
+
+            if pc is not current:
+                # Jumped (or first statement): find the statement index
+                i = index_of.get(pc.position)
+                if i is None:
+                    raise RuntimeError(f"Invalid PC: {pc}")
+                current = pc
+            stmt = statements[i]
+
+            try:
+                if compiled is not None:
+                    compiled.execute(pc, stmt)
+                else:
+                    self.execute_statement(stmt)
+            except BreakException:
+                # User pressed Ctrl+C during INPUT
+                runtime.pc = pc.stop("BREAK")
+                self.io.output(f"Break in {pc}")
+                return state
+            except Exception as e:
+                if not self._handle_statement_error(e, pc):
+                    raise
+            statements_in_tick += 1
+            state.statements_executed += 1
+
+            if state.input_prompt is not None:
+                return state
+
+            if program.version != version:
+                # The statement edited the program (e.g. MERGE)
+                version = program.version
+                pcs, statements, index_of = table.order()
+                current = None
+
+            npc = runtime.npc
+            if npc is not None:
+                runtime.npc = None
+                next_pc = npc
+                if (jit is not None and runtime.pc.is_running() and not runtime.trace_on
+                        and (npc.line < pc.line or (npc.line == pc.line and npc.statement <= pc.statement))):
+                    runtime.pc = npc
+                    statements_in_tick += self._run_loop_trace(npc, pc, max_statements - statements_in_tick)
+                    continue
+            elif current is None:
+                next_pc = table.next_pc(pc)
+            else:
+                if idioms is not None and stmt.__class__ is for_statement and runtime.pc.is_running():
+                    skipped = idioms.run(pc)
+                    statements_in_tick += skipped
+                    state.statements_executed += skipped
+                i += 1
+                next_pc = current = pcs[i]
+
+            if runtime.pc.is_running():
+                runtime.pc = next_pc
+
+            if runtime.trace_on:
+                # TRON just ran - trace from the next statement on
+                return state
+
+        return state
+
+    def _run_loop_trace(self, head, tail, budget):
+        """Pass a loop back-edge (tail jumped to head) to the loop JIT.
+
+        runtime.pc is head. An error raised inside a compiled loop is
+        handled like an error of the statement that raised it.
+
+        Returns:
+            Statements executed (0 if the loop did not run compiled);
+            runtime.pc is the next statement to execute
+        """
+        runtime = self.runtime
+        try:
+            return self.loop_jit.run(head, tail, budget)
+        except Exception as e:
+            pc = runtime.pc
+            if not self._handle_statement_error(e, pc):
+                raise
+            self.state.statements_executed += 1
+            npc = runtime.npc
+            runtime.npc = None
+            if runtime.pc.is_running():
+                runtime.pc = npc if npc is not None else runtime.statement_table.next_pc(pc)
+            return self.loop_jit.error_statements + 1
+
+    def _handle_statement_error(self, e, pc):
+        """Record an error raised by the statement at pc.
+
+        Returns True if an ON ERROR handler took over (NPC now points at
+        the handler). Returns False if the error must propagate; the PC
+        is then already in the error state.
+        """
+        # Check if we're already in an error handler (prevent recursive errors)
+        already_in_error_handler = (self.state.error_info is not None)
+
+        # Set ErrorInfo for both handler and no-handler cases (needed by RESUME)
+        error_code = self._map_exception_to_error_code(e)
+        self.state.error_info = ErrorInfo(
+            error_code=error_code,
+            pc=pc,
+            error_message=str(e)
+        )
+
+        # Check if we have an error handler and not already handling an error
+        if self.runtime.has_error_handler() and not already_in_error_handler:
+            self._invoke_error_handler(error_code, pc)
+            return True
+
+        # No error handler (or recursive error) - set PC to error state
+        self.runtime.pc = pc.with_error(
+            error_code,
+            str(e),
+            self.runtime.error_handler
+        )
+        self._restore_break_handler()
+        return False
+
+    def _tick_debug(self, mode, max_statements, deadline=None):
+        """Full tick loop: breakpoints, TRON, stepping and per-statement polling.
+
+        A 'run' quantum also ends at its deadline (time.perf_counter() value).
+        """
+        statements_in_tick = 0
+        last_traced_line = None
+        # Line numbers with a breakpoint; any breakpoint on a line stops the whole line
+        breakpoint_lines = {bp.line for bp in self.runtime.breakpoints} if mode == 'run' else ()
+
+        while statements_in_tick < max_statements:
+            if deadline is not None and statements_in_tick and time.perf_counter() >= deadline:
+                return self.state
+
+            # Check for pause request
+            if self.state.pause_requested:
+                self.runtime.pc = self.runtime.pc.stop("USER")
+                self.state.pause_requested = False
+                return self.state
+
+            # Get current PC
+            pc = self.runtime.pc
+
+            import sys
+            if mode in ('step_statement', 'step_line'):
+                print(f"DEBUG tick: Starting tick() with PC={pc}, is_running={pc.is_running()}, stop_reason={pc.stop_reason}", file=sys.stderr)
+
+            # Check if not running (stopped/halted/error)
+            # Allow execution to continue in step mode even if stopped at BREAK/USER
+            if not pc.is_running() and not (mode in ('step_statement', 'step_line') and pc.stop_reason in ('BREAK', 'USER')):
+                # Already stopped - PC has stop_reason set
+                self._restore_break_handler()
+                return self.state
+
+            # In step mode from breakpoint: clear stop_reason without messing with flags
+            if mode in ('step_statement', 'step_line') and not pc.is_running():
+                print(f"DEBUG tick: Step from stopped PC {pc}, resuming", file=sys.stderr)
+                # Just clear the stop_reason to allow execution, don't touch flags
+                pc = pc.resume()
+                self.runtime.pc = pc
+                print(f"DEBUG tick: After resume, PC={pc}", file=sys.stderr)
+
+            # Check for Ctrl+C break
+            if self.runtime.break_requested:
+                self.runtime.break_requested = False
+                self.runtime.pc = pc.stop("BREAK")
+                self.io.output("")
+                self.io.output(f"Break in {pc}")
+                # PC keeps current position for resume via CONT
+                return self.state
+
+            # Check for breakpoint (line-level and statement-level)
+            if pc.line_num in breakpoint_lines:
+                if not self.state.skip_next_breakpoint_check:
+                    self.runtime.pc = pc.stop("BREAK")
+                    self.state.skip_next_breakpoint_check = True
+                    return self.state
+                else:
+                    self.state.skip_next_breakpoint_check = False
+
+            # Trace output
+            if self.runtime.trace_on:
+                if self.runtime.trace_detail == 'statement':
+                    # Statement-level trace: show [10.0], [10.1], [10.2]
+                    self.io.output(f"[{pc}]")
+                elif pc.line_num != last_traced_line:
+                    # Line-level trace: show [10] only once per line
+                    self.io.output(f"[{pc.line_num}]")
+                    last_traced_line = pc.line_num
+
+            # Get statement
+            stmt = self.runtime.statement_table.get(pc)
+            if stmt is None:
+                raise RuntimeError(f"Invalid PC: {pc}")
+
+            # Execute statement
+            try:
+                import sys
+                if mode in ('step_statement', 'step_line'):
+                    print(f"DEBUG tick: Executing statement at {pc}: {type(stmt).__name__}", file=sys.stderr)
+                if self.compiled_program is not None:
+                    self.compiled_program.execute(pc, stmt)
+                else:
+                    self.execute_statement(stmt)
+                statements_in_tick += 1
+                self.state.statements_executed += 1
+
+            except BreakException:
+                # User pressed Ctrl+C during INPUT
+                self.runtime.pc = pc.stop("BREAK")
+                self.io.output(f"Break in {pc}")
+                return self.state
+
+            except Exception as e:
+                if not self._handle_statement_error(e, pc):
+                    raise
+                # Error handler set npc - fall through to NPC handling below
+                statements_in_tick += 1
+                self.state.statements_executed += 1
+
+            # Check if we're waiting for input
+            if self.state.input_prompt is not None:
+                return self.state
+
+            # Advance PC: if NPC was set by statement (GOTO/GOSUB/RETURN/etc.), use it;
+            # otherwise advance to next sequential statement
+            if self.runtime.npc is not None:
+                next_pc = self.runtime.npc
+                self.runtime.npc = None
+                import sys
+                if mode in ('step_statement', 'step_line'):
+                    print(f"DEBUG tick: NPC was set to {next_pc}", file=sys.stderr)
+            else:
+                next_pc = self.runtime.statement_table.next_pc(pc)
+                import sys
+                if mode in ('step_statement', 'step_line'):
+                    print(f"DEBUG tick: next_pc from statement_table: {next_pc}", file=sys.stderr)
+
+            # Check for step mode before updating PC
+            if mode == 'step_statement':
+                # Stop at next PC for stepping
+                import sys
+                print(f"DEBUG tick: Step mode, stopping at next_pc={next_pc}, is_running={next_pc.is_running()}", file=sys.stderr)
+                self.runtime.pc = next_pc.stop("BREAK") if next_pc.is_running() else next_pc
+                print(f"DEBUG tick: Final PC set to {self.runtime.pc}", file=sys.stderr)
+                return self.state
+            elif mode == 'step_line' and pc.is_step_point(next_pc, 'step_line'):
+                # Stop at next line for stepping
+                self.runtime.pc = next_pc.stop("BREAK") if next_pc.is_running() else next_pc
+                return self.state
+
+            # Update PC for next iteration (unless already stopped by END/STOP)
+            if self.runtime.pc.is_running():
+                self.runtime.pc = next_pc
+
+            # Yield control periodically
+            if mode == 'run' and statements_in_tick >= max_statements:
+                return self.state
+
         return self.state
 
     def provide_input(self, value: str):
@@ -596,6 +878,7 @@ class Interpreter:
                 # Run until done
                 while self.runtime.pc.is_running() and not state.error_info:
                     state = self.tick(mode='run', max_statements=10000)
+                    self.wait_for_delay()
 
                     # Handle input synchronously for CLI
                     if state.input_prompt:
@@ -624,6 +907,17 @@ class Interpreter:
                 continue
 
 
+    def wait_for_delay(self):
+        """Sleep until the delay loop started by the last tick() is over.
+
+        For callers that run the program synchronously (run(), the CLI).
+        UIs just keep calling tick(), which does no work until then.
+        """
+        remaining = self.state.delay_until - time.perf_counter()
+        if remaining > 0:
+            time.sleep(remaining)
+
+
     # OLD EXECUTION METHODS REMOVED (version 1.0.299)
     # Note: The project has an internal implementation version (tracked in src/version.py)
     # which is separate from the MBASIC 5.21 language version being implemented.
@@ -635,47 +929,7 @@ class Interpreter:
 
     def _map_exception_to_error_code(self, exception):
         """Map Python exception to MBASIC error code"""
-        error_msg = str(exception).lower()
-
-        # Division by zero
-        if isinstance(exception, ZeroDivisionError) or "division by zero" in error_msg:
-            return 11  # Division by zero
-
-        # Type mismatch
-        if isinstance(exception, (TypeError, ValueError)):
-            # Check for specific type mismatch messages
-            if "type mismatch" in error_msg or "invalid literal" in error_msg:
-                return 13  # Type mismatch
-            return 5  # Illegal function call
-
-        # Out of range
-        if isinstance(exception, IndexError) or "subscript out of range" in error_msg:
-            return 9  # Subscript out of range
-
-        # Key errors (undefined variable/function)
-        if isinstance(exception, KeyError) or "undefined" in error_msg:
-            if "function" in error_msg:
-                return 18  # Undefined user function
-            return 8  # Undefined line number
-
-        # Out of data
-        if "out of data" in error_msg:
-            return 4  # Out of DATA
-
-        # NEXT without FOR
-        if "next without for" in error_msg:
-            return 1  # NEXT without FOR
-
-        # RETURN without GOSUB
-        if "return without gosub" in error_msg:
-            return 3  # RETURN without GOSUB
-
-        # Overflow
-        if isinstance(exception, OverflowError):
-            return 6  # Overflow
-
-        # Default to illegal function call
-        return 5  # Illegal function call
+        return exception_to_error_code(exception)
 
     def _invoke_error_handler(self, error_code, error_pc):
         """Invoke the error handler"""
@@ -696,10 +950,14 @@ class Interpreter:
                 self.runtime.push_gosub(next_pc.line_num, next_pc.stmt_offset)
 
         # Jump to error handler line
-        self.runtime.npc = PC.from_line(self.runtime.error_handler)
+        self.runtime.npc = self.runtime.jump_target(self.runtime.error_handler)
 
     def find_matching_wend(self, start_line, start_stmt):
-        """Find the matching WEND for a WHILE statement
+        """Find the matching WEND for a WHILE statement by scanning forward.
+
+        Only needed for WHILE statements not covered by Runtime.loop_pairs()
+        (e.g. a WHILE inside IF...THEN); statement-level WHILEs are paired
+        once at setup.
 
         Args:
             start_line: Line number where WHILE is located
@@ -708,40 +966,21 @@ class Interpreter:
         Returns:
             (line_number, stmt_index) of matching WEND, or None if not found
         """
-        # Start searching from the statement after the WHILE
         depth = 1  # Track nesting depth
+        table = self.runtime.statement_table
 
-        # Get all line numbers from statement_table
-        line_numbers = sorted(set(pc.line_num for pc in self.runtime.statement_table.statements.keys()))
-        try:
-            line_idx = line_numbers.index(start_line)
-        except ValueError:
-            return None
-
-        # Start from the next statement in the same line
-        stmt_idx = start_stmt + 1
-
-        while line_idx < len(line_numbers):
-            line_num = line_numbers[line_idx]
-            line_statements = self.runtime.statement_table.get_line_statements(line_num)
-
-            # Search through statements in this line
-            while stmt_idx < len(line_statements):
-                stmt = line_statements[stmt_idx]
-
-                if isinstance(stmt, ast_nodes.WhileStatementNode):
-                    depth += 1
-                elif isinstance(stmt, ast_nodes.WendStatementNode):
-                    depth -= 1
-                    if depth == 0:
-                        # Found matching WEND
-                        return (line_num, stmt_idx)
-
-                stmt_idx += 1
-
-            # Move to next line
-            line_idx += 1
-            stmt_idx = 0  # Start from first statement in next line
+        # Start searching from the statement after the WHILE
+        pc = table.next_pc(PC.running_at(start_line, start_stmt))
+        while pc.is_running():
+            stmt = table.get(pc)
+            if isinstance(stmt, ast_nodes.WhileStatementNode):
+                depth += 1
+            elif isinstance(stmt, ast_nodes.WendStatementNode):
+                depth -= 1
+                if depth == 0:
+                    # Found matching WEND
+                    return (pc.line_num, pc.stmt_offset)
+            pc = table.next_pc(pc)
 
         return None
 
@@ -801,16 +1040,9 @@ class Interpreter:
                 token=self._make_token_info(stmt.variable)
             )
         else:
-            # Simple variable assignment
-            self.runtime.set_variable(
-                stmt.variable.name,
-                stmt.variable.type_suffix,
-                value,
-                token=self._make_token_info(stmt.variable),
-                limits=self.limits,
-                original_case=getattr(stmt.variable, 'original_case', stmt.variable.name),
-                settings_manager=self.settings_manager
-            )
+            # Simple variable assignment (through its bound storage slot)
+            self.runtime.set_variable_node(stmt.variable, value, limits=self.limits,
+                                           settings_manager=self.settings_manager)
 
     def execute_swap(self, stmt):
         """Execute SWAP statement - exchange values of two variables"""
@@ -880,77 +1112,33 @@ class Interpreter:
         else:
             file_handle = None
 
-        output_parts = []
+        values = [self.evaluate_expression(expr) for expr in stmt.expressions]
+        self._print_values(stmt, file_handle, values)
 
-        for i, expr in enumerate(stmt.expressions):
-            value = self.evaluate_expression(expr)
+    def _print_values(self, stmt, file_handle, values):
+        """Format already-evaluated PRINT items and write them to file or screen.
 
-            # Check for special TAB/SPC markers
-            if isinstance(value, TabMarker) or isinstance(value, SpcMarker):
-                # Keep marker object for later processing
-                output_parts.append(value)
-            # Convert to string
-            elif isinstance(value, float):
-                # Format numbers like BASIC does
-                if value == int(value):
-                    s = str(int(value))
-                else:
-                    s = str(value)
-                # Add space for positive numbers
-                if value >= 0:
-                    s = " " + s
-                s = s + " "
-                output_parts.append(s)
-            else:
-                s = str(value)
-                output_parts.append(s)
-
-        # Handle separators and build output
-        output = ""
-        for i, part in enumerate(output_parts):
-            # Handle TAB and SPC markers
-            if isinstance(part, TabMarker):
-                # TAB(n) - move to column n (1-based)
-                target_col = part.column
-                current_col = len(output) + 1  # 1-based column
-                if current_col < target_col:
-                    # Add spaces to reach target column
-                    output += " " * (target_col - current_col)
-                # If already past target, don't move backwards
-            elif isinstance(part, SpcMarker):
-                # SPC(n) - print n spaces
-                output += " " * part.count
-            else:
-                # Regular string
-                output += part
-            if i < len(stmt.separators):
-                sep = stmt.separators[i]
-                if sep == ',':
-                    # Tab to next zone (14-character zones in MBASIC)
-                    current_len = len(output)
-                    next_zone = ((current_len // 14) + 1) * 14
-                    output += " " * (next_zone - current_len)
-                elif sep == ';':
-                    # No spacing (already handled in number formatting)
-                    pass
-                elif sep == '\n':
-                    # Newline
-                    output += '\n'
+        Shared by execute_print() and the closure engine, which evaluates the
+        expressions itself and hands over the resulting values.
 
-        # Output to file or screen
+        Formatting follows the statement's PrintPlan, built from its
+        separators on first use.
+
+        Args:
+            stmt: PrintStatementNode (supplies the separators)
+            file_handle: Open output file handle, or None for the screen
+            values: Evaluated expression values, in order
+        """
+        plan = PrintPlan.for_statement(stmt)
+        output = plan.format(values)
+
+        # Output to file or screen (no newline after a trailing ; , or newline separator)
         if file_handle:
-            # Print to file (don't add newline if last separator was ; or ,)
-            if stmt.separators and stmt.separators[-1] in [';', ',', '\n']:
-                file_handle.write(output)
-            else:
-                file_handle.write(output + '\n')
-            file_handle.flush()  # Ensure data is written
+            self._write_file(file_handle, output + '\n' if plan.newline else output)
+        elif plan.newline:
+            self.io.output(output)
         else:
-            # Print to screen (don't add newline if last separator was ; or , or \n)
-            if stmt.separators and stmt.separators[-1] in [';', ',', '\n']:
-                self.io.output(output, end='')
-            else:
-                self.io.output(output)
+            self.io.output(output, end='')
 
     def execute_printusing(self, stmt):
         """Execute PRINT USING statement - formatted print to screen or file"""
@@ -979,14 +1167,12 @@ class Interpreter:
             value = self.evaluate_expression(expr)
             values.append(value)
 
-        # Create formatter and format values
-        formatter = UsingFormatter(format_str)
-        output = formatter.format_values(values)
+        # Format values (parsed formatters are cached per format string)
+        output = using_formatter(format_str).format_values(values)
 
         # Output to file or screen
         if file_handle:
-            file_handle.write(output + '\n')
-            file_handle.flush()
+            self._write_file(file_handle, output + '\n')
         else:
             self.io.output(output)
 
@@ -999,7 +1185,7 @@ class Interpreter:
             # Execute THEN clause
             if stmt.then_line_number is not None:
                 # THEN line_number
-                self.runtime.npc = PC.from_line(stmt.then_line_number)
+                self.runtime.npc = self.runtime.jump_target(stmt.then_line_number)
             elif stmt.then_statements:
                 # THEN statement(s)
                 for then_stmt in stmt.then_statements:
@@ -1010,7 +1196,7 @@ class Interpreter:
             # Execute ELSE clause
             if stmt.else_line_number is not None:
                 # ELSE line_number
-                self.runtime.npc = PC.from_line(stmt.else_line_number)
+                self.runtime.npc = self.runtime.jump_target(stmt.else_line_number)
             elif stmt.else_statements:
                 # ELSE statement(s)
                 for else_stmt in stmt.else_statements:
@@ -1020,15 +1206,18 @@ class Interpreter:
 
     def execute_goto(self, stmt):
         """Execute GOTO statement"""
+        # Resolve target first (raises "Undefined line" before any state changes)
+        target = self.runtime.jump_target(stmt.line_number)
         # If we're in an error handler and GOTOing out, clear the error state
         if self.state.error_info is not None:
             self.state.error_info = None
             self.runtime.set_variable_raw('err%', 0)
-        # Set both old and new PC
-        self.runtime.npc = PC.from_line(stmt.line_number)
+        self.runtime.npc = target
 
     def execute_gosub(self, stmt):
         """Execute GOSUB statement"""
+        target = self.runtime.jump_target(stmt.line_number)
+
         # Check resource limits
         self.limits.push_gosub(stmt.line_number)
 
@@ -1041,7 +1230,7 @@ class Interpreter:
         )
 
         # Jump to subroutine
-        self.runtime.npc = PC.from_line(stmt.line_number)
+        self.runtime.npc = target
 
     def execute_ongoto(self, stmt):
         """Execute ON...GOTO statement - computed GOTO
@@ -1060,11 +1249,12 @@ class Interpreter:
 
         # Check if index is valid (1-based indexing)
         if 1 <= index <= len(stmt.line_numbers):
+            target = self.runtime.jump_target(stmt.line_numbers[index - 1])
             # If we're in an error handler and GOTOing out, clear the error state
             if self.state.error_info is not None:
                 self.state.error_info = None
                 self.runtime.set_variable_raw('err%', 0)
-            self.runtime.npc = PC.from_line(stmt.line_numbers[index - 1])
+            self.runtime.npc = target
         # If index is out of range, just continue to next statement (no jump)
 
     def execute_ongosub(self, stmt):
@@ -1084,6 +1274,8 @@ class Interpreter:
 
         # Check if index is valid (1-based indexing)
         if 1 <= index <= len(stmt.line_numbers):
+            target = self.runtime.jump_target(stmt.line_numbers[index - 1])
+
             # Check resource limits
             self.limits.push_gosub(stmt.line_numbers[index - 1])
 
@@ -1094,7 +1286,7 @@ class Interpreter:
                 return_pc.stmt_offset if return_pc.is_running() else 0
             )
             # Jump to subroutine
-            self.runtime.npc = PC.from_line(stmt.line_numbers[index - 1])
+            self.runtime.npc = target
         # If index is out of range, just continue to next statement (no jump)
 
     def execute_return(self, stmt):
@@ -1110,6 +1302,12 @@ class Interpreter:
             self.state.error_info = None
             self.runtime.set_variable_raw('err%', 0)
 
+        # Usually the return address is a statement of the table (no new PC needed)
+        return_pc = self.runtime.statement_table.pc_at(return_line, return_stmt)
+        if return_pc is not None:
+            self.runtime.npc = return_pc
+            return
+
         # Validate that the return address still exists
         if not self.runtime.statement_table.line_exists(return_line):
             raise RuntimeError(f"RETURN error: line {return_line} no longer exists")
@@ -1146,17 +1344,21 @@ class Interpreter:
         end = self.evaluate_expression(stmt.end_expr)
         step = self.evaluate_expression(stmt.step_expr) if stmt.step_expr else 1
 
+        self._begin_for_loop(stmt, start, end, step)
+
+    def _begin_for_loop(self, stmt, start, end, step):
+        """Set the FOR variable to its start value and register the loop.
+
+        Args:
+            stmt: ForStatementNode being executed
+            start: Evaluated start value
+            end: Evaluated end value
+            step: Evaluated step value
+        """
         # Set loop variable to start
         var_name = stmt.variable.name + (stmt.variable.type_suffix or "")
-        self.runtime.set_variable(
-            stmt.variable.name,
-            stmt.variable.type_suffix,
-            start,
-            token=self._make_token_info(stmt.variable),
-            limits=self.limits,
-            original_case=getattr(stmt.variable, 'original_case', stmt.variable.name),
-            settings_manager=self.settings_manager
-        )
+        self.runtime.set_variable_node(stmt.variable, start, limits=self.limits,
+                                       settings_manager=self.settings_manager)
 
         # Register loop - use PC for position
         # Note: No nesting tracking needed - FOR loops are variable-indexed, not stack-based.
@@ -1194,18 +1396,16 @@ class Interpreter:
             # If a variable's loop completes, it's popped and the next variable is processed.
             var_list = stmt.variables
         else:
-            # NEXT without variable - scan back lexically to find most recent FOR
-            var_name = self._find_most_recent_for_variable()
-            if not var_name:
+            # NEXT without variable - use the FOR it was paired with at setup, or
+            # scan back lexically if that loop is not active (jumps into/out of loops)
+            for_var = self.runtime.loop_pairs()[1].get(self.runtime.pc)
+            if for_var is None or self.runtime.get_for_loop_state(
+                    for_var.name + (for_var.type_suffix or "")) is None:
+                for_var = self._find_most_recent_for_variable()
+            if for_var is None:
                 raise RuntimeError("NEXT without FOR")
-            # Create a dummy list with just this variable
-            class DummyVarNode:
-                def __init__(self, name, suffix):
-                    self.name = name
-                    self.type_suffix = suffix
-            base_name = var_name.rstrip('$%!#')
-            type_suffix = var_name[-1] if var_name and var_name[-1] in '$%!#' else None
-            var_list = [DummyVarNode(base_name, type_suffix)]
+            # The FOR's own variable node stands in for the missing one
+            var_list = [for_var]
 
         # Process each variable in order
         for var_node in var_list:
@@ -1217,10 +1417,13 @@ class Interpreter:
                 return
 
     def _find_most_recent_for_variable(self):
-        """Find the variable of the most recent FOR loop by scanning back lexically.
+        """Find the most recent active FOR loop by scanning back lexically.
+
+        Fallback for bare NEXT statements that Runtime.loop_pairs() could not
+        pair with an active loop (e.g. after jumping into or out of loops).
 
         Returns:
-            Variable name with suffix (e.g., 'i!') or None if no FOR found
+            Loop VariableNode of the FOR statement, or None if no FOR found
         """
         # Scan backward from current PC to find most recent FOR statement
         current_pc = self.runtime.pc
@@ -1228,26 +1431,28 @@ class Interpreter:
             return None
 
         # Walk backward through statements
-        pc = PC.running_at(current_pc.line, current_pc.statement - 1)
+        table = self.runtime.statement_table
+        pc = current_pc
         while True:
             # Try to get previous statement
-            pc = self.runtime.statement_table.prev_pc(pc)
+            pc = table.prev_pc(pc)
             if pc is None or not pc.is_running():
                 return None
 
-            # Check if this statement is a FOR
-            stmt = self.runtime.statement_table.get_statement(pc)
-            if stmt and hasattr(stmt, '__class__') and stmt.__class__.__name__ == 'ForStatementNode':
-                # Found a FOR statement - return its variable name
+            # Check if this statement is a FOR whose loop is running
+            stmt = table.get(pc)
+            if isinstance(stmt, ast_nodes.ForStatementNode):
                 var_name = stmt.variable.name + (stmt.variable.type_suffix or "")
-                return var_name
+                if self.runtime.get_for_loop_state(var_name) is not None:
+                    return stmt.variable
 
-    def _execute_next_single(self, var_name, var_node=None):
+    def _execute_next_single(self, var_name, var_node):
         """Execute NEXT for a single variable.
 
         Args:
             var_name: Full variable name with suffix
-            var_node: Optional VariableNode for token info
+            var_node: VariableNode of the NEXT (for a bare NEXT, of its FOR);
+                      the loop variable is read and written through its slot
 
         Returns:
             True if loop continues (jumped back), False if loop finished
@@ -1257,34 +1462,26 @@ class Interpreter:
         if not loop_info:
             raise RuntimeError(f"NEXT without FOR: {var_name}")
 
-        # Create token info for tracking
-        token = self._make_token_info(var_node) if var_node else None
-
         # Increment loop variable
-        base_name = var_name.rstrip('$%!#')
-        type_suffix = var_name[-1] if var_name[-1] in '$%!#' else None
-
-        if token:
-            current = self.runtime.get_variable(base_name, type_suffix, token=token)
-        else:
-            # NEXT without variable - use current line for token
-            class TokenInfo:
-                def __init__(self, line):
-                    self.line = line
-                    self.position = 0
-            token = TokenInfo(self.runtime.pc.line_num if self.runtime.pc.is_running() else 0)
-            current = self.runtime.get_variable(base_name, type_suffix, token=token)
+        current = self.runtime.get_variable_node(var_node, self.settings_manager)
 
         step = loop_info['step']
         new_value = current + step
 
         # Check if loop should continue
         if (step > 0 and new_value <= loop_info['end']) or (step < 0 and new_value >= loop_info['end']):
-            # Validate that the FOR return address still exists
             return_line = loop_info['return_line']
             return_stmt = loop_info['return_stmt']
+            table = self.runtime.statement_table
+            for_pc = table.pc_at(return_line, return_stmt)
+            if for_pc is not None:
+                # FOR statement still exists - update variable and jump to statement AFTER the FOR
+                self.runtime.set_variable_node(var_node, new_value, self.limits, self.settings_manager)
+                self.runtime.npc = table.next_pc(for_pc)
+                return True  # Loop continues
 
-            if not self.runtime.statement_table.line_exists(return_line):
+            # Validate that the FOR return address still exists
+            if not table.line_exists(return_line):
                 raise RuntimeError(f"NEXT error: FOR loop line {return_line} no longer exists")
 
             line_statements = self.runtime.statement_table.get_line_statements(return_line)
@@ -1300,7 +1497,7 @@ class Interpreter:
                 raise RuntimeError(f"NEXT error: FOR statement in line {return_line} no longer exists")
 
             # Continue loop - update variable and jump to statement AFTER the FOR
-            self.runtime.set_variable(base_name, type_suffix, new_value, token=token, limits=self.limits)
+            self.runtime.set_variable_node(var_node, new_value, self.limits, self.settings_manager)
             # Jump back to statement AFTER the FOR
             for_pc = PC.running_at(return_line, return_stmt)
             next_pc = self.runtime.statement_table.next_pc(for_pc)
@@ -1315,22 +1512,29 @@ class Interpreter:
     def execute_while(self, stmt):
         """Execute WHILE statement"""
         # Evaluate the condition
-        condition = self.evaluate_expression(stmt.condition)
+        self._while_condition(self.evaluate_expression(stmt.condition))
 
-        if not condition:
-            # Condition is false - skip to after matching WEND
-            wend_pos = self.find_matching_wend(
-                self.runtime.pc.line_num,
-                self.runtime.pc.stmt_offset
-            )
+    def _while_condition(self, condition):
+        """Enter the WHILE loop body or skip past its WEND.
 
-            if wend_pos is None:
-                raise RuntimeError(f"WHILE without matching WEND at line {self.runtime.pc.line_num}")
+        Args:
+            condition: Evaluated WHILE condition value
+        """
+        if not condition:
+            # Condition is false - skip to after matching WEND (paired at setup)
+            pc = self.runtime.pc
+            while_wend = self.runtime.loop_pairs()[0]
+            if pc in while_wend:
+                wend_pc = while_wend[pc]
+            else:
+                # WHILE is not a statement of its own (e.g. inside IF...THEN)
+                wend_pos = self.find_matching_wend(pc.line_num, pc.stmt_offset)
+                wend_pc = PC.running_at(*wend_pos) if wend_pos else None
 
-            wend_line, wend_stmt = wend_pos
+            if wend_pc is None:
+                raise RuntimeError(f"WHILE without matching WEND at line {pc.line_num}")
 
             # Jump to the statement AFTER the WEND using statement_table
-            wend_pc = PC.running_at(wend_line, wend_stmt)
             next_pc = self.runtime.statement_table.next_pc(wend_pc)
             if not next_pc.is_running():
                 # No more statements - program ends
@@ -1357,7 +1561,8 @@ class Interpreter:
             raise RuntimeError(f"WEND without matching WHILE at line {self.runtime.pc.line_num}")
 
         # Jump back to the WHILE statement to re-evaluate the condition
-        self.runtime.npc = PC.running_at(loop_info['while_line'], loop_info['while_stmt'])
+        self.runtime.npc = (self.runtime.statement_table.pc_at(loop_info['while_line'], loop_info['while_stmt'])
+                            or PC.running_at(loop_info['while_line'], loop_info['while_stmt']))
 
         # Pop the loop from the stack (after setting npc above, before WHILE re-executes).
         # Timing: We pop NOW so the stack is clean before WHILE condition re-evaluation.
@@ -1410,7 +1615,7 @@ class Interpreter:
                 self.runtime.npc = next_pc
         else:
             # RESUME line_number - jump to specific line
-            self.runtime.npc = PC.from_line(stmt.line_number)
+            self.runtime.npc = self.runtime.jump_target(stmt.line_number)
 
     def execute_end(self, stmt):
         """Execute END statement"""
@@ -1563,14 +1768,13 @@ class Interpreter:
         # hiding programming errors.
         for file_num in list(self.runtime.files.keys()):
             try:
-                file_obj = self.runtime.files[file_num]
-                if hasattr(file_obj, 'close'):
-                    file_obj.close()
+                self._close_file(file_num)
             except (OSError, IOError):
                 # Silently ignore OS-level file close errors (e.g., already closed, permission denied)
                 pass
         self.runtime.files.clear()
         self.runtime.field_buffers.clear()
+        self.runtime.field_layouts.clear()
 
         # State preservation for CHAIN compatibility:
         #
@@ -1786,59 +1990,14 @@ class Interpreter:
         not necessarily the CHARACTER MEANING for non-ASCII CP/M text.
         Future enhancement: Add optional encoding conversion setting for CP437/CP850 display.
 
-        EOF Detection (three methods):
-        1. EOF flag already set (file_info['eof'] == True) → returns None immediately
-        2. read() returns empty bytes (physical EOF) → sets EOF flag, returns partial line or None
-        3. Byte value 26 (^Z) encountered → sets EOF flag, returns partial line or None
-
-        Line Ending Handling:
-        - LF (byte 10): Line complete, return
-        - CR+LF (bytes 13+10): Line complete, consume both, return
-        - CR alone (byte 13): Line complete (old Mac format), return
+        Reading goes through the file's BufferedLineReader (see
+        src/filesystem/line_reader.py), shared with INPUT$ and EOF(): the file
+        is read in chunks, lines end with LF, CR+LF or CR, and ^Z or the
+        physical end of file ends the input.
 
         Returns: line string or None if EOF
         """
-        file_info = self.runtime.files[file_num]
-        file_handle = file_info['handle']
-
-        if file_info['eof']:
-            return None
-
-        # Read bytes until newline or ^Z
-        line_bytes = bytearray()
-        while True:
-            byte = file_handle.read(1)
-            if not byte:
-                # End of file
-                file_info['eof'] = True
-                if line_bytes:
-                    # Return partial line
-                    return line_bytes.decode('latin-1', errors='replace').rstrip('\r\n')
-                return None
-
-            b = byte[0]
-            if b == 26:  # ^Z (EOF marker in CP/M)
-                file_info['eof'] = True
-                if line_bytes:
-                    return line_bytes.decode('latin-1', errors='replace').rstrip('\r\n')
-                return None
-            elif b == 10:  # LF
-                # End of line - LF or CRLF (CR already consumed)
-                return line_bytes.decode('latin-1', errors='replace')
-            elif b == 13:  # CR
-                # Peek ahead to see if next byte is LF
-                next_byte = file_handle.read(1)
-                if next_byte and next_byte[0] == 10:  # LF
-                    # CRLF sequence - return line, LF already consumed
-                    return line_bytes.decode('latin-1', errors='replace')
-                else:
-                    # CR alone (old Mac format) - return line
-                    # Put back the peeked byte if it exists
-                    if next_byte:
-                        file_handle.seek(-1, 1)  # Seek back one byte from current position
-                    return line_bytes.decode('latin-1', errors='replace')
-            else:
-                line_bytes.append(b)
+        return self.runtime.files[file_num]['reader'].readline()
 
     def execute_lineinput(self, stmt):
         """Execute LINE INPUT statement - read entire line
@@ -1944,8 +2103,7 @@ class Interpreter:
 
         # Output to file or screen
         if file_handle:
-            file_handle.write(output + '\n')
-            file_handle.flush()
+            self._write_file(file_handle, output + '\n')
         else:
             self.io.output(output)
 
@@ -2058,6 +2216,7 @@ class Interpreter:
 
         # Delegate to interactive mode if available
         if hasattr(self, 'interactive_mode') and self.interactive_mode:
+            self.flush_files()
             self.interactive_mode.cmd_chain(
                 filename,
                 start_line=start_line,
@@ -2070,6 +2229,7 @@ class Interpreter:
 
     def execute_system(self, stmt):
         """Execute SYSTEM statement - exit to OS"""
+        self.flush_files()
         if hasattr(self, 'interactive_mode') and self.interactive_mode:
             self.interactive_mode.cmd_system()
         else:
@@ -2164,8 +2324,7 @@ class Interpreter:
         UI should serialize the empty AST back to text after this executes.
         """
         # Clear the statement table
-        self.runtime.statement_table.statements.clear()
-        self.runtime.statement_table._keys_cache = None
+        self.runtime.statement_table.clear()
 
         # Clear the line text map
         self.runtime.line_text_map.clear()
@@ -2292,6 +2451,9 @@ class Interpreter:
                     args += f",,{increment}"
 
             self.interactive_mode.cmd_renum(args)
+            # RENUM rewrites line references inside AST nodes
+            if self.compiled_program is not None:
+                self.compiled_program.invalidate()
             return
 
         raise RuntimeError("RENUM not yet implemented - TODO")
@@ -2400,6 +2562,9 @@ class Interpreter:
         if file_num in self.runtime.files:
             raise RuntimeError(f"File #{file_num} already open")
 
+        # Another file number may have buffered output for this file
+        self.flush_files(filename)
+
         # Validate and open file with appropriate mode using filesystem provider
         # Valid modes: I (input), O (output), A (append), R (random access)
         # Any other mode raises error listing valid modes
@@ -2409,10 +2574,10 @@ class Interpreter:
                 file_handle = self.fs.open(filename, "r", binary=True)
             elif mode == "O":
                 # Open for output
-                file_handle = self.fs.open(filename, "w", binary=False)
+                file_handle = self.fs.open(filename, "w", binary=False, buffer_size=self.file_buffer_size)
             elif mode == "A":
                 # Open for append
-                file_handle = self.fs.open(filename, "a", binary=False)
+                file_handle = self.fs.open(filename, "a", binary=False, buffer_size=self.file_buffer_size)
             elif mode == "R":
                 # Random access - open for both read and write, create if doesn't exist
                 try:
@@ -2423,14 +2588,21 @@ class Interpreter:
             else:
                 raise RuntimeError(f"Invalid OPEN mode: {mode} (valid modes: I, O, A, R)")
 
-            # Store file handle and mode
+            # Store file handle and mode (input files are read through a BufferedLineReader)
             self.runtime.files[file_num] = {
                 'handle': file_handle,
                 'mode': mode,
                 'filename': filename,
-                'eof': False
+                'reader': BufferedLineReader(file_handle) if mode == "I" else None
             }
 
+            # A restored web session keeps the FIELD layout of its random files
+            layout = self.runtime.field_layouts.pop(file_num, None)
+            if layout is not None and mode == "R":
+                record_file = RecordFile(file_handle, use_mmap=self.random_file_mmap)
+                record_file.restore_layout(layout)
+                self.runtime.field_buffers[file_num] = record_file
+
         except (OSError, IOError, PermissionError) as e:
             raise RuntimeError(f"Cannot open {filename}: {str(e)}")
 
@@ -2449,17 +2621,23 @@ class Interpreter:
         if not stmt.file_numbers:
             # CLOSE with no arguments - close all files
             for file_num in list(self.runtime.files.keys()):
-                self.runtime.files[file_num]['handle'].close()
-                del self.runtime.files[file_num]
+                self._close_file(file_num)
         else:
             # Close specific file numbers
             for file_num_expr in stmt.file_numbers:
                 file_num = int(self.evaluate_expression(file_num_expr))
                 if file_num in self.runtime.files:
-                    self.runtime.files[file_num]['handle'].close()
-                    del self.runtime.files[file_num]
+                    self._close_file(file_num)
                 # Silently ignore closing unopened files (like MBASIC)
 
+    def _close_file(self, file_num):
+        """Close an open file and drop its FIELD record buffer."""
+        record_file = self.runtime.field_buffers.pop(file_num, None)
+        if record_file is not None:
+            record_file.close()
+        self.runtime.files[file_num]['handle'].close()
+        del self.runtime.files[file_num]
+
     def execute_reset(self, stmt):
         """Execute RESET statement - close all open files
 
@@ -2471,8 +2649,7 @@ class Interpreter:
         """
         # Close all open files (errors propagate to caller)
         for file_num in list(self.runtime.files.keys()):
-            self.runtime.files[file_num]['handle'].close()
-            del self.runtime.files[file_num]
+            self._close_file(file_num)
 
         # Reset filesystem provider
         self.fs.reset()
@@ -2498,28 +2675,18 @@ class Interpreter:
         if file_info['mode'] != 'R':
             raise RuntimeError(f"File #{file_num} not open for random access")
 
-        # Initialize field buffer for this file if not exists
-        if file_num not in self.runtime.field_buffers:
-            self.runtime.field_buffers[file_num] = {
-                'buffer': bytearray(),
-                'fields': {},  # var_name -> (offset, width)
-                'current_record': 0
-            }
-
-        buffer_info = self.runtime.field_buffers[file_num]
-        offset = 0
+        # Record buffer of this file (FIELD fields are slices of it)
+        record_file = self.runtime.field_buffers.get(file_num)
+        if record_file is None:
+            record_file = RecordFile(file_info['handle'], use_mmap=self.random_file_mmap)
+            self.runtime.field_buffers[file_num] = record_file
 
-        # Process each field
+        fields = []
         for width_expr, var_node in stmt.fields:
             width = int(self.evaluate_expression(width_expr))
             var_name = var_node.name + (var_node.type_suffix or '')
-
-            # Store field mapping
-            buffer_info['fields'][var_name] = (offset, width)
-            offset += width
-
-        # Initialize buffer to appropriate size
-        buffer_info['buffer'] = bytearray(offset)
+            fields.append((var_name, width))
+        record_file.define_fields(fields)
 
     def execute_get(self, stmt):
         """Execute GET statement - read record from random-access file
@@ -2540,33 +2707,20 @@ class Interpreter:
         if file_num not in self.runtime.field_buffers:
             raise RuntimeError(f"File #{file_num} has no FIELD defined")
 
-        buffer_info = self.runtime.field_buffers[file_num]
-        file_handle = file_info['handle']
+        record_file = self.runtime.field_buffers[file_num]
 
         # Determine record number
         if stmt.record_number:
             record_num = int(self.evaluate_expression(stmt.record_number))
         else:
             # Use next record
-            record_num = buffer_info['current_record'] + 1
-
-        # Seek to record position (records are 1-based)
-        record_size = len(buffer_info['buffer'])
-        file_handle.seek((record_num - 1) * record_size)
+            record_num = record_file.current_record + 1
 
-        # Read data into buffer
-        data = file_handle.read(record_size)
-        if len(data) < record_size:
-            # Pad with spaces if we read past EOF
-            data += b' ' * (record_size - len(data))
-
-        buffer_info['buffer'] = bytearray(data)
-        buffer_info['current_record'] = record_num
+        # Read the record into the buffer (records are 1-based)
+        record_file.get(record_num)
 
         # Update field variables from buffer
-        for var_name, (offset, width) in buffer_info['fields'].items():
-            value = buffer_info['buffer'][offset:offset+width].decode('latin-1')
-            # Strip variable name to get base name and suffix
+        for var_name, value in record_file.field_values():
             if var_name.endswith('$'):
                 self.runtime.set_variable_raw(var_name, value)
             else:
@@ -2595,25 +2749,28 @@ class Interpreter:
         if file_num not in self.runtime.field_buffers:
             raise RuntimeError(f"File #{file_num} has no FIELD defined")
 
-        buffer_info = self.runtime.field_buffers[file_num]
-        file_handle = file_info['handle']
+        record_file = self.runtime.field_buffers[file_num]
 
         # Determine record number
         if stmt.record_number:
             record_num = int(self.evaluate_expression(stmt.record_number))
         else:
             # Use next record
-            record_num = buffer_info['current_record'] + 1
-
-        # Seek to record position (records are 1-based)
-        record_size = len(buffer_info['buffer'])
-        file_handle.seek((record_num - 1) * record_size)
-
-        # Write buffer to file
-        file_handle.write(buffer_info['buffer'])
-        file_handle.flush()
-
-        buffer_info['current_record'] = record_num
+            record_num = record_file.current_record + 1
+
+        # Other file numbers open on the same file: write their pending
+        # records first, then this record at once, and drop their caches
+        filename = file_info['filename'].upper()
+        others = [other for other_num, other in self.runtime.field_buffers.items()
+                  if other_num != file_num and self.runtime.files[other_num]['filename'].upper() == filename]
+        for other in others:
+            other.flush()
+
+        # Write the buffer as the record (records are 1-based; flushed on
+        # CLOSE or when the program stops unless flush_file_writes is set)
+        record_file.put(record_num, flush=self.flush_file_writes or bool(others))
+        for other in others:
+            other.invalidate()
 
     def execute_lset(self, stmt):
         """Execute LSET statement - left-justify string in field variable
@@ -2628,9 +2785,10 @@ class Interpreter:
 
         # Find which file buffer this variable belongs to
         found = False
-        for file_num, buffer_info in self.runtime.field_buffers.items():
-            if var_name in buffer_info['fields']:
-                offset, width = buffer_info['fields'][var_name]
+        for record_file in self.runtime.field_buffers.values():
+            field = record_file.field(var_name)
+            if field is not None:
+                width = len(field)
 
                 # Left-justify and pad/truncate to width
                 if len(value) < width:
@@ -2638,8 +2796,8 @@ class Interpreter:
                 else:
                     value = value[:width]
 
-                # Update buffer
-                buffer_info['buffer'][offset:offset+width] = value.encode('latin-1')
+                # Store into the record buffer in place
+                field[:] = value.encode('latin-1')
 
                 # Also update variable
                 self.runtime.set_variable_raw(var_name, value)
@@ -2670,9 +2828,10 @@ class Interpreter:
 
         # Find which file buffer this variable belongs to
         found = False
-        for file_num, buffer_info in self.runtime.field_buffers.items():
-            if var_name in buffer_info['fields']:
-                offset, width = buffer_info['fields'][var_name]
+        for record_file in self.runtime.field_buffers.values():
+            field = record_file.field(var_name)
+            if field is not None:
+                width = len(field)
 
                 # Right-justify: pad on left if too short, truncate from left if too long
                 if len(value) < width:
@@ -2682,8 +2841,8 @@ class Interpreter:
                     # Truncate from left (keep rightmost characters)
                     value = value[-width:]
 
-                # Update buffer
-                buffer_info['buffer'][offset:offset+width] = value.encode('latin-1')
+                # Store into the record buffer in place
+                field[:] = value.encode('latin-1')
 
                 # Also update variable
                 self.runtime.set_variable_raw(var_name, value)
@@ -2984,14 +3143,8 @@ class Interpreter:
             subscripts = [int(self.evaluate_expression(sub)) for sub in expr.subscripts]
             return self.runtime.get_array_element(expr.name, expr.type_suffix, subscripts, token=self._make_token_info(expr))
         else:
-            # Simple variable
-            return self.runtime.get_variable(
-                expr.name,
-                expr.type_suffix,
-                token=self._make_token_info(expr),
-                original_case=getattr(expr, 'original_case', expr.name),
-                settings_manager=self.settings_manager
-            )
+            # Simple variable (through its bound storage slot)
+            return self.runtime.get_variable_node(expr, self.settings_manager)
 
     def evaluate_binaryop(self, expr):
         """Evaluate binary operation"""
@@ -3108,36 +3261,31 @@ class Interpreter:
         # Evaluate arguments
         args = [self.evaluate_expression(arg) for arg in expr.arguments]
 
-        # Create token info from function call expression
-        call_token = self._make_token_info(expr)
-
-        # Save parameter values (function parameters shadow variables)
-        # Note: get_variable_for_debugger() and debugger_set=True are used to avoid
-        # triggering variable access tracking. This save/restore is internal function
-        # call machinery, not user-visible variable access. The tracking system
-        # (if enabled) should distinguish between:
-        # - User code variable access (tracked for debugging/variables window)
-        # - Internal implementation details (not tracked)
-        # Maintainer warning: Ensure all internal variable operations use debugger_set=True
-        saved_vars = {}
-        for i, param in enumerate(func_def.parameters):
-            param_name = param.name + (param.type_suffix or "")
-            saved_vars[param_name] = self.runtime.get_variable_for_debugger(param.name, param.type_suffix)
-            if i < len(args):
-                # Set parameter to argument value - this is part of function call
-                # Use debugger_set=True to avoid tracking this internal variable operation
-                self.runtime.set_variable(param.name, param.type_suffix, args[i], token=call_token, limits=self.limits, debugger_set=True)
-
-        # Evaluate function expression
-        result = self.evaluate_expression(func_def.expression)
-
-        # Restore parameter values (use debugger_set=True to avoid tracking)
-        for param_name, saved_value in saved_vars.items():
-            base_name = param_name.rstrip('$%!#')
-            type_suffix = param_name[-1] if param_name[-1] in '$%!#' else None
-            self.runtime.set_variable(base_name, type_suffix, saved_value, debugger_set=True)
-
-        return result
+        return self._call_user_function(func_def, args)
+
+    def _call_user_function(self, func_def, args, evaluate=None):
+        """Evaluate a DEF FN body with its parameters bound to the arguments.
+
+        The parameters live in a frame (Runtime.push_fn_frame()) that shadows
+        the global variables of the same name only while the body runs; the
+        globals are restored even if the body raises an error.
+
+        Args:
+            func_def: DefFnStatementNode for the function
+            args: Evaluated argument values
+            evaluate: Optional callable evaluating the body (defaults to
+                      evaluate_expression on func_def.expression)
+
+        Returns:
+            Function result
+        """
+        frame = self.runtime.push_fn_frame(func_def.parameters, args, self.limits)
+        try:
+            if evaluate is not None:
+                return evaluate()
+            return self.evaluate_expression(func_def.expression)
+        finally:
+            self.runtime.pop_fn_frame(frame)
 
     # ========================================================================
     # Settings Commands
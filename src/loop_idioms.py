@@ -0,0 +1,337 @@
+"""
+Loop idiom recognition for the MBASIC interpreter.
+
+Classic programs spend many of their statements in FOR loops that do
+next to nothing per iteration:
+
+    FOR I=1 TO 2000: NEXT I             delay loop (empty body)
+    FOR I=0 TO N: A(I)=0: NEXT I        array fill (A(I)=literal or other variable)
+    FOR I=1 TO N: S=S+I: NEXT I         accumulation (S=S+X or S=S-X)
+
+LoopIdioms finds these loops in the statement table (again whenever the
+program is edited) and, right after such a FOR statement has run,
+fast-forwards every iteration but the last one in a single step:
+
+    idioms = LoopIdioms(interpreter)
+    idioms.run(for_pc)              # from Interpreter._tick_fast()
+
+It is off unless the interpreter is created with Interpreter(loop_idioms=True):
+a fast-forwarded delay loop ends at once (delay_loop_us defaults to 0) and
+is not polled for a break every BREAK_POLL_INTERVAL statements.
+
+Design notes:
+- The last iteration is executed normally. The loop variable, NEXT
+  (including NEXT I, J and bare NEXT), access tracking of scalars and
+  whole arrays, resource accounting and where execution continues are
+  therefore exactly what the plain loop leaves behind. Skipped statements
+  are still counted in InterpreterState.statements_executed.
+- A loop is only fast-forwarded when none of the skipped iterations can
+  fail: the filled array must exist (one dimension, subscripts in range)
+  and accept the value. Otherwise the loop simply runs normally.
+- Loop values are produced by the same repeated `value + step` as NEXT,
+  so float loops and accumulations round exactly as they would.
+- With the delay_loop_us setting, an empty loop keeps taking real time:
+  InterpreterState.delay_until is set to when the loop would have ended
+  and tick() returns without running statements until then, so UIs stay
+  responsive during the delay.
+"""
+
+import array
+import itertools
+import operator
+import time
+
+from src.ast_nodes import (
+    NumberNode, StringNode, VariableNode, UnaryOpNode, BinaryOpNode,
+    ForStatementNode, NextStatementNode, LetStatementNode,
+)
+from src.runtime import Runtime
+from src.tokens import TokenType
+
+
+_ACCUMULATE = {TokenType.PLUS: operator.add, TokenType.MINUS: operator.sub}
+
+
+def _full_name(node):
+    """Variable name with its (resolved) type suffix."""
+    return Runtime._resolve_variable_name(node.name, node.type_suffix)[0]
+
+
+def _is_invariant(expr, loop_var):
+    """True for a literal (optionally negated) or a scalar other than the loop variable."""
+    if isinstance(expr, UnaryOpNode) and expr.operator == TokenType.MINUS:
+        expr = expr.operand
+    if isinstance(expr, VariableNode):
+        return not expr.subscripts and _full_name(expr) != loop_var
+    return isinstance(expr, (NumberNode, StringNode))
+
+
+def _let_value(suffix, value):
+    """Coerce a value as LET does for a target with this type suffix."""
+    if suffix == '%':
+        return int(value)
+    if suffix == '$':
+        return str(value)
+    if not isinstance(value, (int, float)):
+        value = float(value) if value else 0
+    return value
+
+
+class LoopIdiom:
+    """A FOR loop whose iterations can be fast-forwarded."""
+
+    EMPTY = 'empty'
+    FILL = 'fill'
+    ACCUMULATE = 'accumulate'
+
+    def __init__(self, kind, for_stmt, next_var, body=None, operand=None):
+        self.kind = kind
+        self.for_stmt = for_stmt
+        self.var_name = for_stmt.variable.name + (for_stmt.variable.type_suffix or "")
+        self.next_var = next_var    # VariableNode through which NEXT writes the loop variable
+        self.body = body            # LetStatementNode of a fill or accumulation
+        self.operand = operand      # Accumulated expression: loop variable, other variable or literal
+        self.statements = 1 if body is None else 2   # Statements per iteration (body and NEXT)
+
+
+def find_loop_idioms(runtime):
+    """Find the FOR loops of the program that are loop idioms.
+
+    The loop must be a FOR immediately followed by at most one body
+    statement and a NEXT that closes it (NEXT I, NEXT I, J, or a bare
+    NEXT paired with it by Runtime.loop_pairs()).
+
+    Returns:
+        dict: PC of the FOR statement -> LoopIdiom
+    """
+    table = runtime.statement_table
+    next_for = runtime.loop_pairs()[1]
+    idioms = {}
+    for pc, stmt in table.items():
+        if not isinstance(stmt, ForStatementNode) or stmt.variable.type_suffix == '$':
+            continue
+        loop_var = _full_name(stmt.variable)
+        body_pc = table.next_pc(pc)
+        body = table.get(body_pc)
+        if isinstance(body, NextStatementNode):
+            next_pc, next_stmt, body = body_pc, body, None
+        else:
+            next_pc = table.next_pc(body_pc)
+            next_stmt = table.get(next_pc)
+            if not isinstance(next_stmt, NextStatementNode):
+                continue
+
+        # The NEXT must close this loop when it continues
+        if next_stmt.variables:
+            next_var = next_stmt.variables[0]
+            if next_var.subscripts or _full_name(next_var) != loop_var:
+                continue
+        elif next_for.get(next_pc) is stmt.variable:
+            next_var = stmt.variable
+        else:
+            continue
+
+        if body is None:
+            idioms[pc] = LoopIdiom(LoopIdiom.EMPTY, stmt, next_var)
+            continue
+        if not isinstance(body, LetStatementNode):
+            continue
+        target = body.variable
+        expr = body.expression
+        if target.subscripts:
+            # A(I) = literal or variable
+            if (len(target.subscripts) == 1 and isinstance(target.subscripts[0], VariableNode)
+                    and not target.subscripts[0].subscripts
+                    and _full_name(target.subscripts[0]) == loop_var and _is_invariant(expr, loop_var)):
+                idioms[pc] = LoopIdiom(LoopIdiom.FILL, stmt, next_var, body)
+            continue
+        # S = S + X / S = S - X with X the loop variable, another variable or a number
+        target_name = _full_name(target)
+        if (target.type_suffix == '$' or target_name == loop_var
+                or not isinstance(expr, BinaryOpNode) or expr.operator not in _ACCUMULATE
+                or not isinstance(expr.left, VariableNode) or expr.left.subscripts
+                or _full_name(expr.left) != target_name):
+            continue
+        operand = expr.right
+        if isinstance(operand, VariableNode):
+            if operand.subscripts or operand.type_suffix == '$' or _full_name(operand) == target_name:
+                continue
+        elif not isinstance(operand, NumberNode):
+            continue
+        idioms[pc] = LoopIdiom(LoopIdiom.ACCUMULATE, stmt, next_var, body, operand)
+    return idioms
+
+
+class LoopIdioms:
+    """Fast-forward the loop idioms of the running program."""
+
+    # Most iterations of a fill/accumulation (or of a non-integer loop) fast-forwarded
+    # at once; the rest of a longer loop runs normally
+    MAX_ITERATIONS = 1000000
+
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.runtime = interpreter.runtime
+        self.reset()
+
+    def reset(self):
+        """Forget the idioms found so far and re-read the delay_loop_us setting (new RUN)."""
+        self._idioms = None
+        self._table = None
+        self._version = None
+        settings_manager = self.interpreter.settings_manager
+        self.delay_us = settings_manager.get('delay_loop_us', 0) if settings_manager else 0
+
+    def idioms(self):
+        """The loop idioms of the current program (rebuilt after edits)."""
+        table = self.runtime.statement_table
+        if self._table is not table or self._version != table.version:
+            self._idioms = find_loop_idioms(self.runtime)
+            self._table = table
+            self._version = table.version
+        return self._idioms
+
+    def run(self, pc):
+        """Fast-forward the loop whose FOR statement at pc has just run.
+
+        Returns:
+            Statements skipped (0 if the loop is not an idiom or must run
+            normally); runtime.pc stays at the FOR statement
+        """
+        idiom = self.idioms().get(pc)
+        if idiom is None:
+            return 0
+        runtime = self.runtime
+        loop = runtime.get_for_loop_state(idiom.var_name)
+        if loop is None or loop['pc'] != pc:
+            return 0
+        start = runtime._slot_values[idiom.for_stmt.variable.slot]
+        limit = None if idiom.kind == LoopIdiom.EMPTY else self.MAX_ITERATIONS
+        count, last = self._iterations(start, loop['end'], loop['step'], limit)
+        if count == 0:
+            return 0
+
+        if idiom.kind == LoopIdiom.FILL:
+            if not self._fill(idiom, start, loop['step'], count):
+                return 0
+        elif idiom.kind == LoopIdiom.ACCUMULATE:
+            self._accumulate(idiom, start, loop['step'], count)
+        elif self.delay_us:
+            state = self.interpreter.state
+            state.delay_until = time.perf_counter() + count * self.delay_us / 1000000
+
+        # The last iteration runs normally from the loop variable NEXT left behind
+        interp = self.interpreter
+        runtime.set_variable_node(idiom.next_var, last, interp.limits, interp.settings_manager)
+        return count * idiom.statements
+
+    def _iterations(self, start, end, step, limit):
+        """Count the iterations before the last one.
+
+        Integer loops are counted directly (up to limit, if given); other
+        loops step like NEXT, at most MAX_ITERATIONS times.
+
+        Returns:
+            (count, loop variable value of the first iteration not skipped)
+        """
+        if type(start) is int and type(step) is int and type(end) is int:
+            if step == 0:
+                return 0, start
+            count = max(0, (end - start) // step)
+            if limit is not None:
+                count = min(count, limit)
+            return count, start + count * step
+        count = 0
+        value = start
+        while count < self.MAX_ITERATIONS:
+            following = value + step
+            if not ((step > 0 and following <= end) or (step < 0 and following >= end)):
+                break
+            value = following
+            count += 1
+        return count, value
+
+    @staticmethod
+    def _loop_values(start, step, count):
+        """Loop variable values of the skipped iterations (as NEXT computes them)."""
+        value = start
+        for _ in range(count):
+            yield value
+            value = value + step
+
+    def _fill(self, idiom, start, step, count):
+        """Store the value of A(I)=value for the skipped iterations.
+
+        Returns:
+            False if an iteration would fail (nothing is stored then)
+        """
+        runtime = self.runtime
+        target = idiom.body.variable
+        full_name = _full_name(target)
+        array_info = runtime._arrays.get(full_name)
+        if array_info is None or len(array_info['extents']) != 1:
+            return False
+        base = array_info['base']
+        extent = array_info['extents'][0]
+        data = array_info['data']
+
+        if type(start) is int and type(step) is int:
+            indexes = range(start - base, start - base + count * step, step)
+        else:
+            indexes = [int(value) - base for value in self._loop_values(start, step, count)]
+        if not (0 <= indexes[0] < extent and 0 <= indexes[-1] < extent):
+            return False
+
+        try:
+            value = _let_value(target.type_suffix, self.interpreter.evaluate_expression(idiom.body.expression))
+            try:
+                data[indexes[0]] = value
+            except (TypeError, OverflowError):
+                data = runtime._store_element(array_info, indexes[0], value)
+                value = data[indexes[0]]
+        except (RuntimeError, TypeError, ValueError, OverflowError):
+            return False
+
+        ints = array_info['ints']
+        if isinstance(indexes, range) and step == 1:
+            data[indexes.start:indexes.stop] = (array.array(data.typecode, [value]) if isinstance(data, array.array)
+                                                else [value]) * count
+            if ints is not None:
+                ints[indexes.start:indexes.stop] = bytes([type(value) is int]) * count
+        else:
+            for index in indexes:
+                data[index] = value
+            if ints is not None:
+                for index in indexes:
+                    ints[index] = type(value) is int
+
+        if runtime._track_elements:
+            # Per-element history of the skipped writes (the last one is recorded normally)
+            token = self.interpreter._make_token_info(target)
+            line = runtime._token_line(token)
+            position = getattr(token, 'position', None)
+            tracking = runtime._array_element_tracking
+            for index in indexes:
+                key = f"{full_name}[{index + base}]"
+                entry = tracking.get(key)
+                if entry is None:
+                    entry = tracking[key] = {'last_read': None, 'last_write': None}
+                entry['last_write'] = {'line': line, 'position': position, 'timestamp': time.perf_counter()}
+        return True
+
+    def _accumulate(self, idiom, start, step, count):
+        """Apply S=S+X (or S-X) for the skipped iterations."""
+        interp = self.interpreter
+        runtime = self.runtime
+        let = idiom.body
+        apply = _ACCUMULATE[let.expression.operator]
+        suffix = let.variable.type_suffix
+        total = runtime.get_variable_node(let.expression.left, interp.settings_manager)
+        operand = idiom.operand
+        if isinstance(operand, VariableNode) and _full_name(operand) == _full_name(idiom.for_stmt.variable):
+            values = self._loop_values(start, step, count)
+        else:
+            values = itertools.repeat(interp.evaluate_expression(operand), count)
+        for value in values:
+            total = _let_value(suffix, apply(total, value))
+        runtime.set_variable_node(let.variable, total, interp.limits, interp.settings_manager)
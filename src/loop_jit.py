@@ -0,0 +1,761 @@
+"""
+Hot-loop tracing JIT for the MBASIC interpreter.
+
+Long-running BASIC programs spend nearly all of their time in a few
+FOR/NEXT or GOTO loops. With Interpreter(jit=True), the tick loop reports
+every back-edge (a jump to the same or an earlier statement) to LoopJIT.
+Once a loop head has been jumped to HOT_LOOP_THRESHOLD times, the
+statements from the head up to the jumping statement are translated into
+the source of one Python function, compiled with compile()/exec, and from
+then on every back-edge to that head runs the loop in the function:
+
+    jit = LoopJIT(interpreter)
+    jit.run(head_pc, tail_pc, budget)   # from Interpreter._tick_fast()
+
+Design notes:
+- A trace covers straight-line code: LET, IF...THEN/ELSE, GOTO, PRINT,
+  REM and a few self-contained statements (SWAP, MID$, READ, PRINT USING)
+  that call their execute_* handler. The loop ends with NEXT (FOR loops)
+  or a jump back to the head. Jumps elsewhere leave the trace at the
+  target. Loops containing anything else - INPUT, GOSUB, FOR, WHILE, file
+  I/O, ... - are never compiled and keep running in the interpreter.
+- Generated code reads and writes variable slots (Runtime._slot_values)
+  directly and indexes 1-D/2-D array buffers itself, with the same
+  conversions, errors and access tracking as the Runtime methods. Values
+  stay ordinary Python numbers and strings, so mixed int/float values need
+  no type specialisation. Accesses whose slot is not settled yet (variable
+  not created, new spelling, string write, memory not accounted) go
+  through get_variable_node()/set_variable_node() and the array methods.
+- Guards on entry check that the program, variable store, case-conflict
+  memo, tracking mode, loop state and arrays are still the ones the trace
+  was compiled against. A failed guard is a bailout: the trace is dropped
+  and rebuilt on the next back-edge (a loop that keeps failing its guards
+  is left to the interpreter).
+- Each iteration first checks the tick budget and then pause, Ctrl+C and
+  breakpoints; on any of them the trace returns at the loop head and the
+  normal tick_pc() path takes over, so statement counts, quanta and
+  breakpoints behave as without the JIT.
+- An error inside the trace is reported at the statement that raised it
+  (found from the traceback line) after crediting the statements executed
+  before it, so ON ERROR, ERL and error messages are unchanged.
+"""
+
+from src.ast_nodes import (
+    NumberNode, StringNode, VariableNode, UnaryOpNode, BinaryOpNode, FunctionCallNode,
+    LetStatementNode, IfStatementNode, GotoStatementNode, NextStatementNode,
+    PrintStatementNode, PrintUsingStatementNode, RemarkStatementNode, DataStatementNode,
+    SwapStatementNode, MidAssignmentStatementNode, ReadStatementNode,
+)
+from src.runtime import Runtime, _UNSET, split_variable_name_and_suffix
+from src.tokens import TokenType
+import time
+
+
+# Statements executed through their Interpreter.execute_* handler inside a trace
+# (they neither jump nor wait for input)
+_HANDLER_STATEMENTS = (SwapStatementNode, MidAssignmentStatementNode, ReadStatementNode)
+
+# Builtin functions that read the keyboard
+_INPUT_FUNCTIONS = ('INKEY', 'INPUT')
+
+_ARITHMETIC = {TokenType.MINUS: '-', TokenType.MULTIPLY: '*', TokenType.POWER: '**', TokenType.MOD: '%'}
+_RELATIONAL = {TokenType.EQUAL: '==', TokenType.NOT_EQUAL: '!=', TokenType.LESS_THAN: '<',
+               TokenType.GREATER_THAN: '>', TokenType.LESS_EQUAL: '<=', TokenType.GREATER_EQUAL: '>='}
+_BITWISE = {TokenType.AND: '&', TokenType.OR: '|', TokenType.XOR: '^'}
+
+
+class NotCompilable(Exception):
+    """Raised while building a trace for a loop the JIT does not handle."""
+
+
+def _subscript_error(full_name, subscripts):
+    raise RuntimeError(f"Array subscript out of range: {full_name}{subscripts}")
+
+
+def _division_by_zero():
+    raise RuntimeError("Division by zero")
+
+
+def _undefined_function(name):
+    raise RuntimeError(f"Undefined function: {name}")
+
+
+def _plus(left, right):
+    """BASIC + (with the 255 character limit on concatenation)."""
+    result = left + right
+    if isinstance(result, str) and len(result) > 255:
+        raise RuntimeError("String too long")
+    return result
+
+
+def _divide(left, right):
+    if right == 0:
+        raise RuntimeError("Division by zero")
+    return left / right
+
+
+def _int_divide(left, right):
+    if right == 0:
+        raise RuntimeError("Division by zero")
+    return int(left // right)
+
+
+def _let_number(value):
+    """LET coercion of a value assigned to a numeric variable."""
+    if not isinstance(value, (int, float)):
+        value = float(value) if value else 0
+    return value
+
+
+class LoopTrace:
+    """A compiled loop: the generated function and the statements it covers."""
+
+    def __init__(self, head, pcs, function, owners, source):
+        self.head = head
+        self.pcs = pcs              # PCs of the loop's statements, head first
+        self.function = function    # function(runtime, budget) -> (exit PC, statements) or None
+        self.owners = owners        # generated source line -> index into pcs
+        self.source = source
+
+    def statement_index(self, tb):
+        """Index (into pcs) of the statement that raised, from a traceback."""
+        lineno = None
+        code = self.function.__code__
+        while tb is not None:
+            if tb.tb_frame.f_code is code:
+                lineno = tb.tb_lineno
+            tb = tb.tb_next
+        if lineno is None or lineno >= len(self.owners):
+            return 0
+        return self.owners[lineno]
+
+
+class LoopJIT:
+    """Compile hot loops of the running program into Python functions."""
+
+    # Back-edges to a loop head before its loop is compiled
+    HOT_LOOP_THRESHOLD = 32
+
+    # Longest loop body (in statements) that is compiled
+    MAX_TRACE_STATEMENTS = 64
+
+    # Guard failures tolerated per loop before it is left to the interpreter
+    MAX_RECOMPILES = 8
+
+    def __init__(self, interpreter, threshold=None):
+        self.interpreter = interpreter
+        self.threshold = threshold if threshold is not None else self.HOT_LOOP_THRESHOLD
+        self.reset()
+
+    def reset(self):
+        """Forget all loops (called by Interpreter.start())."""
+        self._back_edges = {}     # loop head PC -> back-edges seen
+        self._traces = {}         # loop head PC -> LoopTrace, or None if not compilable
+        self._recompiles = {}     # loop head PC -> traces dropped by failed guards
+        self._partial = 0         # statements completed by a trace before it raised
+        self.error_statements = 0
+
+    def run(self, head, tail, budget):
+        """Count a back-edge from tail to head; run the loop's trace once it is hot.
+
+        Args:
+            head: PC jumped to (the loop head); runtime.pc is already head
+            tail: PC of the statement that jumped back
+            budget: Statements left in the current tick
+
+        Returns:
+            Number of statements executed by the trace (0 if it did not
+            run). runtime.pc is the next statement to execute.
+
+        Raises:
+            The error of a statement that failed inside the trace, with
+            runtime.pc set to that statement and error_statements to the
+            number of statements completed before it
+        """
+        trace = self._traces.get(head, False)
+        if trace is False:
+            count = self._back_edges.get(head, 0) + 1
+            self._back_edges[head] = count
+            if count < self.threshold:
+                return 0
+            trace = self._compile(head, tail)
+        if trace is None or budget < len(trace.pcs):
+            return 0
+
+        interp = self.interpreter
+        runtime = interp.runtime
+        state = interp.state
+        try:
+            result = trace.function(runtime, budget)
+        except Exception as e:
+            index = trace.statement_index(e.__traceback__)
+            executed = self._partial + index
+            state.statements_executed += executed
+            state.jit_statements += executed
+            state.jit_bailouts += 1
+            runtime.pc = trace.pcs[index]
+            self.error_statements = executed
+            raise
+
+        if result is None:
+            # Guard failed: the program or its state no longer match the trace
+            state.jit_bailouts += 1
+            self._drop(head)
+            return 0
+
+        exit_pc, executed = result
+        state.statements_executed += executed
+        state.jit_statements += executed
+        if exit_pc == head and (state.pause_requested or runtime.break_requested or runtime.breakpoints):
+            state.jit_bailouts += 1
+        runtime.pc = exit_pc
+        return executed
+
+    def _drop(self, head):
+        """Discard a trace whose guards failed; give up on the loop after MAX_RECOMPILES."""
+        recompiles = self._recompiles.get(head, 0) + 1
+        self._recompiles[head] = recompiles
+        if recompiles > self.MAX_RECOMPILES:
+            self._traces[head] = None
+        else:
+            del self._traces[head]
+
+    def _compile(self, head, tail):
+        """Build the trace for the loop head..tail (None if it cannot be compiled)."""
+        try:
+            trace = _TraceBuilder(self, head, tail).build()
+        except NotCompilable:
+            trace = None
+        self._traces[head] = trace
+        if trace is not None:
+            self.interpreter.state.jit_loops_compiled += 1
+        return trace
+
+    def _call_function(self, func_def, args):
+        """Call a DEF FN function from a trace (like evaluating FunctionCallNode)."""
+        interp = self.interpreter
+        compiled = interp.compiled_program
+        if compiled is not None:
+            return interp._call_user_function(func_def, args, compiled._function_body(func_def))
+        return interp._call_user_function(func_def, args)
+
+
+class _TraceBuilder:
+    """Generate the Python source of one loop trace."""
+
+    def __init__(self, jit, head, tail):
+        self.jit = jit
+        self.interpreter = jit.interpreter
+        self.runtime = jit.interpreter.runtime
+        self.table = self.runtime.statement_table
+        self.head = head
+        self.tail = tail
+        self.track = self.runtime._track_access
+        self.namespace = {
+            'U': _UNSET, 'J': jit, 'I': self.interpreter, 'clock': time.perf_counter,
+            'RuntimeError': RuntimeError, 'OOB': _subscript_error, 'DIV0': _division_by_zero,
+            'UNDEF': _undefined_function, 'PLUS': _plus, 'DIV': _divide, 'IDIV': _int_divide,
+            'LETN': _let_number, 'WIDEN': Runtime._store_element,
+            'GV': self.runtime.get_variable_node, 'SV': self.runtime.set_variable_node,
+            'GE': self.runtime.get_array_element, 'SE': self.runtime.set_array_element,
+            'FN': jit._call_function, 'PV': self.interpreter._print_values,
+        }
+        self._constants = {}      # id(object) -> namespace name
+        self.lines = []
+        self.owners = [0, 0]      # source line (1-based) -> statement index; 'def' is line 1
+        self.owner = 0
+        self.temps = 0
+        self.read_slots = {}      # fast-read slot -> variable name (guarded on entry)
+        self.write_slots = {}     # fast-write slot -> variable name
+        self.arrays = {}          # full array name -> (binding number, rank)
+        self.reads = []           # fast reads of the statement part being compiled
+        self.loop = None          # (var_name, FOR PC) of the closing NEXT
+
+    # ========================================================================
+    # Source helpers
+    # ========================================================================
+
+    def const(self, obj, prefix='K'):
+        """Name of obj in the function's namespace.
+
+        Names are prefix + counter; the prefixes (K, F, H, M, P, S, T) must
+        not clash with the array binding locals a, B, D, E and G.
+        """
+        name = self._constants.get(id(obj))
+        if name is None:
+            name = f"{prefix}{len(self._constants)}"
+            self._constants[id(obj)] = name
+            self.namespace[name] = obj
+        return name
+
+    def emit(self, indent, text):
+        self.lines.append('    ' * indent + text)
+        self.owners.append(self.owner)
+
+    def temp(self):
+        self.temps += 1
+        return f"_t{self.temps}"
+
+    def emit_read_tracking(self, indent):
+        """Record last_read of the fast scalar reads of the current statement part."""
+        if self.track and self.reads:
+            self.emit(indent, "t = clock()")
+            for slot, node in self.reads:
+                self.emit(indent, f"LR[{slot}] = ({node.line_num!r}, {node.column!r}, t)")
+        self.reads = []
+
+    # ========================================================================
+    # Building
+    # ========================================================================
+
+    def build(self):
+        """Generate, compile and return the LoopTrace."""
+        pcs = self._loop_pcs()
+        count = len(pcs)
+        self.pcs = pcs
+        self.count = count
+
+        body = []
+        self.lines = body
+        for index, pc in enumerate(pcs):
+            self.owner = index
+            self.statement(self.table.get(pc), index, 3, top=True)
+        self.owner = count - 1
+        self.emit(3, f"return {self.const(self.table.next_pc(pcs[-1]), 'P')}, n + {count}")
+        body_owners = self.owners[2:]
+
+        # Entry guards and bindings, then the loop
+        self.lines = []
+        self.owners = [0, 0]
+        self.owner = 0
+        runtime = self.runtime
+        checks = [
+            f"rt._variable_store is not {self.const(runtime._variable_store, 'S')}",
+            f"rt.statement_table is not {self.const(self.table, 'T')}",
+            f"{self.const(self.table, 'T')}.version != {self.table.version!r}",
+            f"rt._case_memo is not {self.const(runtime._case_memo, 'M')}",
+            "rt._case_memo_variants is not rt._variable_case_variants",
+            f"rt._track_access is not {self.track!r}",
+            f"rt._track_elements is not {runtime._track_elements!r}",
+            "ST.error_info is not None",
+        ]
+        self.emit(1, "ST = I.state")
+        self.emit(1, f"if ({' or '.join(checks)}):")
+        self.emit(2, "return None")
+        self.emit(1, "V = rt._slot_values")
+        if self.track:
+            self.emit(1, "LR = rt._slot_last_read")
+            self.emit(1, "LW = rt._slot_last_write")
+        self.emit(1, "L = I.limits")
+        self.emit(1, "SM = I.settings_manager")
+        self.emit(1, "UF = rt.user_functions")
+        slots = sorted(set(self.read_slots) | set(self.write_slots))
+        if slots:
+            self.emit(1, f"if {' or '.join(f'V[{s}] is U' for s in slots)}:")
+            self.emit(2, "return None")
+        if self.write_slots:
+            names = sorted(set(self.write_slots.values()))
+            allocated = ' or '.join(f"{name!r} not in L.allocations" for name in names)
+            self.emit(1, f"if L is not None and ({allocated}):")
+            self.emit(2, "return None")
+        if self.arrays:
+            self.emit(1, "AR = rt._arrays")
+        for full_name, (k, rank) in self.arrays.items():
+            self.emit(1, f"a{k} = AR.get({full_name!r})")
+            self.emit(1, f"if a{k} is None or len(a{k}['extents']) != {rank}:")
+            self.emit(2, "return None")
+            self.emit(1, f"D{k} = a{k}['data']")
+            self.emit(1, f"T{k} = a{k}['ints']")
+            self.emit(1, f"B{k} = a{k}['base']")
+            if rank == 1:
+                self.emit(1, f"(E{k},) = a{k}['extents']")
+            else:
+                self.emit(1, f"E{k}, G{k} = a{k}['extents']")
+        if self.loop is not None:
+            var_name, for_pc = self.loop
+            self.emit(1, f"fl = rt.for_loop_states.get({var_name!r})")
+            self.emit(1, f"if fl is None or fl['pc'] != {self.const(for_pc, 'P')}:")
+            self.emit(2, "return None")
+            self.emit(1, "end = fl['end']")
+            self.emit(1, "step = fl['step']")
+            self.emit(1, "up = step > 0")
+            self.emit(1, "down = step < 0")
+        self.emit(1, f"limit = budget - {count}")
+        self.emit(1, "n = 0")
+        self.emit(1, "try:")
+        self.emit(2, "while True:")
+        head = self.const(self.head, 'P')
+        self.emit(3, "if n > limit:")
+        self.emit(4, f"return {head}, n")
+        self.emit(3, "if ST.pause_requested or rt.break_requested or rt.breakpoints:")
+        self.emit(4, f"return {head}, n")
+        prologue, prologue_owners = self.lines, self.owners
+        self.lines = prologue + body
+        self.owners = prologue_owners + body_owners
+        self.emit(1, "except BaseException:")
+        self.emit(2, "J._partial = n")
+        self.emit(2, "raise")
+
+        source = "def loop_trace(rt, budget):\n" + "\n".join(self.lines) + "\n"
+        code = compile(source, f"<loop {self.head.line}.{self.head.statement}>", 'exec')
+        exec(code, self.namespace)
+        return LoopTrace(self.head, pcs, self.namespace['loop_trace'], self.owners, source)
+
+    def _loop_pcs(self):
+        """PCs from the loop head to the back-edge statement, in program order."""
+        pcs = []
+        pc = self.head
+        while True:
+            if pc is None or not pc.is_running() or self.table.get(pc) is None:
+                raise NotCompilable("loop head is not before its back-edge")
+            pcs.append(pc)
+            if pc == self.tail:
+                return pcs
+            if len(pcs) >= self.jit.MAX_TRACE_STATEMENTS:
+                raise NotCompilable("loop too long")
+            pc = self.table.next_pc(pc)
+
+    # ========================================================================
+    # Statements
+    # ========================================================================
+
+    def statement(self, stmt, index, indent, top=False):
+        """Emit the code of one statement; index is its top-level position in the loop."""
+        if isinstance(stmt, LetStatementNode):
+            self.let(stmt, indent)
+        elif isinstance(stmt, IfStatementNode):
+            self.if_(stmt, index, indent)
+        elif isinstance(stmt, GotoStatementNode):
+            self.jump(stmt.line_number, index, indent)
+        elif isinstance(stmt, NextStatementNode) and top and index == len(self.pcs) - 1:
+            self.next_(stmt, indent)
+        elif isinstance(stmt, PrintStatementNode) and stmt.file_number is None:
+            values = ', '.join(self.expression(e) for e in stmt.expressions)
+            self.emit(indent, f"p = [{values}]")
+            self.emit_read_tracking(indent)
+            self.emit(indent, f"PV({self.const(stmt)}, None, p)")
+        elif isinstance(stmt, (RemarkStatementNode, DataStatementNode)):
+            self.emit(indent, "pass")
+        elif (isinstance(stmt, _HANDLER_STATEMENTS)
+              or (isinstance(stmt, PrintUsingStatementNode) and stmt.file_number is None)):
+            stmt_type = type(stmt).__name__
+            handler = getattr(self.interpreter, f"execute_{stmt_type.replace('Node', '').replace('Statement', '').lower()}")
+            self.emit(indent, f"{self.const(handler, 'H')}({self.const(stmt)})")
+        else:
+            raise NotCompilable(type(stmt).__name__)
+
+    def block(self, statements, index, indent):
+        """Emit a THEN/ELSE statement list."""
+        for stmt in statements:
+            self.statement(stmt, index, indent)
+
+    def jump(self, line_number, index, indent):
+        """Emit a jump: next iteration if it targets the loop head, else leave the trace."""
+        target = self.table.line_slot(line_number).pc
+        if target is None:
+            self.emit(indent, f"raise RuntimeError({f'Undefined line {line_number}'!r})")
+        elif target == self.head:
+            self.emit(indent, f"n += {index + 1}")
+            self.emit(indent, "continue")
+        else:
+            self.emit(indent, f"return {self.const(target, 'P')}, n + {index + 1}")
+
+    def let(self, stmt, indent):
+        var = stmt.variable
+        suffix = var.type_suffix
+        value = self.expression(stmt.expression)
+        if suffix == '%':
+            value = f"int({value})"
+        elif suffix == '$':
+            value = f"str({value})"
+        elif not self.numeric(stmt.expression):
+            value = f"LETN({value})"
+
+        if var.subscripts:
+            self.emit(indent, f"v = {value}")
+            self.emit_array_store(var, indent)
+            return
+
+        slot = self.slot(var, write=True)
+        if slot is None:
+            self.emit(indent, f"v = {value}")
+            self.emit_read_tracking(indent)
+            self.emit(indent, f"SV({self.const(var)}, v, I.limits, SM)")
+        elif self.track:
+            self.emit(indent, f"v = {value}")
+            self.emit_read_tracking(indent)
+            self.emit(indent, f"V[{slot}] = v")
+            self.emit(indent, f"LW[{slot}] = ({var.line_num!r}, {var.column!r}, clock())")
+        else:
+            self.emit(indent, f"V[{slot}] = {value}")
+            self.reads = []
+
+    def emit_array_store(self, var, indent):
+        """Store v in an array element (LET with subscripts)."""
+        binding = self.array_binding(var)
+        if binding is None:
+            subscripts = ', '.join(f"int({self.expression(s)})" for s in var.subscripts)
+            self.emit_read_tracking(indent)
+            self.emit(indent, f"SE({var.name!r}, {var.type_suffix!r}, [{subscripts}], v, "
+                              f"token={self.const(self.interpreter._make_token_info(var))})")
+            return
+        self.emit(indent, f"i = {self.element_index(var, binding)}")
+        self.reads = []
+        k = binding
+        self.emit(indent, "try:")
+        self.emit(indent + 1, f"D{k}[i] = v")
+        self.emit(indent, "except (TypeError, OverflowError):")
+        self.emit(indent + 1, f"D{k} = WIDEN(a{k}, i, v)")
+        if self.int_flags(var):
+            self.emit(indent, f"T{k}[i] = type(v) is int")
+
+    def if_(self, stmt, index, indent):
+        condition = self.condition(stmt.condition)
+        if self.track and self.reads:
+            self.emit(indent, f"c = {condition}")
+            self.emit_read_tracking(indent)
+            condition = "c"
+        self.reads = []
+        self.emit(indent, f"if {condition}:")
+        if stmt.then_line_number is not None:
+            self.jump(stmt.then_line_number, index, indent + 1)
+        elif stmt.then_statements:
+            self.block(stmt.then_statements, index, indent + 1)
+        else:
+            self.emit(indent + 1, "pass")
+        if stmt.else_line_number is not None:
+            self.emit(indent, "else:")
+            self.jump(stmt.else_line_number, index, indent + 1)
+        elif stmt.else_statements:
+            self.emit(indent, "else:")
+            self.block(stmt.else_statements, index, indent + 1)
+
+    def next_(self, stmt, indent):
+        """The NEXT closing the loop: step its variable and jump back to the head."""
+        runtime = self.runtime
+        if stmt.variables:
+            var_nodes = list(stmt.variables)
+        else:
+            var = runtime.loop_pairs()[1].get(self.tail)
+            if var is None:
+                raise NotCompilable("bare NEXT without a paired FOR")
+            var_nodes = [var]
+        var = var_nodes[0]
+        var_name = var.name + (var.type_suffix or "")
+        loop_state = runtime.get_for_loop_state(var_name)
+        if loop_state is None or self.table.next_pc(loop_state['pc']) != self.head:
+            raise NotCompilable("NEXT does not close the loop at its head")
+        self.loop = (var_name, loop_state['pc'])
+        count = len(self.pcs)
+
+        slot = self.slot(var, write=True)
+        if slot is None:
+            self.emit(indent, f"v = GV({self.const(var)}, SM) + step")
+        else:
+            self.emit(indent, f"v = V[{slot}] + step")
+            self.reads.append((slot, var))
+        self.emit_read_tracking(indent)
+        self.emit(indent, "if (up and v <= end) or (down and v >= end):")
+        if slot is None:
+            self.emit(indent + 1, f"SV({self.const(var)}, v, I.limits, SM)")
+        else:
+            self.emit(indent + 1, f"V[{slot}] = v")
+            if self.track:
+                self.emit(indent + 1, f"LW[{slot}] = ({var.line_num!r}, {var.column!r}, clock())")
+        self.emit(indent + 1, f"n += {count}")
+        self.emit(indent + 1, "continue")
+        self.emit(indent, f"{self.const(runtime.pop_for_loop, 'H')}({var_name!r})")
+        next_single = self.const(self.interpreter._execute_next_single, 'H')
+        for other in var_nodes[1:]:
+            other_name = other.name + (other.type_suffix or "")
+            self.emit(indent, f"if {next_single}({other_name!r}, {self.const(other)}):")
+            self.emit(indent + 1, "npc = rt.npc")
+            self.emit(indent + 1, "rt.npc = None")
+            self.emit(indent + 1, f"return npc, n + {count}")
+
+    # ========================================================================
+    # Variables
+    # ========================================================================
+
+    def slot(self, node, write=False):
+        """Slot of a scalar variable if it can be accessed directly, else None.
+
+        Direct access needs a variable that exists, whose spelling is already
+        registered with the case-conflict memo (so the access would not
+        change anything) and, for writes, a numeric variable whose memory is
+        already accounted for (re-accounting a number does not change it).
+        """
+        runtime = self.runtime
+        if node.slot_store is not runtime._variable_store:
+            runtime.resolve_variable(node)
+        slot = node.slot
+        full_name = runtime._slot_names[slot]
+        if runtime._slot_values[slot] is _UNSET or runtime._slot_case[slot] is None:
+            return None
+        if runtime._case_memo_variants is not runtime._variable_case_variants:
+            return None
+        memo = runtime._case_memo.get(split_variable_name_and_suffix(full_name)[0])
+        if memo is None or (node.original_case or node.name) not in memo[1]:
+            return None
+        if write:
+            limits = self.interpreter.limits
+            if full_name[-1] == '$' or (limits is not None and full_name not in limits.allocations):
+                return None
+            self.write_slots[slot] = full_name
+        else:
+            self.read_slots[slot] = full_name
+        return slot
+
+    def array_binding(self, node):
+        """Binding number of an array indexed directly by the trace, else None.
+
+        Direct indexing covers existing 1-D and 2-D arrays with access
+        tracking off; everything else uses the Runtime array methods.
+        """
+        if self.track:
+            return None
+        full_name, _ = self.runtime._resolve_variable_name(node.name, node.type_suffix)
+        array_info = self.runtime._arrays.get(full_name)
+        rank = len(node.subscripts)
+        if array_info is None or len(array_info['extents']) != rank or rank > 2:
+            return None
+        entry = self.arrays.get(full_name)
+        if entry is None:
+            entry = self.arrays[full_name] = (len(self.arrays), rank)
+        return entry[0]
+
+    def int_flags(self, node):
+        """True if the array of node flags its int elements ('ints', SINGLE/DOUBLE arrays)."""
+        full_name, _ = self.runtime._resolve_variable_name(node.name, node.type_suffix)
+        return self.runtime._arrays[full_name]['ints'] is not None
+
+    def element_index(self, node, k):
+        """Expression for the flat index of an element of array binding k."""
+        full_name, _ = self.runtime._resolve_variable_name(node.name, node.type_suffix)
+        subscripts = [self.expression(s) for s in node.subscripts]
+        if len(subscripts) == 1:
+            t = self.temp()
+            return (f"({t} if 0 <= ({t} := int({subscripts[0]}) - B{k}) < E{k} "
+                    f"else OOB({full_name!r}, [{t} + B{k}]))")
+        t, u = self.temp(), self.temp()
+        return (f"({t} * G{k} + {u} if (({t} := int({subscripts[0]}) - B{k}), ({u} := int({subscripts[1]}) - B{k})) "
+                f"and 0 <= {t} < E{k} and 0 <= {u} < G{k} else OOB({full_name!r}, [{t} + B{k}, {u} + B{k}]))")
+
+    # ========================================================================
+    # Expressions
+    # ========================================================================
+
+    def numeric(self, expr):
+        """True if expr always evaluates to an int or float (when it does not raise)."""
+        if isinstance(expr, NumberNode):
+            return True
+        if isinstance(expr, VariableNode):
+            return expr.type_suffix != '$'
+        if isinstance(expr, UnaryOpNode):
+            return True
+        if isinstance(expr, BinaryOpNode):
+            if expr.operator in _RELATIONAL or expr.operator in _BITWISE:
+                return True
+            if expr.operator in (TokenType.EQV, TokenType.IMP):
+                return True
+            if expr.operator == TokenType.POWER:
+                return False    # may produce a complex number
+            return self.numeric(expr.left) and self.numeric(expr.right)
+        if isinstance(expr, FunctionCallNode):
+            return (not expr.name.endswith('$')
+                    and getattr(self.interpreter.builtins, expr.name, None) is not None)
+        return False
+
+    def pure(self, expr):
+        """True if evaluating expr has no side effects and cannot raise."""
+        if isinstance(expr, (NumberNode, StringNode)):
+            return True
+        return (isinstance(expr, VariableNode) and not expr.subscripts
+                and expr.slot_store is self.runtime._variable_store and expr.slot in self.read_slots)
+
+    def condition(self, expr):
+        """Expression used only for its truth value (IF)."""
+        if isinstance(expr, BinaryOpNode) and expr.operator in _RELATIONAL:
+            return f"({self.expression(expr.left)} {_RELATIONAL[expr.operator]} {self.expression(expr.right)})"
+        return self.expression(expr)
+
+    def expression(self, expr):
+        """Python source evaluating expr like Interpreter.evaluate_expression()."""
+        if isinstance(expr, NumberNode):
+            return f"({expr.value!r})" if expr.value < 0 else repr(expr.value)
+        if isinstance(expr, StringNode):
+            return repr(expr.value)
+        if isinstance(expr, VariableNode):
+            return self.variable(expr)
+        if isinstance(expr, UnaryOpNode):
+            operand = self.expression(expr.operand)
+            if expr.operator == TokenType.MINUS:
+                return f"(-{operand})"
+            if expr.operator == TokenType.NOT:
+                return f"(~int({operand}))"
+            if expr.operator == TokenType.PLUS:
+                return operand
+        elif isinstance(expr, BinaryOpNode):
+            return self.binary(expr)
+        elif isinstance(expr, FunctionCallNode):
+            return self.call(expr)
+        return f"I.evaluate_expression({self.const(expr)})"
+
+    def variable(self, expr):
+        if expr.subscripts:
+            binding = self.array_binding(expr)
+            if binding is None:
+                subscripts = ', '.join(f"int({self.expression(s)})" for s in expr.subscripts)
+                return (f"GE({expr.name!r}, {expr.type_suffix!r}, [{subscripts}], "
+                        f"token={self.const(self.interpreter._make_token_info(expr))})")
+            index = self.element_index(expr, binding)
+            if not self.int_flags(expr):
+                return f"D{binding}[{index}]"
+            t = self.temp()
+            return f"(int(D{binding}[{t}]) if T{binding}[({t} := {index})] else D{binding}[{t}])"
+        slot = self.slot(expr)
+        if slot is None:
+            return f"GV({self.const(expr)}, SM)"
+        self.reads.append((slot, expr))
+        return f"V[{slot}]"
+
+    def binary(self, expr):
+        op = expr.operator
+        if op not in _ARITHMETIC and op not in _RELATIONAL and op not in _BITWISE and op not in (
+                TokenType.PLUS, TokenType.DIVIDE, TokenType.BACKSLASH, TokenType.EQV, TokenType.IMP):
+            return f"I.evaluate_binaryop({self.const(expr)})"
+        left = self.expression(expr.left)
+        right = self.expression(expr.right)
+        if op == TokenType.PLUS:
+            if self.numeric(expr.left) and self.numeric(expr.right):
+                return f"({left} + {right})"
+            return f"PLUS({left}, {right})"
+        if op in _ARITHMETIC:
+            return f"({left} {_ARITHMETIC[op]} {right})"
+        if op in (TokenType.DIVIDE, TokenType.BACKSLASH):
+            if isinstance(expr.right, NumberNode) and expr.right.value != 0:
+                if op == TokenType.DIVIDE:
+                    return f"({left} / {right})"
+                return f"int({left} // {right})"
+            if self.pure(expr.left):
+                d = self.temp()
+                result = f"{left} / {d}" if op == TokenType.DIVIDE else f"int({left} // {d})"
+                return f"({result} if ({d} := {right}) != 0 else DIV0())"
+            return f"{'DIV' if op == TokenType.DIVIDE else 'IDIV'}({left}, {right})"
+        if op in _RELATIONAL:
+            return f"(-1 if {left} {_RELATIONAL[op]} {right} else 0)"
+        if op in _BITWISE:
+            return f"(int({left}) {_BITWISE[op]} int({right}))"
+        if op == TokenType.EQV:
+            return f"(~(int({left}) ^ int({right})))"
+        return f"((~int({left})) | int({right}))"
+
+    def call(self, expr):
+        name = expr.name.rstrip('$')
+        if name in _INPUT_FUNCTIONS:
+            raise NotCompilable(f"{expr.name} reads input")
+        args = [self.expression(a) for a in expr.arguments]
+        builtin = getattr(self.interpreter.builtins, name, None)
+        if builtin is not None:
+            return f"{self.const(builtin, 'F')}({', '.join(args)})"
+        return f"FN(UF.get({expr.name!r}) or UNDEF({expr.name!r}), [{', '.join(args)}])"
@@ -5,6 +5,7 @@ Centralizes all multi-user related configuration including:
 - Error logging (stderr/MySQL)
 - Rate limiting
 - Autosave settings
+- Monitoring endpoints
 
 Configuration is loaded from config/multiuser.json if it exists,
 otherwise uses sensible defaults for single-user mode.
@@ -52,6 +53,8 @@ class RateLimitConfig:
     enabled: bool = False
     max_requests_per_minute: int = 60
     max_concurrent_sessions: int = 100
+    max_program_cpu: float = 0.75  # CPUs all running BASIC programs may use together
+    max_session_cpu: float = 0.5   # CPU share of one web session's program (1.0 = no limit)
 
 
 @dataclass
@@ -61,6 +64,13 @@ class AutosaveConfig:
     interval_seconds: int = 60
 
 
+@dataclass
+class MonitoringConfig:
+    """Configuration for monitoring endpoints."""
+    scheduler_endpoint: bool = False  # Serve GET /scheduler (per-session CPU data)
+    token: Optional[str] = None       # Required as X-Monitoring-Token header when set
+
+
 @dataclass
 class MultiUserConfig:
     """Complete multi-user configuration."""
@@ -69,6 +79,7 @@ class MultiUserConfig:
     error_logging: ErrorLoggingConfig = None
     rate_limiting: RateLimitConfig = None
     autosave: AutosaveConfig = None
+    monitoring: MonitoringConfig = None
 
     def __post_init__(self):
         if self.session_storage is None:
@@ -79,6 +90,8 @@ class MultiUserConfig:
             self.rate_limiting = RateLimitConfig()
         if self.autosave is None:
             self.autosave = AutosaveConfig()
+        if self.monitoring is None:
+            self.monitoring = MonitoringConfig()
 
 
 def load_config() -> MultiUserConfig:
@@ -186,7 +199,9 @@ def _parse_config_dict(data: Dict[str, Any]) -> MultiUserConfig:
         config.rate_limiting = RateLimitConfig(
             enabled=rl.get('enabled', False),
             max_requests_per_minute=rl.get('max_requests_per_minute', 60),
-            max_concurrent_sessions=rl.get('max_concurrent_sessions', 100)
+            max_concurrent_sessions=rl.get('max_concurrent_sessions', 100),
+            max_program_cpu=rl.get('max_program_cpu', 0.75),
+            max_session_cpu=rl.get('max_session_cpu', 0.5)
         )
 
     # Autosave
@@ -197,6 +212,21 @@ def _parse_config_dict(data: Dict[str, Any]) -> MultiUserConfig:
             interval_seconds=a.get('interval_seconds', 60)
         )
 
+    # Monitoring
+    if 'monitoring' in data:
+        mon = data['monitoring']
+        config.monitoring = MonitoringConfig(
+            scheduler_endpoint=mon.get('scheduler_endpoint', False),
+            token=mon.get('token') or None
+        )
+        if config.monitoring.token and config.monitoring.token.startswith('${'):
+            # Token environment variable not set: keep the endpoint off
+            import sys
+            print(f"Warning: monitoring token {config.monitoring.token} not set, "
+                  "scheduler endpoint disabled", file=sys.stderr)
+            config.monitoring.scheduler_endpoint = False
+            config.monitoring.token = None
+
     return config
 
 
@@ -0,0 +1,114 @@
+"""
+Output pane buffer for the web UI: a line ring buffer and append-only deltas.
+
+The web UI used to keep its output as one string, split all of it into
+lines on every flush to enforce the line limit, and send the whole text
+to the browser each time. OutputRingBuffer keeps the last max_lines lines
+with work proportional to the appended text, and the browser receives
+only the appended text (append_script()), trimming its copy of the
+output to the same line limit itself.
+
+    buffer = OutputRingBuffer(1000, 'Welcome\\n')
+    buffer.append('HELLO\\n')                          # server copy
+    ui.run_javascript(append_script(element_id, 'HELLO\\n', 1000))
+    buffer.text()                                     # same text as the browser shows
+
+Both sides keep the text's last max_lines segments (text.split('\\n'),
+the last one being the unfinished line) and prefix TRUNCATED_MARKER once
+lines have been dropped. CLIENT_SCRIPT defines the browser side; a page
+must load it once before append_script() messages are run.
+"""
+
+import json
+from collections import deque
+
+
+TRUNCATED_MARKER = '[... output truncated ...]\n'
+
+
+class OutputRingBuffer:
+    """The last max_lines lines of output text."""
+
+    def __init__(self, max_lines, text=''):
+        self.max_lines = max_lines
+        self.lines = deque(maxlen=max(max_lines - 1, 0))   # Finished lines
+        self.partial = ''                                   # Unfinished last line
+        self.truncated = False
+        if text.startswith(TRUNCATED_MARKER):
+            self.truncated = True
+            text = text[len(TRUNCATED_MARKER):]
+        self.append(text)
+
+    def append(self, text):
+        """Add output text, dropping the oldest lines beyond max_lines."""
+        if '\n' not in text:
+            self.partial += text
+            return
+        parts = text.split('\n')
+        parts[0] = self.partial + parts[0]
+        self.partial = parts.pop()
+        lines = self.lines
+        if len(lines) + len(parts) > lines.maxlen:
+            self.truncated = True
+            if len(parts) > lines.maxlen:
+                parts = parts[len(parts) - lines.maxlen:]
+        lines.extend(parts)
+
+    def clear(self):
+        self.lines.clear()
+        self.partial = ''
+        self.truncated = False
+
+    def text(self):
+        """The buffered output, with TRUNCATED_MARKER first if lines were dropped."""
+        text = '\n'.join(self.lines) + '\n' + self.partial if self.lines else self.partial
+        return TRUNCATED_MARKER + text if self.truncated else text
+
+
+# Browser side: append text to the output textarea's value, trim it to
+# maxLines segments like OutputRingBuffer and keep it scrolled to the
+# bottom unless the user has scrolled up. The element's Vue model is
+# updated when the page exposes it, so a later re-render keeps the text.
+CLIENT_SCRIPT = '''
+window.mbasicAppendOutput = function (id, text, maxLines) {
+    const marker = %s;
+    const element = window.mounted_app && window.mounted_app.elements && window.mounted_app.elements[id];
+    let textarea = document.querySelector('[data-marker="output"] textarea');
+    if (!textarea) {
+        const textareas = document.querySelectorAll('textarea[readonly]');
+        textarea = textareas[textareas.length - 1];
+    }
+    let value = element ? (element.props.value || '') : (textarea ? textarea.value : '');
+    let truncated = value.startsWith(marker);
+    if (truncated) value = value.slice(marker.length);
+    value += text;
+    let cut = value.length;
+    for (let i = 0; i < maxLines && cut >= 0; i++) {
+        cut = cut > 0 ? value.lastIndexOf('\\n', cut - 1) : -1;
+    }
+    if (cut >= 0) {
+        value = value.slice(cut + 1);
+        truncated = true;
+    }
+    if (truncated) value = marker + value;
+    if (element) element.props.value = value;
+    if (!textarea) return;
+    if (textarea.value !== value) textarea.value = value;
+    if (!textarea.dataset.scrollTrackerInstalled) {
+        textarea.dataset.scrollTrackerInstalled = 'true';
+        textarea.dataset.userScrolledUp = 'false';
+        textarea.addEventListener('scroll', function () {
+            const isAtBottom = this.scrollTop >= this.scrollHeight - this.clientHeight - 50;
+            this.dataset.userScrolledUp = isAtBottom ? 'false' : 'true';
+        });
+    }
+    if (textarea.dataset.userScrolledUp !== 'true') {
+        textarea.scrollTop = textarea.scrollHeight;
+    }
+};
+''' % json.dumps(TRUNCATED_MARKER)
+
+
+def append_script(element_id, text, max_lines):
+    """JavaScript call appending text to the output element (see CLIENT_SCRIPT)."""
+    return f'mbasicAppendOutput({json.dumps(element_id)}, {json.dumps(text)}, {max_lines})'
@@ -20,10 +20,33 @@ This eliminates entire classes of bugs:
 - Clear semantics (is_running() is the only question)
 """
 
+import bisect
 from dataclasses import dataclass
 from typing import Optional
 
 
+# Low bits of a packed position hold the statement offset (see pack_position())
+STATEMENT_BITS = 16
+
+
+def pack_position(line: int, statement: int) -> int:
+    """
+    Pack a (line, statement) position into one integer.
+
+    Packed positions order like (line, statement) tuples, and unlike PCs
+    they hash and compare in C, so the interpreter's hot path uses them as
+    dict keys. Full PC objects are only needed at the API boundary.
+
+    Args:
+        line: Line number
+        statement: Statement index (0-based)
+
+    Returns:
+        line << STATEMENT_BITS | statement
+    """
+    return line << STATEMENT_BITS | statement
+
+
 @dataclass(frozen=True)
 class ErrorInfo:
     """
@@ -116,6 +139,13 @@ class PC:
         """
         return hash((self.line, self.statement))
 
+    @property
+    def position(self) -> int:
+        """Packed integer position (see pack_position()), -1 if not in program"""
+        if self.line is None:
+            return -1
+        return self.line << STATEMENT_BITS | self.statement
+
     def __repr__(self):
         """String representation for debugging"""
         if self.line is None:
@@ -299,18 +329,164 @@ class PC:
         return False
 
 
+class LineSlot:
+    """
+    Resolved jump target for one line number.
+
+    Every GOTO/GOSUB/ON.../IF...THEN/RESUME reference to the same line
+    shares one slot. The statement table keeps slot.pc pointing at the first
+    statement of the line (or None while the line does not exist), so a
+    jump is a single attribute read and editing a line relinks all of its
+    referrers at once.
+    """
+
+    __slots__ = ('line', 'pc')
+
+    def __init__(self, line, pc=None):
+        self.line = line
+        self.pc = pc
+
+    def __repr__(self):
+        return f"LineSlot({self.line} -> {self.pc})"
+
+
+class _StatementDict(dict):
+    """PC -> statement dict counting its changes (StatementTable.version).
+
+    Direct edits of StatementTable.statements bump the version too, so the
+    table's index and the tables derived from the program see them.
+    """
+
+    version = 0
+
+    def __setitem__(self, pc, stmt_node):
+        self.version += 1
+        dict.__setitem__(self, pc, stmt_node)
+
+    def __delitem__(self, pc):
+        self.version += 1
+        dict.__delitem__(self, pc)
+
+    def pop(self, *args):
+        self.version += 1
+        return dict.pop(self, *args)
+
+    def popitem(self):
+        self.version += 1
+        return dict.popitem(self)
+
+    def setdefault(self, pc, default=None):
+        self.version += 1
+        return dict.setdefault(self, pc, default)
+
+    def update(self, *args, **kwargs):
+        self.version += 1
+        dict.update(self, *args, **kwargs)
+
+    def clear(self):
+        self.version += 1
+        dict.clear(self)
+
+
 class StatementTable:
     """
     Ordered collection of statements indexed by PC.
 
-    Uses regular dict which maintains insertion order (Python 3.7+).
-    Provides navigation methods (first_pc, next_pc) for sequential execution.
+    Statements are ordered by (line number, statement offset). Besides the
+    PC -> statement dict, the table keeps a navigation index so sequential
+    stepping never scans the program:
+    - _lines: sorted list of line numbers
+    - _line_pcs: line number -> PCs of that line in statement order
+    - _next / _prev: PC -> following / preceding PC
+
+    add(), delete_line() and replace_line() update the index incrementally
+    (only the edited line and its two neighbours are relinked), so
+    next_pc()/prev_pc() stay O(1) while a paused program is being edited.
+    If self.statements is modified directly, the index is rebuilt on the
+    next lookup (the edit changes version, see below).
+
+    line_slot() hands out LineSlot objects (jump targets) that are kept
+    up to date by the same incremental updates.
+
+    version changes whenever statements are added, replaced or removed
+    (through the table or directly in self.statements), so tables derived
+    from the program (e.g. Runtime.loop_pairs()) can tell when they are
+    out of date.
+
+    order() flattens the program into lists indexed by statement index
+    (rebuilt lazily per version) for the interpreter's tick loop, which
+    steps through the program by index and only looks up jump targets;
+    pc_at() finds the table's own PC for a position without allocating.
     """
 
     def __init__(self):
         """Initialize empty statement table"""
-        self.statements = {}  # PC -> stmt_node (insertion-ordered)
-        self._keys_cache = None  # Cache for next_pc() lookups
+        self.statements = _StatementDict()  # PC -> stmt_node
+        self._lines = []      # Sorted line numbers
+        self._line_pcs = {}   # line number -> [PC, ...] ordered by statement offset
+        self._next = {}       # PC -> next PC (None after the last statement)
+        self._prev = {}       # PC -> previous PC (None before the first statement)
+        self._indexed = 0     # version the index is up to date with
+        self._slots = {}      # line number -> LineSlot (jump targets)
+        self._order = None    # Cached order() result
+        self._order_version = None
+
+    @property
+    def version(self):
+        """Bumped on every change to the program."""
+        return self.statements.version
+
+    @version.setter
+    def version(self, value):
+        self.statements.version = value
+
+    def _index_stale(self):
+        """True if self.statements was changed behind the index's back."""
+        return self._indexed != self.statements.version
+
+    def _rebuild_index(self):
+        """Rebuild the whole navigation index from self.statements."""
+        self._line_pcs = {}
+        for pc in self.statements:
+            self._line_pcs.setdefault(pc.line, []).append(pc)
+        for pcs in self._line_pcs.values():
+            pcs.sort(key=lambda p: p.statement)
+        self._lines = sorted(self._line_pcs)
+
+        self._next = {}
+        self._prev = {}
+        previous = None
+        for line in self._lines:
+            for pc in self._line_pcs[line]:
+                self._prev[pc] = previous
+                if previous is not None:
+                    self._next[previous] = pc
+                previous = pc
+        if previous is not None:
+            self._next[previous] = None
+
+        for line_num, slot in self._slots.items():
+            pcs = self._line_pcs.get(line_num)
+            slot.pc = pcs[0] if pcs else None
+        self.version += 1
+        self._indexed = self.version
+
+    def _line_position(self, line_num):
+        """Index of line_num in self._lines (or where it would be inserted)."""
+        return bisect.bisect_left(self._lines, line_num)
+
+    def _relink_line(self, line_num):
+        """Relink the PCs of one line with the last PC of the previous line
+        and the first PC of the next line."""
+        pos = self._line_position(line_num)
+        before = self._line_pcs[self._lines[pos - 1]][-1] if pos > 0 else None
+        after = self._line_pcs[self._lines[pos + 1]][0] if pos + 1 < len(self._lines) else None
+        chain = [before] + self._line_pcs[line_num] + [after]
+        for a, b in zip(chain, chain[1:]):
+            if a is not None:
+                self._next[a] = b
+            if b is not None:
+                self._prev[b] = a
 
     def add(self, pc, stmt_node):
         """
@@ -320,8 +496,100 @@ class StatementTable:
             pc: Program counter identifying this statement
             stmt_node: AST node for the statement
         """
+        stale = self._index_stale()
+        if pc in self.statements:
+            # Same position, new node - ordering unchanged
+            self.statements[pc] = stmt_node
+            if not stale:
+                self._indexed = self.version
+            return
+
         self.statements[pc] = stmt_node
-        self._keys_cache = None  # Invalidate cache when table changes
+        if stale:
+            # Index will be rebuilt on the next lookup
+            return
+
+        pcs = self._line_pcs.get(pc.line)
+        if pcs is None:
+            bisect.insort(self._lines, pc.line)
+            pcs = self._line_pcs[pc.line] = []
+        pcs.append(pc)
+        if len(pcs) > 1 and pcs[-2].statement > pc.statement:
+            pcs.sort(key=lambda p: p.statement)
+        self._relink_line(pc.line)
+        self._indexed = self.version
+
+        slot = self._slots.get(pc.line)
+        if slot is not None:
+            slot.pc = pcs[0]
+
+    def clear(self):
+        """Remove all statements."""
+        self.statements.clear()
+        self._lines = []
+        self._line_pcs = {}
+        self._next = {}
+        self._prev = {}
+        for slot in self._slots.values():
+            slot.pc = None
+        self.version += 1
+        self._indexed = self.version
+
+    def line_slot(self, line_num):
+        """
+        Get the jump-target slot for a line number.
+
+        Args:
+            line_num: Target line number
+
+        Returns:
+            LineSlot whose pc is the first statement of the line, or None
+            if the line does not exist (yet)
+        """
+        if self._index_stale():
+            self._rebuild_index()
+        slot = self._slots.get(line_num)
+        if slot is None:
+            pcs = self._line_pcs.get(line_num)
+            slot = self._slots[line_num] = LineSlot(line_num, pcs[0] if pcs else None)
+        return slot
+
+    def order(self):
+        """
+        Get the program flattened in execution order.
+
+        Returns:
+            (pcs, statements, index): the table's PCs and statement nodes by
+            statement index, each followed by one end entry (a halted PC and
+            None), and a dict mapping packed positions (PC.position) to
+            statement indexes. Cached until the program changes.
+        """
+        if self._index_stale():
+            self._rebuild_index()
+        if self._order_version != self.version:
+            pcs = [pc for line_num in self._lines for pc in self._line_pcs[line_num]]
+            statements = [self.statements[pc] for pc in pcs]
+            index = {pc.position: i for i, pc in enumerate(pcs)}
+            pcs.append(PC.halted())
+            statements.append(None)
+            self._order = (pcs, statements, index)
+            self._order_version = self.version
+        return self._order
+
+    def pc_at(self, line_num, statement):
+        """
+        Get the table's PC for a position (no new PC object is created).
+
+        Args:
+            line_num: Line number
+            statement: Statement index
+
+        Returns:
+            PC stored in the table, or None if there is no such statement
+        """
+        pcs, _, index = self.order()
+        i = index.get(pack_position(line_num, statement))
+        return None if i is None else pcs[i]
 
     def get(self, pc):
         """
@@ -342,10 +610,11 @@ class StatementTable:
         Returns:
             PC of first statement, or halted PC if table is empty
         """
-        try:
-            return next(iter(self.statements))
-        except StopIteration:
+        if self._index_stale():
+            self._rebuild_index()
+        if not self._lines:
             return PC.halted()
+        return self._line_pcs[self._lines[0]][0]
 
     def next_pc(self, pc):
         """
@@ -361,19 +630,12 @@ class StatementTable:
         Returns:
             Next PC in sequence, or halted PC if at end or PC not found in table
         """
-        # Build/rebuild keys cache if needed
-        if self._keys_cache is None:
-            self._keys_cache = list(self.statements.keys())
-
-        try:
-            idx = self._keys_cache.index(pc)
-            if idx + 1 < len(self._keys_cache):
-                return self._keys_cache[idx + 1]
-        except ValueError:
-            # PC not found in table
-            pass
-
-        return PC.halted()
+        if self._indexed != self.statements.version:
+            self._rebuild_index()
+        next_pc = self._next.get(pc)
+        if next_pc is None:
+            return PC.halted()
+        return next_pc
 
     def prev_pc(self, pc):
         """
@@ -388,19 +650,9 @@ class StatementTable:
         Returns:
             Previous PC in sequence, or None if at beginning or PC not found in table
         """
-        # Build/rebuild keys cache if needed
-        if self._keys_cache is None:
-            self._keys_cache = list(self.statements.keys())
-
-        try:
-            idx = self._keys_cache.index(pc)
-            if idx > 0:
-                return self._keys_cache[idx - 1]
-        except ValueError:
-            # PC not found in table
-            pass
-
-        return None
+        if self._indexed != self.statements.version:
+            self._rebuild_index()
+        return self._prev.get(pc)
 
     def __contains__(self, pc):
         """Check if PC exists in table (for breakpoint checks)"""
@@ -424,11 +676,22 @@ class StatementTable:
         Returns:
             List of statement nodes for that line, in order by statement index
         """
-        result = []
-        for pc, stmt in self.statements.items():
-            if pc.line == line_num:
-                result.append(stmt)
-        return result
+        if self._index_stale():
+            self._rebuild_index()
+        return [self.statements[pc] for pc in self._line_pcs.get(line_num, ())]
+
+    def items(self):
+        """
+        Iterate over the program in execution order.
+
+        Yields:
+            (PC, statement node) pairs ordered by line number and statement offset
+        """
+        if self._index_stale():
+            self._rebuild_index()
+        for line_num in self._lines:
+            for pc in self._line_pcs[line_num]:
+                yield pc, self.statements[pc]
 
     def line_exists(self, line_num):
         """
@@ -440,7 +703,9 @@ class StatementTable:
         Returns:
             True if line has any statements
         """
-        return any(pc.line == line_num for pc in self.statements.keys())
+        if self._index_stale():
+            self._rebuild_index()
+        return line_num in self._line_pcs
 
     def delete_line(self, line_num):
         """
@@ -449,11 +714,32 @@ class StatementTable:
         Args:
             line_num: Line number to delete
         """
-        # Remove all PCs for this line
-        to_remove = [pc for pc in self.statements.keys() if pc.line == line_num]
-        for pc in to_remove:
+        if self._index_stale():
+            self._rebuild_index()
+        pcs = self._line_pcs.pop(line_num, None)
+        if pcs is None:
+            return
+
+        self.version += 1
+        pos = self._line_position(line_num)
+        del self._lines[pos]
+        for pc in pcs:
             del self.statements[pc]
-        self._keys_cache = None  # Invalidate cache
+            self._next.pop(pc, None)
+            self._prev.pop(pc, None)
+        self._indexed = self.version
+
+        slot = self._slots.get(line_num)
+        if slot is not None:
+            slot.pc = None
+
+        # Link the neighbouring lines to each other
+        before = self._line_pcs[self._lines[pos - 1]][-1] if pos > 0 else None
+        after = self._line_pcs[self._lines[pos]][0] if pos < len(self._lines) else None
+        if before is not None:
+            self._next[before] = after
+        if after is not None:
+            self._prev[after] = before
 
     def replace_line(self, line_num, line_node):
         """
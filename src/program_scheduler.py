@@ -0,0 +1,293 @@
+"""
+Fair scheduling of the web UI's program time slices across sessions.
+
+Every running web session hands its program's time slices to one
+per-process ProgramScheduler (see ProgramWorker.start()). The scheduler
+runs them on its threads in round-robin order and keeps the CPU budgets:
+
+    scheduler = get_scheduler()        # configured from config/multiuser.json
+    worker = ProgramWorker(scheduler)
+    worker.start(interpreter)           # queue the program's next slice
+    scheduler.stats()                   # monitoring snapshot
+
+Design notes:
+- A slice that ends only because its TIME_SLICE is used up goes to the
+  back of the queue: the program keeps running, taking turns with the
+  other sessions, without waiting for its UI timer. Slices that end for
+  anything the UI must handle (INPUT, an error, the end of the program,
+  stop(), a delay loop, a wait for a key) complete the worker's future.
+- CPU is measured per slice with time.thread_time(). A session may use
+  ResourceLimits.max_cpu_share of one CPU on average, all programs
+  together RateLimitConfig.max_program_cpu CPUs (when rate limiting is
+  enabled). Both are leaky buckets (CpuBudget) allowing BURST seconds
+  over budget; a session over its budget waits in the queue, and while
+  the process is over its budget no slice starts.
+- Sessions whose browser tab is hidden (ProgramWorker.background) run
+  when no visible session's slice is ready, and at least every
+  BACKGROUND_TURN-th slice, so they are slowed down but never starved.
+- Stopped sessions skip the queue and their budgets.
+"""
+
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import Future
+
+
+class CpuBudget:
+    """Leaky bucket of CPU time: `share` CPUs on average, `burst` seconds over."""
+
+    def __init__(self, share, burst):
+        self.share = share
+        self.burst = burst
+        self.debt = 0.0         # CPU seconds used and not yet paid back
+        self.updated = time.monotonic()
+
+    def _drain(self, now):
+        self.debt = max(0.0, self.debt - (now - self.updated) * self.share)
+        self.updated = now
+
+    def charge(self, cpu, now):
+        """Add CPU seconds used."""
+        self._drain(now)
+        self.debt += cpu
+
+    def ready_at(self, now):
+        """Monotonic time from which the budget allows running again."""
+        self._drain(now)
+        if self.debt <= self.burst:
+            return now
+        return now + (self.debt - self.burst) / self.share
+
+
+class _Job:
+    """A session's queued or running time slices, until its future completes."""
+
+    __slots__ = ('worker', 'future', 'ready_at')
+
+    def __init__(self, worker, ready_at):
+        self.worker = worker
+        self.future = Future()
+        self.ready_at = ready_at
+
+
+class _Session:
+    """Scheduler state kept per ProgramWorker."""
+
+    def __init__(self, session_id):
+        self.id = session_id
+        self.budget = None
+
+
+class ProgramScheduler:
+    """Runs the time slices of all sessions' programs on a few shared threads."""
+
+    THREADS = 4
+    BURST = 0.05                # CPU seconds a budget may be exceeded by
+    BACKGROUND_TURN = 8         # Every 8th slice goes to a hidden tab if one is ready
+    STATS_WINDOW = 10.0         # Seconds of history behind stats()
+
+    def __init__(self, threads=THREADS, max_cpu=None):
+        """
+        Args:
+            threads: Threads running slices (at most this many at a time)
+            max_cpu: CPUs all programs together may use on average (None = no limit)
+        """
+        self.threads = threads
+        self.max_cpu = max_cpu
+        self.budget = CpuBudget(max_cpu, self.BURST) if max_cpu else None
+        self._cond = threading.Condition()
+        self._queue = deque()               # _Jobs waiting for a thread
+        self._running = 0
+        self._dispatched = 0
+        self._started = False
+        self._sessions = weakref.WeakKeyDictionary()    # ProgramWorker -> _Session
+        self._next_id = 1
+        self._latencies = deque(maxlen=1000)    # Seconds from ready to running, per slice
+        self._history = deque()                 # (end time, session id, CPU seconds)
+        self._created = time.monotonic()
+
+    def submit(self, worker):
+        """Queue the worker's program; returns a Future of its state when the UI must act."""
+        job = _Job(worker, time.monotonic())
+        with self._cond:
+            if not self._started:
+                self._started = True
+                for n in range(self.threads):
+                    threading.Thread(target=self._thread_main, name=f'mbasic-program-{n}',
+                                     daemon=True).start()
+            self._queue.append(job)
+            self._cond.notify()
+        return job.future
+
+    def wake(self):
+        """Re-check the queue (a queued session was stopped)."""
+        with self._cond:
+            self._cond.notify_all()
+
+    def _thread_main(self):
+        while True:
+            self._run_slice(self._next_job())
+
+    def _next_job(self):
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                job, wait = self._pick(now)
+                if job is not None:
+                    self._queue.remove(job)
+                    self._running += 1
+                    self._dispatched += 1
+                    self._latencies.append(max(0.0, now - job.ready_at))
+                    return job
+                self._cond.wait(wait)
+
+    def _pick(self, now):
+        """The next job to run, or (None, seconds to wait; None = until notified)."""
+        for job in self._queue:
+            if job.worker.stop_requested:
+                return job, None
+        if not self._queue:
+            return None, None
+        if self.budget is not None:
+            ready = self.budget.ready_at(now)
+            if ready > now:
+                return None, ready - now
+        foreground = background = None
+        wait = None
+        for job in self._queue:
+            if job.ready_at > now:
+                wait = job.ready_at - now if wait is None else min(wait, job.ready_at - now)
+            elif job.worker.background:
+                background = background or job
+            else:
+                foreground = foreground or job
+            if foreground is not None and background is not None:
+                break
+        if background is not None and (foreground is None
+                                       or (self._dispatched + 1) % self.BACKGROUND_TURN == 0):
+            return background, None
+        return foreground, wait
+
+    def _session(self, worker):
+        session = self._sessions.get(worker)
+        if session is None:
+            session = self._sessions[worker] = _Session(self._next_id)
+            self._next_id += 1
+        return session
+
+    def _run_slice(self, job):
+        worker = job.worker
+        state = error = None
+        cpu = time.thread_time()
+        try:
+            if worker.stop_requested:
+                state = worker.interpreter.state
+            else:
+                state = worker.run_slice(worker.interpreter)
+        except BaseException as e:
+            error = e
+        cpu = time.thread_time() - cpu
+        now = time.monotonic()
+
+        with self._cond:
+            self._running -= 1
+            session = self._session(worker)
+            self._history.append((now, session.id, cpu))
+            self._trim_history(now)
+            if self.budget is not None:
+                self.budget.charge(cpu, now)
+            share = worker.interpreter.limits.max_cpu_share
+            if share < 1.0:
+                if session.budget is None:
+                    session.budget = CpuBudget(share, self.BURST)
+                session.budget.share = share
+                session.budget.charge(cpu, now)
+            if error is None and worker.preempted and not worker.stop_requested:
+                # Slice used up: back of the queue, once the session's budget allows
+                job.ready_at = session.budget.ready_at(now) if share < 1.0 else now
+                self._queue.append(job)
+                self._cond.notify_all()
+                return
+            self._cond.notify_all()
+
+        if error is not None:
+            job.future.set_exception(error)
+        else:
+            job.future.set_result(state)
+
+    def _trim_history(self, now):
+        """Drop the history older than STATS_WINDOW (called with _cond held)."""
+        history = self._history
+        while history and history[0][0] < now - self.STATS_WINDOW:
+            history.popleft()
+
+    def stats(self):
+        """Monitoring snapshot of the scheduler.
+
+        Returns:
+            Dict with the threads, slices running, queue_length (slices ready
+            to run), throttled (slices waiting for their session's budget),
+            background (queued slices of hidden tabs), slice_latency_ms (p50,
+            p95 and max delay from ready to running over the last 1000
+            slices), cpu_percent (of one CPU, all programs over the last
+            STATS_WINDOW seconds), max_cpu_percent (None = no limit) and
+            sessions (per session id: cpu_seconds and cpu_share of the
+            programs' CPU time in the window).
+        """
+        with self._cond:
+            now = time.monotonic()
+            self._trim_history(now)
+            queued = len(self._queue)
+            ready = sum(1 for job in self._queue if job.ready_at <= now)
+            background = sum(1 for job in self._queue if job.worker.background)
+            latencies = sorted(self._latencies)
+            history = list(self._history)
+            running = self._running
+
+        per_session = {}
+        for _, session_id, cpu in history:
+            per_session[session_id] = per_session.get(session_id, 0.0) + cpu
+        total = sum(per_session.values())
+        window = min(self.STATS_WINDOW, now - self._created) or 1.0
+
+        def percentile(fraction):
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000, 2)
+
+        return {
+            'threads': self.threads,
+            'running': running,
+            'queue_length': ready,
+            'throttled': queued - ready,
+            'background': background,
+            'slice_latency_ms': {'p50': percentile(0.5), 'p95': percentile(0.95),
+                                 'max': percentile(1.0)},
+            'cpu_percent': round(total / window * 100, 1),
+            'max_cpu_percent': self.max_cpu * 100 if self.max_cpu else None,
+            'sessions': {session_id: {'cpu_seconds': round(cpu, 3),
+                                      'cpu_share': round(cpu / total, 3) if total else 0.0}
+                         for session_id, cpu in per_session.items()},
+        }
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """The process's ProgramScheduler (created on first use).
+
+    The global CPU budget is rate_limiting.max_program_cpu from
+    config/multiuser.json when rate limiting is enabled.
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            from src.multiuser_config import get_config
+            rate_limiting = get_config().rate_limiting
+            _scheduler = ProgramScheduler(
+                max_cpu=rate_limiting.max_program_cpu if rate_limiting.enabled else None)
+        return _scheduler
@@ -0,0 +1,190 @@
+"""
+Run BASIC programs on worker threads, off the UI event loop.
+
+The web UI serves every browser session from one asyncio event loop. A
+ProgramWorker runs a session's program on the threads of the process's
+ProgramScheduler (src/program_scheduler.py) instead, so a CPU-heavy
+program does not stall the other sessions:
+
+    worker = ProgramWorker()
+    interpreter.io = SimpleWebIOHandler(worker.wrap_output(append_output), get_input)
+    worker.start(interpreter)           # run the program on the scheduler
+
+    # polled from a UI timer:
+    append_output(worker.drain_output())
+    if not worker.busy:
+        state = worker.result()         # state when the UI must act
+
+Design notes:
+- A time slice runs interpreter.tick() quanta until the program stops,
+  waits for INPUT, fails, is stopped with stop(), or has run for
+  TIME_SLICE seconds. Then the thread is free for another session; a
+  slice that used up its time (preempted) is queued again by the
+  scheduler, any other ending completes the worker's future and the UI
+  handles the state. The quanta are sized by AdaptiveQuantum
+  (src/tick_quantum.py), starting at QUANTUM_STATEMENTS.
+- Between quanta the worker releases the GIL (time.sleep(0)) and `lock`,
+  which it holds while a quantum runs. UI code that touches the
+  interpreter or runtime while a program runs (immediate mode, Step)
+  takes `lock`, so it waits at most one quantum.
+- Output written on the worker thread is queued, not passed to the UI
+  callback: UI elements may only be updated from the event loop.
+- Signal handlers can only be changed on the main thread, so the
+  interpreter's Ctrl+C (Break) handler is restored by result() when the
+  program stops; Stop in the web UI uses stop().
+- INPUT does not block the worker: the interpreter sets
+  state.input_prompt and the slice ends. provide_input() is called on
+  the event loop while the worker is idle, then start() resumes it.
+- A program that only polls INKEY$ without getting a key (at least
+  INKEY_IDLE_POLLS misses in a row, at most INKEY_IDLE_STATEMENTS
+  statements per miss, no output) is waiting for a key: the slice ends
+  with waiting_for_key set. The UI then starts a slice only every
+  KEY_WAIT_INTERVAL seconds, and at once when a key is pressed. Such a
+  slice runs KEY_WAIT_STATEMENTS statements and ends if they still only
+  miss INKEY$ (KEY_WAIT_POLLS times): the program keeps running at about
+  the speed of the original machines, so an INKEY$ timeout loop still
+  times out, using little CPU.
+- The UI sets `background` while the session's browser tab is hidden;
+  the scheduler then runs its slices less often.
+"""
+
+import asyncio
+import queue
+import threading
+import time
+
+from src.program_scheduler import get_scheduler
+from src.tick_quantum import AdaptiveQuantum
+
+
+class ProgramWorker:
+    """Runs one session's program in time slices on the shared ProgramScheduler."""
+
+    QUANTUM_STATEMENTS = 1000
+    TIME_SLICE = 0.05
+    INKEY_IDLE_POLLS = 200
+    INKEY_IDLE_STATEMENTS = 8
+    KEY_WAIT_INTERVAL = 0.25    # Seconds between slices while waiting for a key
+    KEY_WAIT_STATEMENTS = 40    # Statements per slice while waiting for a key
+    KEY_WAIT_POLLS = 5          # INKEY$ misses in them that confirm the wait
+
+    def __init__(self, scheduler=None):
+        """
+        Args:
+            scheduler: ProgramScheduler running the slices (default: get_scheduler())
+        """
+        self.scheduler = scheduler or get_scheduler()
+        self.lock = threading.Lock()
+        self.quantum = AdaptiveQuantum(target_ms=self.TIME_SLICE * 1000,
+                                       statements=self.QUANTUM_STATEMENTS)
+        self.future = None
+        self.waiting_for_key = False
+        self.preempted = False          # Last slice ended at its TIME_SLICE
+        self.background = False         # Browser tab hidden
+        self.interpreter = None
+        self.stop_requested = False
+        self._output = queue.SimpleQueue()
+        self._output_count = 0
+        self._thread = None
+
+    @property
+    def busy(self):
+        """True while a time slice is queued or running."""
+        return self.future is not None and not self.future.done()
+
+    def wrap_output(self, callback):
+        """Output callback that queues text written by the worker thread.
+
+        Text written on any other thread (immediate mode, Step) goes to
+        callback directly.
+        """
+        def output(text):
+            if threading.current_thread() is self._thread:
+                self._output.put(text)
+                self._output_count += 1
+            else:
+                callback(text)
+        return output
+
+    def drain_output(self):
+        """Text queued by the worker since the last call ('' if none)."""
+        parts = []
+        while True:
+            try:
+                parts.append(self._output.get_nowait())
+            except queue.Empty:
+                return ''.join(parts)
+
+    def start(self, interpreter):
+        """Run the interpreter's program on the scheduler until the UI must act.
+
+        If the last slice ended waiting for a key (waiting_for_key), the
+        next one first runs a short quantum, and ends after it if the
+        program is still waiting; clear waiting_for_key when a key arrives.
+        """
+        self.stop_requested = False
+        self.interpreter = interpreter
+        self.future = self.scheduler.submit(self)
+
+    def stop(self):
+        """Ask the running time slice to end after its current quantum."""
+        self.stop_requested = True
+        self.waiting_for_key = False
+        self.scheduler.wake()
+
+    async def wait(self):
+        """Wait (without blocking the event loop) until the time slice has ended."""
+        if self.future is not None:
+            await asyncio.wait([asyncio.wrap_future(self.future)])
+
+    def result(self):
+        """Interpreter state when the program last needed the UI, once (None if there is none).
+
+        Re-raises an exception raised by interpreter.tick(). Once the
+        program has stopped, restores the Ctrl+C handler it installed, which
+        the worker thread cannot do (call this on the main thread).
+        """
+        if self.future is None or not self.future.done():
+            return None
+        future, self.future = self.future, None
+        if not self.interpreter.runtime.pc.is_running():
+            self.interpreter._restore_break_handler()
+        return future.result()
+
+    def run_slice(self, interpreter):
+        """Run one time slice on the calling (scheduler) thread; returns the state."""
+        self._thread = threading.current_thread()
+        self.preempted = False
+        key_wait, self.waiting_for_key = self.waiting_for_key, False
+        deadline = time.perf_counter() + self.TIME_SLICE
+        builtins = interpreter.builtins
+        slice_start = interpreter.state.statements_executed
+        misses_start = builtins.inkey_misses
+        output_start = self._output_count
+        try:
+            while True:
+                executed = interpreter.state.statements_executed
+                with self.lock:
+                    if key_wait:
+                        # Just enough statements to tell whether it still waits
+                        state = interpreter.tick(mode='run', max_statements=self.KEY_WAIT_STATEMENTS,
+                                                 max_ms=(deadline - time.perf_counter()) * 1000)
+                    else:
+                        state = self.quantum.tick(interpreter, max_ms=(deadline - time.perf_counter()) * 1000)
+                if (self.stop_requested or state.error_info or state.input_prompt
+                        or not interpreter.runtime.pc.is_running()
+                        or state.statements_executed == executed):   # Waiting (delay loop)
+                    return state
+                misses = builtins.inkey_misses - misses_start
+                if (misses >= (self.KEY_WAIT_POLLS if key_wait else self.INKEY_IDLE_POLLS)
+                        and self._output_count == output_start
+                        and state.statements_executed - slice_start <= misses * self.INKEY_IDLE_STATEMENTS):
+                    self.waiting_for_key = True
+                    return state
+                key_wait = False
+                if time.perf_counter() >= deadline:
+                    self.preempted = True
+                    return state
+                time.sleep(0)   # Let the event loop thread have the GIL
+        finally:
+            self._thread = None
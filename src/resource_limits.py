@@ -51,6 +51,7 @@ class ResourceLimits:
                  # Execution limits
                  max_execution_time: float = 60.0,       # 60 seconds
                  max_statements_per_tick: int = 1000,    # For tick-based execution
+                 max_cpu_share: float = 1.0,             # Average CPUs (web UI scheduler)
                  ):
         """Initialize resource limits.
 
@@ -66,6 +67,8 @@ class ResourceLimits:
             max_total_files: Maximum number of files that can be created
             max_execution_time: Maximum execution time in seconds
             max_statements_per_tick: Maximum statements per tick (for tick-based UIs)
+            max_cpu_share: Fraction of one CPU the program may use on average when
+                          run by the web UI's ProgramScheduler (1.0 = no limit)
         """
         # Store limits
         self.max_gosub_depth = max_gosub_depth
@@ -78,6 +81,7 @@ class ResourceLimits:
         self.max_total_files = max_total_files
         self.max_execution_time = max_execution_time
         self.max_statements_per_tick = max_statements_per_tick
+        self.max_cpu_share = max_cpu_share
 
         # Track current usage
         self.current_memory_usage = 0
@@ -359,6 +363,7 @@ def create_web_limits() -> ResourceLimits:
         max_total_files=10,
         max_execution_time=30.0,            # 30 seconds
         max_statements_per_tick=500,
+        max_cpu_share=0.5,
     )
 
 
@@ -381,9 +386,27 @@ def create_local_limits() -> ResourceLimits:
         max_total_files=100,
         max_execution_time=300.0,           # 5 minutes
         max_statements_per_tick=10000,
+        max_cpu_share=1.0,
     )
 
 
+def create_web_session_limits() -> ResourceLimits:
+    """Create resource limits for a web UI session.
+
+    Web UI sessions run programs with the local limits, except for the CPU
+    share the ProgramScheduler enforces per session, which comes from
+    rate_limiting.max_session_cpu in config/multiuser.json (default 0.5,
+    as in create_web_limits()).
+
+    Returns:
+        ResourceLimits configured for a web UI session
+    """
+    from src.multiuser_config import get_config
+    limits = create_local_limits()
+    limits.max_cpu_share = get_config().rate_limiting.max_session_cpu
+    return limits
+
+
 def create_unlimited_limits() -> ResourceLimits:
     """Create effectively unlimited limits (for testing).
 
@@ -407,4 +430,5 @@ def create_unlimited_limits() -> ResourceLimits:
         max_total_files=1000,
         max_execution_time=3600.0,          # 1 hour
         max_statements_per_tick=100000,
+        max_cpu_share=1.0,
     )
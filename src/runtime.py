@@ -12,11 +12,33 @@ This module manages:
 - Program counter (PC) based execution
 """
 
+import array
 import time
-from src.ast_nodes import DataStatementNode, DefFnStatementNode
+from src.ast_nodes import (DataStatementNode, DefFnStatementNode, GotoStatementNode, GosubStatementNode,
+                           OnGotoStatementNode, OnGosubStatementNode, IfStatementNode,
+                           OnErrorStatementNode, ResumeStatementNode, VariableNode, TypeInfo,
+                           WhileStatementNode, WendStatementNode, ForStatementNode, NextStatementNode,
+                           SourceLocation)
 from src.pc import PC, StatementTable
 
 
+# Value of a variable slot whose variable has not been created yet
+_UNSET = object()
+
+# array.array typecodes for numeric BASIC arrays (string arrays stay lists).
+# INTEGER is 16-bit like MBASIC. SINGLE uses 'd' too: single-precision scalars hold
+# Python floats, and a float32 buffer would round them (A(I) = X: A(I) <> X).
+# SINGLE/DOUBLE elements holding an int (never assigned, or assigned an integer
+# value) are flagged in the array's 'ints' bytearray and read back as ints, so
+# STR$() formats them as it would have from a list. INTEGER elements outside
+# 16 bits widen the buffer to 'q' and then to a list, as INTEGER scalars keep them.
+_ARRAY_TYPECODES = {'%': 'h', '!': 'd', '#': 'd'}
+
+
+# Token of internal/system writes (set_variable_raw); line -1, see the last_write note in __init__
+_SYSTEM_LOCATION = SourceLocation(-1, None)
+
+
 def split_variable_name_and_suffix(full_name):
     """
     Split a full variable name into base name and type suffix.
@@ -40,6 +62,9 @@ def split_variable_name_and_suffix(full_name):
 class Runtime:
     """Runtime state for BASIC program execution"""
 
+    # Variable access tracking levels, least to most (see set_tracking_mode())
+    TRACKING_MODES = ('off', 'array', 'full')
+
     def __init__(self, ast_or_line_table, line_text_map=None):
         """Initialize runtime.
 
@@ -52,26 +77,39 @@ class Runtime:
         self._ast_or_line_table = ast_or_line_table
 
         # Variable storage (PRIVATE - use get_variable/set_variable methods)
-        # Each variable is stored as: name_with_suffix -> {'value': val, 'last_read': {...}, 'last_write': {...}, 'original_case': str}
+        # Scalars live in a slot store (see _new_variable_store()): every name_with_suffix gets an
+        # integer slot, and per-slot lists hold value, canonical case and last_read/last_write.
+        # VariableNodes are bound to their slot once (resolve_variables() at setup), so program
+        # execution reads/writes a list element instead of looking the name up on every access.
+        # The _variables property still presents the old name_with_suffix ->
+        # {'value': val, 'last_read': {...}, 'last_write': {...}, 'original_case': str} view.
         # Note: The 'original_case' field stores the canonical case for display (determined by case_conflict policy).
         #       Despite its misleading name, this field contains the policy-resolved canonical case variant,
         #       not the original case as first typed. See _check_case_conflict() for resolution logic.
         # Note: line -1 in last_write indicates non-program execution sources:
-        #       1. System/internal variables (ERR%, ERL%) via set_variable_raw() with FakeToken(line=-1)
+        #       1. System/internal variables (ERR%, ERL%) via set_variable_raw() with _SYSTEM_LOCATION (line=-1)
         #       2. Debugger/interactive prompt via set_variable() with debugger_set=True (always uses line=-1)
         #       Both use line=-1, making them indistinguishable from each other in last_write alone.
         #       However, line=-1 distinguishes these special sources from normal program execution (line >= 0).
-        self._variables = {}
-        self._arrays = {}             # name_with_suffix -> {'dims': [...], 'data': [...]}
+        self._new_variable_store()
+        self._arrays = {}             # name_with_suffix -> {'dims': [...], 'data': array.array or list, ...} (see _new_array())
 
         # Case tracking for conflict detection (settings.case_conflict)
         # Stored separately from variable entries for efficient tracking:
         # Maps normalized name (lowercase) to list of all case variants seen: {'targetangle': [('TargetAngle', line, col), ('targetangle', line, col)]}
         self._variable_case_variants = {}
+        # name -> (canonical case, set of registered spellings), valid for _case_memo_variants
+        self._case_memo = {}
+        self._case_memo_variants = None
+        self._case_policy = None      # case_conflict setting for this RUN (see _case_conflict_policy())
 
-        # Array element tracking for per-element read/write timestamps
+        # Array element tracking for per-element read/write timestamps (tracking mode 'full' only)
         self._array_element_tracking = {}
 
+        # How much access history program execution records (see set_tracking_mode()).
+        # Defaults to everything; UIs turn it down while nothing displays it.
+        self.set_tracking_mode('full')
+
         self.common_vars = []         # List of variable names declared in COMMON (order matters!)
         self.array_base = 0           # Array index base (0 or 1, set by OPTION BASE)
         self.option_base_executed = False  # Track if OPTION BASE has been executed (can only execute once)
@@ -81,6 +119,12 @@ class Runtime:
         self.npc = None               # Next program counter (set by GOTO/GOSUB/etc., None = sequential)
         self.statement_table = StatementTable()  # Ordered collection of statements indexed by PC
 
+        # Loop structure found by pair_loops() (see loop_pairs())
+        self.while_wend = {}          # WHILE PC -> matching WEND PC (None if unmatched)
+        self.next_for = {}            # bare NEXT PC -> loop VariableNode of its FOR
+        self._loop_pairs_table = None     # statement_table / version the tables were built from
+        self._loop_pairs_version = None
+
         # Unified execution stack - tracks GOSUB and WHILE only (FOR loops use variable-indexed approach)
         # Each entry: {'type': 'GOSUB'|'WHILE', ...type-specific fields...}
         self.execution_stack = []
@@ -106,7 +150,8 @@ class Runtime:
 
         # File I/O
         self.files = {}               # file_number -> file_handle
-        self.field_buffers = {}       # file_number -> buffer_dict
+        self.field_buffers = {}       # file_number -> RecordFile (FIELD layout and record buffer)
+        self.field_layouts = {}       # file_number -> RecordFile.layout() of a restored session, used on reopen
 
         # Error handling registration (ON ERROR GOTO/GOSUB)
         self.error_handler = None     # Line number for registered error handler
@@ -139,6 +184,12 @@ class Runtime:
         Initialize runtime by building lookup tables.
         Call this once before execution starts.
         """
+        # Read the case_conflict policy again for this run; case resolutions
+        # made under the old policy are re-checked on the next access
+        self._case_policy = None
+        self._case_memo_variants = None
+        self._slot_spelling = [None] * len(self._slot_names)
+
         # Determine which lines to process from input
         if isinstance(self._ast_or_line_table, dict):
             # New style: dict {line_num: LineNode} already provided
@@ -171,11 +222,370 @@ class Runtime:
                 elif isinstance(stmt, DefFnStatementNode):
                     self.user_functions[stmt.name] = stmt
 
+        # Resolve GOTO/GOSUB/... line references to statement-table slots
+        self.link()
+
+        # Pair WHILE/WEND and bare NEXT/FOR once instead of searching at run time
+        self.pair_loops()
+
+        # Bind every scalar variable reference to its storage slot
+        self.resolve_variables()
+
         # Initialize PC to first statement
         self.pc = self.statement_table.first_pc()
 
         return self
 
+    @staticmethod
+    def _line_references(stmt):
+        """Yield every line number a statement can transfer control to.
+
+        Includes the THEN/ELSE clauses of IF statements. RESUME NEXT (-1),
+        RESUME/RESUME 0 and ON ERROR GOTO 0 are not line references.
+        """
+        if isinstance(stmt, (GotoStatementNode, GosubStatementNode)):
+            yield stmt.line_number
+        elif isinstance(stmt, (OnGotoStatementNode, OnGosubStatementNode)):
+            yield from stmt.line_numbers
+        elif isinstance(stmt, IfStatementNode):
+            if stmt.then_line_number is not None:
+                yield stmt.then_line_number
+            if stmt.else_line_number is not None:
+                yield stmt.else_line_number
+            for sub_stmt in (stmt.then_statements or []) + (stmt.else_statements or []):
+                yield from Runtime._line_references(sub_stmt)
+        elif isinstance(stmt, OnErrorStatementNode):
+            if stmt.line_number:
+                yield stmt.line_number
+        elif isinstance(stmt, ResumeStatementNode):
+            if stmt.line_number is not None and stmt.line_number > 0:
+                yield stmt.line_number
+
+    def link(self):
+        """Link phase: resolve every line-number reference in the program.
+
+        Each referenced line gets a LineSlot from the statement table; the
+        table keeps slots pointing at the line's first statement as lines are
+        added, replaced or deleted, so edits made while the program is paused
+        relink all jumps to that line without re-running this pass.
+
+        References to lines that do not exist get an empty slot. As in MBASIC,
+        they are not reported up front: executing such a jump raises
+        "Undefined line" (error 8), and lines added later (MERGE, edits)
+        fill the slot.
+        """
+        line_slot = self.statement_table.line_slot
+        for stmt in self.statement_table.statements.values():
+            for line_num in self._line_references(stmt):
+                line_slot(line_num)
+
+    def pair_loops(self):
+        """Structural pass pairing loop statements of the program.
+
+        Builds two tables over the statement-level program text:
+        - self.while_wend: every WHILE -> its matching WEND (None if it has none)
+        - self.next_for: every bare NEXT -> loop variable (VariableNode) of the
+          innermost FOR it closes
+
+        Pairing is lexical with proper nesting, like the WEND search MBASIC
+        does. Statements nested inside IF...THEN and jumps into the middle of
+        a loop are not covered; the interpreter falls back to searching at
+        run time for those.
+
+        Returns:
+            (while_wend, next_for)
+        """
+        while_wend = {}
+        next_for = {}
+        open_whiles = []
+        open_fors = []
+        for pc, stmt in self.statement_table.items():
+            if isinstance(stmt, WhileStatementNode):
+                open_whiles.append(pc)
+            elif isinstance(stmt, WendStatementNode):
+                if open_whiles:
+                    while_wend[open_whiles.pop()] = pc
+            elif isinstance(stmt, ForStatementNode):
+                open_fors.append(stmt.variable)
+            elif isinstance(stmt, NextStatementNode):
+                if not stmt.variables:
+                    if open_fors:
+                        next_for[pc] = open_fors.pop()
+                    continue
+                # NEXT I, J closes I, then J (and any loops left open inside them)
+                for var in stmt.variables:
+                    var_name = var.name + (var.type_suffix or "")
+                    for depth in range(len(open_fors) - 1, -1, -1):
+                        if open_fors[depth].name + (open_fors[depth].type_suffix or "") == var_name:
+                            del open_fors[depth:]
+                            break
+        for pc in open_whiles:
+            while_wend[pc] = None
+
+        self.while_wend = while_wend
+        self.next_for = next_for
+        self._loop_pairs_table = self.statement_table
+        self._loop_pairs_version = self.statement_table.version
+        return while_wend, next_for
+
+    def loop_pairs(self):
+        """WHILE->WEND and bare NEXT->FOR tables for the current program.
+
+        Rebuilt by pair_loops() if the program was edited since they were built.
+
+        Returns:
+            (while_wend, next_for)
+        """
+        if (self._loop_pairs_table is not self.statement_table
+                or self._loop_pairs_version != self.statement_table.version):
+            return self.pair_loops()
+        return self.while_wend, self.next_for
+
+    @staticmethod
+    def _scalar_variable_nodes(node):
+        """Yield every scalar (non-array) VariableNode inside an AST node."""
+        stack = [node]
+        seen = set()
+        while stack:
+            item = stack.pop()
+            if isinstance(item, (list, tuple)):
+                stack.extend(item)
+                continue
+            if not hasattr(item, '__dataclass_fields__') or id(item) in seen:
+                continue
+            seen.add(id(item))
+            if isinstance(item, VariableNode) and not item.subscripts:
+                yield item
+            stack.extend(vars(item).values())
+
+    def resolve_variables(self):
+        """Bind the scalar VariableNodes of the program to storage slots.
+
+        DEFINT/DEFSNG/DEFDBL/DEFSTR typing is already folded into each
+        node's type_suffix by the parser, so the slot (and with it the
+        variable's type) is fixed here. Nodes that are not part of the
+        program (immediate mode, edits made while paused) are bound on
+        their first execution instead.
+        """
+        for stmt in self.statement_table.statements.values():
+            for node in self._scalar_variable_nodes(stmt):
+                self.resolve_variable(node)
+
+    def resolve_variable(self, node):
+        """Bind a scalar VariableNode to its slot in this runtime's store.
+
+        Returns:
+            int: The slot index
+        """
+        full_name, _ = self._resolve_variable_name(node.name, node.type_suffix)
+        slot = self.variable_slot(full_name)
+        node.slot = slot
+        node.slot_store = self._variable_store
+        return slot
+
+    def _new_variable_store(self):
+        """Start an empty variable store.
+
+        Nodes bound to the previous store are rebound on their next access.
+        """
+        self._variable_store = object()   # Identity token compared against VariableNode.slot_store
+        self._variable_slots = {}         # name_with_suffix -> slot
+        self._slot_names = []             # slot -> name_with_suffix
+        self._slot_types = []             # slot -> TypeInfo (for resource limit tracking)
+        self._slot_values = []            # slot -> value, or _UNSET if the variable does not exist
+        self._slot_case = []              # slot -> canonical case for display
+        # slot -> spelling (original_case) of the last access, already registered with
+        # _check_case_conflict(); accesses with the same spelling skip the check (its
+        # result can only change when a new spelling is registered, which updates _slot_case)
+        self._slot_spelling = []
+        self._slot_last_read = []         # slot -> (line, position, timestamp) or None
+        self._slot_last_write = []
+        self._defined_slots = []          # slots of existing variables, in creation order
+
+    def variable_slot(self, full_name):
+        """Get (allocating if needed) the slot for a variable name with suffix."""
+        slot = self._variable_slots.get(full_name)
+        if slot is None:
+            slot = len(self._slot_names)
+            self._variable_slots[full_name] = slot
+            self._slot_names.append(full_name)
+            self._slot_types.append(TypeInfo.from_suffix(split_variable_name_and_suffix(full_name)[1]))
+            self._slot_values.append(_UNSET)
+            self._slot_case.append(None)
+            self._slot_spelling.append(None)
+            self._slot_last_read.append(None)
+            self._slot_last_write.append(None)
+        return slot
+
+    @staticmethod
+    def _access_info(access):
+        """Convert a stored (line, position, timestamp) tuple to the last_read/last_write dict."""
+        if access is None:
+            return None
+        return {'line': access[0], 'position': access[1], 'timestamp': access[2]}
+
+    @staticmethod
+    def _access_tuple(info):
+        """Convert a last_read/last_write dict to the stored tuple form."""
+        if not info:
+            return None
+        return (info.get('line'), info.get('position'), info.get('timestamp'))
+
+    def _define_slot(self, slot, value, original_case, last_read=None, last_write=None):
+        """Store a complete variable entry (used by restore paths, not program execution)."""
+        if self._slot_values[slot] is _UNSET:
+            self._defined_slots.append(slot)
+        self._slot_values[slot] = value
+        self._slot_case[slot] = original_case
+        self._slot_spelling[slot] = None
+        self._slot_last_read[slot] = last_read
+        self._slot_last_write[slot] = last_write
+
+    def _note_spelling(self, slot, spelling, line, settings_manager):
+        """Run the case-conflict check for an access with a different spelling."""
+        name = split_variable_name_and_suffix(self._slot_names[slot])[0]
+        self._slot_case[slot] = self._check_case_conflict(name, spelling, SourceLocation(line, None), settings_manager)
+        self._slot_spelling[slot] = spelling
+
+    def _read_slot(self, slot, spelling, line, position, settings_manager):
+        """Read a variable slot for program execution (creates the variable if needed)."""
+        if self._slot_spelling[slot] != spelling:
+            self._note_spelling(slot, spelling, line, settings_manager)
+        value = self._slot_values[slot]
+        if value is _UNSET:
+            value = "" if self._slot_names[slot][-1] == '$' else 0
+            self._slot_values[slot] = value
+            self._defined_slots.append(slot)
+        if self._track_access:
+            self._slot_last_read[slot] = (line, position, time.perf_counter())
+        return value
+
+    def _write_slot(self, slot, value, spelling, line, position, limits, settings_manager):
+        """Write a variable slot for program execution."""
+        if self._slot_spelling[slot] != spelling:
+            self._note_spelling(slot, spelling, line, settings_manager)
+        full_name = self._slot_names[slot]
+        if full_name[-1] == '$' and isinstance(value, str):
+            # Enforce 255 byte string limit (MBASIC 5.21 compatibility)
+            if len(value) > 255:
+                raise RuntimeError("String too long")
+            if limits:
+                limits.check_string_length(value)
+        if limits:
+            limits.allocate_variable(full_name, value, self._slot_types[slot])
+        if self._slot_values[slot] is _UNSET:
+            self._defined_slots.append(slot)
+        self._slot_values[slot] = value
+        if self._track_access:
+            self._slot_last_write[slot] = (line, position, time.perf_counter())
+
+    def _token_line(self, token):
+        """Line recorded for an access: token.line, falling back to the current PC."""
+        if hasattr(token, 'line'):
+            return token.line
+        return self.pc.line_num if self.pc and not self.pc.halted() else None
+
+    def get_variable_node(self, node, settings_manager=None):
+        """Read a scalar variable for program execution through its bound slot.
+
+        Same behaviour as get_variable() with the node's name, suffix,
+        original_case and source location, without the name lookup.
+
+        Args:
+            node: Scalar VariableNode
+            settings_manager: Optional SettingsManager for case conflict handling
+
+        Returns:
+            Variable value (default 0 for numeric, "" for string)
+        """
+        if node.slot_store is not self._variable_store:
+            self.resolve_variable(node)
+        slot = node.slot
+        spelling = node.original_case or node.name
+        if self._slot_spelling[slot] != spelling:
+            self._note_spelling(slot, spelling, node.line_num, settings_manager)
+        value = self._slot_values[slot]
+        if value is _UNSET:
+            return self._read_slot(slot, spelling, node.line_num, node.column, settings_manager)
+        if self._track_access:
+            self._slot_last_read[slot] = (node.line_num, node.column, time.perf_counter())
+        return value
+
+    def set_variable_node(self, node, value, limits=None, settings_manager=None):
+        """Assign a scalar variable for program execution through its bound slot.
+
+        Same behaviour as set_variable() with the node's name, suffix,
+        original_case and source location, without the name lookup.
+
+        Args:
+            node: Scalar VariableNode
+            value: New value
+            limits: Optional ResourceLimits object for tracking
+            settings_manager: Optional SettingsManager for case conflict handling
+        """
+        if node.slot_store is not self._variable_store:
+            self.resolve_variable(node)
+        self._write_slot(node.slot, value, node.original_case or node.name,
+                         node.line_num, node.column, limits, settings_manager)
+
+    def push_fn_frame(self, parameters, args, limits=None):
+        """Bind DEF FN parameters to argument values for evaluating the body.
+
+        Each parameter's slot takes the argument value, shadowing the global
+        variable of the same name; other variables stay visible. The shadowed
+        values are kept in the returned frame and put back by pop_fn_frame().
+        Binding is not a program write: no access tracking, case checking or
+        variable creation.
+
+        Args:
+            parameters: Parameter VariableNodes of the DefFnStatementNode
+            args: Evaluated argument values (extra parameters keep their value)
+            limits: Optional ResourceLimits object for string length checks
+
+        Returns:
+            Frame to pass to pop_fn_frame()
+        """
+        store = self._variable_store
+        values = self._slot_values
+        frame = []
+        for param, value in zip(parameters, args):
+            if param.slot_store is not store:
+                self.resolve_variable(param)
+            slot = param.slot
+            if isinstance(value, str) and self._slot_names[slot][-1] == '$':
+                # Enforce 255 byte string limit (MBASIC 5.21 compatibility)
+                if len(value) > 255:
+                    raise RuntimeError("String too long")
+                if limits:
+                    limits.check_string_length(value)
+            frame.append((slot, values[slot]))
+            values[slot] = value
+        return frame
+
+    def pop_fn_frame(self, frame):
+        """Restore the variables shadowed by push_fn_frame()."""
+        values = self._slot_values
+        # Reverse order so a parameter listed twice ends up with its original value
+        for slot, saved in reversed(frame):
+            values[slot] = saved
+
+    def jump_target(self, line_number):
+        """Get the PC of the first statement of a line (resolved link slot).
+
+        Args:
+            line_number: Target line number
+
+        Returns:
+            PC of the first statement on that line
+
+        Raises:
+            RuntimeError: "Undefined line N" if the line does not exist
+        """
+        pc = self.statement_table.line_slot(line_number).pc
+        if pc is None:
+            raise RuntimeError(f"Undefined line {line_number}")
+        return pc
+
     def is_paused_at_statement(self):
         """Check if halted at a valid statement (not past end).
 
@@ -245,10 +655,40 @@ class Runtime:
         # No DEF type map or not found - default to single precision
         return (name + '!', '!')
 
+    def _case_conflict_policy(self, settings_manager):
+        """The case_conflict setting, read once per RUN (setup() drops the cached value)."""
+        if not settings_manager:
+            return "first_wins"
+        if self._case_policy is None:
+            self._case_policy = settings_manager.get("case_conflict", "first_wins")
+        return self._case_policy
+
+    @staticmethod
+    def _resolve_case(policy, variants):
+        """Pick the canonical case among the (case, line, col) variants seen for a name."""
+        if policy == "prefer_upper":
+            return max(variants, key=lambda x: sum(1 for c in x[0] if c.isupper()))[0]
+        if policy == "prefer_lower":
+            return max(variants, key=lambda x: sum(1 for c in x[0] if c.islower()))[0]
+        if policy == "prefer_mixed":
+            # Prefer mixed case (camelCase/PascalCase): has both upper and lower
+            def mixed_score(case_str):
+                has_upper = any(c.isupper() for c in case_str)
+                has_lower = any(c.islower() for c in case_str)
+                return 1 if has_upper and has_lower else 0
+            return max(variants, key=lambda x: mixed_score(x[0]))[0]
+        # first_wins (and unknown policies): the first case seen
+        return variants[0][0]
+
     def _check_case_conflict(self, name, original_case, token, settings_manager=None):
         """
         Check for variable name case conflicts and handle according to settings.
 
+        Resolution runs once per distinct (name, spelling): the result is
+        memoized per name together with the spellings already registered, and
+        only a new spelling re-applies the policy (which may change the
+        canonical case of the name, e.g. for prefer_upper).
+
         Args:
             name: Normalized lowercase name (e.g., 'targetangle')
             original_case: Original case from source (e.g., 'TargetAngle')
@@ -261,85 +701,38 @@ class Runtime:
         Raises:
             RuntimeError: If case_conflict setting is 'error' and conflict detected
         """
-        # Get the case conflict setting
-        case_conflict_policy = "first_wins"  # Default
-        if settings_manager:
-            case_conflict_policy = settings_manager.get("case_conflict", "first_wins")
-
-        # Track this case variant
-        if name not in self._variable_case_variants:
-            self._variable_case_variants[name] = []
-
-        variants = self._variable_case_variants[name]
-
-        # Check if this exact case already exists
-        for existing_case, existing_line, existing_col in variants:
-            if existing_case == original_case:
-                # Same case - no conflict
-                return original_case
-
-        # New case variant detected
-        line_num = getattr(token, 'line', None)
-        col_num = getattr(token, 'column', None)
-
-        # If this is the first variant, just store it
-        if not variants:
-            variants.append((original_case, line_num, col_num))
-            return original_case
-
-        # Conflict detected! Handle according to policy
-        if case_conflict_policy == "error":
-            # Raise error showing all variants
-            first_case, first_line, first_col = variants[0]
-            error_msg = f"Variable name case conflict: '{first_case}' at line {first_line}"
-            error_msg += f" vs '{original_case}' at line {line_num}"
-            raise RuntimeError(error_msg)
-
-        elif case_conflict_policy == "first_wins":
-            # Use the first case seen (silent)
-            first_case, _, _ = variants[0]
-            # Still track this variant for inspection/debugging
+        if self._case_memo_variants is not self._variable_case_variants:
+            # Variants were replaced (reset, restored session) - memo is stale
+            self._case_memo = {}
+            self._case_memo_variants = self._variable_case_variants
+        memo = self._case_memo.get(name)
+        if memo is not None and original_case in memo[1]:
+            return memo[0]
+
+        variants = self._variable_case_variants.setdefault(name, [])
+        spellings = {case for case, _, _ in variants}
+        if original_case not in spellings:
+            # New case variant detected
+            line_num = getattr(token, 'line', None)
+            col_num = getattr(token, 'column', None)
+            if variants and self._case_conflict_policy(settings_manager) == "error":
+                # Raise error showing all variants
+                first_case, first_line, first_col = variants[0]
+                error_msg = f"Variable name case conflict: '{first_case}' at line {first_line}"
+                error_msg += f" vs '{original_case}' at line {line_num}"
+                raise RuntimeError(error_msg)
             variants.append((original_case, line_num, col_num))
-            return first_case
-
-        elif case_conflict_policy == "prefer_upper":
-            # Choose version with most uppercase letters
-            all_cases = variants + [(original_case, line_num, col_num)]
-            best_case = max(all_cases, key=lambda x: sum(1 for c in x[0] if c.isupper()))
-            if (original_case, line_num, col_num) not in variants:
-                variants.append((original_case, line_num, col_num))
-            return best_case[0]
-
-        elif case_conflict_policy == "prefer_lower":
-            # Choose version with most lowercase letters
-            all_cases = variants + [(original_case, line_num, col_num)]
-            best_case = max(all_cases, key=lambda x: sum(1 for c in x[0] if c.islower()))
-            if (original_case, line_num, col_num) not in variants:
-                variants.append((original_case, line_num, col_num))
-            return best_case[0]
-
-        elif case_conflict_policy == "prefer_mixed":
-            # Prefer mixed case (camelCase/PascalCase)
-            # Mixed case = has both upper and lower
-            all_cases = variants + [(original_case, line_num, col_num)]
-
-            def mixed_score(case_str):
-                has_upper = any(c.isupper() for c in case_str)
-                has_lower = any(c.islower() for c in case_str)
-                if has_upper and has_lower:
-                    return 1  # Mixed case
-                return 0  # All upper or all lower
-
-            best_case = max(all_cases, key=lambda x: mixed_score(x[0]))
-            if (original_case, line_num, col_num) not in variants:
-                variants.append((original_case, line_num, col_num))
-            return best_case[0]
-
-        else:
-            # Unknown policy - default to first_wins
-            first_case, _, _ = variants[0]
-            variants.append((original_case, line_num, col_num))
-            return first_case
+            spellings.add(original_case)
+
+        canonical = self._resolve_case(self._case_conflict_policy(settings_manager), variants)
+        if memo is not None and memo[0] != canonical:
+            # Canonical case changed: update the display case of the name's variables
+            for suffix in '$%!#':
+                slot = self._variable_slots.get(name + suffix)
+                if slot is not None and self._slot_case[slot] is not None:
+                    self._slot_case[slot] = canonical
+        self._case_memo[name] = (canonical, spellings)
+        return canonical
 
     def get_variable(self, name, type_suffix=None, def_type_map=None, token=None, original_case=None, settings_manager=None):
         """
@@ -376,35 +769,11 @@ class Runtime:
         # Resolve full variable name
         full_name, resolved_suffix = self._resolve_variable_name(name, type_suffix, def_type_map)
 
-        # Check for case conflicts and get canonical case
         if original_case is None:
             original_case = name  # Fallback if not provided
-        canonical_case = self._check_case_conflict(name, original_case, token, settings_manager)
-
-        # Initialize variable entry if needed
-        if full_name not in self._variables:
-            # Create with default value
-            default_value = "" if resolved_suffix == '$' else 0
-            self._variables[full_name] = {
-                'value': default_value,
-                'last_read': None,
-                'last_write': None,
-                'original_case': canonical_case  # Canonical case for display (field name is misleading, see module header)
-            }
-        else:
-            # Always update to canonical case (for prefer_upper/prefer_lower/prefer_mixed policies)
-            # Note: The field name is misleading - it stores canonical case not original (see module header)
-            self._variables[full_name]['original_case'] = canonical_case
-
-        # Track read access
-        self._variables[full_name]['last_read'] = {
-            'line': getattr(token, 'line', self.pc.line_num if self.pc and not self.pc.halted() else None),
-            'position': getattr(token, 'position', None),
-            'timestamp': time.perf_counter()  # High precision timestamp for debugging
-        }
-
-        # Return value
-        return self._variables[full_name]['value']
+        line = self._token_line(token)
+        return self._read_slot(self.variable_slot(full_name), original_case, line,
+                               getattr(token, 'position', None), settings_manager)
 
     def set_variable(self, name, type_suffix, value, def_type_map=None, token=None, debugger_set=False, limits=None, original_case=None, settings_manager=None):
         """
@@ -432,18 +801,19 @@ class Runtime:
 
         # Resolve full variable name
         full_name, resolved_suffix = self._resolve_variable_name(name, type_suffix, def_type_map)
+        slot = self.variable_slot(full_name)
 
-        # Check for case conflicts and get canonical case (skip for debugger sets)
-        # Note: If not debugger_set, token is guaranteed to be non-None by the ValueError check above.
-        # Debugger sets skip case conflict checking because they don't have source location context
-        # and are used for internal/system variables that don't need case consistency enforcement.
         if not debugger_set:
+            # Note: token is guaranteed to be non-None by the ValueError check above.
             if original_case is None:
                 original_case = name  # Fallback if not provided
-            canonical_case = self._check_case_conflict(name, original_case, token, settings_manager)
-        else:
-            canonical_case = original_case or name
+            line = self._token_line(token)
+            self._write_slot(slot, value, original_case, line, getattr(token, 'position', None),
+                             limits, settings_manager)
+            return
 
+        # Debugger sets skip case conflict checking because they don't have source location context
+        # and are used for internal/system variables that don't need case consistency enforcement.
         # Enforce 255 byte string limit (MBASIC 5.21 compatibility)
         if resolved_suffix == '$' and isinstance(value, str) and len(value) > 255:
             raise RuntimeError("String too long")
@@ -452,44 +822,9 @@ class Runtime:
         if limits and resolved_suffix == '$' and isinstance(value, str):
             limits.check_string_length(value)
 
-        # Track variable memory if limits provided
-        if limits and not debugger_set:
-            from src.ast_nodes import TypeInfo
-            var_type = TypeInfo.from_suffix(resolved_suffix)
-            limits.allocate_variable(full_name, value, var_type)
-
-        # Initialize variable entry if needed
-        if full_name not in self._variables:
-            self._variables[full_name] = {
-                'value': None,
-                'last_read': None,
-                'last_write': None,
-                'original_case': canonical_case  # Canonical case for display (field name is misleading, see module header)
-            }
-        else:
-            # Always update to canonical case (for prefer_upper/prefer_lower/prefer_mixed policies)
-            # Note: The field name is misleading - it stores canonical case not original (see module header)
-            self._variables[full_name]['original_case'] = canonical_case
-
-        # Set value
-        self._variables[full_name]['value'] = value
-
-        # Update last_write tracking
-        if debugger_set:
-            # Debugger/prompt set: use line -1 as sentinel
-            self._variables[full_name]['last_write'] = {
-                'line': -1,
-                'position': None,
-                'timestamp': time.perf_counter()
-            }
-        elif token is not None:
-            # Non-debugger path: normal program execution (token.line >= 0) OR internal/system set (token.line = -1)
-            # Both use this branch; line value from token distinguishes them
-            self._variables[full_name]['last_write'] = {
-                'line': getattr(token, 'line', self.pc.line_num if self.pc and not self.pc.halted() else None),
-                'position': getattr(token, 'position', None),
-                'timestamp': time.perf_counter()  # High precision timestamp for debugging
-            }
+        # Debugger/prompt set: use line -1 as sentinel
+        self._define_slot(slot, value, original_case or name,
+                          self._slot_last_read[slot], (-1, None, time.perf_counter()))
 
     def get_variable_for_debugger(self, name, type_suffix=None, def_type_map=None):
         """
@@ -511,8 +846,9 @@ class Runtime:
         full_name, resolved_suffix = self._resolve_variable_name(name, type_suffix, def_type_map)
 
         # Return existing value or default (no tracking)
-        if full_name in self._variables:
-            return self._variables[full_name]['value']
+        slot = self._variable_slots.get(full_name)
+        if slot is not None and self._slot_values[slot] is not _UNSET:
+            return self._slot_values[slot]
 
         # Default values
         if resolved_suffix == '$':
@@ -533,15 +869,17 @@ class Runtime:
         Returns:
             Variable value or None if not found
         """
-        var_entry = self._variables.get(full_name)
-        return var_entry['value'] if var_entry else None
+        slot = self._variable_slots.get(full_name)
+        if slot is None or self._slot_values[slot] is _UNSET:
+            return None
+        return self._slot_values[slot]
 
     def set_variable_raw(self, full_name, value):
         """
         Set variable by full name (e.g., 'err%', 'erl%').
 
         Convenience wrapper for system/internal variable updates (ERR%, ERL%, etc.).
-        Internally calls set_variable() with a FakeToken(line=-1) to mark this as
+        Internally calls set_variable() with _SYSTEM_LOCATION (line=-1) to mark this as
         a system/internal set (not from program execution).
 
         The line=-1 marker in last_write indicates system/internal variables.
@@ -559,25 +897,77 @@ class Runtime:
         # Split the variable name from the type suffix using utility function
         name, type_suffix = split_variable_name_and_suffix(full_name)
 
-        # Create a fake token with line=-1 to indicate internal/system setting
+        # Call set_variable for uniform handling; line=-1 marks an internal/system setting
         # (see _variables comment in __init__ for details on line=-1 usage)
-        class FakeToken:
-            def __init__(self):
-                self.line = -1
-                self.position = None
-
-        fake_token = FakeToken()
-
-        # Call set_variable for uniform handling
-        self.set_variable(name, type_suffix, value, token=fake_token)
+        self.set_variable(name, type_suffix, value, token=_SYSTEM_LOCATION)
 
     def clear_variables(self):
-        """Clear all variables."""
-        self._variables.clear()
+        """Clear all variables (slots stay allocated and bound)."""
+        for slot in self._defined_slots:
+            self._slot_values[slot] = _UNSET
+            self._slot_case[slot] = None
+            self._slot_spelling[slot] = None
+            self._slot_last_read[slot] = None
+            self._slot_last_write[slot] = None
+        self._defined_slots = []
+
+    @property
+    def _variables(self):
+        """Snapshot of the scalar variables in the old dict-of-dicts format.
+
+        name_with_suffix -> {'value', 'last_read', 'last_write', 'original_case'}.
+        Used by session save/restore; changing the returned dicts does not
+        change the variables.
+        """
+        return {
+            self._slot_names[slot]: {
+                'value': self._slot_values[slot],
+                'last_read': self._access_info(self._slot_last_read[slot]),
+                'last_write': self._access_info(self._slot_last_write[slot]),
+                'original_case': self._slot_case[slot],
+            }
+            for slot in self._defined_slots
+        }
+
+    @_variables.setter
+    def _variables(self, variables):
+        """Replace all scalar variables from the dict-of-dicts format."""
+        self._new_variable_store()
+        for full_name, entry in variables.items():
+            base_name = split_variable_name_and_suffix(full_name)[0]
+            self._define_slot(self.variable_slot(full_name), entry['value'],
+                              entry.get('original_case', base_name),
+                              self._access_tuple(entry.get('last_read')),
+                              self._access_tuple(entry.get('last_write')))
 
     def clear_arrays(self):
         """Clear all arrays."""
         self._arrays.clear()
+        self._array_element_tracking.clear()
+
+    def set_tracking_mode(self, mode):
+        """Choose how much variable access history program execution records.
+
+        Modes:
+        - 'off': nothing - no last_read/last_write, no timestamps taken
+        - 'array': last_read/last_write of scalars and of whole arrays
+          (with last subscripts), which is what the variables windows show
+        - 'full': 'array' plus per-element history in _array_element_tracking
+
+        Can be switched at any time, including while a program is running.
+        History recorded so far is kept, except per-element history, which
+        is dropped when leaving 'full'.
+
+        Raises:
+            ValueError: If mode is not one of TRACKING_MODES
+        """
+        if mode not in self.TRACKING_MODES:
+            raise ValueError(f"Invalid tracking mode {mode!r}, expected one of {', '.join(self.TRACKING_MODES)}")
+        self.tracking_mode = mode
+        self._track_access = mode != 'off'
+        self._track_elements = mode == 'full'
+        if not self._track_elements:
+            self._array_element_tracking.clear()
 
     def bind_for_loop(self, var_name, pc, end_value, step_value):
         """
@@ -633,18 +1023,16 @@ class Runtime:
 
             if var_info['is_array']:
                 # Restore array
-                self._arrays[full_name] = {
-                    'dims': var_info['dimensions'],
-                    'data': [0] * self._calculate_array_size(var_info['dimensions'])
-                }
+                self._arrays[full_name] = self._new_array(var_info['type_suffix'], var_info['dimensions'])
             else:
                 # Restore scalar variable with original_case preservation
-                self._variables[full_name] = {
-                    'value': var_info['value'],
-                    'last_read': var_info.get('last_read'),
-                    'last_write': var_info.get('last_write'),
-                    'original_case': var_info.get('original_case', var_info['name'])  # Preserve canonical case
-                }
+                self._define_slot(
+                    self.variable_slot(full_name),
+                    var_info['value'],
+                    var_info.get('original_case', var_info['name']),  # Preserve canonical case
+                    self._access_tuple(var_info.get('last_read')),
+                    self._access_tuple(var_info.get('last_write'))
+                )
 
     def update_arrays(self, arrays):
         """
@@ -655,6 +1043,43 @@ class Runtime:
         """
         self._arrays.update(arrays)
 
+    def serialize_arrays(self):
+        """
+        Arrays in JSON-serializable form (for saving web session state).
+
+        Numeric buffers become lists plus their typecode, the 'ints' flags
+        of SINGLE/DOUBLE arrays a hex string.
+
+        Returns:
+            dict: array_name -> array info, for restore_arrays()
+        """
+        saved = {}
+        for full_name, array_info in self._arrays.items():
+            entry = dict(array_info)
+            data = array_info['data']
+            entry['data'] = data.tolist() if isinstance(data, array.array) else list(data)
+            entry['typecode'] = data.typecode if isinstance(data, array.array) else None
+            entry['ints'] = array_info['ints'].hex() if array_info['ints'] is not None else None
+            saved[full_name] = entry
+        return saved
+
+    def restore_arrays(self, saved):
+        """
+        Replace all arrays with ones saved by serialize_arrays().
+
+        Args:
+            saved: dict from serialize_arrays()
+        """
+        self._arrays = {}
+        for full_name, entry in saved.items():
+            array_info = dict(entry)
+            typecode = array_info.pop('typecode', None)
+            array_info['data'] = array.array(typecode, entry['data']) if typecode else list(entry['data'])
+            array_info['ints'] = bytearray.fromhex(entry['ints']) if entry.get('ints') is not None else None
+            array_info['extents'] = tuple(entry['extents'])
+            array_info['strides'] = tuple(entry['strides'])
+            self._arrays[full_name] = array_info
+
     def variable_exists(self, full_name):
         """
         Check if a variable exists.
@@ -665,7 +1090,8 @@ class Runtime:
         Returns:
             bool: True if variable exists
         """
-        return full_name in self._variables
+        slot = self._variable_slots.get(full_name)
+        return slot is not None and self._slot_values[slot] is not _UNSET
 
     def array_exists(self, full_name):
         """
@@ -710,39 +1136,36 @@ class Runtime:
             self.dimension_array(name, type_suffix, default_dims, def_type_map)
 
         array_info = self._arrays[full_name]
-        dims = array_info['dims']
         data = array_info['data']
+        index = self._element_index(full_name, array_info, subscripts)
 
-        # Calculate flat index using global array_base
-        index = self._calculate_array_index(subscripts, dims, self.array_base)
-
-        # Bounds check
-        if index < 0 or index >= len(data):
-            raise RuntimeError(f"Array subscript out of range: {full_name}{subscripts}")
-
-        # Track read access if token is provided
-        if token is not None:
+        # Track read access if token is provided (and tracking is on)
+        if token is not None and self._track_access:
             # Track at array level (for variables window display)
             tracking_info = {
-                'line': getattr(token, 'line', self.pc.line_num if self.pc and not self.pc.halted() else None),
+                'line': self._token_line(token),
                 'position': getattr(token, 'position', None),
                 'timestamp': time.perf_counter()
             }
             array_info['last_read_subscripts'] = list(subscripts)  # Store copy of subscripts
             array_info['last_read'] = tracking_info
 
-            # Create tracking key for this array element (for per-element tracking)
-            element_key = f"{full_name}[{','.join(map(str, subscripts))}]"
+            if self._track_elements:
+                # Create tracking key for this array element (for per-element tracking)
+                element_key = f"{full_name}[{','.join(map(str, subscripts))}]"
 
-            if element_key not in self._array_element_tracking:
-                self._array_element_tracking[element_key] = {
-                    'last_read': None,
-                    'last_write': None
-                }
+                if element_key not in self._array_element_tracking:
+                    self._array_element_tracking[element_key] = {
+                        'last_read': None,
+                        'last_write': None
+                    }
 
-            # Update per-element read tracking
-            self._array_element_tracking[element_key]['last_read'] = tracking_info
+                # Update per-element read tracking
+                self._array_element_tracking[element_key]['last_read'] = tracking_info
 
+        ints = array_info['ints']
+        if ints is not None and ints[index]:
+            return int(data[index])
         return data[index]
 
     def set_array_element(self, name, type_suffix, subscripts, value, def_type_map=None, token=None):
@@ -774,39 +1197,40 @@ class Runtime:
             self.dimension_array(name, type_suffix, default_dims, def_type_map)
 
         array_info = self._arrays[full_name]
-        dims = array_info['dims']
         data = array_info['data']
-
-        # Calculate flat index using global array_base
-        index = self._calculate_array_index(subscripts, dims, self.array_base)
-
-        if index < 0 or index >= len(data):
-            raise RuntimeError(f"Array subscript out of range: {full_name}{subscripts}")
-
-        data[index] = value
-
-        # Track write access if token is provided
-        if token is not None:
+        index = self._element_index(full_name, array_info, subscripts)
+
+        try:
+            data[index] = value
+        except (TypeError, OverflowError):
+            self._store_element(array_info, index, value)
+        ints = array_info['ints']
+        if ints is not None:
+            ints[index] = type(value) is int
+
+        # Track write access if token is provided (and tracking is on)
+        if token is not None and self._track_access:
             # Track at array level (for variables window display)
             tracking_info = {
-                'line': getattr(token, 'line', self.pc.line_num if self.pc and not self.pc.halted() else None),
+                'line': self._token_line(token),
                 'position': getattr(token, 'position', None),
                 'timestamp': time.perf_counter()
             }
             array_info['last_write_subscripts'] = list(subscripts)  # Store copy of subscripts
             array_info['last_write'] = tracking_info
 
-            # Create tracking key for this array element (for per-element tracking)
-            element_key = f"{full_name}[{','.join(map(str, subscripts))}]"
+            if self._track_elements:
+                # Create tracking key for this array element (for per-element tracking)
+                element_key = f"{full_name}[{','.join(map(str, subscripts))}]"
 
-            if element_key not in self._array_element_tracking:
-                self._array_element_tracking[element_key] = {
-                    'last_read': None,
-                    'last_write': None
-                }
+                if element_key not in self._array_element_tracking:
+                    self._array_element_tracking[element_key] = {
+                        'last_read': None,
+                        'last_write': None
+                    }
 
-            # Update per-element write tracking
-            self._array_element_tracking[element_key]['last_write'] = tracking_info
+                # Update per-element write tracking
+                self._array_element_tracking[element_key]['last_write'] = tracking_info
 
     def get_array_element_for_debugger(self, name, type_suffix, subscripts, def_type_map=None):
         """
@@ -828,36 +1252,120 @@ class Runtime:
         # Simply call get_array_element without a token (no tracking)
         return self.get_array_element(name, type_suffix, subscripts, def_type_map, token=None)
 
-    def _calculate_array_index(self, subscripts, dims, base=0):
+    def _element_index(self, full_name, array_info, subscripts):
         """
         Calculate flat array index from multi-dimensional subscripts.
 
-        MBASIC uses row-major order.
+        MBASIC uses row-major order. Uses the extents/strides computed at DIM
+        time, with direct paths for 1-D and 2-D arrays.
 
         Args:
+            full_name: Array name with suffix (for error messages)
+            array_info: Array entry from _arrays
             subscripts: User-provided subscript values
-            dims: Array dimension sizes
-            base: Array base (0 or 1)
+
+        Raises:
+            RuntimeError: Wrong number of subscripts, or a subscript outside
+                          its dimension ("Subscript out of range", error 9)
+        """
+        extents = array_info['extents']
+        base = array_info['base']
+        rank = len(extents)
+        if len(subscripts) != rank:
+            raise RuntimeError(f"Wrong number of subscripts: got {len(subscripts)}, expected {rank}")
+
+        if rank == 1:
+            i = subscripts[0] - base
+            if 0 <= i < extents[0]:
+                return i
+        elif rank == 2:
+            i = subscripts[0] - base
+            j = subscripts[1] - base
+            if 0 <= i < extents[0] and 0 <= j < extents[1]:
+                return i * extents[1] + j
+        else:
+            index = 0
+            for subscript, extent, stride in zip(subscripts, extents, array_info['strides']):
+                i = subscript - base
+                if not 0 <= i < extent:
+                    break
+                index += i * stride
+            else:
+                return index
+
+        raise RuntimeError(f"Array subscript out of range: {full_name}{subscripts}")
+
+    @staticmethod
+    def _store_element(array_info, index, value):
+        """Store a value that the array's buffer rejected as-is.
+
+        Integer arrays take non-integral numbers truncated (like LET A% = X);
+        a value outside the buffer's range widens it ('h' to 'q', then to a
+        list), since INTEGER scalars keep such values too.
+
+        Returns:
+            The array's data, which may be a new, wider buffer
+
+        Raises:
+            TypeError: "Type mismatch" for a string in a numeric array
+            OverflowError: "Overflow" for an int too large for a float element
         """
-        if len(subscripts) != len(dims):
-            raise RuntimeError(f"Wrong number of subscripts: got {len(subscripts)}, expected {len(dims)}")
+        if isinstance(value, str):
+            raise TypeError("Type mismatch")
+        data = array_info['data']
+        if data.typecode == 'd':
+            raise OverflowError("Overflow")
+        value = int(value)
+        if data.typecode == 'h' and -2 ** 63 <= value < 2 ** 63:
+            data = array.array('q', data)
+        else:
+            data = data.tolist()
+        data[index] = value
+        array_info['data'] = data
+        return data
 
-        index = 0
-        multiplier = 1
+    def _new_array(self, resolved_suffix, dimensions, tracking_info=None):
+        """
+        Create an array entry for _arrays with every element set to 0 or "".
 
-        # Calculate index (row-major order)
-        for i in range(len(dims) - 1, -1, -1):
-            # Adjust subscript by base
-            adjusted_subscript = subscripts[i] - base
-            index += adjusted_subscript * multiplier
+        Numeric arrays are stored in compact array.array buffers (see
+        _ARRAY_TYPECODES), string arrays in lists. Extents and row-major
+        strides are computed here, once, for _element_index().
 
-            # Multiplier depends on base
-            if base == 0:
-                multiplier *= (dims[i] + 1)  # 0-based: 0 to dim inclusive
-            else:
-                multiplier *= dims[i]  # 1-based: 1 to dim inclusive
+        Args:
+            resolved_suffix: Type suffix of the array ($, %, ! or #)
+            dimensions: List of dimension sizes (highest subscripts)
+            tracking_info: Optional access info recorded as last read/write
+        """
+        # If base is 0: DIM A(10) creates indices 0-10 (11 elements)
+        # If base is 1: DIM A(10) creates indices 1-10 (10 elements)
+        base = self.array_base
+        extents = tuple(dim + 1 - base for dim in dimensions)
+        strides = [1] * len(extents)
+        for i in range(len(extents) - 2, -1, -1):
+            strides[i] = strides[i + 1] * extents[i + 1]
+        total_size = strides[0] * extents[0] if all(extent > 0 for extent in extents) else 0
+
+        typecode = _ARRAY_TYPECODES.get(resolved_suffix)
+        if typecode is None:
+            data = [""] * total_size
+        else:
+            data = array.array(typecode, bytes(array.array(typecode).itemsize * total_size))
+        # SINGLE/DOUBLE elements start as the int 0
+        ints = bytearray(b'\x01') * total_size if typecode == 'd' else None
 
-        return index
+        return {
+            'dims': dimensions,
+            'data': data,
+            'ints': ints,  # 'd' buffers: 1 where the element holds an int (see _ARRAY_TYPECODES)
+            'base': base,
+            'extents': extents,
+            'strides': tuple(strides),
+            'last_read_subscripts': None,  # Last accessed subscripts for read
+            'last_write_subscripts': None,  # Last accessed subscripts for write
+            'last_read': tracking_info,  # Track DIM location (initialization sets read timestamp for debugger)
+            'last_write': tracking_info  # Track DIM location (array initialization counts as write)
+        }
 
     def dimension_array(self, name, type_suffix, dimensions, def_type_map=None, token=None):
         """
@@ -875,40 +1383,17 @@ class Runtime:
         # Resolve full array name
         full_name, resolved_suffix = self._resolve_variable_name(name, type_suffix, def_type_map)
 
-        # Calculate total size based on array_base
-        # If base is 0: DIM A(10) creates indices 0-10 (11 elements)
-        # If base is 1: DIM A(10) creates indices 1-10 (10 elements)
-        total_size = 1
-        for dim in dimensions:
-            if self.array_base == 0:
-                total_size *= (dim + 1)  # 0-based: 0 to dim inclusive
-            else:
-                total_size *= dim  # 1-based: 1 to dim inclusive
-
-        # Default value based on type
-        if resolved_suffix == '$':
-            default_value = ""
-        else:
-            default_value = 0
-
         # Track DIM as a write operation
         tracking_info = None
-        if token is not None:
+        if token is not None and self._track_access:
             tracking_info = {
-                'line': getattr(token, 'line', self.pc.line_num if self.pc and not self.pc.halted() else None),
+                'line': self._token_line(token),
                 'position': getattr(token, 'position', None),
                 'timestamp': time.perf_counter()
             }
 
         # Create array with access tracking
-        self._arrays[full_name] = {
-            'dims': dimensions,
-            'data': [default_value] * total_size,
-            'last_read_subscripts': None,  # Last accessed subscripts for read
-            'last_write_subscripts': None,  # Last accessed subscripts for write
-            'last_read': tracking_info,  # Track DIM location (initialization sets read timestamp for debugger)
-            'last_write': tracking_info  # Track DIM location (array initialization counts as write)
-        }
+        self._arrays[full_name] = self._new_array(resolved_suffix, dimensions, tracking_info)
         # Note: DIM is tracked as both read and write to provide consistent debugger display.
         # While DIM is technically allocation/initialization (write-only operation), setting
         # last_read to the DIM location ensures that debuggers/inspectors can show "Last accessed"
@@ -1251,24 +1736,24 @@ class Runtime:
                 return full_name[:-1], last_char
             else:
                 # No explicit suffix - default to single precision (!)
-                # Note: In normal operation, all names in _variables have resolved type suffixes
+                # Note: In normal operation, all variable names have resolved type suffixes
                 # from _resolve_variable_name() which applies DEF type rules. This fallback
                 # is defensive programming for robustness - it should not occur in practice,
                 # but protects against potential edge cases in legacy code or future changes.
                 return full_name, '!'
 
         # Process scalar variables
-        for full_name, var_entry in self._variables.items():
-            base_name, type_suffix = parse_name(full_name)
+        for slot in self._defined_slots:
+            base_name, type_suffix = parse_name(self._slot_names[slot])
 
             var_info = {
                 'name': base_name,
                 'type_suffix': type_suffix,
                 'is_array': False,
-                'value': var_entry['value'],
-                'last_read': var_entry['last_read'],
-                'last_write': var_entry['last_write'],
-                'original_case': var_entry.get('original_case', base_name)  # Include canonical case for display
+                'value': self._slot_values[slot],
+                'last_read': self._access_info(self._slot_last_read[slot]),
+                'last_write': self._access_info(self._slot_last_write[slot]),
+                'original_case': self._slot_case[slot] or base_name  # Include canonical case for display
             }
 
             result.append(var_info)
@@ -1502,6 +1987,7 @@ class Runtime:
 
         Preserves:
         - Breakpoints (persist across runs)
+        - Tracking mode (set_tracking_mode())
         - common_vars (preserved for CHAIN compatibility)
 
         Args:
@@ -1512,10 +1998,13 @@ class Runtime:
         self._ast_or_line_table = ast_or_line_table
         self.line_text_map = line_text_map or {}
 
-        # Clear variables and arrays
-        self._variables.clear()
+        # Clear variables and arrays (a new store also drops the case-check memo,
+        # which is only valid while _variable_case_variants is kept)
+        self._new_variable_store()
         self._arrays.clear()
+        self._array_element_tracking.clear()
         self._variable_case_variants.clear()
+        self._case_memo_variants = None
 
         # Reset array base (can be set again by OPTION BASE)
         self.array_base = 0
@@ -1543,6 +2032,7 @@ class Runtime:
                 pass
         self.files.clear()
         self.field_buffers.clear()
+        self.field_layouts.clear()
 
         # Clear error handling
         self.error_handler = None
@@ -2524,7 +2524,7 @@ class SemanticAnalyzer:
                 # Check for IV strength reduction BEFORE analyzing (which transforms expressions)
                 if self.current_loop:
                     for subscript in expr.subscripts:
-                        self._detect_iv_strength_reduction(var_name, subscript)
+                        self._detect_iv_strength_reduction(var_key, subscript)
 
                 # Now analyze each subscript expression
                 for subscript in expr.subscripts:
@@ -2532,10 +2532,10 @@ class SemanticAnalyzer:
 
                 # If multi-dimensional, flatten the subscripts
                 if len(expr.subscripts) > 1:
-                    var_info = self.symbols.variables.get(var_name)
+                    var_info = self.symbols.variables.get(var_key)
                     if var_info and var_info.is_array and var_info.dimensions:
                         # Transform multi-dimensional subscripts to flat index
-                        flattened = self._flatten_array_subscripts(var_name, expr.subscripts, var_info.dimensions)
+                        flattened = self._flatten_array_subscripts(var_key, expr.subscripts, var_info.dimensions)
                         # Replace the subscripts list with a single flattened expression
                         expr.subscripts = [flattened]
 
@@ -4016,10 +4016,13 @@ class SemanticAnalyzer:
                 for subscript in expr.subscripts:
                     self._collect_strings_from_expr(subscript, line_num, string_occurrences)
 
-    def _is_pure_builtin_function(self, func_name: str) -> Tuple[bool, str]:
+    @staticmethod
+    def _is_pure_builtin_function(func_name: str) -> Tuple[bool, str]:
         """
         Determine if a built-in function is pure (no side effects, deterministic).
 
+        Also used by the closure engine's constant folding (ClosureCompiler).
+
         Returns: (is_pure, reason)
         """
         # Normalize function name to uppercase
@@ -4753,8 +4756,7 @@ class SemanticAnalyzer:
 
             elif isinstance(stmt, ForStatementNode):
                 # stmt.variable is a VariableNode
-                from parser import VariableNode as VarNode
-                if isinstance(stmt.variable, VarNode):
+                if isinstance(stmt.variable, VariableNode):
                     modified.add(stmt.variable.name.upper())
                 elif isinstance(stmt.variable, str):
                     modified.add(stmt.variable.upper())
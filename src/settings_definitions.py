@@ -116,6 +116,56 @@ SETTING_DEFINITIONS: Dict[str, SettingDefinition] = {
         scope=SettingScope.GLOBAL,
     ),
 
+    "variable_tracking": SettingDefinition(
+        key="variable_tracking",
+        type=SettingType.ENUM,
+        default="array",
+        choices=["off", "array", "full"],
+        description="Variable access history recorded while the variable window is open",
+        help_text="off (none), array (last read/write per variable and array), full (also per array element)",
+        scope=SettingScope.GLOBAL,
+    ),
+
+    "delay_loop_us": SettingDefinition(
+        key="delay_loop_us",
+        type=SettingType.INTEGER,
+        default=0,
+        min_value=0,
+        max_value=100000,
+        description="Real time per iteration of empty FOR/NEXT delay loops (microseconds)",
+        help_text="With loop idioms enabled, empty loops such as FOR I=1 TO 2000: NEXT I are skipped instantly; set this to make them pause again (0: no delay)",
+        scope=SettingScope.GLOBAL,
+    ),
+
+    "file_buffer_size": SettingDefinition(
+        key="file_buffer_size",
+        type=SettingType.INTEGER,
+        default=65536,
+        min_value=0,
+        max_value=16777216,
+        description="Write buffer size for files opened by OPEN (bytes)",
+        help_text="PRINT#/WRITE# output is written in blocks of this size; files are flushed on CLOSE, RESET, END, CHAIN, errors and SYSTEM (0: Python default)",
+        scope=SettingScope.GLOBAL,
+    ),
+
+    "flush_file_writes": SettingDefinition(
+        key="flush_file_writes",
+        type=SettingType.BOOLEAN,
+        default=False,
+        description="Flush files after every PRINT#/WRITE#/PUT",
+        help_text="Enable to write each PRINT#/WRITE#/PUT through to the file at once, e.g. when another program reads the file while BASIC writes it (slower)",
+        scope=SettingScope.GLOBAL,
+    ),
+
+    "random_file_mmap": SettingDefinition(
+        key="random_file_mmap",
+        type=SettingType.BOOLEAN,
+        default=False,
+        description="Memory-map random-access files for GET/PUT",
+        help_text="Files opened with OPEN \"R\" on disk are read and written through a memory map (faster for large files with many GETs)",
+        scope=SettingScope.GLOBAL,
+    ),
+
     # Keyword settings
     "case_style": SettingDefinition(
         key="case_style",
@@ -0,0 +1,91 @@
+"""
+Adaptive tick quantum for the UIs' run loops.
+
+The UIs run programs from a timer callback on their event loop (Tk
+root.after(), urwid set_alarm_in(), the web UI's ProgramWorker). A fixed
+quantum of N statements per callback fits no program: a fast program
+spends most of its wall time waiting for the next callback, while a few
+slow statements (large file I/O) can hold the event loop far longer than
+one frame.
+
+AdaptiveQuantum.run() executes tick() quanta for up to target_ms per
+callback, starting the next quantum at once while budget remains. It
+measures how long statements take and sizes each quantum
+(max_statements) to about a quarter of the budget, so a quantum ends
+close to the budget whether statements take a microsecond or a
+millisecond; the tick's own max_ms budget stops it at the end of the
+callback's budget.
+
+    quantum = AdaptiveQuantum()
+    def on_timer():
+        state = quantum.run(interpreter)
+        if interpreter.runtime.pc.is_running() and state.input_prompt is None:
+            schedule(AdaptiveQuantum.gap_ms(state), on_timer)
+
+The UI schedules the next callback GAP_MS later, which is enough for the
+event loop to handle input and redraw between callbacks. While a delay
+loop runs (state.delay_until) there is nothing to do before it is over,
+so gap_ms() waits until then, at most DELAY_GAP_MS.
+"""
+
+import math
+import time
+
+
+class AdaptiveQuantum:
+    """Sizes run-mode tick quanta to fill a time budget per UI callback."""
+
+    TARGET_MS = 20.0            # Work per UI callback
+    GAP_MS = 1                  # Event loop time between callbacks
+    DELAY_GAP_MS = 100          # Longest gap in a delay loop (Break and pause are seen by tick())
+    TICKS_PER_BUDGET = 4        # Quantum size: a quarter of the budget
+    MIN_STATEMENTS = 1
+    MAX_STATEMENTS = 1000000
+
+    def __init__(self, target_ms=TARGET_MS, statements=100):
+        self.target_ms = target_ms
+        self.statements = statements
+
+    def tick(self, interpreter, max_ms=None):
+        """Run one 'run' quantum of self.statements and adapt the quantum to it."""
+        state = interpreter.state
+        executed = state.statements_executed if state is not None else 0
+        start = time.perf_counter()
+        state = interpreter.tick(mode='run', max_statements=self.statements,
+                                 max_ms=self.target_ms if max_ms is None else max_ms)
+        self.update(state.statements_executed - executed, (time.perf_counter() - start) * 1000)
+        return state
+
+    def run(self, interpreter):
+        """Run quanta until target_ms is used or the program stops, fails or needs input.
+
+        Returns:
+            InterpreterState after the last quantum
+        """
+        deadline = time.perf_counter() + self.target_ms / 1000
+        while True:
+            executed = interpreter.state.statements_executed
+            state = self.tick(interpreter, max_ms=(deadline - time.perf_counter()) * 1000)
+            if (state.input_prompt is not None or state.error_info
+                    or not interpreter.runtime.pc.is_running()
+                    or state.statements_executed == executed     # Waiting (delay loop)
+                    or time.perf_counter() >= deadline):
+                return state
+
+    @classmethod
+    def gap_ms(cls, state):
+        """Milliseconds before the next callback: GAP_MS, or until the pending delay loop is over."""
+        remaining = math.ceil((state.delay_until - time.perf_counter()) * 1000)
+        return max(cls.GAP_MS, min(cls.DELAY_GAP_MS, remaining))
+
+    def update(self, executed, elapsed_ms):
+        """Resize the quantum from a quantum that ran executed statements in elapsed_ms."""
+        if executed <= 0:
+            return
+        goal_ms = self.target_ms / self.TICKS_PER_BUDGET
+        if elapsed_ms <= 0:
+            size = self.statements * 2
+        else:
+            # Grow at most 2x per quantum; shrink at once when statements are slow
+            size = min(int(executed * goal_ms / elapsed_ms), self.statements * 2)
+        self.statements = max(self.MIN_STATEMENTS, min(self.MAX_STATEMENTS, size))
@@ -27,6 +27,7 @@ from .auto_save import AutoSaveManager
 from .interactive_menu import InteractiveMenuBar
 from src.runtime import Runtime
 from src.interpreter import Interpreter
+from src.tick_quantum import AdaptiveQuantum
 from src.lexer import Lexer
 from src.parser import Parser
 from src.immediate_executor import ImmediateExecutor, OutputCapturingIOHandler
@@ -1363,6 +1364,7 @@ class CursesBackend(UIBackend):
         # UI state
         self.app = None
         self.loop = None
+        self.tick_quantum = AdaptiveQuantum()  # Statements per tick, sized to a time budget
         self.loop_running = False  # Track if event loop has been started
         self.editor = None
         self.output = None
@@ -1395,6 +1397,7 @@ class CursesBackend(UIBackend):
         from src.interpreter import Interpreter
         from src.resource_limits import create_unlimited_limits
         self.runtime = Runtime({}, {})
+        self._apply_variable_tracking()
 
         # Create capturing IO handler for execution (created once, reused)
         # Import shared CapturingIOHandler
@@ -2887,6 +2890,7 @@ class CursesBackend(UIBackend):
     def _toggle_variables_window(self):
         """Toggle visibility of the variables window."""
         self.variables_window_visible = not self.variables_window_visible
+        self._apply_variable_tracking()
 
         if self.variables_window_visible:
             # Add variables window to the pile (position 2, between editor and output)
@@ -2907,6 +2911,14 @@ class CursesBackend(UIBackend):
         if hasattr(self, 'loop') and self.loop and self.loop_running:
             self.loop.draw_screen()
 
+    def _apply_variable_tracking(self):
+        """Record variable access history only while the variables window is shown.
+
+        Takes effect immediately, also for a running program.
+        """
+        from src.settings import get
+        self.runtime.set_tracking_mode(get('variable_tracking') if self.variables_window_visible else 'off')
+
     def _update_variables_window(self):
         """Update the variables window with current runtime state."""
         # Clear current display
@@ -3546,8 +3558,8 @@ class CursesBackend(UIBackend):
     def _execute_tick(self):
         """Execute one tick of the interpreter and schedule next tick."""
         try:
-            # Execute one tick
-            state = self.interpreter.tick(mode='run', max_statements=100)
+            # Execute quanta for up to AdaptiveQuantum.TARGET_MS
+            state = self.tick_quantum.run(self.interpreter)
 
             # Collect any output produced during the tick
             new_output = self.io_handler.get_and_clear_output()
@@ -3616,8 +3628,10 @@ class CursesBackend(UIBackend):
                     self._update_immediate_status()
 
             else:
-                # Still running - schedule next tick
-                self.loop.set_alarm_in(0.01, lambda _loop, _user_data: self._execute_tick())
+                # Still running - schedule next tick (the gap lets urwid handle input and redraw;
+                # longer in a delay loop)
+                self.loop.set_alarm_in(AdaptiveQuantum.gap_ms(state) / 1000,
+                                       lambda _loop, _user_data: self._execute_tick())
 
         except Exception as e:
             import traceback
@@ -3803,8 +3817,7 @@ class CursesBackend(UIBackend):
         old_pc = self.runtime.pc
 
         # Clear and rebuild statement table
-        self.runtime.statement_table.statements.clear()
-        self.runtime.statement_table._keys_cache = None
+        self.runtime.statement_table.clear()
 
         # Update line text map
         self.runtime.line_text_map = dict(self.program.lines)
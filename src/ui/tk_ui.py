@@ -8,6 +8,7 @@ making it suitable for a modern BASIC IDE experience.
 from .base import UIBackend
 from src.runtime import Runtime
 from src.interpreter import Interpreter
+from src.tick_quantum import AdaptiveQuantum
 from .keybinding_loader import KeybindingLoader
 from .recent_files import RecentFilesManager
 from .auto_save import AutoSaveManager
@@ -87,6 +88,7 @@ class TkBackend(UIBackend):
         self.paused_at_breakpoint = False
         self.breakpoints = set()  # Set of line numbers with breakpoints
         self.tick_timer_id = None  # ID of pending after() call
+        self.tick_quantum = AdaptiveQuantum()  # Statements per tick, sized to a time budget
 
         # Variables window state
         self.variables_window = None
@@ -338,6 +340,7 @@ class TkBackend(UIBackend):
         self.runtime = Runtime({}, {})
         # Sync breakpoints from UI to runtime
         self.runtime.breakpoints = self.breakpoints.copy()
+        self._apply_variable_tracking()
 
         # Create IOHandler that outputs to output pane
         tk_io = TkIOHandler(self._add_output, self.root, backend=self)
@@ -1069,17 +1072,28 @@ class TkBackend(UIBackend):
                 # If that fails, toggle visibility
                 self.variables_window.withdraw()
                 self.variables_visible = False
+                self._apply_variable_tracking()
         else:
             self.variables_window.deiconify()
             self.variables_window.lift()
             self.variables_window.focus_force()
             self.variables_visible = True
+            self._apply_variable_tracking()
             self._update_variables()
 
     def _close_variables(self):
         """Close variables window (called from X button)."""
         self.variables_window.withdraw()
         self.variables_visible = False
+        self._apply_variable_tracking()
+
+    def _apply_variable_tracking(self):
+        """Record variable access history only while the variables window is shown.
+
+        Takes effect immediately, also for a running program.
+        """
+        from src.settings import get
+        self.runtime.set_tracking_mode(get('variable_tracking') if self.variables_visible else 'off')
 
     def _on_variable_heading_click(self, event):
         """Handle clicks on variable list column headings.
@@ -2115,8 +2129,7 @@ class TkBackend(UIBackend):
         old_pc = self.runtime.pc
 
         # Clear and rebuild statement table
-        self.runtime.statement_table.statements.clear()
-        self.runtime.statement_table._keys_cache = None
+        self.runtime.statement_table.clear()
 
         # Update line text map
         self.runtime.line_text_map = dict(self.program.lines)
@@ -3092,8 +3105,8 @@ class TkBackend(UIBackend):
             return
 
         try:
-            # Execute one quantum of work
-            state = self.interpreter.tick(mode='run', max_statements=100)
+            # Execute quanta for up to AdaptiveQuantum.TARGET_MS
+            state = self.tick_quantum.run(self.interpreter)
 
             # Output is routed to output pane via TkIOHandler
 
@@ -3174,8 +3187,8 @@ class TkBackend(UIBackend):
                 # Running - highlight current statement (brief flash effect)
                 if state.current_statement_char_start > 0 or state.current_statement_char_end > 0:
                     self._highlight_current_statement(state.current_line, state.current_statement_char_start, state.current_statement_char_end)
-                # Schedule next tick
-                self.tick_timer_id = self.root.after(10, self._execute_tick)
+                # Schedule next tick (the gap lets Tk handle events and redraw; longer in a delay loop)
+                self.tick_timer_id = self.root.after(AdaptiveQuantum.gap_ms(state), self._execute_tick)
 
         except Exception as e:
             import traceback
@@ -8,12 +8,15 @@ import sys
 import asyncio
 import traceback
 import signal
+from collections import deque
 from typing import Dict
 from nicegui import ui, app
 from pathlib import Path
 from ..base import UIBackend
 from src.runtime import Runtime
 from src.interpreter import Interpreter
+from src.program_worker import ProgramWorker
+from src.output_buffer import OutputRingBuffer, CLIENT_SCRIPT, append_script
 from src.iohandler.base import IOHandler
 from src.version import VERSION
 from src.pc import PC
@@ -66,6 +69,15 @@ def is_uptime_probe(request) -> bool:
     return user_agent.startswith('DigitalOcean Uptime Probe')
 
 
+def _set_value_quietly(element, value):
+    """Set a NiceGUI value element's server-side value without sending it to the browser."""
+    element._send_update_on_value_change = False
+    try:
+        element.value = value
+    finally:
+        element._send_update_on_value_change = True
+
+
 class SimpleWebIOHandler(IOHandler):
     """Simple IO handler for NiceGUI that appends to textarea."""
 
@@ -151,6 +163,8 @@ class VariablesDialog(ui.dialog):
         # Sort state (matches Tk UI defaults: see sort_mode and sort_reverse in src/ui/tk_ui.py)
         self.sort_mode = 'accessed'  # Current sort mode
         self.sort_reverse = True  # Sort direction
+        # Access history is only recorded while the dialog is open
+        self.on_value_change(lambda e: self.backend._apply_variable_tracking())
 
     def _toggle_direction(self):
         """Toggle sort direction and refresh display."""
@@ -1138,6 +1152,9 @@ class NiceGUIBackend(UIBackend):
     Based on TK UI feature set (see docs/dev/claude_if_you_read_in_here_you_loop/TK_UI_FEATURE_AUDIT.md).
     """
 
+    # INKEY$ characters for named browser keys (other keys are single characters)
+    INKEY_KEYS = {'Enter': '\r', 'Escape': chr(27), 'Backspace': chr(8), 'Tab': '\t'}
+
     def __init__(self, io_handler, program_manager):
         """Initialize NiceGUI backend.
 
@@ -1149,11 +1166,12 @@ class NiceGUIBackend(UIBackend):
 
         # Per-client state (now instance variables instead of session storage)
         from src.runtime import Runtime
-        from src.resource_limits import create_local_limits
+        from src.resource_limits import create_web_session_limits
         from src.file_io import SandboxedFileIO
         from src.filesystem import SandboxedFileSystemProvider
 
         self.runtime = Runtime({}, {})
+        self.runtime.set_tracking_mode('off')  # Variables window starts closed
 
         # Create session ID for this backend instance
         # Used for sandboxed filesystem and settings isolation
@@ -1174,6 +1192,7 @@ class NiceGUIBackend(UIBackend):
         self.auto_save_enabled = True       # Enable auto-save
         self.auto_save_interval = 30        # Auto-save every 30 seconds
         self.output_max_lines = 1000  # Maximum lines to keep in output buffer (reduced for web performance)
+        self._output_value_stale = False  # Output element's server-side value lags the browser (see _output_value)
 
         # UI elements (created in build_ui())
         self.editor = None
@@ -1191,13 +1210,19 @@ class NiceGUIBackend(UIBackend):
         self.input_submit_btn = None
 
         # Create one interpreter for the session - don't create multiple!
+        # Runs the program off the event loop (see _execute_tick)
+        self.program_worker = ProgramWorker()
         # Create IO handler for immediate mode
-        immediate_io = SimpleWebIOHandler(self._append_output, self._get_input)
+        immediate_io = SimpleWebIOHandler(self.program_worker.wrap_output(self._append_output),
+                                          self._get_input)
         sandboxed_file_io = SandboxedFileIO(self)
         self.interpreter = Interpreter(self.runtime, immediate_io,
-                                      limits=create_local_limits(),
+                                      limits=create_web_session_limits(),
                                       file_io=sandboxed_file_io,
                                       filesystem_provider=self.sandboxed_fs)
+        # Keys pressed in the page while a program runs, read by INKEY$
+        self.key_buffer = deque()
+        self.interpreter.builtins.key_source = self._read_key
 
         self.running = False
         self.paused = False
@@ -1208,6 +1233,7 @@ class NiceGUIBackend(UIBackend):
         self.input_future = None
         self.last_save_content = ''
         self.exec_timer = None
+        self.key_wait = False  # Ticking every KEY_WAIT_INTERVAL: program polls INKEY$ for a key
         self.auto_save_timer = None
 
         # Output batching to reduce DOM updates
@@ -1290,6 +1316,18 @@ class NiceGUIBackend(UIBackend):
         - Output pane
         - Status bar
         """
+        # Output pane: appends output deltas in the browser (see src/output_buffer.py)
+        ui.add_head_html(f'<script>{CLIENT_SCRIPT}</script>')
+
+        # Keys typed outside the input fields go to a running program's INKEY$
+        ui.keyboard(on_key=self._on_key)
+
+        # Programs in hidden tabs get fewer time slices (see ProgramScheduler)
+        ui.add_head_html('''<script>
+            document.addEventListener('visibilitychange', () => emitEvent('mbasic_visibility', document.hidden));
+        </script>''')
+        ui.on('mbasic_visibility', self._on_visibility)
+
         # Use CodeMirror 5 (legacy) - simple script tags, no ES6 modules
         ui.add_head_html('<link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/codemirror/5.65.2/codemirror.min.css">')
         ui.add_head_html('<script src="https://cdnjs.cloudflare.com/ajax/libs/codemirror/5.65.2/codemirror.min.js"></script>')
@@ -2038,6 +2076,7 @@ class NiceGUIBackend(UIBackend):
         if self.exec_timer:
             self.exec_timer.cancel()
             self.exec_timer = None
+        self.program_worker.stop()
 
         self.running = False
         self.paused = False
@@ -2207,6 +2246,7 @@ class NiceGUIBackend(UIBackend):
             if self.exec_timer:
                 self.exec_timer.cancel()
                 self.exec_timer = None
+            await self._stop_program_worker()
 
             # Save editor content to program first
             if not self._save_editor_to_program():
@@ -2227,9 +2267,13 @@ class NiceGUIBackend(UIBackend):
             # Reset runtime with current program - RUN = CLEAR + GOTO first line
             # This preserves breakpoints but clears variables
             self.runtime.reset_for_run(self.program.line_asts, self.program.lines)
+            self.key_buffer.clear()
+            self.key_wait = False
 
             # Update interpreter's IO handler to output to execution pane
-            self.exec_io = SimpleWebIOHandler(self._append_output, self._get_input)
+            # (output written by the program worker is queued for _execute_tick)
+            self.exec_io = SimpleWebIOHandler(self.program_worker.wrap_output(self._append_output),
+                                              self._get_input)
             self.interpreter.io = self.exec_io
 
             # Start interpreter (sets up statement table, etc.)
@@ -2274,9 +2318,13 @@ class NiceGUIBackend(UIBackend):
             self.running = False
 
     def _execute_tick(self):
-        """Execute one tick of the interpreter.
+        """Poll the program worker and run the next time slice of the program.
 
         This method is called every 10ms by ui.timer() during program execution.
+        The program itself runs on a ProgramWorker thread, so a long-running
+        program does not block the event loop (and the other sessions on it);
+        this method shows the output the worker queued and handles the state
+        it stopped in (error, INPUT, end of program, breakpoint).
 
         Note: In the web UI, Ctrl+C in the browser does not send interrupt signals to
         the Python backend process. To stop a running program, users must use the Stop
@@ -2293,6 +2341,12 @@ class NiceGUIBackend(UIBackend):
             if not state:
                 return
 
+            output = self.program_worker.drain_output()
+            if output:
+                self._append_output(output)
+            if self.program_worker.busy:
+                return
+
             # If waiting for input, don't tick - wait for input to be provided
             if state.input_prompt:
                 # Show prompt and focus the immediate mode input box
@@ -2317,10 +2371,34 @@ class NiceGUIBackend(UIBackend):
                         char_start = state.current_statement_char_start if state.current_statement_char_start > 0 else None
                         char_end = state.current_statement_char_end if state.current_statement_char_end > 0 else None
                         self.editor.set_current_statement(state.current_line, char_start, char_end)
+                # Submitting the input resumes execution (_resume_execution)
+                if self.exec_timer:
+                    self.exec_timer.cancel()
+                    self.exec_timer = None
                 return
 
-            # Execute one tick (up to 1000 statements)
-            state = self.interpreter.tick(mode='run', max_statements=1000)
+            # Run the next time slice on the worker once the last one is handled
+            state = self.program_worker.result()
+            if state is not None and self.program_worker.waiting_for_key and not self.key_buffer:
+                # Program is polling INKEY$ for a key: run a slice every
+                # KEY_WAIT_INTERVAL seconds instead of every tick, so INKEY$
+                # timeout loops still finish (a keypress resumes at once, _on_key)
+                if not self.key_wait:
+                    self.key_wait = True
+                    self._start_exec_timer(ProgramWorker.KEY_WAIT_INTERVAL)
+                    return
+            elif self.key_wait and state is not None:
+                # Program did something else than wait for a key: tick normally
+                self.key_wait = False
+                self._start_exec_timer(0.01)
+            if state is None or not (state.error_info or state.input_prompt
+                                     or not self.runtime.pc.is_running()):
+                import time
+                if self.interpreter.state.delay_until > time.perf_counter():
+                    # Delay loop: no slice has anything to run until it is over
+                    return
+                self.program_worker.start(self.interpreter)
+                return
 
             # Handle state using microprocessor model
             if state.error_info:
@@ -2362,7 +2440,10 @@ class NiceGUIBackend(UIBackend):
                         char_start = state.current_statement_char_start if state.current_statement_char_start > 0 else None
                         char_end = state.current_statement_char_end if state.current_statement_char_end > 0 else None
                         self.editor.set_current_statement(state.current_line, char_start, char_end)
-                # Don't cancel timer - keep ticking to check when input is provided
+                # Submitting the input resumes execution (_resume_execution)
+                if self.exec_timer:
+                    self.exec_timer.cancel()
+                    self.exec_timer = None
             elif not self.runtime.pc.is_running():
                 # Check if done or paused at breakpoint
                 if not self.runtime.is_paused_at_statement():
@@ -2406,12 +2487,64 @@ class NiceGUIBackend(UIBackend):
             self._set_status(f"Error: {e}")
             self.running = False
 
+    def _resume_execution(self):
+        """Continue a running program that was waiting for INPUT or a key.
+
+        The tick timer is cancelled while a program waits for INPUT, and
+        slowed to KEY_WAIT_INTERVAL while it polls INKEY$ for a key, so
+        parked sessions cost (almost) no CPU; this restarts normal ticks.
+        """
+        if not self.running or self.paused or (self.exec_timer and not self.key_wait):
+            return
+        self.key_wait = False
+        self.program_worker.waiting_for_key = False
+        self._start_exec_timer(0.01)
+
+    def _start_exec_timer(self, interval):
+        """(Re)start the tick timer calling _execute_tick every interval seconds."""
+        if self.exec_timer:
+            self.exec_timer.cancel()
+        self.exec_timer = ui.timer(interval, self._execute_tick, once=False)
+
+    def _read_key(self):
+        """INKEY$ key source: the oldest key pressed in the page ('' if none)."""
+        return self.key_buffer.popleft() if self.key_buffer else ''
+
+    def _on_key(self, e):
+        """Queue keys pressed while a program runs for INKEY$."""
+        if not e.action.keydown or not self.running or self.paused or self.waiting_for_input:
+            return
+        name = e.key.name
+        key = name if len(name) == 1 else self.INKEY_KEYS.get(name)
+        if key is None:
+            return
+        self.key_buffer.append(key)
+        if self.key_wait:
+            self._resume_execution()
+
+    def _on_visibility(self, e):
+        """Track whether the browser tab is hidden, for the program scheduler."""
+        self.program_worker.background = bool(e.args)
+
+    async def _stop_program_worker(self):
+        """End the program worker's time slice and show the output it queued."""
+        self.program_worker.stop()
+        await self.program_worker.wait()
+        output = self.program_worker.drain_output()
+        if output:
+            self._append_output(output)
+        try:
+            self.program_worker.result()
+        except Exception as e:
+            self._log_error("_stop_program_worker", e)
+
     async def _menu_stop(self):
         """Run > Stop - Stop execution."""
-        # Cancel the execution timer first
+        # Cancel the execution timer first, then let the worker finish its quantum
         if self.exec_timer:
             self.exec_timer.cancel()
             self.exec_timer = None
+        await self._stop_program_worker()
 
         # Stop the interpreter
         # Note: PC handles halted state - no need to set flags
@@ -2495,18 +2628,22 @@ class NiceGUIBackend(UIBackend):
                 # Note: Output is NOT cleared - continuous scrolling like ASR33 teletype
 
                 # Create or reset runtime - preserves breakpoints
-                from src.resource_limits import create_local_limits
+                from src.resource_limits import create_web_session_limits
                 if self.runtime is None:
                     self.runtime = Runtime(self.program.line_asts, self.program.lines)
+                    self._apply_variable_tracking()
                     self.runtime.setup()
                 else:
                     # Reset runtime for fresh execution (clears variables but preserves breakpoints)
                     self.runtime.reset_for_run(self.program.line_asts, self.program.lines)
+                    self.key_buffer.clear()
+                    self.key_wait = False
 
                 # Create new IO handler for execution
-                self.exec_io = SimpleWebIOHandler(self._append_output, self._get_input)
+                self.exec_io = SimpleWebIOHandler(self.program_worker.wrap_output(self._append_output),
+                                                  self._get_input)
                 self.interpreter.io = self.exec_io
-                self.interpreter.limits = create_local_limits()
+                self.interpreter.limits = create_web_session_limits()
 
                 # Wire up interpreter
                 self.interpreter.interactive_mode = self
@@ -2528,7 +2665,9 @@ class NiceGUIBackend(UIBackend):
                 if self.interpreter:
                     try:
                         # PC will be updated by tick - no need to manipulate flags
-                        state = self.interpreter.tick(mode='step_line', max_statements=100)
+                        # (the lock waits for a running program worker's quantum)
+                        with self.program_worker.lock:
+                            state = self.interpreter.tick(mode='step_line', max_statements=100)
                         self._handle_step_result(state, 'line')
                     except Exception as e:
                         self._log_error("_menu_step_line tick", e)
@@ -2569,19 +2708,23 @@ class NiceGUIBackend(UIBackend):
                 # Note: Output is NOT cleared - continuous scrolling like ASR33 teletype
 
                 # Create or reset runtime - preserves breakpoints
-                from src.resource_limits import create_local_limits
+                from src.resource_limits import create_web_session_limits
                 if self.runtime is None:
                     self.runtime = Runtime(self.program.line_asts, self.program.lines)
+                    self._apply_variable_tracking()
                     self.runtime.setup()
                 else:
                     self.runtime.reset_for_run(self.program.line_asts, self.program.lines)
+                    self.key_buffer.clear()
+                    self.key_wait = False
 
                 # Create new IO handler for execution
                 # Note: Interpreter/runtime objects are reused across runs (not recreated each time).
                 # The runtime.reset_for_run() call above clears variables but preserves breakpoints.
-                self.exec_io = SimpleWebIOHandler(self._append_output, self._get_input)
+                self.exec_io = SimpleWebIOHandler(self.program_worker.wrap_output(self._append_output),
+                                                  self._get_input)
                 self.interpreter.io = self.exec_io
-                self.interpreter.limits = create_local_limits()
+                self.interpreter.limits = create_web_session_limits()
 
                 # Wire up interpreter
                 self.interpreter.interactive_mode = self
@@ -2603,7 +2746,9 @@ class NiceGUIBackend(UIBackend):
                 if self.interpreter:
                     try:
                         # PC will be updated by tick - no need to manipulate flags
-                        state = self.interpreter.tick(mode='step_statement', max_statements=1)
+                        # (the lock waits for a running program worker's quantum)
+                        with self.program_worker.lock:
+                            state = self.interpreter.tick(mode='step_statement', max_statements=1)
                         self._handle_step_result(state, 'statement')
                     except Exception as e:
                         self._log_error("_menu_step_stmt tick", e)
@@ -2770,6 +2915,16 @@ class NiceGUIBackend(UIBackend):
         """Show Variables window using reusable dialog."""
         self.variables_dialog.show()
 
+    def _apply_variable_tracking(self):
+        """Record variable access history only while the Variables window is open.
+
+        Called when the dialog opens or closes (takes effect mid-run) and for new runtimes.
+        """
+        if self.variables_dialog.value:
+            self.runtime.set_tracking_mode(self.settings_manager.get('variable_tracking'))
+        else:
+            self.runtime.set_tracking_mode('off')
+
     def _show_stack_window(self):
         """Show Execution Stack window using reusable dialog."""
         self.stack_dialog.show()
@@ -2961,8 +3116,7 @@ class NiceGUIBackend(UIBackend):
         old_pc = self.runtime.pc
 
         # Clear and rebuild statement table
-        self.runtime.statement_table.statements.clear()
-        self.runtime.statement_table._keys_cache = None
+        self.runtime.statement_table.clear()
 
         # Update line text map
         self.runtime.line_text_map = dict(self.program.lines)
@@ -3374,8 +3528,29 @@ class NiceGUIBackend(UIBackend):
         if self.output:
             self.output.value = ''
             self.output.update()
+            self._output_value_stale = False
         self._set_status('Output cleared')
 
+    @property
+    def output_text(self):
+        """Text of the output pane (its last output_max_lines lines)."""
+        return self.output_buffer.text()
+
+    @output_text.setter
+    def output_text(self, text):
+        self.output_buffer = OutputRingBuffer(self.output_max_lines, text)
+
+    def _output_value(self):
+        """Text of the output textarea, including anything typed into it.
+
+        Output deltas only reach the browser (see _flush_output_batch), so
+        the element's server-side value is brought up to date first.
+        """
+        if self._output_value_stale:
+            _set_value_quietly(self.output, self.output_text)
+            self._output_value_stale = False
+        return self.output.value or ''
+
     def _append_output(self, text):
         """Append text to output pane with batching for performance.
 
@@ -3415,52 +3590,12 @@ class NiceGUIBackend(UIBackend):
             self.output_batch_timer.cancel()
             self.output_batch_timer = None
 
-        # Update our internal buffer
-        self.output_text += batch_text
-
-        # Limit output buffer by number of lines to prevent infinite growth
-        lines = self.output_text.split('\n')
-        if len(lines) > self.output_max_lines:
-            # Keep last N lines, add indicator at start
-            lines = lines[-self.output_max_lines:]
-            self.output_text = '\n'.join(lines)
-            # Add truncation indicator if not already present
-            if not self.output_text.startswith('[... output truncated'):
-                self.output_text = '[... output truncated ...]\n' + self.output_text
-
-        # Update the textarea directly
+        # Keep the last output_max_lines lines; the browser is sent only the
+        # new text and trims its copy of the output the same way
+        self.output_buffer.append(batch_text)
         if self.output:
-            self.output.value = self.output_text
-            self.output.update()
-
-            # Auto-scroll to bottom with smart scroll tracking
-            ui.run_javascript('''
-                (function() {
-                    let textarea = document.querySelector('[data-marker="output"] textarea');
-                    if (!textarea) {
-                        const textareas = document.querySelectorAll('textarea[readonly]');
-                        textarea = textareas[textareas.length - 1];
-                    }
-                    if (!textarea) return;
-
-                    // Set up scroll event listener if not already done
-                    if (!textarea.dataset.scrollTrackerInstalled) {
-                        textarea.dataset.scrollTrackerInstalled = 'true';
-                        textarea.dataset.userScrolledUp = 'false';
-
-                        textarea.addEventListener('scroll', function() {
-                            // Check if user is within 50px of bottom
-                            const isAtBottom = this.scrollTop >= this.scrollHeight - this.clientHeight - 50;
-                            this.dataset.userScrolledUp = isAtBottom ? 'false' : 'true';
-                        });
-                    }
-
-                    // Only auto-scroll if user hasn't manually scrolled up
-                    if (textarea.dataset.userScrolledUp !== 'true') {
-                        textarea.scrollTop = textarea.scrollHeight;
-                    }
-                })();
-            ''')
+            ui.run_javascript(append_script(self.output.id, batch_text, self.output_max_lines))
+            self._output_value_stale = True
 
     def _handle_output_enter(self, e):
         """Handle Enter key in output textarea for inline input."""
@@ -3470,7 +3605,7 @@ class NiceGUIBackend(UIBackend):
             return
 
         # Get the text from the output
-        current_text = self.output.value or ''
+        current_text = self._output_value()
 
         # Find what the user typed after the prompt
         if self.input_prompt_text:
@@ -3489,7 +3624,8 @@ class NiceGUIBackend(UIBackend):
         user_input = user_input.strip()
 
         # Add newline after input to move to next line
-        self.output.value = current_text + '\n'
+        self.output_text = current_text + '\n'
+        self.output.value = self.output_text
 
         # Make output readonly again - use JavaScript to set readonly attribute
         self.output.run_method('() => { const el = this.$el.querySelector("textarea"); if (el) { el.setAttribute("readonly", "readonly"); } }')
@@ -3520,6 +3656,7 @@ class NiceGUIBackend(UIBackend):
         #    (checked via interpreter.state.input_prompt). Stores input for retrieval.
         if self.interpreter and self.interpreter.state.input_prompt:
             self.interpreter.provide_input(user_input)
+            self._resume_execution()
 
         # 2. input_future.set_result() - Used when async code is waiting via asyncio.Future
         #    (see _get_input_async method). Only one path will be active at a time, but we
@@ -3533,11 +3670,13 @@ class NiceGUIBackend(UIBackend):
     def _enable_inline_input(self, prompt=''):
         """Enable inline input in output textarea."""
         # Append prompt to output without newline
-        current_text = self.output.value or ''
+        self._flush_output_batch()
+        current_text = self._output_value()
         if not current_text.endswith('\n') and current_text:
-            self.output.value = current_text + '\n' + prompt
+            self.output_text = current_text + '\n' + prompt
         else:
-            self.output.value = current_text + prompt
+            self.output_text = current_text + prompt
+        self.output.value = self.output_text
 
         # Store prompt for later extraction of user input
         self.input_prompt_text = prompt
@@ -3598,8 +3737,9 @@ class NiceGUIBackend(UIBackend):
             # Echo the input to output
             self._append_output(user_input + '\n')
 
-            # Provide input to interpreter
+            # Provide input to interpreter and continue the program
             self.interpreter.provide_input(user_input)
+            self._resume_execution()
 
             # Clear waiting state and restore placeholder
             self.waiting_for_input = False
@@ -3647,23 +3787,26 @@ class NiceGUIBackend(UIBackend):
             runtime = self.runtime
             interpreter = self.interpreter
 
-            # Parse editor content into program (in case user typed lines directly)
-            # This updates self.program but doesn't affect runtime yet
-            self._save_editor_to_program()
+            # A running program's worker must not tick while the command
+            # changes the runtime: wait for its current quantum
+            with self.program_worker.lock:
+                # Parse editor content into program (in case user typed lines directly)
+                # This updates self.program but doesn't affect runtime yet
+                self._save_editor_to_program()
 
-            # Sync program to runtime (but don't reset PC - keep current execution state)
-            # This allows LIST to work, but doesn't start execution
-            self._sync_program_to_runtime()
+                # Sync program to runtime (but don't reset PC - keep current execution state)
+                # This allows LIST to work, but doesn't start execution
+                self._sync_program_to_runtime()
 
-            # Create immediate executor (runtime, interpreter, output_io)
-            immediate_executor = ImmediateExecutor(
-                runtime,
-                interpreter,
-                output_io
-            )
+                # Create immediate executor (runtime, interpreter, output_io)
+                immediate_executor = ImmediateExecutor(
+                    runtime,
+                    interpreter,
+                    output_io
+                )
 
-            # Execute command
-            success, output = immediate_executor.execute(command)
+                # Execute command
+                success, output = immediate_executor.execute(command)
 
             # Show result
             if output:
@@ -3789,17 +3932,20 @@ class NiceGUIBackend(UIBackend):
         """
         from src.ui.web.session_state import SessionState
 
-        # Sync program manager from editor content before serializing
-        # This ensures we capture any edits that haven't been run yet
-        self._sync_program_from_editor()
+        # A running program's worker must not tick while the runtime is
+        # pickled and its files closed: wait for its current quantum
+        with self.program_worker.lock:
+            # Sync program manager from editor content before serializing
+            # This ensures we capture any edits that haven't been run yet
+            self._sync_program_from_editor()
 
-        # Close any open files before serialization
-        self._close_all_files()
+            program_lines = self._serialize_program()
+            runtime_state = self._serialize_runtime()
 
         state = SessionState(
             session_id=self.sandboxed_fs.user_id,
-            program_lines=self._serialize_program(),
-            runtime_state=self._serialize_runtime(),
+            program_lines=program_lines,
+            runtime_state=runtime_state,
             running=self.running,
             paused=self.paused,
             output_text=self.output_text,
@@ -3944,6 +4090,7 @@ class NiceGUIBackend(UIBackend):
         Uses pickle for complex objects:
         - statement_table: Contains StatementTable with AST statement nodes (pickled)
         - user_functions: Contains DefFnStatementNode AST nodes (pickled)
+        Arrays are converted by Runtime.serialize_arrays() (array.array buffers to lists).
         Other fields use direct serialization (dicts, lists, primitives).
 
         Returns:
@@ -3951,12 +4098,15 @@ class NiceGUIBackend(UIBackend):
         """
         import pickle
 
-        # Close open files first
+        # Keep the FIELD layouts (rebuilt when the files are reopened), then close open files
+        field_layouts = dict(self.runtime.field_layouts)
+        field_layouts.update((file_num, record_file.layout())
+                             for file_num, record_file in self.runtime.field_buffers.items())
         self._close_all_files()
 
         return {
             'variables': self.runtime._variables,
-            'arrays': self.runtime._arrays,
+            'arrays': self.runtime.serialize_arrays(),
             'variable_case_variants': self.runtime._variable_case_variants,
             'array_element_tracking': self.runtime._array_element_tracking,
             'common_vars': self.runtime.common_vars,
@@ -3973,7 +4123,7 @@ class NiceGUIBackend(UIBackend):
             'data_pointer': self.runtime.data_pointer,
             'data_line_map': self.runtime.data_line_map,
             'user_functions': pickle.dumps(self.runtime.user_functions).hex(),
-            'field_buffers': self.runtime.field_buffers,
+            'field_layouts': field_layouts,
             'error_handler': self.runtime.error_handler,
             'error_handler_is_gosub': self.runtime.error_handler_is_gosub,
             'rnd_last': self.runtime.rnd_last,
@@ -3994,7 +4144,7 @@ class NiceGUIBackend(UIBackend):
         from src.pc import PC
 
         self.runtime._variables = state['variables']
-        self.runtime._arrays = state['arrays']
+        self.runtime.restore_arrays(state['arrays'])
         self.runtime._variable_case_variants = state['variable_case_variants']
         self.runtime._array_element_tracking = state['array_element_tracking']
         self.runtime.common_vars = state['common_vars']
@@ -4018,7 +4168,10 @@ class NiceGUIBackend(UIBackend):
         self.runtime.data_pointer = state['data_pointer']
         self.runtime.data_line_map = state['data_line_map']
         self.runtime.user_functions = pickle.loads(bytes.fromhex(state['user_functions']))
-        self.runtime.field_buffers = state['field_buffers']
+        self.runtime.field_buffers = {}
+        # JSON storage turns the file numbers into strings
+        self.runtime.field_layouts = {int(file_num): layout
+                                      for file_num, layout in state.get('field_layouts', {}).items()}
         self.runtime.error_handler = state['error_handler']
         self.runtime.error_handler_is_gosub = state['error_handler_is_gosub']
         self.runtime.rnd_last = state['rnd_last']
@@ -4030,34 +4183,38 @@ class NiceGUIBackend(UIBackend):
         self.runtime.trace_detail = state['trace_detail']
 
     def _close_all_files(self) -> None:
-        """Close all open file handles before serialization."""
-        if hasattr(self.runtime, 'files'):
-            open_file_numbers = list(self.runtime.files.keys())
-            for file_num in open_file_numbers:
-                try:
-                    self.runtime.files[file_num].close()
-                except Exception:
-                    pass  # Ignore errors closing files
-            self.runtime.files.clear()
+        """Close all open file handles and record buffers before serialization."""
+        for file_num, file_info in list(self.runtime.files.items()):
+            record_file = self.runtime.field_buffers.pop(file_num, None)
+            try:
+                if record_file is not None:
+                    record_file.close()
+                file_info['handle'].close()
+            except Exception:
+                pass  # Ignore errors closing files
+        self.runtime.files.clear()
+        self.runtime.field_buffers.clear()
 
     def _recreate_interpreter(self) -> None:
         """Recreate interpreter instance with restored runtime."""
         from src.interpreter import Interpreter
-        from src.resource_limits import create_local_limits
+        from src.resource_limits import create_web_session_limits
         from src.file_io import SandboxedFileIO
 
         # Create IO handler for immediate mode
-        immediate_io = SimpleWebIOHandler(self._append_output, self._get_input)
+        immediate_io = SimpleWebIOHandler(self.program_worker.wrap_output(self._append_output),
+                                          self._get_input)
         sandboxed_file_io = SandboxedFileIO(self)
 
         # Recreate interpreter with restored runtime
         self.interpreter = Interpreter(
             self.runtime,
             immediate_io,
-            limits=create_local_limits(),
+            limits=create_web_session_limits(),
             file_io=sandboxed_file_io,
             filesystem_provider=self.sandboxed_fs
         )
+        self.interpreter.builtins.key_source = self._read_key
 
     # =========================================================================
     # UIBackend Interface
@@ -4406,6 +4563,28 @@ def start_web_ui(port=8080):
 
         return health_status
 
+    from fastapi import Request
+
+    @app.get('/scheduler')
+    def scheduler_stats(request: Request):
+        """Program scheduler statistics for monitoring (see ProgramScheduler.stats()).
+
+        Served only with monitoring.scheduler_endpoint enabled in
+        config/multiuser.json; with monitoring.token set, the request must
+        send it in the X-Monitoring-Token header.
+        """
+        import hmac
+        from fastapi.responses import JSONResponse
+        from src.multiuser_config import get_config
+        from src.program_scheduler import get_scheduler
+        monitoring = get_config().monitoring
+        if not monitoring.scheduler_endpoint:
+            return JSONResponse(status_code=404, content={'detail': 'Not Found'})
+        if monitoring.token and not hmac.compare_digest(
+                request.headers.get('X-Monitoring-Token', ''), monitoring.token):
+            return JSONResponse(status_code=403, content={'detail': 'Forbidden'})
+        return get_scheduler().stats()
+
     # Check if Redis is configured
     import os
     redis_url = os.environ.get('NICEGUI_REDIS_URL')
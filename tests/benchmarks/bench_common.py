@@ -0,0 +1,94 @@
+"""
+Shared helpers for the MBASIC benchmark scripts.
+
+Benchmarks are plain scripts (not test_*.py) so the regression runner does
+not pick them up. Run them directly, e.g.:
+
+    python3 tests/benchmarks/benchmark_engine.py
+"""
+
+import os
+import sys
+import time
+
+# Add project root to path (2 levels up from tests/benchmarks/)
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.lexer import Lexer
+from src.parser import Parser
+from src.runtime import Runtime
+from src.interpreter import Interpreter
+from src.resource_limits import create_unlimited_limits
+
+
+class NullIO:
+    """IO handler that discards output and answers every prompt with '1'."""
+
+    def output(self, text, end='\n'):
+        pass
+
+    def input(self, prompt=''):
+        return '1'
+
+    def input_line(self, prompt=''):
+        return '1'
+
+    def input_char(self, blocking=True):
+        return ''
+
+    def clear_screen(self):
+        pass
+
+    def error(self, message):
+        pass
+
+    def debug(self, message):
+        pass
+
+
+def read_program(path):
+    """Read a .bas file from the corpus (path relative to the project root)."""
+    with open(os.path.join(PROJECT_ROOT, path), encoding='latin-1') as f:
+        source = f.read()
+    return source.replace('\r\n', '\n').replace('\r', '\n').split('\x1a')[0]
+
+
+def make_interpreter(source, **interpreter_kwargs):
+    """Parse source and return an Interpreter with discarded output and no limits."""
+    ast = Parser(Lexer(source).tokenize()).parse()
+    runtime = Runtime({line.line_number: line for line in ast.lines})
+    interpreter_kwargs.setdefault('limits', create_unlimited_limits())
+    return Interpreter(runtime, NullIO(), **interpreter_kwargs)
+
+
+def run_program(source, max_statements=200000, quantum=1000, setup=None, **interpreter_kwargs):
+    """Run a program to completion (or max_statements) using the tick API.
+
+    INPUT prompts are answered with '1'. Runtime errors end the run.
+    If given, setup(interpreter) is called before the program starts.
+
+    Returns:
+        (statements_executed, elapsed_seconds)
+    """
+    interp = make_interpreter(source, **interpreter_kwargs)
+    if setup is not None:
+        setup(interp)
+    start = time.perf_counter()
+    state = interp.start()
+    try:
+        while (interp.runtime.pc.is_running() and not state.error_info
+               and state.statements_executed < max_statements):
+            state = interp.tick(mode='run', max_statements=quantum)
+            if state.input_prompt is not None:
+                state = interp.provide_input('1')
+    except Exception:
+        pass
+    elapsed = time.perf_counter() - start
+    return interp.state.statements_executed, elapsed
+
+
+def best_of(repeat, func, *args, **kwargs):
+    """Call func repeat times and return the result with the lowest elapsed time."""
+    results = [func(*args, **kwargs) for _ in range(repeat)]
+    return min(results, key=lambda r: r[1])
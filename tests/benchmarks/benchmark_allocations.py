@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Count memory allocations left behind by variable access (tracemalloc).
+
+Runs a tight FOR I=1 TO 100000: X=X+I: NEXT loop with the cyclic garbage
+collector disabled and tracemalloc tracing, then reports:
+- blocks: memory blocks allocated by src/ code that are still alive at the
+  end (per-access objects that need the cycle collector, such as classes
+  created on every call, pile up here)
+- garbage: unreachable objects found by gc.collect() afterwards
+- peak: peak traced memory during the run
+
+Usage:
+    python3 tests/benchmarks/benchmark_allocations.py [--iterations N]
+"""
+
+import argparse
+import gc
+import os
+import time
+import tracemalloc
+
+from bench_common import make_interpreter, PROJECT_ROOT
+
+SRC_DIR = os.path.join(PROJECT_ROOT, 'src')
+
+
+def measure(source, engine, tracking_mode):
+    # Every iteration has to run for the measurement (no loop idiom fast-forwarding)
+    interp = make_interpreter(source, engine=engine, loop_idioms=False)
+    interp.runtime.set_tracking_mode(tracking_mode)
+    interp.start()
+    gc.collect()
+    gc.disable()
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        while interp.runtime.pc.is_running() and not interp.state.error_info:
+            interp.tick(mode='run', max_statements=1000)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+        garbage = gc.collect()
+        gc.enable()
+    src_filter = [tracemalloc.Filter(True, os.path.join(SRC_DIR, '*'))]
+    blocks = sum(stat.count for stat in snapshot.filter_traces(src_filter).statistics('filename'))
+    return blocks, garbage, peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=100000, help='loop iterations')
+    args = parser.parse_args()
+    source = f"10 FOR I=1 TO {args.iterations}: X=X+I: NEXT\n"
+
+    print(f"FOR I=1 TO {args.iterations}: X=X+I: NEXT")
+    print(f"{'engine':8} {'tracking':9} {'blocks':>9} {'garbage':>9} {'peak KiB':>9} {'time (s)':>9}")
+    for engine in ('ast', 'closure'):
+        for mode in ('off', 'full'):
+            blocks, garbage, peak, elapsed = measure(source, engine, mode)
+            print(f"{engine:8} {mode:9} {blocks:9d} {garbage:9d} {peak / 1024:9.0f} {elapsed:9.2f}")
+
+
+if __name__ == '__main__':
+    main()
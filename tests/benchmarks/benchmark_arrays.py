@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark BASIC array storage and subscripting.
+
+Three parts:
+- Bytes per element of a filled DIM A(100,100) for each type (deep size of
+  the storage: buffer or list plus the element objects it references)
+- Per-access cost of Runtime.get_array_element()/set_array_element() for
+  1-D, 2-D and 3-D arrays
+- Statements/second for array-heavy BASIC loops on both engines
+
+Usage:
+    python3 tests/benchmarks/benchmark_arrays.py [--repeat N] [--calls N]
+"""
+
+import argparse
+import sys
+import time
+
+from bench_common import run_program, best_of
+
+from src.runtime import Runtime
+
+PROGRAMS = {
+    'sieve (1-D integer)': ('10 DEFINT A-Z: DIM F(5000)\n'
+                            '20 FOR I=2 TO 70: IF F(I) THEN 50\n'
+                            '30 FOR J=I*I TO 5000 STEP I: F(J)=1: NEXT J\n'
+                            '50 NEXT I\n'),
+    'matrix multiply (2-D single)': ('10 N=12: DIM A(N,N), B(N,N), C(N,N)\n'
+                                     '20 FOR I=0 TO N: FOR J=0 TO N: A(I,J)=I+J/7: B(I,J)=I-J/3: NEXT J: NEXT I\n'
+                                     '30 FOR I=0 TO N: FOR J=0 TO N: S=0\n'
+                                     '40 FOR K=0 TO N: S=S+A(I,K)*B(K,J): NEXT K\n'
+                                     '50 C(I,J)=S: NEXT J: NEXT I\n'),
+    'string table (1-D string)': ('10 DIM S$(300)\n'
+                                  '20 FOR R=1 TO 10: FOR I=0 TO 300: S$(I)=S$(300-I)+"X": NEXT I: NEXT R\n'),
+}
+
+
+def storage_size(data):
+    """sys.getsizeof() of an array's storage plus each distinct element object."""
+    size = sys.getsizeof(data)
+    if isinstance(data, list):
+        seen = set()
+        for value in data:
+            if id(value) not in seen:
+                seen.add(id(value))
+                size += sys.getsizeof(value)
+    return size
+
+
+def benchmark_memory():
+    print(f"{'DIM A(100,100)':16} {'storage':>12} {'bytes/element':>14}")
+    for suffix, fill in (('%', lambda i: i % 30000), ('!', lambda i: i / 3), ('#', lambda i: i / 7),
+                         ('$', lambda i: 'AB')):
+        runtime = Runtime({})
+        runtime.dimension_array('a', suffix, [100, 100])
+        info = runtime._arrays['a' + suffix]
+        data = info['data']
+        for i in range(len(data)):
+            data[i] = fill(i)
+        kind = f"array('{data.typecode}')" if hasattr(data, 'typecode') else 'list'
+        print(f"{'A' + suffix:16} {kind:>12} {storage_size(data) / len(data):14.1f}")
+
+
+def time_calls(calls, func):
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+def benchmark_access(calls):
+    runtime = Runtime({})
+    shapes = (('1-D', [100], [57]), ('2-D', [30, 30], [17, 23]), ('3-D', [10, 10, 10], [3, 7, 9]))
+    print(f"{'access':12} {'read (ns)':>10} {'write (ns)':>11}")
+    for label, dims, subscripts in shapes:
+        runtime.dimension_array('a', '!', dims)
+        get = lambda: runtime.get_array_element('a', '!', subscripts)
+        put = lambda: runtime.set_array_element('a', '!', subscripts, 1.5)
+        t_get = min(time_calls(calls, get) for _ in range(3))
+        t_put = min(time_calls(calls, put) for _ in range(3))
+        print(f"{label:12} {t_get:10.0f} {t_put:11.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3, help='runs per engine (best time is reported)')
+    parser.add_argument('--calls', type=int, default=200000, help='calls per access timing')
+    args = parser.parse_args()
+
+    benchmark_memory()
+    print()
+    benchmark_access(args.calls)
+    print()
+    print(f"{'program':34} {'stmts':>8} {'ast st/s':>10} {'closure st/s':>13}")
+    for name, source in PROGRAMS.items():
+        n_ast, t_ast = best_of(args.repeat, run_program, source, engine='ast')
+        n_closure, t_closure = best_of(args.repeat, run_program, source, engine='closure')
+        print(f"{name:34} {n_ast:8d} {n_ast / t_ast:10.0f} {n_closure / t_closure:13.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark programs compiled by the Python backend (--compile-py) against the interpreter.
+
+Each program is run to completion by the interpreter (closure engine) and,
+after compiling it with PythonBackend, as a standalone `python` process.
+The compiled time includes interpreter startup of the script; INPUT
+prompts are answered with '1' in both cases.
+
+Usage:
+    python3 tests/benchmarks/benchmark_compile_py.py [--repeat N] [file.bas ...]
+"""
+
+import argparse
+import copy
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench_common import PROJECT_ROOT, read_program, run_program, best_of
+
+from src.lexer import Lexer
+from src.parser import Parser
+from src.semantic_analyzer import SemanticAnalyzer
+from src.codegen_py_backend import PythonBackend
+
+SYNTHETIC = {
+    'numeric loop': "10 FOR I=1 TO 200000\n20 X=X+I*2\n30 NEXT I\n",
+    'string build': ('10 FOR I=1 TO 50000\n20 A$=LEFT$(A$+CHR$(65+I MOD 26),50)\n'
+                     '30 IF LEN(A$)>40 THEN A$=""\n40 NEXT I\n'),
+    'arrays+gosub': ('10 DIM A(100)\n20 FOR I=1 TO 30000\n30 GOSUB 100\n40 NEXT I\n50 END\n'
+                     '100 J=I MOD 100: A(J)=A(J)+1: RETURN\n'),
+    'sieve': ('10 DEFINT A-Z: DIM F(8190)\n20 FOR K=1 TO 3: C=0\n30 FOR I=0 TO 8190: F(I)=1: NEXT I\n'
+              '40 FOR I=0 TO 8190: IF F(I)=0 THEN 80\n50 P=I+I+3: C=C+1: J=I+P\n'
+              '60 IF J<=8190 THEN F(J)=0: J=J+P: GOTO 60\n80 NEXT I\n90 NEXT K\n100 PRINT C\n'),
+}
+
+CORPUS = [
+    'basic/business/log10k.bas',
+    'basic/utilities/fprime.bas',
+    'basic/games/love.bas',
+    'basic/games/calendar.bas',
+    'basic/games/bunny.bas',
+    'basic/games/3dplot.bas',
+]
+
+
+def compile_program(source, path):
+    """Compile source with PythonBackend and write the script to path."""
+    ast = Parser(Lexer(source).tokenize()).parse()
+    analyzer = SemanticAnalyzer()
+    analyzer.analyze(copy.deepcopy(ast))
+    backend = PythonBackend(analyzer.symbols)
+    code = backend.generate(ast)
+    if backend.errors:
+        raise ValueError('; '.join(backend.errors))
+    with open(path, 'w') as f:
+        f.write(code)
+
+
+def run_script(path):
+    """Run a compiled script to completion; returns (None, elapsed_seconds)."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, path], input=b'1\n' * 1000, stdout=subprocess.DEVNULL,
+                   stderr=subprocess.DEVNULL, cwd=PROJECT_ROOT)
+    return None, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3, help='runs per program (best time is reported)')
+    parser.add_argument('files', nargs='*', help='.bas files to benchmark (default: built-in set)')
+    args = parser.parse_args()
+
+    programs = [(path, read_program(path)) for path in args.files] if args.files else \
+        list(SYNTHETIC.items()) + [(path, read_program(path)) for path in CORPUS]
+
+    print(f"{'program':34} {'stmts':>9} {'interp s':>9} {'compiled s':>11} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        script = os.path.join(tmp, 'program.py')
+        for name, source in programs:
+            try:
+                compile_program(source, script)
+            except ValueError as e:
+                print(f"{name:34} not compiled: {e}")
+                continue
+            n, t_interp = best_of(args.repeat, run_program, source, max_statements=10 ** 9)
+            _, t_compiled = best_of(args.repeat, run_script, script)
+            print(f"{name:34} {n:9d} {t_interp:9.3f} {t_compiled:11.3f} {t_interp / t_compiled:7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Benchmark statements/second for the AST and closure execution engines.
+
+Runs a few synthetic loops plus CPU-bound programs from the basic/ corpus
+with Interpreter(engine='ast') and Interpreter(engine='closure').
+
+Usage:
+    python3 tests/benchmarks/benchmark_engine.py [--repeat N] [file.bas ...]
+"""
+
+import argparse
+
+from bench_common import read_program, run_program, best_of
+
+SYNTHETIC = {
+    'numeric loop': "10 FOR I=1 TO 20000\n20 X=X+I*2\n30 NEXT I\n",
+    'string build': ('10 FOR I=1 TO 5000\n20 A$=LEFT$(A$+CHR$(65+I MOD 26),50)\n'
+                     '30 IF LEN(A$)>40 THEN A$=""\n40 NEXT I\n'),
+    'arrays+gosub': ('10 DIM A(100)\n20 FOR I=1 TO 3000\n30 GOSUB 100\n40 NEXT I\n50 END\n'
+                     '100 J=I MOD 100: A(J)=A(J)+1: RETURN\n'),
+}
+
+CORPUS = [
+    'basic/business/log10k.bas',
+    'basic/utilities/fprime.bas',
+    'basic/games/love.bas',
+    'basic/games/calendar.bas',
+    'basic/games/bunny.bas',
+    'basic/games/3dplot.bas',
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3, help='runs per engine (best time is reported)')
+    parser.add_argument('files', nargs='*', help='.bas files to benchmark (default: built-in set)')
+    args = parser.parse_args()
+
+    programs = [(path, read_program(path)) for path in args.files] if args.files else \
+        list(SYNTHETIC.items()) + [(path, read_program(path)) for path in CORPUS]
+
+    print(f"{'program':34} {'stmts':>8} {'ast st/s':>10} {'closure st/s':>13} {'speedup':>8}")
+    for name, source in programs:
+        n_ast, t_ast = best_of(args.repeat, run_program, source, engine='ast')
+        n_closure, t_closure = best_of(args.repeat, run_program, source, engine='closure')
+        rate_ast = n_ast / t_ast
+        rate_closure = n_closure / t_closure
+        mismatch = '' if n_ast == n_closure else f'  (statement count differs: {n_closure})'
+        print(f"{name:34} {n_ast:8d} {rate_ast:10.0f} {rate_closure:13.0f} "
+              f"{rate_closure / rate_ast:7.2f}x{mismatch}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark reading a large sequential data file with INPUT# and LINE INPUT#.
+
+Writes a data file of --records lines (several MB by default) and reads it
+back in WHILE NOT EOF(1) loops on the AST engine, reporting lines/second
+and the number of read() calls made on the file handle. To compare with
+an older checkout, run the same script from a git worktree of it.
+
+Usage:
+    python3 tests/benchmarks/benchmark_file_input.py [--repeat N] [--records N]
+"""
+
+import argparse
+import os
+import tempfile
+
+from bench_common import run_program, best_of
+from src.filesystem import RealFileSystemProvider
+
+PROGRAMS = {
+    'LINE INPUT#': ('10 OPEN "I", #1, "{path}"\n'
+                    '20 WHILE NOT EOF(1): LINE INPUT #1, A$: N=N+1: WEND\n'
+                    '30 CLOSE #1\n'),
+    'INPUT#': ('10 OPEN "I", #1, "{path}"\n'
+               '20 WHILE NOT EOF(1): INPUT #1, A$, B, C$: N=N+1: WEND\n'
+               '30 CLOSE #1\n'),
+}
+
+
+class CountingFileSystem(RealFileSystemProvider):
+    """Real filesystem counting read() calls on the handles it opens."""
+
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+
+    def open(self, filename, mode, binary=False, buffer_size=None):
+        handle = super().open(filename, mode, binary, buffer_size)
+        read = handle.read
+
+        def counting_read(size=-1):
+            self.reads += 1
+            return read(size)
+        handle.read = counting_read
+        return handle
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3, help='runs per program (best time is reported)')
+    parser.add_argument('--records', type=int, default=100000, help='lines in the data file')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'data.txt')
+        with open(path, 'w', newline='\r\n') as f:
+            for i in range(args.records):
+                f.write(f"CUSTOMER {i:07d},{i * 1.25},ACCOUNT-{i % 977:04d}\n")
+        print(f"data file: {args.records} lines, {os.path.getsize(path)} bytes")
+
+        print(f"{'program':12} {'lines/s':>9} {'reads':>9}")
+        for name, template in PROGRAMS.items():
+            fs = CountingFileSystem()
+            n, elapsed = best_of(args.repeat, run_program, template.format(path=path),
+                                 max_statements=float('inf'), filesystem_provider=fs)
+            print(f"{name:12} {args.records / elapsed:9.0f} {fs.reads // args.repeat:9d}")
+
+
+if __name__ == '__main__':
+    main()
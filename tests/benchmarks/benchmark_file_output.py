@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark writing a large sequential file with PRINT# and WRITE#.
+
+Writes --records records to a temporary file on the real filesystem and
+to the in-memory (web UI) filesystem, once with buffered output (the
+default) and once with flush_file_writes, and reports records/second and
+the file size. Both runs must produce the same file.
+
+Usage:
+    python3 tests/benchmarks/benchmark_file_output.py [--repeat N] [--records N] [--buffer-size BYTES]
+"""
+
+import argparse
+import os
+import tempfile
+
+from bench_common import run_program, best_of
+from src.filesystem import RealFileSystemProvider, SandboxedFileSystemProvider
+
+PROGRAM = ('10 OPEN "O", #1, "{path}"\n'
+           '20 FOR I=1 TO {n}\n'
+           '30 PRINT #1, I; "CUSTOMER"; I MOD 97, I*1.5\n'
+           '40 WRITE #1, I, "ACCT", I/4\n'
+           '50 NEXT I\n'
+           '60 CLOSE #1\n')
+
+
+class Settings:
+    """Settings manager stand-in with fixed values."""
+
+    def __init__(self, **values):
+        self.values = values
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3, help='runs per configuration (best time is reported)')
+    parser.add_argument('--records', type=int, default=50000, help='loop iterations (two records each)')
+    parser.add_argument('--buffer-size', type=int, default=65536, help='file_buffer_size setting')
+    args = parser.parse_args()
+
+    print(f"{'filesystem':12} {'mode':10} {'records/s':>10} {'bytes':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        providers = {
+            'real': (lambda: RealFileSystemProvider(), os.path.join(tmp, 'out.txt')),
+            'in-memory': (lambda: SandboxedFileSystemProvider(user_id='benchmark_file_output',
+                                                              max_file_size=1 << 30), 'OUT.TXT'),
+        }
+        for name, (make_fs, path) in providers.items():
+            contents = set()
+            for mode, flush in (('buffered', False), ('flush', True)):
+                fs = make_fs()
+                settings = Settings(file_buffer_size=args.buffer_size, flush_file_writes=flush)
+                n, elapsed = best_of(args.repeat, run_program, PROGRAM.format(path=path, n=args.records),
+                                     max_statements=float('inf'), settings_manager=settings,
+                                     filesystem_provider=fs)
+                handle = fs.open(path, 'r')
+                text = handle.read()
+                handle.close()
+                contents.add(text)
+                print(f"{name:12} {mode:10} {2 * args.records / elapsed:10.0f} {len(text):10d}")
+            if len(contents) != 1:
+                print(f"{name:12} files differ between buffered and flushed output")
+        SandboxedFileSystemProvider.clear_user_filesystem('benchmark_file_output')
+
+
+if __name__ == '__main__':
+    main()
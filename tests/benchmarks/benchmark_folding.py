@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Benchmark constant folding in the closure engine.
+
+Runs loops whose expressions are partly or wholly constant (3.14159/180,
+CHR$(27)+"[2J", 2^8-1, ...) on the AST engine and the closure engine with
+and without fold_constants, and reports statements/second.
+
+Usage:
+    python3 tests/benchmarks/benchmark_folding.py [--repeat N]
+"""
+
+import argparse
+
+from bench_common import run_program, best_of
+
+PROGRAMS = {
+    'degrees to radians': ("10 FOR I = 1 TO 3000\n"
+                           "20 R = I * (3.14159 / 180)\n"
+                           "30 NEXT I\n"),
+    'escape sequences': ("10 FOR I = 1 TO 3000\n"
+                         "20 A$ = CHR$(27) + \"[2J\" + CHR$(27) + \"[H\"\n"
+                         "30 NEXT I\n"),
+    'masks': ("10 FOR I = 1 TO 3000\n"
+              "20 M = I AND (2 ^ 8 - 1): H = I \\ (2 ^ 8)\n"
+              "30 NEXT I\n"),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3, help='runs per engine (best time is reported)')
+    args = parser.parse_args()
+
+    print(f"{'program':20} {'stmts':>7} {'ast st/s':>10} {'closure st/s':>13} {'folded st/s':>12}")
+    for name, source in PROGRAMS.items():
+        n_ast, t_ast = best_of(args.repeat, run_program, source, engine='ast')
+        n_closure, t_closure = best_of(args.repeat, run_program, source, engine='closure')
+        n_folded, t_folded = best_of(args.repeat, run_program, source, engine='closure', fold_constants=True)
+        print(f"{name:20} {n_ast:7d} {n_ast / t_ast:10.0f} {n_closure / t_closure:13.0f} "
+              f"{n_folded / t_folded:12.0f}")
+
+
+if __name__ == '__main__':
+    main()
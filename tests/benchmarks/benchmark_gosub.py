@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark control flow (GOSUB/RETURN, NEXT, WEND) and the PC objects it creates.
+
+Runs GOSUB-heavy programs once for timing, then again with the cyclic
+garbage collector disabled and tracemalloc tracing, and reports:
+- st/s: statements/second (best of --repeat untraced runs)
+- PCs/1k: PC objects created per 1000 statements (the tick loop steps
+  through StatementTable.order() and jumps to the table's own PCs, so
+  this should stay near zero)
+- blocks: memory blocks allocated by src/ code that are still alive
+- peak: peak traced memory during the run
+
+Usage:
+    python3 tests/benchmarks/benchmark_gosub.py [--iterations N] [--repeat N]
+"""
+
+import argparse
+import gc
+import os
+import tracemalloc
+
+from bench_common import make_interpreter, run_program, best_of, PROJECT_ROOT
+
+from src.pc import PC
+
+SRC_DIR = os.path.join(PROJECT_ROOT, 'src')
+
+PROGRAMS = {
+    'nested gosub': ("10 FOR I=1 TO {n}\n20 GOSUB 100: GOSUB 200\n30 NEXT I\n40 END\n"
+                     "100 S=S+1: RETURN\n200 IF S>0 THEN GOSUB 300\n210 RETURN\n300 T=T+1: RETURN\n"),
+    'on gosub': ("10 FOR I=1 TO {n}\n20 ON I MOD 3 + 1 GOSUB 100, 200, 300\n30 NEXT I\n40 END\n"
+                 "100 A=A+1: RETURN\n200 B=B+1: RETURN\n300 C=C+1: RETURN\n"),
+    'while/wend': ("10 WHILE I<{n}\n20 I=I+1: GOSUB 100\n30 WEND\n40 END\n"
+                   "100 S=S+I: RETURN\n"),
+}
+
+
+class PCCounter:
+    """Count PC objects created while installed (wraps PC.__init__)."""
+
+    def __init__(self):
+        self.count = 0
+        self._init = PC.__init__
+
+    def __enter__(self):
+        init = self._init
+
+        def counting_init(pc, *args, **kwargs):
+            self.count += 1
+            init(pc, *args, **kwargs)
+        PC.__init__ = counting_init
+        return self
+
+    def __exit__(self, *exc):
+        PC.__init__ = self._init
+
+
+def measure_allocations(source, engine):
+    # Every iteration has to run for the measurement (no loop idiom fast-forwarding)
+    interp = make_interpreter(source, engine=engine, loop_idioms=False)
+    interp.runtime.set_tracking_mode('off')
+    interp.start()
+    gc.collect()
+    gc.disable()
+    tracemalloc.start()
+    try:
+        with PCCounter() as pcs:
+            while interp.runtime.pc.is_running() and not interp.state.error_info:
+                interp.tick(mode='run', max_statements=1000)
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+        gc.enable()
+    src_filter = [tracemalloc.Filter(True, os.path.join(SRC_DIR, '*'))]
+    blocks = sum(stat.count for stat in snapshot.filter_traces(src_filter).statistics('filename'))
+    return interp.state.statements_executed, pcs.count, blocks, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=20000, help='loop iterations per program')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per program (best time is reported)')
+    args = parser.parse_args()
+
+    print(f"{'program':14} {'engine':8} {'stmts':>8} {'st/s':>8} {'PCs/1k':>7} {'blocks':>7} {'peak KiB':>9}")
+    for name, template in PROGRAMS.items():
+        for engine in ('ast', 'closure'):
+            source = template.format(n=args.iterations)
+            n, elapsed = best_of(args.repeat, run_program, source, max_statements=float('inf'),
+                                 engine=engine, loop_idioms=False)
+            n, pcs, blocks, peak = measure_allocations(source, engine)
+            print(f"{name:14} {engine:8} {n:8d} {n / elapsed:8.0f} {pcs * 1000 / n:7.1f} "
+                  f"{blocks:7d} {peak / 1024:9.0f}")
+
+
+if __name__ == '__main__':
+    main()
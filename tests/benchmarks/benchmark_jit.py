@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark the hot-loop JIT (Interpreter(jit=True)).
+
+Runs numeric loops and CPU-bound programs from the basic/ corpus with and
+without the loop JIT and reports statements/second, the share of
+statements executed inside compiled loops, and loops compiled/bailouts.
+
+Usage:
+    python3 tests/benchmarks/benchmark_jit.py [--repeat N] [--tracking MODE] [file.bas ...]
+"""
+
+import argparse
+
+from bench_common import read_program, run_program, best_of
+
+SYNTHETIC = {
+    'numeric loop': "10 FOR I=1 TO 20000\n20 X=X+I*2\n30 NEXT I\n",
+    'goto loop': "10 I=I+1: S=S+I/3: IF I<10000 THEN 10\n",
+    'nested arrays': ('10 DIM A(50,50)\n20 FOR I=0 TO 50: FOR J=0 TO 50\n'
+                      '30 A(I,J)=I*J: S=S+A(I,J)\n40 NEXT J, I\n'),
+    'sieve': ('10 DIM F(8191)\n20 FOR I=2 TO 8191: IF F(I) THEN 60\n'
+              '30 C=C+1: K=I+I\n40 IF K<=8191 THEN F(K)=1: K=K+I: GOTO 40\n60 NEXT I\n'),
+}
+
+CORPUS = [
+    'basic/business/log10k.bas',
+    'basic/utilities/fprime.bas',
+    'basic/games/love.bas',
+    'basic/games/calendar.bas',
+    'basic/games/3dplot.bas',
+]
+
+
+def run_jit(source, tracking, **kwargs):
+    """run_program() with the JIT; also returns the interpreter's JIT statistics."""
+    interpreters = []
+
+    def setup(interp):
+        interp.runtime.set_tracking_mode(tracking)
+        interpreters.append(interp)
+    n, elapsed = run_program(source, setup=setup, jit=True, **kwargs)
+    state = interpreters[0].state
+    return n, elapsed, (state.jit_statements, state.jit_loops_compiled, state.jit_bailouts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3, help='runs per configuration (best time is reported)')
+    parser.add_argument('--tracking', default='off', choices=('off', 'array', 'full'),
+                        help='variable tracking mode (the CLI runs programs with off)')
+    parser.add_argument('files', nargs='*', help='.bas files to benchmark (default: built-in set)')
+    args = parser.parse_args()
+
+    programs = [(path, read_program(path)) for path in args.files] if args.files else \
+        list(SYNTHETIC.items()) + [(path, read_program(path)) for path in CORPUS]
+
+    def tracking(interp):
+        interp.runtime.set_tracking_mode(args.tracking)
+
+    print(f"{'program':30} {'stmts':>8} {'ast st/s':>10} {'jit st/s':>10} {'speedup':>8} "
+          f"{'compiled':>9} {'loops':>6} {'bails':>6}")
+    for name, source in programs:
+        n_ast, t_ast = best_of(args.repeat, run_program, source, setup=tracking)
+        n_jit, t_jit, (in_loops, compiled, bailouts) = best_of(args.repeat, run_jit, source, args.tracking)
+        mismatch = '' if n_ast == n_jit else f'  (statement count differs: {n_jit})'
+        print(f"{name:30} {n_ast:8d} {n_ast / t_ast:10.0f} {n_jit / t_jit:10.0f} "
+              f"{(n_jit / t_jit) / (n_ast / t_ast):7.2f}x {in_loops / max(n_jit, 1):9.0%} "
+              f"{compiled:6d} {bailouts:6d}{mismatch}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Benchmark loop idiom fast-forwarding (delay loops, array fills, accumulations).
+
+Runs each program with and without loop idioms (Interpreter(loop_idioms=...))
+and reports statements/second; the statement count is the same either way,
+since fast-forwarded iterations are still counted.
+
+Usage:
+    python3 tests/benchmarks/benchmark_loop_idioms.py [--repeat N] [--engine ast|closure] [file.bas ...]
+"""
+
+import argparse
+
+from bench_common import read_program, run_program, best_of
+
+SYNTHETIC = {
+    'delay loops': "10 FOR K=1 TO 20: FOR I=1 TO 2000: NEXT I: PRINT K;: NEXT K\n",
+    'array fills': ('10 DIM A(2000), B%(2000), N$(500)\n'
+                    '20 FOR K=1 TO 10: FOR I=0 TO 2000: A(I)=0: NEXT: FOR I=0 TO 2000: B%(I)=K: NEXT\n'
+                    '30 FOR I=0 TO 500: N$(I)="": NEXT I: NEXT K\n'),
+    'accumulations': ('10 FOR K=1 TO 20: S=0: FOR I=1 TO 1000: S=S+I: NEXT I\n'
+                      '20 FOR I=1 TO 1000 STEP 2: T=T-0.5: NEXT I: NEXT K\n'),
+}
+
+CORPUS = [
+    'basic/dev/bas_tests/prime2.bas',
+    'basic/utilities/charfreq.bas',
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3, help='runs per configuration (best time is reported)')
+    parser.add_argument('--engine', default='ast', choices=('ast', 'closure'), help='execution engine')
+    parser.add_argument('files', nargs='*', help='.bas files to benchmark (default: built-in set)')
+    args = parser.parse_args()
+
+    programs = [(path, read_program(path)) for path in args.files] if args.files else \
+        list(SYNTHETIC.items()) + [(path, read_program(path)) for path in CORPUS]
+
+    print(f"{'program':30} {'stmts':>8} {'plain st/s':>11} {'idioms st/s':>12} {'speedup':>8}")
+    for name, source in programs:
+        n_plain, t_plain = best_of(args.repeat, run_program, source, engine=args.engine, loop_idioms=False)
+        n_idioms, t_idioms = best_of(args.repeat, run_program, source, engine=args.engine,
+                                     loop_idioms=True)
+        mismatch = '' if n_plain == n_idioms else f'  (statement count differs: {n_idioms})'
+        print(f"{name:30} {n_plain:8d} {n_plain / t_plain:11.0f} {n_idioms / t_idioms:12.0f} "
+              f"{(n_idioms / t_idioms) / (n_plain / t_plain):7.2f}x{mismatch}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Benchmark WHILE/WEND exits and bare NEXT on programs of different lengths.
+
+A false WHILE condition jumps past the matching WEND, and a bare NEXT needs
+the variable of its FOR. Both are looked up in the tables Runtime.setup()
+builds (Runtime.loop_pairs()); the cost of a search grows with the program,
+so each program is padded with extra (never executed) lines.
+
+Usage:
+    python3 tests/benchmarks/benchmark_loops.py [--repeat N] [--padding N ...]
+"""
+
+import argparse
+
+from bench_common import run_program, best_of
+
+# Inner WHILE exits 2000 times
+NESTED_WHILE = ("10 I = 0\n"
+                "20 WHILE I < 400: I = I + 1: J = 0\n"
+                "30 WHILE J < 3: J = J + 1: K = 0\n"
+                "40 WHILE K < 2: K = K + 1: WEND\n"
+                "50 WEND\n"
+                "60 WEND\n"
+                "70 END\n")
+
+BARE_NEXT = ("10 FOR I = 1 TO 60: FOR J = 1 TO 20\n"
+             "20 S = S + J\n"
+             "30 NEXT: NEXT\n"
+             "40 END\n")
+
+PROGRAMS = {'nested WHILE': NESTED_WHILE, 'bare NEXT': BARE_NEXT}
+
+
+def padded(source, lines):
+    """Append lines that are never executed (after END)."""
+    return source + ''.join(f"{1000 + n} REM PADDING {n}\n" for n in range(lines))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3, help='runs per program (best time is reported)')
+    parser.add_argument('--padding', type=int, nargs='+', default=[0, 500, 2000],
+                        help='extra program lines to add')
+    args = parser.parse_args()
+
+    print(f"{'program':16} {'lines':>6} {'stmts':>7} {'ast st/s':>10} {'closure st/s':>13}")
+    for name, source in PROGRAMS.items():
+        for lines in args.padding:
+            program = padded(source, lines)
+            # The bare NEXT loop is an accumulation idiom; run every iteration
+            n_ast, t_ast = best_of(args.repeat, run_program, program, engine='ast', loop_idioms=False)
+            n_closure, t_closure = best_of(args.repeat, run_program, program, engine='closure',
+                                           loop_idioms=False)
+            print(f"{name:16} {source.count(chr(10)) + lines:6d} {n_ast:7d} "
+                  f"{n_ast / t_ast:10.0f} {n_closure / t_closure:13.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark process CPU time of web sessions parked waiting for the user.
+
+Simulates --sessions web UI sessions without NiceGUI: each runs its
+program on a ProgramWorker from a 10 ms timer (an asyncio task standing
+in for ui.timer), as NiceGUIBackend._execute_tick does. Two programs:
+
+    input   stops at INPUT
+    inkey   loops on INKEY$ until a key is pressed
+
+and two ways of waiting:
+
+    before  the timer keeps firing: at INPUT each tick checks
+            state.input_prompt and returns; an INKEY$ loop is run in
+            time slices back to back
+    after   at INPUT the timer is cancelled until the input is submitted;
+            once the worker reports waiting_for_key, the program gets a
+            slice every KEY_WAIT_INTERVAL until a key is pressed
+
+Reports the process CPU time used while the sessions are parked for
+--seconds, and how long a key takes to reach a parked INKEY$ session.
+
+Usage:
+    python3 tests/benchmarks/benchmark_parked_sessions.py [--sessions N] [--seconds S]
+"""
+
+import argparse
+import asyncio
+import time
+
+from bench_common import make_interpreter
+from src.program_worker import ProgramWorker
+
+PROGRAMS = {
+    'input': '10 INPUT "NAME"; N$\n20 PRINT "HELLO "; N$\n',
+    'inkey': '10 K$ = INKEY$: IF K$ = "" THEN 10\n20 PRINT "KEY "; K$\n',
+}
+
+
+class Session:
+    """A program run from a 10 ms timer task, like one browser session."""
+
+    def __init__(self, program, event_driven):
+        self.interp = make_interpreter(program)
+        self.keys = []
+        self.interp.builtins.key_source = lambda: self.keys.pop(0) if self.keys else ''
+        self.worker = ProgramWorker()
+        self.event_driven = event_driven
+        self.interval = 0.01
+        self.timer = None
+        self.interp.start()
+
+    def start_timer(self):
+        if self.timer is None:
+            self.timer = asyncio.ensure_future(self._timer())
+
+    async def _timer(self):
+        while self.tick():
+            await asyncio.sleep(self.interval)
+        self.timer = None
+
+    def tick(self):
+        """One timer callback; False cancels the timer."""
+        self.worker.drain_output()
+        if self.worker.busy:
+            return True
+        state = self.interp.state
+        if state.input_prompt:
+            return not self.event_driven
+        state = self.worker.result()
+        if state is not None and self.worker.waiting_for_key and self.event_driven and not self.keys:
+            if self.interval != ProgramWorker.KEY_WAIT_INTERVAL:
+                self.interval = ProgramWorker.KEY_WAIT_INTERVAL
+                return True
+        elif state is not None:
+            self.interval = 0.01
+        if state is None or not (state.error_info or state.input_prompt
+                                 or not self.interp.runtime.pc.is_running()):
+            self.worker.start(self.interp)
+            return True
+        return not state.input_prompt or not self.event_driven
+
+    def press_key(self, key):
+        self.keys.append(key)
+        if self.event_driven and self.timer is not None:
+            # Resume at once instead of at the next slow tick (_on_key)
+            self.timer.cancel()
+            self.timer = None
+            self.interval = 0.01
+            self.worker.waiting_for_key = False
+            self.start_timer()
+
+
+async def park(program, event_driven, sessions, seconds):
+    """CPU seconds used while the sessions are parked, and the key latency in ms."""
+    parked = [Session(PROGRAMS[program], event_driven) for _ in range(sessions)]
+    for session in parked:
+        session.start_timer()
+    await asyncio.sleep(2.0)        # Let every program reach its wait
+    cpu = time.process_time()
+    await asyncio.sleep(seconds)
+    cpu = time.process_time() - cpu
+
+    latency = None
+    if program == 'inkey':
+        session = parked[0]
+        start = time.perf_counter()
+        session.press_key('Q')
+        while session.interp.runtime.pc.is_running():
+            await asyncio.sleep(0.001)
+        latency = (time.perf_counter() - start) * 1000
+
+    for session in parked:
+        session.worker.stop()
+        if session.timer is not None:
+            session.timer.cancel()
+        await session.worker.wait()
+    return cpu, latency
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=200, help='parked sessions')
+    parser.add_argument('--seconds', type=float, default=5.0, help='seconds to measure')
+    args = parser.parse_args()
+
+    print(f"{'program':8} {'wait':7} {'cpu s':>6} {'cpu %':>6} {'key ms':>7}")
+    for program in PROGRAMS:
+        for label, event_driven in (('before', False), ('after', True)):
+            cpu, latency = asyncio.run(park(program, event_driven, args.sessions, args.seconds))
+            key_ms = f"{latency:7.1f}" if latency is not None else f"{'-':>7}"
+            print(f"{program:8} {label:7} {cpu:6.2f} {cpu / args.seconds * 100:6.1f} {key_ms}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Benchmark report-style PRINT and PRINT USING output.
+
+Runs programs that print thousands of formatted lines (zones, TAB(),
+numbers, PRINT USING with constant and variable format strings) on both
+engines and reports statements/second and lines/second. To compare with
+an older checkout, run the same script from a git worktree of it.
+
+Usage:
+    python3 tests/benchmarks/benchmark_print.py [--repeat N] [--lines N]
+"""
+
+import argparse
+
+from bench_common import run_program, best_of
+
+PROGRAMS = {
+    'zones and TAB': '10 FOR I=1 TO {n}: PRINT I, I*1.5, "ITEM"; TAB(40); -I/7: NEXT\n',
+    'using constant': '10 FOR I=1 TO {n}: PRINT USING "**$##,###.##-"; -I*3.5: NEXT\n',
+    'using variable': ('10 F$="####.## \\\\   \\\\ $$#,###.##"\n'
+                       '20 FOR I=1 TO {n}: PRINT USING F$; I/3; "ABCDEF"; I*17.25: NEXT\n'),
+    'report': ('10 F$="\\\\        \\\\ ###,###.## ##.#%"\n'
+               '20 FOR I=1 TO {n}: N$="ACCT"+STR$(I): T=T+I*9.95\n'
+               '30 PRINT USING F$; N$; I*9.95; I MOD 100\n'
+               '40 IF I MOD 50 = 0 THEN PRINT "SUBTOTAL", T: PRINT\n'
+               '50 NEXT I\n'),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3, help='runs per configuration (best time is reported)')
+    parser.add_argument('--lines', type=int, default=3000, help='lines printed per program')
+    args = parser.parse_args()
+
+    print(f"{'program':16} {'engine':8} {'stmts':>8} {'st/s':>8} {'lines/s':>8}")
+    for name, template in PROGRAMS.items():
+        source = template.format(n=args.lines)
+        for engine in ('ast', 'closure'):
+            n, elapsed = best_of(args.repeat, run_program, source, max_statements=float('inf'),
+                                 engine=engine, loop_idioms=False)
+            print(f"{name:16} {engine:8} {n:8d} {n / elapsed:8.0f} {args.lines / elapsed:8.0f}")
+
+
+if __name__ == '__main__':
+    main()
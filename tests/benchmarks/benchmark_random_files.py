@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark random-access record I/O (FIELD, LSET/RSET, PUT, GET).
+
+Builds a file of --records 64-byte records with PUT, then reads records
+back with GET in random order and in a "lookup" pattern that keeps
+revisiting a small set of records, with and without the random_file_mmap
+setting. Reports records/second for each phase. To compare with an older
+checkout, run the same script from a git worktree of it.
+
+Usage:
+    python3 tests/benchmarks/benchmark_random_files.py [--repeat N] [--records N]
+"""
+
+import argparse
+import os
+import tempfile
+
+from bench_common import run_program, best_of
+
+FIELDS = '20 FIELD #1, 30 AS N$, 10 AS A$, 24 AS R$\n'
+
+PROGRAMS = {
+    'PUT': ('10 OPEN "R", #1, "{path}"\n' + FIELDS +
+            '30 FOR I=1 TO {n}: LSET N$="CUSTOMER"+STR$(I): RSET A$=STR$(I*3): LSET R$="X": PUT #1, I: NEXT\n'
+            '40 CLOSE #1\n'),
+    'GET random': ('10 OPEN "R", #1, "{path}"\n' + FIELDS +
+                   '30 FOR I=1 TO {n}: GET #1, (I*7919) MOD {n} + 1: T=T+LEN(N$): NEXT\n'
+                   '40 CLOSE #1\n'),
+    'GET lookup': ('10 OPEN "R", #1, "{path}"\n' + FIELDS +
+                   '30 FOR I=1 TO {n}: GET #1, (I*31) MOD 40 + 1: T=T+LEN(N$): NEXT\n'
+                   '40 CLOSE #1\n'),
+}
+
+
+class Settings:
+    """Settings manager stand-in with fixed values."""
+
+    def __init__(self, **values):
+        self.values = values
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3, help='runs per configuration (best time is reported)')
+    parser.add_argument('--records', type=int, default=20000, help='records in the file')
+    args = parser.parse_args()
+
+    print(f"{'phase':12} {'mmap':5} {'records/s':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'db.dat')
+        for use_mmap in (False, True):
+            if os.path.exists(path):
+                os.remove(path)
+            settings = Settings(random_file_mmap=use_mmap)
+            for name, template in PROGRAMS.items():
+                n, elapsed = best_of(args.repeat, run_program, template.format(path=path, n=args.records),
+                                     max_statements=float('inf'), settings_manager=settings)
+                print(f"{name:12} {'on' if use_mmap else 'off':5} {args.records / elapsed:10.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark how web sessions running busy programs share the CPU.
+
+Simulates --sessions browser sessions on one asyncio event loop, each
+running a CPU-heavy BASIC program polled by a 10 ms timer (as the web
+UI's _execute_tick does); --hidden of them are in hidden tabs. Modes:
+
+    pool        slices on a plain 4-thread pool, each started by its
+                session's timer (the web UI before ProgramScheduler)
+    scheduler   ProgramScheduler: round robin, slices requeued without
+                waiting for the timer, hidden tabs deprioritized
+    capped      ProgramScheduler with a 0.5 CPU budget for all programs
+
+Reports the statements per second over all sessions, Jain's fairness
+index of the visible sessions' statements (1.0 = perfectly even), the
+hidden sessions' rate relative to the visible ones, the process CPU use
+and the event loop's p95 wake-up delay.
+
+Usage:
+    python3 tests/benchmarks/benchmark_session_fairness.py [--sessions N] [--hidden N] [--seconds S]
+"""
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bench_common import make_interpreter
+from src.program_scheduler import ProgramScheduler
+from src.program_worker import ProgramWorker
+
+PROGRAM = '10 X = X + SQR(I) * 2: I = I + 1: IF I > 1000 THEN I = 0\n20 GOTO 10\n'
+
+
+class PoolWorker(ProgramWorker):
+    """ProgramWorker starting each slice on a plain thread pool (before)."""
+
+    pool = ThreadPoolExecutor(max_workers=ProgramScheduler.THREADS)
+
+    def start(self, interpreter):
+        self.stop_requested = False
+        self.interpreter = interpreter
+        self.future = self.pool.submit(self.run_slice, interpreter)
+
+
+async def session(interp, worker, stop):
+    """A session's 10 ms timer: start the next slice whenever the last one is handled."""
+    while not stop.is_set():
+        worker.drain_output()
+        if not worker.busy:
+            worker.result()
+            worker.start(interp)
+        await asyncio.sleep(0.01)
+    worker.stop()
+    await worker.wait()
+    worker.result()
+
+
+async def measure(mode, sessions, hidden, seconds):
+    scheduler = ProgramScheduler(max_cpu=0.5 if mode == 'capped' else None)
+    interpreters = [make_interpreter(PROGRAM) for _ in range(sessions)]
+    workers = []
+    for n, interp in enumerate(interpreters):
+        interp.start()
+        worker = PoolWorker(scheduler) if mode == 'pool' else ProgramWorker(scheduler)
+        worker.background = n >= sessions - hidden
+        workers.append(worker)
+    stop = asyncio.Event()
+    tasks = [asyncio.ensure_future(session(interp, worker, stop))
+             for interp, worker in zip(interpreters, workers)]
+
+    delays = []
+    cpu = time.process_time()
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        delays.append(time.perf_counter() - start - 0.01)
+    cpu = time.process_time() - cpu
+    stop.set()
+    await asyncio.gather(*tasks)
+    return [interp.state.statements_executed for interp in interpreters], cpu, delays
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=12, help='simulated browser sessions')
+    parser.add_argument('--hidden', type=int, default=4, help='sessions in hidden tabs')
+    parser.add_argument('--seconds', type=float, default=5.0, help='measuring time per mode')
+    args = parser.parse_args()
+
+    print(f"{args.sessions} sessions ({args.hidden} hidden), {args.seconds:g} s per mode")
+    print(f"{'mode':10} {'stmts/s':>9} {'fairness':>9} {'hidden':>7} {'cpu %':>6} {'p95 ms':>7}")
+    for mode in ('pool', 'scheduler', 'capped'):
+        executed, cpu, delays = asyncio.run(measure(mode, args.sessions, args.hidden, args.seconds))
+        visible = executed[:args.sessions - args.hidden]
+        hidden = executed[args.sessions - args.hidden:]
+        fairness = sum(visible) ** 2 / (len(visible) * sum(n * n for n in visible))
+        hidden_ratio = (sum(hidden) / len(hidden)) / (sum(visible) / len(visible)) if hidden else 0.0
+        p95 = sorted(delays)[int(0.95 * (len(delays) - 1))]
+        print(f"{mode:10} {sum(executed) / args.seconds:9.0f} {fairness:9.3f} {hidden_ratio:7.2f} "
+              f"{cpu / args.seconds * 100:6.1f} {p95 * 1000:7.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark StatementTable navigation cost as program size grows.
+
+For programs of 100 to 20,000 lines this measures:
+- next_pc: average cost of one sequential step through the whole table
+- prev_pc: average cost of one backward step
+- run: interpreter time per executed statement for a straight-line
+  program (one assignment per line)
+- edit: cost of replace_line() in the middle of the program
+
+Per-statement cost should stay flat as the program grows.
+
+Usage:
+    python3 tests/benchmarks/benchmark_statement_table.py [--sizes 100,1000,...]
+"""
+
+import argparse
+import time
+
+from bench_common import run_program
+from src.pc import PC, StatementTable
+from src.lexer import Lexer
+from src.parser import Parser
+
+
+def build_table(lines, stmts_per_line=2):
+    table = StatementTable()
+    for i in range(lines):
+        for s in range(stmts_per_line):
+            table.add(PC((i + 1) * 3, s), None)
+    return table
+
+
+def time_walk(table, step, start):
+    """Walk the whole table with step(); return (steps, seconds)."""
+    steps = 0
+    begin = time.perf_counter()
+    pc = start
+    while pc is not None and pc.is_running():
+        pc = step(pc)
+        steps += 1
+    return steps, time.perf_counter() - begin
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='100,1000,5000,20000', help='comma-separated line counts')
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(',')]
+
+    print(f"{'lines':>7} {'next_pc ns':>11} {'prev_pc ns':>11} {'run us/stmt':>12} {'edit us':>9}")
+    for lines in sizes:
+        table = build_table(lines)
+        steps, elapsed = time_walk(table, table.next_pc, table.first_pc())
+        next_ns = elapsed / steps * 1e9
+
+        last = PC(lines * 3, 1)
+        steps, elapsed = time_walk(table, table.prev_pc, last)
+        prev_ns = elapsed / steps * 1e9
+
+        source = "".join(f"{(i + 1) * 3} X=X+1\n" for i in range(lines))
+        executed, elapsed = run_program(source, quantum=10000)
+        run_us = elapsed / executed * 1e6
+
+        replacement = Parser(Lexer(f"{(lines // 2) * 3} X=X+2: Y=1\n").tokenize()).parse().lines[0]
+        begin = time.perf_counter()
+        for _ in range(100):
+            table.replace_line((lines // 2) * 3, replacement)
+        edit_us = (time.perf_counter() - begin) / 100 * 1e6
+
+        print(f"{lines:7d} {next_ns:11.0f} {prev_ns:11.0f} {run_us:12.1f} {edit_us:9.1f}")
+
+
+if __name__ == '__main__':
+    main()
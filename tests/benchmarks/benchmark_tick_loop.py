@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark the tick() fast path against the full debug loop.
+
+In-process mode runs each program twice with the AST engine: once normally
+(fast path) and once with a breakpoint on a line that does not exist, which
+forces the per-statement debug loop without ever stopping.
+
+With --cli, the programs are instead run end-to-end the way users run them,
+    printf 'RUN\\nSYSTEM\\n' | mbasic --ui cli program.bas
+and wall time is reported. Pass --baseline /path/to/other/mbasic to time a
+second checkout (e.g. a git worktree of an older commit) side by side.
+
+Usage:
+    python3 tests/benchmarks/benchmark_tick_loop.py [--repeat N] [file.bas ...]
+    python3 tests/benchmarks/benchmark_tick_loop.py --cli [--baseline PATH] [file.bas ...]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from bench_common import PROJECT_ROOT, read_program, run_program, best_of
+from benchmark_engine import SYNTHETIC, CORPUS
+
+from src.pc import PC
+
+# Line number that no program uses; a breakpoint here never triggers
+UNUSED_LINE = 65529
+
+
+def add_inert_breakpoint(interp):
+    """Force tick() onto the debug loop without ever stopping."""
+    interp.runtime.breakpoints.add(PC(UNUSED_LINE, 0))
+
+
+def run_cli(mbasic, path):
+    """Run path through the CLI UI and return (None, elapsed_seconds)."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, mbasic, '--ui', 'cli', os.path.join(PROJECT_ROOT, path)],
+                   input='RUN\nSYSTEM\n', capture_output=True, text=True, timeout=600)
+    return None, time.perf_counter() - start
+
+
+def benchmark_in_process(programs, repeat):
+    print(f"{'program':34} {'stmts':>8} {'debug st/s':>11} {'fast st/s':>10} {'speedup':>8}")
+    for name, source in programs:
+        n_debug, t_debug = best_of(repeat, run_program, source, setup=add_inert_breakpoint)
+        n_fast, t_fast = best_of(repeat, run_program, source)
+        mismatch = '' if n_debug == n_fast else f'  (statement count differs: {n_fast})'
+        print(f"{name:34} {n_fast:8d} {n_debug / t_debug:11.0f} {n_fast / t_fast:10.0f} "
+              f"{t_debug / t_fast:7.2f}x{mismatch}")
+
+
+def benchmark_cli(paths, repeat, baseline):
+    mbasic = os.path.join(PROJECT_ROOT, 'mbasic')
+    header = f"{'program':34} {'this tree (s)':>14}"
+    if baseline:
+        header += f" {'baseline (s)':>13} {'speedup':>8}"
+    print(header)
+    total = total_baseline = 0.0
+    for path in paths:
+        _, elapsed = best_of(repeat, run_cli, mbasic, path)
+        total += elapsed
+        line = f"{path:34} {elapsed:14.2f}"
+        if baseline:
+            _, elapsed_baseline = best_of(repeat, run_cli, baseline, path)
+            total_baseline += elapsed_baseline
+            line += f" {elapsed_baseline:13.2f} {elapsed_baseline / elapsed:7.2f}x"
+        print(line)
+    line = f"{'total':34} {total:14.2f}"
+    if baseline:
+        line += f" {total_baseline:13.2f} {total_baseline / total:7.2f}x"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3, help='runs per variant (best time is reported)')
+    parser.add_argument('--cli', action='store_true', help='time whole `mbasic --ui cli` runs')
+    parser.add_argument('--baseline', help='another mbasic script to compare against (with --cli)')
+    parser.add_argument('files', nargs='*', help='.bas files to benchmark (default: built-in set)')
+    args = parser.parse_args()
+
+    if args.cli:
+        benchmark_cli(args.files or CORPUS, args.repeat, args.baseline)
+        return
+
+    programs = [(path, read_program(path)) for path in args.files] if args.files else \
+        list(SYNTHETIC.items()) + [(path, read_program(path)) for path in CORPUS]
+    benchmark_in_process(programs, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark variable access tracking modes (Runtime.set_tracking_mode()).
+
+Runs an array-heavy program under each mode and reports how many per-element
+entries _array_element_tracking ends up holding, their deep size, the
+tracemalloc peak of the whole run and statements/second.
+
+Usage:
+    python3 tests/benchmarks/benchmark_tracking.py [--repeat N] [--size N]
+"""
+
+import argparse
+import sys
+import tracemalloc
+
+from bench_common import run_program, best_of
+
+from src.runtime import Runtime
+
+
+def array_program(size):
+    """Fill a size x size array, then read every element back."""
+    return (f"10 DIM A({size},{size})\n"
+            f"20 FOR I=0 TO {size}: FOR J=0 TO {size}: A(I,J)=I*J: NEXT J: NEXT I\n"
+            f"30 FOR I=0 TO {size}: FOR J=0 TO {size}: S=S+A(I,J): NEXT J: NEXT I\n"
+            "40 PRINT S\n")
+
+
+def deep_sizeof(obj, seen=None):
+    """sys.getsizeof() of obj plus everything reachable through dicts/lists/tuples."""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    return size
+
+
+def measure_memory(source, mode, engine):
+    """Run once under tracemalloc; return (tracked elements, their deep size, peak bytes)."""
+    interpreters = []
+
+    def setup(interp):
+        interp.runtime.set_tracking_mode(mode)
+        interpreters.append(interp)
+
+    tracemalloc.start()
+    run_program(source, setup=setup, engine=engine)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    tracking = interpreters[0].runtime._array_element_tracking
+    return len(tracking), deep_sizeof(tracking), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per mode (best time is reported)')
+    parser.add_argument('--size', type=int, default=100, help='array is DIM A(size,size)')
+    args = parser.parse_args()
+
+    source = array_program(args.size)
+    print(f"DIM A({args.size},{args.size}): write then read every element")
+    print(f"{'engine':8} {'mode':6} {'elements':>9} {'tracking (KiB)':>15} {'peak (KiB)':>11} {'st/s':>8}")
+    for engine in ('ast', 'closure'):
+        run_program(source, engine=engine)  # warm up (lazy imports would count towards the first peak)
+        for mode in Runtime.TRACKING_MODES:
+            elements, tracking_size, peak = measure_memory(source, mode, engine)
+            setup = lambda interp: interp.runtime.set_tracking_mode(mode)
+            n, elapsed = best_of(args.repeat, run_program, source, setup=setup, engine=engine)
+            print(f"{engine:8} {mode:6} {elements:9d} {tracking_size / 1024:15.0f} "
+                  f"{peak / 1024:11.0f} {n / elapsed:8.0f}")
+
+
+if __name__ == '__main__':
+    main()
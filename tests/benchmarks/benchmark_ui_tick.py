@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark wall-clock runtime of a compute-bound program under each UI's run loop.
+
+The UIs run programs from timer callbacks on their event loop. This
+simulates those loops without Tk, urwid or NiceGUI (an idle event loop
+is a sleep until the next callback) and compares the fixed quanta they
+used with AdaptiveQuantum (src/tick_quantum.py):
+
+    tk, curses  before: 100 statements per callback, next callback in 10 ms
+                after:  AdaptiveQuantum.run(), next callback in GAP_MS
+    web         before: 1000 statements per 10 ms timer callback
+                after:  ProgramWorker time slices, polled every 10 ms
+
+Reports the wall time, the statements per second and the longest
+callback (how long the event loop was held).
+
+Usage:
+    python3 tests/benchmarks/benchmark_ui_tick.py [--iterations N]
+"""
+
+import argparse
+import asyncio
+import time
+
+from bench_common import make_interpreter
+from src.tick_quantum import AdaptiveQuantum
+from src.program_worker import ProgramWorker
+
+PROGRAM = '10 FOR I=1 TO {n}: X=X+I: Y=SQR(X): NEXT\n20 PRINT X\n'
+
+
+def fixed_loop(interp, statements, gap_ms):
+    """Fixed quantum per callback (the UIs before AdaptiveQuantum); returns the longest callback."""
+    longest = 0.0
+    while interp.runtime.pc.is_running():
+        start = time.perf_counter()
+        interp.tick(mode='run', max_statements=statements)
+        longest = max(longest, time.perf_counter() - start)
+        time.sleep(gap_ms / 1000)
+    return longest
+
+
+def adaptive_loop(interp, statements, gap_ms):
+    """AdaptiveQuantum.run() per callback (Tk and curses); returns the longest callback."""
+    quantum = AdaptiveQuantum(statements=statements)
+    longest = 0.0
+    while interp.runtime.pc.is_running():
+        start = time.perf_counter()
+        quantum.run(interp)
+        longest = max(longest, time.perf_counter() - start)
+        time.sleep(gap_ms / 1000)
+    return longest
+
+
+def worker_loop(interp, statements, gap_ms):
+    """ProgramWorker polled by a 10 ms timer (web UI); returns the longest poll."""
+    async def poll():
+        worker = ProgramWorker()
+        longest = 0.0
+        while interp.runtime.pc.is_running():
+            start = time.perf_counter()
+            if not worker.busy:
+                worker.result()
+                worker.start(interp)
+            longest = max(longest, time.perf_counter() - start)
+            await asyncio.sleep(gap_ms / 1000)
+        await worker.wait()
+        worker.result()
+        return longest
+    return asyncio.run(poll())
+
+
+MODES = [
+    ('tk/curses', 'before', fixed_loop, 100, 10),
+    ('tk/curses', 'after', adaptive_loop, 100, AdaptiveQuantum.GAP_MS),
+    ('web', 'before', fixed_loop, 1000, 10),
+    ('web', 'after', worker_loop, ProgramWorker.QUANTUM_STATEMENTS, 10),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=10000, help='FOR loop iterations of the program')
+    args = parser.parse_args()
+
+    print(f"{'ui':10} {'loop':7} {'wall s':>7} {'stmts/s':>9} {'longest ms':>11}")
+    for ui, label, loop, statements, gap_ms in MODES:
+        interp = make_interpreter(PROGRAM.format(n=args.iterations))
+        interp.start()
+        start = time.perf_counter()
+        longest = loop(interp, statements, gap_ms)
+        elapsed = time.perf_counter() - start
+        print(f"{ui:10} {label:7} {elapsed:7.2f} {interp.state.statements_executed / elapsed:9.0f} "
+              f"{longest * 1000:11.1f}")
+
+
+if __name__ == '__main__':
+    main()
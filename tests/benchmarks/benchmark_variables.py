@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark scalar variable access.
+
+Two parts:
+- Per-access cost of Runtime.get_variable()/set_variable() (name lookup on
+  every call) versus get_variable_node()/set_variable_node() (slot bound once
+  per VariableNode).
+- Statements/second for variable-heavy BASIC loops on both engines
+  ('mixed spellings' uses TOTAL/Total/total, so every access changes the
+  spelling and goes through case-conflict resolution).
+
+Usage:
+    python3 tests/benchmarks/benchmark_variables.py [--repeat N] [--calls N]
+"""
+
+import argparse
+import time
+
+from bench_common import run_program, best_of
+
+from src.lexer import Lexer
+from src.parser import Parser
+from src.runtime import Runtime
+
+PROGRAMS = {
+    'scalar arithmetic': ('10 A=1: B=2: C=3\n'
+                          '20 FOR I=1 TO 5000\n'
+                          '30 D=A+B*C-D/2: E=D+A: A=B: B=C: C=E-D\n'
+                          '40 NEXT I\n'),
+    'many names': ('10 DEFINT I-N\n'
+                   '20 FOR I=1 TO 3000\n'
+                   '30 J=I: K=J+1: L=K+J: M=L-K: N=M*2\n'
+                   '40 X1=X1+N: X2=X2+X1: X3=X3+X2: X4=X4+X3: X5=X5+X4\n'
+                   '50 NEXT I\n'),
+    'string scalars': ('10 FOR I=1 TO 4000\n'
+                       '20 A$="AB": B$=A$+"C": C$=B$: IF C$<>"ABC" THEN PRINT "BAD"\n'
+                       '30 NEXT I\n'),
+    'mixed spellings': ('10 Total=0\n'
+                        '20 FOR I=1 TO 4000\n'
+                        '30 TOTAL=total+I: Total=TOTAL-1\n'
+                        '40 NEXT I\n'),
+}
+
+
+class Location:
+    """Token stand-in for the name-based API."""
+
+    def __init__(self, line, position):
+        self.line = line
+        self.position = position
+
+
+def time_calls(calls, func):
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+def benchmark_access(calls):
+    """Print ns per read/write through the name API and the slot API."""
+    line = Parser(Lexer("10 TOTAL = TOTAL + 1\n").tokenize()).parse().lines[0]
+    runtime = Runtime({10: line})
+    runtime.setup()
+    stmt = line.statements[0]
+    node = stmt.variable
+    token = Location(node.line_num, node.column)
+
+    by_name_get = lambda: runtime.get_variable(node.name, node.type_suffix, token=token,
+                                               original_case=node.original_case)
+    by_name_set = lambda: runtime.set_variable(node.name, node.type_suffix, 1.0, token=token,
+                                               original_case=node.original_case)
+    by_slot_get = lambda: runtime.get_variable_node(node)
+    by_slot_set = lambda: runtime.set_variable_node(node, 1.0)
+
+    print(f"{'access':12} {'by name (ns)':>13} {'by slot (ns)':>13} {'speedup':>8}")
+    for label, by_name, by_slot in (('read', by_name_get, by_slot_get), ('write', by_name_set, by_slot_set)):
+        t_name = min(time_calls(calls, by_name) for _ in range(3))
+        t_slot = min(time_calls(calls, by_slot) for _ in range(3))
+        print(f"{label:12} {t_name:13.0f} {t_slot:13.0f} {t_name / t_slot:7.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3, help='runs per engine (best time is reported)')
+    parser.add_argument('--calls', type=int, default=200000, help='calls per access timing')
+    args = parser.parse_args()
+
+    benchmark_access(args.calls)
+    print()
+    print(f"{'program':34} {'stmts':>8} {'ast st/s':>10} {'closure st/s':>13}")
+    for name, source in PROGRAMS.items():
+        n_ast, t_ast = best_of(args.repeat, run_program, source, engine='ast')
+        n_closure, t_closure = best_of(args.repeat, run_program, source, engine='closure')
+        print(f"{name:34} {n_ast:8d} {n_ast / t_ast:10.0f} {n_closure / t_closure:13.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark the web output pane with a program printing --lines lines.
+
+Replays the program's output through the web UI's output batching (a
+flush every 50 output calls) and compares the two ways of updating the
+output pane, without NiceGUI:
+
+    before  append to one output string, split it into lines to keep the
+            last 1000, send the whole text plus the auto-scroll script
+    after   OutputRingBuffer (src/output_buffer.py) on the server, only
+            the new text sent (append_script())
+
+Reports the server CPU time spent in the flushes and the payload bytes
+sent to the browser (JSON-encoded text and scripts; the websocket
+framing adds a little to both).
+
+Usage:
+    python3 tests/benchmarks/benchmark_web_output.py [--lines N]
+"""
+
+import argparse
+import json
+import time
+
+from bench_common import make_interpreter
+from src.output_buffer import OutputRingBuffer, append_script
+
+MAX_LINES = 1000
+BATCH = 50                  # Output calls per flush (NiceGUIBackend._append_output)
+SCROLL_SCRIPT_BYTES = 1331  # Auto-scroll script sent with every flush before
+
+
+class WholeTextPane:
+    """Output pane updated with its whole text (before)."""
+
+    def __init__(self):
+        self.output_text = ''
+        self.bytes_sent = 0
+
+    def flush(self, batch_text):
+        self.output_text += batch_text
+        lines = self.output_text.split('\n')
+        if len(lines) > MAX_LINES:
+            lines = lines[-MAX_LINES:]
+            self.output_text = '\n'.join(lines)
+            if not self.output_text.startswith('[... output truncated'):
+                self.output_text = '[... output truncated ...]\n' + self.output_text
+        self.bytes_sent += len(json.dumps(self.output_text)) + SCROLL_SCRIPT_BYTES
+
+
+class DeltaPane:
+    """Output pane updated with the new text only (after)."""
+
+    def __init__(self):
+        self.buffer = OutputRingBuffer(MAX_LINES)
+        self.bytes_sent = 0
+
+    def flush(self, batch_text):
+        self.buffer.append(batch_text)
+        self.bytes_sent += len(append_script('c7', batch_text, MAX_LINES))
+
+
+class BatchingIO:
+    """IO handler batching output like NiceGUIBackend._append_output."""
+
+    def __init__(self, pane):
+        self.pane = pane
+        self.batch = []
+        self.cpu = 0.0
+
+    def output(self, text, end='\n'):
+        self.batch.append(str(text) + end)
+        if len(self.batch) >= BATCH:
+            self.flush()
+
+    def flush(self):
+        start = time.process_time()
+        self.pane.flush(''.join(self.batch))
+        self.cpu += time.process_time() - start
+        self.batch.clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--lines', type=int, default=100000, help='lines printed by the program')
+    args = parser.parse_args()
+
+    program = f'10 FOR I=1 TO {args.lines}: PRINT "LINE"; I; "OF OUTPUT"; I * 3: NEXT\n'
+    print(f"{'pane':7} {'flush cpu s':>11} {'bytes sent':>12} {'bytes/line':>10}")
+    for name, pane in (('before', WholeTextPane()), ('after', DeltaPane())):
+        io = BatchingIO(pane)
+        interp = make_interpreter(program)
+        interp.io = io
+        interp.start()
+        while interp.runtime.pc.is_running():
+            interp.tick(mode='run', max_statements=100000)
+        io.flush()
+        print(f"{name:7} {io.cpu:11.3f} {pane.bytes_sent:12d} {pane.bytes_sent / args.lines:10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Load test: UI event loop latency with many web sessions running programs.
+
+Simulates --sessions browser sessions on one asyncio event loop (as the
+NiceGUI web UI serves them), each running a CPU-heavy BASIC program,
+while a probe task measures how late the loop wakes it up every 10 ms -
+the delay every session sees for clicks, typing and output updates.
+
+    inline  programs tick on the event loop from a 10 ms timer (the web
+            UI before programs moved to ProgramWorker)
+    worker  programs run on ProgramWorker (ProgramScheduler threads);
+            the 10 ms timer only polls them (the web UI's _execute_tick)
+
+Reports probe latency percentiles and the statements executed per second
+over all sessions. NiceGUI is not needed.
+
+Usage:
+    python3 tests/benchmarks/benchmark_web_sessions.py [--sessions N] [--seconds S]
+"""
+
+import argparse
+import asyncio
+import time
+
+from bench_common import make_interpreter
+from src.program_scheduler import ProgramScheduler
+from src.program_worker import ProgramWorker
+
+PROGRAM = '10 X = X + SQR(I) * 2: I = I + 1: IF I > 1000 THEN I = 0\n20 GOTO 10\n'
+
+
+async def inline_session(interp, stop):
+    """A session ticking its program on the event loop every 10 ms."""
+    while not stop.is_set():
+        interp.tick(mode='run', max_statements=1000)
+        await asyncio.sleep(0.01)
+
+
+async def worker_session(interp, stop):
+    """A session polling its program's ProgramWorker every 10 ms."""
+    worker = ProgramWorker()
+    while not stop.is_set():
+        if not worker.busy:
+            worker.result()
+            worker.start(interp)
+        await asyncio.sleep(0.01)
+    worker.stop()
+    await worker.wait()
+
+
+async def measure(mode, sessions, seconds):
+    """Run the sessions for seconds; return (probe delays in seconds, statements executed)."""
+    interpreters = [make_interpreter(PROGRAM) for _ in range(sessions)]
+    for interp in interpreters:
+        interp.start()
+    stop = asyncio.Event()
+    session = inline_session if mode == 'inline' else worker_session
+    tasks = [asyncio.ensure_future(session(interp, stop)) for interp in interpreters]
+
+    delays = []
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        delays.append(time.perf_counter() - start - 0.01)
+    stop.set()
+    await asyncio.gather(*tasks)
+    return delays, sum(interp.state.statements_executed for interp in interpreters)
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=50, help='simulated browser sessions')
+    parser.add_argument('--seconds', type=float, default=5.0, help='measuring time per mode')
+    args = parser.parse_args()
+
+    print(f"{args.sessions} sessions, {args.seconds:g} s per mode, "
+          f"{ProgramScheduler.THREADS} worker threads")
+    print(f"{'mode':7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'stmts/s':>10}")
+    for mode in ('inline', 'worker'):
+        delays, statements = asyncio.run(measure(mode, args.sessions, args.seconds))
+        print(f"{mode:7} {percentile(delays, 0.5) * 1000:8.1f} {percentile(delays, 0.95) * 1000:8.1f} "
+              f"{percentile(delays, 0.99) * 1000:8.1f} {max(delays) * 1000:8.1f} "
+              f"{statements / args.seconds:10.0f}")
+
+
+if __name__ == '__main__':
+    main()
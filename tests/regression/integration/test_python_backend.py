@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Test the Python source backend (mbasic --compile-py).
+
+Tests:
+- Compiled scripts print the same output as the interpreter
+- Runtime errors are reported with the interpreter's code, line and message
+- INPUT reads standard input with the interpreter's prompts
+- Statements the backend does not support are reported, not miscompiled
+- The mbasic --compile-py command writes a runnable script
+"""
+
+import sys
+import os
+import copy
+import subprocess
+import tempfile
+
+# Add project root to path (3 levels up from tests/regression/integration/)
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.semantic_analyzer import SemanticAnalyzer
+from src.codegen_py_backend import PythonBackend
+from tests.regression.regression_common import parse, run_program
+
+
+def compile_program(code):
+    ast = parse(code)
+    analyzer = SemanticAnalyzer()
+    analyzer.analyze(copy.deepcopy(ast))
+    backend = PythonBackend(analyzer.symbols)
+    return backend.generate(ast), backend
+
+
+def run_compiled(code, stdin=''):
+    script, backend = compile_program(code)
+    assert not backend.errors, f"Unexpected compile errors: {backend.errors}"
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'program.py')
+        with open(path, 'w') as f:
+            f.write(script)
+        result = subprocess.run([sys.executable, path], input=stdin, capture_output=True,
+                                text=True, timeout=60)
+    return result.stdout
+
+
+def run_interpreted(code):
+    return run_program(code)[2].text
+
+
+PROGRAMS = {
+    'print formatting': ('10 A=1/3: B%=7: C#=-2.5: D$="X"\n'
+                         '20 PRINT A;B%;C#;D$, "ZONE"; TAB(30); "T"; SPC(2); 1E+20\n'
+                         '30 PRINT "A";: PRINT "B": PRINT 7 \\ 2; 7 MOD 3; 2^10; NOT 0; 5 AND 3; 5 OR 8; -1 EQV 0\n'
+                         '40 PRINT USING "##.## ##.##"; 3.14159; 2\n'),
+    'loops and subroutines': ('10 FOR I=1 TO 3: FOR J=I TO 1 STEP -1: S=S+I*J: NEXT J, I\n'
+                              '20 FOR K=1 TO 10 STEP 4: GOSUB 100: NEXT\n'
+                              '30 W=0: WHILE W<3: W=W+1: T=T+W: WEND\n'
+                              '40 ON 2 GOSUB 110, 120: PRINT S; T; K\n'
+                              '50 END\n'
+                              '100 S=S+K: RETURN\n'
+                              '110 PRINT "ONE": RETURN\n'
+                              '120 PRINT "TWO": RETURN\n'),
+    'arrays and strings': ('10 OPTION BASE 1: DIM A(3,4), N$(5)\n'
+                           '20 FOR I=1 TO 3: FOR J=1 TO 4: A(I,J)=I*10+J: NEXT J, I\n'
+                           '30 N$(2)="HELLO": MID$(N$(2),2,3)="ipp": PRINT N$(2); A(2,3); A(3,4)\n'
+                           '40 X$=STRING$(3,"*")+LEFT$("ABCDEF",2)+STR$(42): PRINT X$; LEN(X$)\n'
+                           '50 SWAP A(1,1), A(3,4): PRINT A(1,1); A(3,4)\n'
+                           '60 B%(3)=32767: PRINT B%(3); INSTR("HELLO","L"); ASC("A"); VAL("12.5")\n'),
+    'functions and data': ('10 DEF FNA(X)=X*X+1: DEF FNB(X,Y)=FNA(X)+Y\n'
+                           '20 DEF FNS$(A$)=A$+A$\n'
+                           '30 X=100: PRINT FNA(3); FNB(2,5); FNS$("AB"); X\n'
+                           '40 READ A, B$, C%: PRINT A; B$; C%\n'
+                           '50 RESTORE 80: READ D: PRINT D\n'
+                           '60 IF A>1 AND B$="TWO" THEN PRINT "YES" ELSE PRINT "NO"\n'
+                           '70 DATA 1.5, TWO, 3.7\n'
+                           '80 DATA 99\n'),
+}
+
+
+def test_same_output():
+    for name, code in PROGRAMS.items():
+        expected = run_interpreted(code)
+        actual = run_compiled(code)
+        assert actual == expected, f"{name}: compiled output differs\n{actual!r}\n!=\n{expected!r}"
+    print("✓ Compiled programs print the same output as the interpreter")
+
+
+def test_runtime_errors():
+    cases = [
+        ('10 PRINT "A"\n20 X=0\n30 PRINT 1/X\n', 'A\n?11 Error in 30: Division by zero\n'),
+        ('10 DIM A(5)\n20 A(6)=1\n', '?9 Error in 20: Array subscript out of range: a![6]\n'),
+        ('10 RETURN\n', '?3 Error in 10: RETURN without GOSUB\n'),
+        ('10 NEXT I\n', '?1 Error in 10: NEXT without FOR: i!\n'),
+        ('10 READ A\n', '?4 Error in 10: Out of DATA\n'),
+        ('10 GOTO 50\n', '?8 Error in 10: Undefined line 50\n'),
+        ('10 A%(1)=40000\n', '?6 Error in 10: Overflow\n'),
+        ('10 STOP\n20 PRINT "NO"\n', 'Break in 10\n'),
+    ]
+    for code, expected in cases:
+        actual = run_compiled(code)
+        assert actual == expected, f"{code!r}: got {actual!r}, expected {expected!r}"
+    print("✓ Runtime errors report the interpreter's code, line and message")
+
+
+def test_input():
+    code = ('10 INPUT "NAME"; N$\n'
+            '20 INPUT A, B\n'
+            '30 LINE INPUT "LINE: "; L$\n'
+            '40 PRINT N$; A+B; L$\n')
+    actual = run_compiled(code, 'BOB\n1, 2\nsome, text\n')
+    assert actual == 'NAME? ? LINE: BOB 3 some, text\n', f"Unexpected INPUT output {actual!r}"
+    print("✓ INPUT and LINE INPUT read standard input")
+
+
+def test_unsupported():
+    script, backend = compile_program('10 OPEN "O", #1, "X.TXT"\n20 ON ERROR GOTO 100\n100 END\n')
+    assert script == '', "Script generated despite unsupported statements"
+    assert any('OPEN' in e and '10' in e for e in backend.errors), f"Errors: {backend.errors}"
+    assert any('ON ERROR' in e for e in backend.errors), f"Errors: {backend.errors}"
+    print("✓ Unsupported statements are reported")
+
+
+def test_command_line():
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'hello.bas')
+        output = os.path.join(tmp, 'hello.py')
+        with open(source, 'w') as f:
+            f.write('10 FOR I=1 TO 3: PRINT "HELLO"; I: NEXT I\n')
+        result = subprocess.run([sys.executable, os.path.join(PROJECT_ROOT, 'mbasic'),
+                                 '--compile-py', output, source], capture_output=True, text=True, timeout=60)
+        assert result.returncode == 0, f"mbasic --compile-py failed: {result.stderr}"
+        run = subprocess.run([sys.executable, output], capture_output=True, text=True, timeout=60)
+        assert run.stdout == 'HELLO 1 \nHELLO 2 \nHELLO 3 \n', f"Unexpected output {run.stdout!r}"
+    print("✓ mbasic --compile-py writes a runnable script")
+
+
+if __name__ == "__main__":
+    try:
+        test_same_output()
+        test_runtime_errors()
+        test_input()
+        test_unsupported()
+        test_command_line()
+        print("\n✅ All tests passed")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
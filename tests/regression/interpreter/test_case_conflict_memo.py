@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test memoized variable case-conflict resolution.
+
+Tests:
+- first_wins keeps the first spelling, however often other spellings are used
+- The case_conflict setting is read once per RUN, not per access
+- prefer_upper updates the display case when a better spelling appears
+- error policy still reports the conflicting spellings
+"""
+
+import sys
+import os
+
+# Add project root to path (3 levels up from tests/regression/interpreter/)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from tests.regression.regression_common import line_table, make_interpreter, run_to_end
+
+
+class CountingSettings:
+    """Settings manager stub counting case_conflict lookups."""
+
+    def __init__(self, policy):
+        self.policy = policy
+        self.reads = 0
+
+    def get(self, key, default=None):
+        if key == "case_conflict":
+            self.reads += 1
+            return self.policy
+        return default
+
+
+def display_case(runtime, name):
+    return {v['name'] + v['type_suffix']: v for v in runtime.get_all_variables()}[name]['original_case']
+
+
+MIXED = ("10 Count = 0\n"
+         "20 FOR I = 1 TO 50: COUNT = count + 1: Count = Count + COUNT: NEXT I\n"
+         "30 PRINT Count\n")
+
+
+def test_first_wins():
+    for engine in ('ast', 'closure'):
+        settings = CountingSettings("first_wins")
+        interp, runtime, io = make_interpreter(MIXED, settings_manager=settings, engine=engine)
+        interp.run()
+        assert display_case(runtime, 'count!') == 'Count', \
+            f"{engine}: display case {display_case(runtime, 'count!')}"
+        assert [case for case, _, _ in runtime._variable_case_variants['count']] == ['Count', 'count', 'COUNT'], \
+            f"{engine}: variants {runtime._variable_case_variants['count']}"
+        assert settings.reads == 1, f"{engine}: case_conflict read {settings.reads} times"
+    print("✓ first_wins keeps the first spelling; policy read once")
+
+
+def test_policy_per_run():
+    settings = CountingSettings("first_wins")
+    interp, runtime, io = make_interpreter(MIXED, settings_manager=settings, start=True)
+    interp.tick(max_statements=5)
+    settings.policy = "error"        # changed mid-run: applies from the next RUN
+    run_to_end(interp)
+    assert runtime.pc.stop_reason != "ERROR", f"Policy change applied mid-run: {runtime.pc.error}"
+
+    # RUN again
+    runtime.reset_for_run(line_table(MIXED))
+    interp.start()
+    while runtime.pc.is_running():
+        try:
+            interp.tick(max_statements=1000)
+        except RuntimeError:
+            break
+    assert runtime.pc.stop_reason == "ERROR", "New policy not applied on the next RUN"
+    print("✓ case_conflict setting is read once per RUN")
+
+
+def test_prefer_upper_and_error():
+    code = ("10 tot = 1\n"
+            "20 Tot = tot + 1\n"
+            "30 TOT = Tot + 1\n"
+            "40 tot = tot + 1\n")
+    interp, runtime, io = make_interpreter(code, settings_manager=CountingSettings("prefer_upper"), start=True)
+    interp.tick(max_statements=2)
+    assert display_case(runtime, 'tot!') == 'Tot', f"Display case {display_case(runtime, 'tot!')}"
+    run_to_end(interp)
+    assert display_case(runtime, 'tot!') == 'TOT', f"Display case {display_case(runtime, 'tot!')}"
+
+    for engine in ('ast', 'closure'):
+        interp, runtime, io = make_interpreter(code, settings_manager=CountingSettings("error"),
+                                               engine=engine, start=True)
+        while runtime.pc.is_running():
+            try:
+                interp.tick(max_statements=1000)
+            except RuntimeError:
+                break
+        error = str(runtime.pc.error)
+        assert "'tot'" in error and "'Tot'" in error, f"{engine}: unexpected error {error!r}"
+    print("✓ prefer_upper follows new spellings; error policy reports conflicts")
+
+
+if __name__ == "__main__":
+    try:
+        test_first_wins()
+        test_policy_per_run()
+        test_prefer_upper_and_error()
+        print("\n✅ All tests passed")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Test the closure-compiled execution engine (Interpreter(engine='closure')).
+
+Tests:
+- Each program produces the same output with engine='ast' and engine='closure'
+- Runtime errors (division by zero, string too long) and ON ERROR handling match
+- Edited statements are recompiled instead of running stale closures
+- Unknown engine names are rejected
+"""
+
+import sys
+import os
+
+# Add project root to path (3 levels up from tests/regression/interpreter/)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from src.runtime import Runtime
+from src.interpreter import Interpreter
+from src.resource_limits import create_unlimited_limits
+from tests.regression.regression_common import CaptureIO, make_interpreter, parse, run_to_end
+
+
+PROGRAMS = {
+    'arithmetic': """
+10 A = 7: B% = 3: C# = 2.5
+20 PRINT A + B%, A - B%, A * C#, A / 2, A \\ 2, A MOD 3, 2 ^ 10
+30 PRINT -A; NOT 0; 5 AND 3; 5 OR 3; 5 XOR 3; 5 EQV 3; 5 IMP 3
+40 PRINT A = 7; A <> 7; A < 8; A > 8; A <= 7; A >= 8
+50 B% = 7.9: PRINT B%
+""",
+    'strings': """
+10 A$ = "HELLO": B$ = A$ + ", " + "WORLD"
+20 PRINT B$; LEN(B$); LEFT$(B$, 3); MID$(B$, 2, 3); CHR$(65)
+30 PRINT "A", "B"; "C", TAB(30); "D"; SPC(2); "E"
+40 X = 12: PRINT "X ="; X; "DONE"
+""",
+    'control_flow': """
+10 FOR I = 1 TO 3
+20   FOR J = I TO 1 STEP -1: PRINT I * 10 + J;: NEXT J
+30 NEXT I
+40 PRINT
+50 K = 0
+60 WHILE K < 3: K = K + 1: WHILE 0: PRINT "NEVER": WEND: PRINT "K"; K: WEND
+70 IF K = 3 THEN PRINT "THEN": PRINT "STILL THEN" ELSE PRINT "ELSE"
+80 IF K = 4 THEN 200 ELSE 90
+90 GOSUB 300: ON K - 1 GOTO 100, 110
+100 PRINT "WRONG": END
+110 ON 1 GOSUB 300: PRINT "BACK"
+120 FOR I = 1 TO 2: NEXT I
+130 PRINT "I ="; I
+140 END
+200 PRINT "WRONG"
+300 PRINT "SUB": RETURN
+""",
+    'arrays_and_functions': """
+10 DIM A(10), M%(3, 3)
+20 FOR I = 0 TO 10: A(I) = I * I: NEXT I
+30 FOR I = 1 TO 3: FOR J = 1 TO 3: M%(I, J) = I * J: NEXT J, I
+40 DEF FNSQ(X) = X * X + Y
+50 X = 100: Y = 1
+60 PRINT A(5); M%(2, 3); FNSQ(3); X
+70 DEF FNSQ(X) = X + 1000
+80 PRINT FNSQ(A(2))
+""",
+    'errors': """
+10 ON ERROR GOTO 100
+20 X = 1 / 0
+30 PRINT "AFTER DIVIDE"
+40 A$ = STRING$(200, "A"): B$ = A$ + A$
+50 PRINT "AFTER CONCAT"
+60 END
+100 PRINT "ERROR"; ERR; "AT"; ERL
+110 RESUME NEXT
+""",
+}
+
+
+def run_engine(code, engine):
+    """Run a BASIC program and return (output, final PC)."""
+    interp, runtime, io = make_interpreter(code, limits=create_unlimited_limits(), engine=engine)
+    try:
+        interp.run()
+    except RuntimeError as e:
+        io.output(f"?{e}")
+    return io.text, runtime.pc
+
+
+def test_engines_match():
+    """Closure engine output must match the AST engine for every program."""
+    for name, code in PROGRAMS.items():
+        ast_output, ast_pc = run_engine(code, 'ast')
+        closure_output, closure_pc = run_engine(code, 'closure')
+        assert closure_output == ast_output, \
+            f"{name}: output differs\n--- ast ---\n{ast_output}\n--- closure ---\n{closure_output}"
+        assert closure_pc.stop_reason == ast_pc.stop_reason, \
+            f"{name}: stop reason {closure_pc.stop_reason} != {ast_pc.stop_reason}"
+        print(f"✓ {name}: outputs match")
+
+
+def test_uncaught_error_matches():
+    """An unhandled runtime error stops both engines at the same PC."""
+    code = "10 PRINT \"START\"\n20 X = 0\n30 PRINT 1 / X\n40 PRINT \"NOT REACHED\"\n"
+    ast_output, ast_pc = run_engine(code, 'ast')
+    closure_output, closure_pc = run_engine(code, 'closure')
+    assert "Division by zero" in closure_output, f"Expected division error, got {closure_output!r}"
+    assert closure_output == ast_output, f"{closure_output!r} != {ast_output!r}"
+    assert (closure_pc.line, closure_pc.statement) == (ast_pc.line, ast_pc.statement) == (30, 0), \
+        f"Error PC mismatch: {closure_pc} vs {ast_pc}"
+    print("✓ Unhandled errors stop at the same PC")
+
+
+def test_recompiles_edited_statement():
+    """Replacing a line after start() runs the new code, not the cached closure."""
+    code = "10 PRINT \"OLD\"\n20 END\n"
+    interp, runtime, io = make_interpreter(code, engine='closure', start=True)
+
+    new_line = parse("10 PRINT \"NEW\"\n").lines[0]
+    runtime.statement_table.replace_line(10, new_line)
+    runtime.pc = runtime.pc.running_at(10, 0)
+    run_to_end(interp, quantum=100)
+
+    assert io.text == "NEW\n", f"Expected recompiled output, got {io.text!r}"
+    print("✓ Edited statements are recompiled")
+
+
+def test_unknown_engine_rejected():
+    """Constructing an interpreter with an unknown engine raises ValueError."""
+    try:
+        Interpreter(Runtime({}), CaptureIO(), engine='turbo')
+    except ValueError as e:
+        assert 'turbo' in str(e), f"Unexpected message: {e}"
+        print("✓ Unknown engine rejected")
+        return
+    raise AssertionError("Expected ValueError for unknown engine")
+
+
+if __name__ == "__main__":
+    try:
+        test_engines_match()
+        test_uncaught_error_matches()
+        test_recompiles_edited_statement()
+        test_unknown_engine_rejected()
+        print("\n✅ All tests passed")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
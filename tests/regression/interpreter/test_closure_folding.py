@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test constant folding in the closure engine (Interpreter(fold_constants=True)).
+
+Tests:
+- Folded programs print exactly what the AST and unfolded closure engines print
+- Only literal/operator/pure-builtin expressions are folded (not RND, DEF FN
+  or variables)
+- Constant expressions that raise are left to raise at run time
+"""
+
+import sys
+import os
+
+# Add project root to path (3 levels up from tests/regression/interpreter/)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from tests.regression.regression_common import run_program
+
+
+CONSTANTS = ("10 PRINT 3.14159/180; 2^8-1; 7\\2; 10 MOD 3; -5+2; NOT 0; 1=1; 3 AND 6\n"
+             "20 PRINT INT(2.5); CINT(2.5); FIX(-2.5); SQR(16); ABS(-3); SGN(-7); 1/3\n"
+             "30 A$ = CHR$(27) + \"[2J\": PRINT LEN(A$); ASC(A$); MID$(\"HELLO\", 2, 3)\n"
+             "40 PRINT STR$(5); LEFT$(\"ABC\", 2); STRING$(3, 42); HEX$(255); VAL(\"12.5\") * 2\n"
+             "50 X% = 2^8-1: Y# = 1/3: PRINT X%; Y#; 100000 * 3\n"
+             "60 FOR I = 1 TO 2 + 1: PRINT I * (2 + 3);: NEXT I: PRINT\n"
+             "70 IF 1 < 2 THEN PRINT \"YES\" ELSE PRINT \"NO\"\n")
+
+
+def test_identical_output():
+    expected = run_program(CONSTANTS)[2].text
+    unfolded = run_program(CONSTANTS, engine='closure')[2].text
+    interp, _, io = run_program(CONSTANTS, engine='closure', fold_constants=True)
+    folded = io.text
+    assert unfolded == expected, f"closure engine differs:\n{unfolded}\n{expected}"
+    assert folded == expected, f"Folded output differs:\n{folded}\nexpected:\n{expected}"
+    assert interp.compiled_program.constants_folded >= 25, \
+        f"Only {interp.compiled_program.constants_folded} expressions folded"
+    print("✓ Folded constants print identically")
+
+
+def test_not_folded():
+    code = ("10 DEF FNA(X) = X + 1\n"
+            "20 S = 0: FOR I = 1 TO 3: S = S + FNA(1) + I * 2: NEXT I\n"
+            "30 R = RND(1) + RND(1): PRINT S; R <> 0\n")
+    interp, _, io = run_program(code, engine='closure', fold_constants=True)
+    assert io.text == " 18 -1\n", f"Unexpected output {io.text!r}"
+    assert interp.compiled_program.constants_folded == 0, \
+        f"Folded {interp.compiled_program.constants_folded} non-constant expressions"
+
+    try:
+        run_program("10 PRINT 1\n", fold_constants=True)
+        assert False, "fold_constants accepted for the AST engine"
+    except ValueError:
+        pass
+    print("✓ Variables, DEF FN and impure builtins are not folded")
+
+
+def test_errors_at_run_time():
+    code = ("10 ON ERROR GOTO 100\n"
+            "20 PRINT \"A\"\n"
+            "30 X = 1/0: PRINT \"B\": Y% = 40000 * 2\n"
+            "40 END\n"
+            "100 PRINT \"E\"; ERR; ERL: RESUME NEXT\n")
+    expected = run_program(code)[2].text
+    folded = run_program(code, engine='closure', fold_constants=True)[2].text
+    assert folded == expected, f"Error behaviour differs: {folded!r} vs {expected!r}"
+    print("✓ Constant expressions that raise still raise at run time")
+
+
+if __name__ == "__main__":
+    try:
+        test_identical_output()
+        test_not_folded()
+        test_errors_at_run_time()
+        print("\n✅ All tests passed")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test DEF FN parameter frames (Runtime.push_fn_frame()/pop_fn_frame()).
+
+Tests:
+- Parameters shadow globals of the same name; other globals stay visible
+- Globals are restored after the call, nested calls and calls that raise
+- Binding a parameter neither creates the global nor records access history
+"""
+
+import sys
+import os
+
+# Add project root to path (3 levels up from tests/regression/interpreter/)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from tests.regression.regression_common import run_program
+
+
+def listing(runtime):
+    return {v['name'] + v['type_suffix']: v for v in runtime.get_all_variables()}
+
+
+def test_shadowing():
+    code = ("10 X = 100: Y = 7: N$ = \"GLOBAL\"\n"
+            "20 DEF FNA(X) = X * 2 + Y\n"
+            "30 DEF FNB(X, Y) = FNA(X + Y) + X\n"
+            "40 DEF FNG$(N$) = N$ + \"!\"\n"
+            "50 PRINT FNA(5); FNB(1, 2); FNA(FNA(1)); FNG$(\"HI\")\n"
+            "60 PRINT X; Y; N$\n")
+    for engine in ('ast', 'closure'):
+        _, runtime, io = run_program(code, engine=engine)
+        # FNB's Y is the one FNA sees while FNB runs
+        assert io.text == " 17  9  25 HI!\n 100  7 GLOBAL\n", f"{engine}: unexpected output {io.text!r}"
+    print("✓ Parameters shadow globals; other globals visible and restored")
+
+
+def test_error_restores():
+    code = ("10 ON ERROR GOTO 100\n"
+            "20 X = 3: DEF FND(X) = 10 / X\n"
+            "30 PRINT FND(0)\n"
+            "40 PRINT \"X=\"; X: END\n"
+            "100 PRINT \"ERROR\"; ERR: RESUME NEXT\n")
+    for engine in ('ast', 'closure'):
+        _, runtime, io = run_program(code, engine=engine)
+        assert io.text == "ERROR11\nX= 3 \n", f"{engine}: unexpected output {io.text!r}"
+    print("✓ Globals restored when the function body raises an error")
+
+
+def test_no_side_effects():
+    _, runtime, io = run_program("10 DEF FNS(P, Q) = P + Q\n"
+                                 "20 T = FNS(1, 2)\n")
+    variables = listing(runtime)
+    assert 'p!' not in variables and 'q!' not in variables, \
+        f"Parameters created globals: {sorted(variables)}"
+
+    _, runtime, io = run_program("10 P = 5\n"
+                                 "20 DEF FNS(P) = P + 1\n"
+                                 "30 T = FNS(1)\n")
+    p = listing(runtime)['p!']
+    # last_write is still the LET, not a debugger-style (-1) write
+    assert p['value'] == 5 and p['last_write']['line'] != -1, f"Global changed by call: {p}"
+    print("✓ Binding parameters creates no variables and records no writes")
+
+
+if __name__ == "__main__":
+    try:
+        test_shadowing()
+        test_error_restores()
+        test_no_side_effects()
+        print("\n✅ All tests passed")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test buffered sequential file output (PRINT#, WRITE#, PRINT# USING).
+
+Tests:
+- Output files are not flushed after every write by default
+- Buffered output is written when the program stops without CLOSE
+  (END, error) and on CLOSE
+- flush_file_writes restores the flush after every write
+- The in-memory (web) filesystem publishes flushed files without a CLOSE
+- OPEN of a file that is open for output sees its buffered output
+"""
+
+import sys
+import os
+import tempfile
+
+# Add project root to path (3 levels up from tests/regression/interpreter/)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from src.filesystem import SandboxedFileSystemProvider
+from tests.regression.regression_common import Settings, make_interpreter, run_to_end
+
+
+def write_program(path, tail):
+    """Program writing 50 records, then waiting at line 30 until X is set."""
+    return (f'10 OPEN "O", #1, "{path}"\n'
+            f'20 FOR I=1 TO 50: PRINT #1, I; "ABC": WRITE #1, I, "D": PRINT #1, USING "##.#"; I: NEXT\n'
+            f'30 IF X=0 THEN 30\n'
+            f'40 {tail}\n')
+
+
+EXPECTED = ''.join(f' {i} ABC\n{i},"D"\n{i:4.1f}\n' for i in range(1, 51))
+
+
+def test_buffered_until_stop():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'out.txt')
+        for tail, expect_error in (('END', False), ('ERROR 5', True), ('CLOSE', False)):
+            interp, runtime, _ = make_interpreter(write_program(path, tail), settings_manager=Settings(),
+                                                  start=True)
+            interp.tick(max_statements=400)
+            assert runtime.pc.is_running(), "Program stopped early"
+            assert os.path.getsize(path) == 0, f"{tail}: output flushed while the program runs"
+            runtime.set_variable_raw('X', 1)
+            try:
+                run_to_end(interp, quantum=100)
+            except RuntimeError:
+                pass
+            assert (interp.state.error_info is not None) == expect_error, f"{tail}: unexpected end state"
+            with open(path) as f:
+                text = f.read()
+            assert text == EXPECTED, f"{tail}: file incomplete ({len(text)} of {len(EXPECTED)} characters)"
+            interp.fs.reset()
+    print("✓ File output is buffered and written on END, errors and CLOSE")
+
+
+def test_flush_each_write():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'out.txt')
+        interp, runtime, _ = make_interpreter(write_program(path, 'END'),
+                                              settings_manager=Settings(flush_file_writes=True), start=True)
+        interp.tick(max_statements=400)
+        assert runtime.pc.is_running(), "Program stopped early"
+        with open(path) as f:
+            assert f.read() == EXPECTED, "flush_file_writes did not flush every write"
+        interp.fs.reset()
+    print("✓ flush_file_writes flushes after every write")
+
+
+def test_sandboxed_filesystem():
+    fs = SandboxedFileSystemProvider(user_id='test_file_buffering')
+    try:
+        interp, runtime, _ = make_interpreter(write_program('out.txt', 'END'), settings_manager=Settings(),
+                                              filesystem_provider=fs, start=True)
+        interp.tick(max_statements=400)
+        assert not fs.exists('OUT.TXT') or fs.get_size('OUT.TXT') == 0, "Output published while the program runs"
+        runtime.set_variable_raw('X', 1)
+        run_to_end(interp, quantum=100)
+        assert fs.get_size('OUT.TXT') == len(EXPECTED), "Output not published at END"
+        handle = fs.open('OUT.TXT', 'r')
+        assert handle.read() == EXPECTED, "Published output differs"
+        handle.close()
+    finally:
+        fs.reset()
+        SandboxedFileSystemProvider.clear_user_filesystem('test_file_buffering')
+    print("✓ In-memory files are published when the program stops")
+
+
+def test_open_sees_buffered_output():
+    program = ('10 OPEN "O", #1, "{path}": PRINT #1, "A": WRITE #1, 1, "B"\n'
+               '20 OPEN "I", #2, "{path}": INPUT #2, A$: LINE INPUT #2, B$: PRINT A$; "|"; B$\n'
+               '30 CLOSE\n')
+    with tempfile.TemporaryDirectory() as tmp:
+        interp, runtime, io = make_interpreter(program.format(path=os.path.join(tmp, 'x.txt')),
+                                               settings_manager=Settings(), start=True)
+        run_to_end(interp)
+        assert io.text == 'A|1,"B"\n', f"Second OPEN missed buffered output: {io.text!r}"
+    fs = SandboxedFileSystemProvider(user_id='test_file_buffering')
+    try:
+        interp, runtime, io = make_interpreter(program.format(path='x.txt'), settings_manager=Settings(),
+                                               filesystem_provider=fs, start=True)
+        run_to_end(interp)
+        assert io.text == 'A|1,"B"\n', f"Second OPEN missed buffered in-memory output: {io.text!r}"
+    finally:
+        fs.reset()
+        SandboxedFileSystemProvider.clear_user_filesystem('test_file_buffering')
+    print("✓ OPEN sees output buffered for the same file under another number")
+
+
+if __name__ == "__main__":
+    try:
+        test_buffered_until_stop()
+        test_flush_each_write()
+        test_sandboxed_filesystem()
+        test_open_sees_buffered_output()
+        print("\n✅ All tests passed")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test the link phase that resolves GOTO/GOSUB/ON.../IF...THEN/RESUME targets.
+
+Tests:
+- References to undefined lines do not stop a program that never takes them
+- Jumping to an undefined line raises error 8, catchable with ON ERROR
+- Editing lines of a paused program relinks jumps to those lines
+- Both execution engines use the same link slots
+"""
+
+import sys
+import os
+
+# Add project root to path (3 levels up from tests/regression/interpreter/)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from src.pc import PC
+from tests.regression.regression_common import make_interpreter, parse_line, run_to_end
+
+
+def test_undefined_lines_not_rejected():
+    code = ("10 IF X = 1 THEN 500 ELSE 20\n"
+            "20 ON X GOSUB 30, 600\n"
+            "30 PRINT \"OK\": END\n")
+    for engine in ('ast', 'closure'):
+        interp, runtime, io = make_interpreter(code, engine=engine)
+        interp.start()
+        table = runtime.statement_table
+        assert table.line_slot(500).pc is None and table.line_slot(600).pc is None, f"{engine}: slots resolved"
+        run_to_end(interp)
+        assert io.text == "OK\n", f"{engine}: dead references must not stop the program, got {io.text!r}"
+    print("✓ Undefined lines do not reject the program")
+
+
+def test_undefined_line_error_is_catchable():
+    code = ("10 ON ERROR GOTO 100\n"
+            "20 GOTO 999\n"
+            "30 END\n"
+            "100 PRINT \"ERR\"; ERR; \"ERL\"; ERL: RESUME NEXT\n")
+    for engine in ('ast', 'closure'):
+        interp, runtime, io = make_interpreter(code, engine=engine)
+        interp.start()
+        run_to_end(interp)
+        assert io.text == "ERR8ERL20\n", f"{engine}: expected error 8 at line 20, got {io.text!r}"
+    print("✓ Jump to undefined line raises catchable error 8")
+
+
+def test_edits_relink_paused_program():
+    code = ("10 GOSUB 100\n"
+            "20 GOTO 50\n"
+            "100 PRINT \"OLD\": RETURN\n")
+    for engine in ('ast', 'closure'):
+        interp, runtime, io = make_interpreter(code, engine=engine)
+        interp.start()
+        assert runtime.statement_table.line_slot(50).pc is None, "Line 50 linked before it exists"
+
+        # Pause after the first statement, then edit the program
+        interp.tick(max_statements=1)
+        runtime.statement_table.replace_line(100, parse_line("100 PRINT \"NEW\": RETURN"))
+        runtime.statement_table.replace_line(50, parse_line("50 PRINT \"ADDED\": END"))
+        run_to_end(interp)
+        assert io.text == "NEW\nADDED\n", f"{engine}: edits not relinked, got {io.text!r}"
+    print("✓ Editing a paused program relinks jump targets")
+
+
+def test_slots_shared_and_updated():
+    interp, runtime, io = make_interpreter("10 GOTO 30\n20 GOTO 30\n30 END\n")
+    interp.start()
+    table = runtime.statement_table
+    slot = table.line_slot(30)
+    assert slot is table.line_slot(30), "Slots for the same line should be shared"
+    assert slot.pc == PC(30, 0), f"Slot not resolved: {slot}"
+    table.delete_line(30)
+    assert slot.pc is None, "Deleting a line should unlink its slot"
+    table.replace_line(30, parse_line("30 PRINT 1: END"))
+    assert slot.pc == PC(30, 0), "Re-adding a line should relink its slot"
+    print("✓ Link slots are shared and kept up to date")
+
+
+if __name__ == "__main__":
+    try:
+        test_undefined_lines_not_rejected()
+        test_undefined_line_error_is_catchable()
+        test_edits_relink_paused_program()
+        test_slots_shared_and_updated()
+        print("\n✅ All tests passed")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test the buffered reader behind INPUT#, LINE INPUT#, INPUT$ and EOF().
+
+Tests:
+- LF, CR+LF and lone CR line endings, a last line without an ending
+- ^Z ends the input (EOF() and INPUT#), bytes after it are not read
+- INPUT$ returns raw characters, LOC reports the read position
+- Files are read in chunks, not one byte per read() call
+"""
+
+import sys
+import os
+import tempfile
+
+# Add project root to path (3 levels up from tests/regression/interpreter/)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from src.filesystem import BufferedLineReader
+from tests.regression.regression_common import CountingFileSystem, make_interpreter, run_to_end
+
+
+def run(code, fs=None):
+    interp, runtime, io = make_interpreter(code, filesystem_provider=fs, start=True)
+    try:
+        run_to_end(interp)
+    except RuntimeError:
+        pass
+    return interp, io
+
+
+def test_line_endings_and_ctrl_z():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'in.dat')
+        with open(path, 'wb') as f:
+            f.write(b'ONE\nTWO\r\nTHREE\rFOUR,5\r\n\xe9T\x1aHIDDEN\n')
+        interp, io = run(f'10 OPEN "I", #1, "{path}"\n'
+                         f'20 WHILE NOT EOF(1): LINE INPUT #1, A$: PRINT "["; A$; "]"; LOC(1): WEND\n'
+                         f'30 CLOSE #1\n')
+        assert interp.state.error_info is None, "Program failed"
+        assert io.text == '[ONE]0\n[TWO]0\n[THREE]0\n[FOUR,5]0\n[\xe9T]0\n', \
+            f"Unexpected LINE INPUT# output {io.text!r}"
+
+        with open(path, 'wb') as f:
+            f.write(b'1,AB\r\n2,CD\r')
+        interp, io = run(f'10 OPEN "I", #1, "{path}"\n'
+                         f'20 A$=INPUT$(3, 1): PRINT LEN(A$); A$\n'
+                         f'30 INPUT #1, B$: PRINT B$: INPUT #1, N, C$: PRINT N; C$; EOF(1)\n'
+                         f'40 CLOSE #1\n')
+        assert io.text == '31,A\nB\n 2 CD-1\n', f"Unexpected INPUT$/INPUT# output {io.text!r}"
+    print("✓ Line endings, ^Z, INPUT$ and LOC")
+
+
+def test_last_line_and_past_end():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'in.dat')
+        with open(path, 'wb') as f:
+            f.write(b'A\nLAST')
+        interp, io = run(f'10 OPEN "I", #1, "{path}"\n'
+                         f'20 LINE INPUT #1, A$: LINE INPUT #1, B$: PRINT A$; B$; EOF(1)\n'
+                         f'30 LINE INPUT #1, C$\n')
+        assert io.text == 'ALAST-1\n', f"Unexpected output {io.text!r}"
+        error = interp.state.error_info
+        assert error is not None and 'past end' in error.error_message, "No 'Input past end' error"
+        interp.fs.reset()
+    print("✓ Last line without ending, Input past end of file")
+
+
+def test_chunked_reads():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'big.dat')
+        with open(path, 'w') as f:
+            for i in range(20000):
+                f.write(f"RECORD {i},{i * 3}\n")
+        fs = CountingFileSystem()
+        interp, io = run(f'10 OPEN "I", #1, "{path}"\n'
+                         f'20 WHILE NOT EOF(1): INPUT #1, A$, N: T=T+N: WEND\n'
+                         f'30 PRINT T: CLOSE #1\n', fs)
+        assert io.text == f" {sum(i * 3 for i in range(20000))} \n", f"Unexpected total {io.text!r}"
+        chunks = os.path.getsize(path) // BufferedLineReader.CHUNK_SIZE + 2
+        assert fs.reads <= chunks, f"{fs.reads} read() calls for {chunks} chunks"
+    print("✓ Input files are read in chunks")
+
+
+if __name__ == "__main__":
+    try:
+        test_line_endings_and_ctrl_z()
+        test_last_line_and_past_end()
+        test_chunked_reads()
+        print("\n✅ All tests passed")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Test loop idiom recognition (empty delay loops, array fills, accumulations).
+
+Tests:
+- Recognized loops leave the same output, statement count, variables,
+  arrays and access tracking as running every iteration, on both engines
+- Recognition of the three idioms (and of loops that are not idioms)
+- Fast-forwarding happens in one tick; loops whose skipped iterations
+  would fail run normally and report the error at the same statement
+- The delay_loop_us setting makes empty loops take real time without
+  blocking tick()
+"""
+
+import sys
+import os
+import time
+
+# Add project root to path (3 levels up from tests/regression/interpreter/)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from src.runtime import Runtime
+from src.loop_idioms import LoopIdiom, find_loop_idioms
+from src.pc import PC
+from tests.regression.regression_common import Settings, line_table, make_interpreter, run_to_end
+
+
+def run(code, loop_idioms=True, engine='ast', tracking='full'):
+    interp, runtime, io = make_interpreter(code, tracking=tracking, start=True, engine=engine,
+                                           loop_idioms=loop_idioms)
+    try:
+        run_to_end(interp, quantum=100)
+    except (RuntimeError, OverflowError):
+        pass
+    return interp, runtime, io
+
+
+def snapshot(interp, runtime, io):
+    variables = sorted(
+        (v['name'] + v['type_suffix'], repr(v.get('value')), v['original_case'],
+         (v['last_read'] or {}).get('line'), (v['last_read'] or {}).get('position'),
+         (v['last_write'] or {}).get('line'), (v['last_write'] or {}).get('position'))
+        for v in runtime.get_all_variables())
+    arrays = sorted((name, list(info['data']), info['ints'], info['last_read_subscripts'], info['last_write_subscripts'])
+                    for name, info in runtime._arrays.items())
+    elements = sorted((key, (entry['last_read'] or {}).get('line'), (entry['last_write'] or {}).get('line'))
+                      for key, entry in runtime._array_element_tracking.items())
+    return (io.text, interp.state.statements_executed, repr(runtime.pc), repr(runtime.pc.error),
+            variables, arrays, elements, sorted(runtime.for_loop_states))
+
+
+PROGRAMS = {
+    'delay loops': ("10 FOR I=1 TO 2000: NEXT I\n"
+                    "20 FOR D%=10 TO 1 STEP -3: NEXT\n"
+                    "30 FOR T=0 TO 1 STEP 0.1\n40 NEXT T\n"
+                    "50 FOR K=5 TO 1: NEXT K\n"
+                    "60 PRINT I; D%; T; K\n"),
+    'array fills': ("10 DIM A(100), B%(50), N$(20), C#(30)\n"
+                    "20 FOR I=0 TO 100: A(I)=7: NEXT I\n"
+                    "30 FOR I=50 TO 0 STEP -2: B%(I)=-3.7: NEXT\n"
+                    "40 FOR I=1 TO 20: N$(I)=\"X\": NEXT I\n"
+                    "50 FOR Q=0.5 TO 29: C#(Q)=1.5: NEXT Q\n"
+                    "60 PRINT A(0); A(100); B%(50); B%(1); B%(0); N$(0); N$(20); C#(0); C#(29); I; Q\n"),
+    'accumulations': ("10 FOR I=1 TO 1000: S=S+I: NEXT I\n"
+                      "20 FOR I=1 TO 100: C%=C%+3: NEXT\n"
+                      "30 W=0.1: FOR J=1 TO 500 STEP 2: F=F-W: NEXT J\n"
+                      "40 FOR X=0 TO 1 STEP 0.01: Z#=Z#+X: NEXT X\n"
+                      "50 PRINT S; C%; F; Z#; I; J; X\n"),
+    'nested loops': ("10 DIM M(9)\n"
+                     "20 FOR I=1 TO 9: FOR J=0 TO 9: M(J)=I: NEXT J, I\n"
+                     "30 FOR I=1 TO 3: FOR J=1 TO 300: NEXT: S=S+J: NEXT\n"
+                     "40 PRINT M(0); M(9); S; I; J\n"),
+}
+
+
+def test_same_results():
+    for name, code in PROGRAMS.items():
+        for engine in ('ast', 'closure'):
+            for tracking in ('off', 'full'):
+                expected = snapshot(*run(code, False, engine, tracking))
+                actual = snapshot(*run(code, True, engine, tracking))
+                assert actual == expected, \
+                    f"{name} ({engine}, {tracking}): results differ\n{actual}\n!=\n{expected}"
+    print("✓ Recognized loops give the same results as running every iteration")
+
+
+def test_recognition():
+    code = ("10 FOR I=1 TO 10: NEXT I\n"
+            "20 FOR I=1 TO 10: A(I)=0: NEXT\n"
+            "30 FOR I=1 TO 10: S=S+I: NEXT I\n"
+            "40 FOR I=1 TO 10: J=J+1: NEXT J, I\n"
+            "50 FOR I=1 TO 10: A(I)=I: NEXT I\n"
+            "55 FOR I=1 TO 10: A(I)=-J: NEXT I\n"
+            "60 FOR I=1 TO 10: S=S*I: NEXT I\n"
+            "70 FOR I=1 TO 10: PRINT I: NEXT I\n"
+            "80 FOR I=1 TO 10: A(I)=0: B(I)=0: NEXT I\n")
+    runtime = Runtime(line_table(code))
+    runtime.setup()
+    kinds = {pc.line: idiom.kind for pc, idiom in find_loop_idioms(runtime).items()}
+    assert kinds == {10: LoopIdiom.EMPTY, 20: LoopIdiom.FILL, 30: LoopIdiom.ACCUMULATE, 55: LoopIdiom.FILL}, \
+        f"Idioms: {kinds}"
+    print("✓ Empty loops, constant fills and accumulations are recognized")
+
+
+def test_fast_forward():
+    interp, runtime, io = make_interpreter("10 FOR I=1 TO 30000: NEXT I\n20 PRINT I\n", tracking='off',
+                                           loop_idioms=True)
+    interp.start()
+    interp.tick(max_statements=100)
+    assert runtime.pc == PC(10, 1), f"Loop not fast-forwarded in one tick: {runtime.pc!r}"
+    run_to_end(interp, quantum=100)
+    assert io.text == " 30000 \n", f"Unexpected output {io.text!r}"
+    assert interp.state.statements_executed == 30002, f"Statements: {interp.state.statements_executed}"
+
+    # Skipped iterations that would fail run normally: the error is reported as before
+    code = "10 DIM A(40)\n20 FOR I=0 TO 100: A(I)=1: NEXT I\n"
+    expected = snapshot(*run(code, False))
+    interp, runtime, io = run(code)
+    assert snapshot(interp, runtime, io) == expected, "Error results differ"
+    assert runtime.pc.error is not None, "No error"
+
+    # A fill outside 16 bits widens the INTEGER array as a LET would
+    code = "10 DIM A%(40)\n20 FOR I=0 TO 40: A%(I)=40000: NEXT I\n"
+    expected = snapshot(*run(code, False))
+    interp, runtime, io = run(code)
+    assert snapshot(interp, runtime, io) == expected, "Widening fill results differ"
+    assert runtime._arrays['a%']['data'].typecode == 'q', "INTEGER array not widened"
+    print("✓ Loops are fast-forwarded in one step; failing loops run normally")
+
+
+def test_delay():
+    code = "10 FOR I=1 TO 2000: NEXT I\n20 PRINT \"DONE\"\n"
+    interp, runtime, io = make_interpreter(code, tracking='off', settings_manager=Settings(delay_loop_us=50),
+                                           loop_idioms=True)
+    interp.start()
+    started = time.perf_counter()
+    interp.tick(max_statements=100)
+    assert interp.state.delay_until > started, "No delay recorded"
+    statements = interp.state.statements_executed
+    interp.tick(max_statements=100)
+    assert interp.state.statements_executed == statements, "Statements ran during the delay"
+    while runtime.pc.is_running():
+        interp.tick(max_statements=100)
+        time.sleep(0.005)
+    assert io.text == "DONE\n" and time.perf_counter() - started >= 0.0999, \
+        f"Delay not honored: {time.perf_counter() - started:.3f}s"
+
+    # run() waits for the delay instead of spinning; without the setting there is none
+    interp, runtime, io = make_interpreter(code, tracking='off', settings_manager=Settings(delay_loop_us=50),
+                                           loop_idioms=True)
+    started = time.perf_counter()
+    interp.run()
+    assert time.perf_counter() - started >= 0.0999, "run() did not honor the delay"
+    interp, runtime, io = make_interpreter(code, tracking='off', settings_manager=Settings(),
+                                           loop_idioms=True)
+    interp.start()
+    interp.tick(max_statements=100)
+    assert interp.state.delay_until == 0, "Delay without the setting"
+    print("✓ delay_loop_us makes empty loops take real time")
+
+
+if __name__ == "__main__":
+    try:
+        test_same_results()
+        test_recognition()
+        test_fast_forward()
+        test_delay()
+        print("\n✅ All tests passed")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Test the hot-loop JIT (Interpreter(jit=True)).
+
+Tests:
+- Compiled loops give the same output, statement count, variables and
+  access tracking as the interpreter, on both engines and small quanta
+- JIT statistics in InterpreterState
+- Errors inside compiled loops report the failing statement (ON ERROR, ERL)
+- Pause and breakpoints stop a compiled loop at the loop head
+- Loops with INPUT are not compiled; changed state makes a loop bail out
+  and recompile
+"""
+
+import sys
+import os
+
+# Add project root to path (3 levels up from tests/regression/interpreter/)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from src.pc import PC
+from tests.regression.regression_common import make_interpreter, run_to_end
+
+
+def make_jit_interpreter(code, jit, engine='ast', tracking='full'):
+    # Loop idioms would fast-forward some test loops before they get hot
+    return make_interpreter(code, tracking=tracking, engine=engine, jit=jit, loop_idioms=False)
+
+
+def run(code, jit, engine='ast', tracking='full', quantum=1000):
+    interp, runtime, io = make_jit_interpreter(code, jit, engine, tracking)
+    interp.start()
+    try:
+        run_to_end(interp, quantum)
+    except RuntimeError:
+        pass
+    return interp, runtime, io
+
+
+def snapshot(interp, runtime, io):
+    variables = sorted(
+        (v['name'] + v['type_suffix'], repr(v.get('value')), v['original_case'],
+         (v['last_read'] or {}).get('line'), (v['last_read'] or {}).get('position'),
+         (v['last_write'] or {}).get('line'), (v['last_write'] or {}).get('position'))
+        for v in runtime.get_all_variables())
+    arrays = sorted((name, list(info['data']), info['ints'], info['last_write_subscripts'])
+                    for name, info in runtime._arrays.items())
+    return (io.text, interp.state.statements_executed, repr(runtime.pc), repr(runtime.pc.error),
+            variables, arrays, sorted(runtime._array_element_tracking))
+
+
+PROGRAMS = {
+    'for/next': ("10 DIM A(20), B(5,5)\n"
+                 "20 FOR I=1 TO 500: S=S+I*2: A(I MOD 20)=A(I MOD 20)+I/7: NEXT I\n"
+                 "30 FOR I=0 TO 5: FOR J=0 TO 5: B(I,J)=I*J: T=T+B(I,J): NEXT J, I\n"
+                 "40 FOR X=10 TO 1 STEP -0.5: Y=Y+X: NEXT\n"
+                 "50 PRINT S; A(3); T; Y; I; J; X\n"),
+    '2-D arrays and builtins': ("10 DIM S(7,7)\n"
+                                "20 FOR Y=0 TO 7: FOR X=0 TO 7: S(X,Y)=X-Y\n"
+                                "30 PRINT TAB(X*2); ABS(S(X,Y));: NEXT X: PRINT: NEXT Y\n"),
+    'goto loops': ("10 K%=0\n"
+                   "20 K%=K%+1: IF K% MOD 3 = 0 THEN C=C+1 ELSE D=D+1\n"
+                   "30 IF K%<300 THEN 20\n"
+                   "40 N=N+1: IF N=250 THEN 60\n"
+                   "50 GOTO 40\n"
+                   "60 PRINT K%; C; D; N\n"),
+    'strings and functions': ("10 DEF FNF(X)=X*X+Q\n"
+                              "20 Q=1: FOR I=1 TO 200\n"
+                              "30 A$=RIGHT$(A$+CHR$(65+I MOD 26),10): S=S+FNF(I)\n"
+                              "40 IF I MOD 50=0 THEN PRINT A$;: PRINT S\n"
+                              "50 NEXT I\n"),
+    'late variables': ("10 FOR I=1 TO 300: IF I>250 THEN Z=Z+1: W$=\"LATE\"\n"
+                       "20 Total = TOTAL + i: NEXT i: PRINT Z; W$; total\n"),
+}
+
+
+def test_same_results():
+    for name, code in PROGRAMS.items():
+        for engine in ('ast', 'closure'):
+            for tracking in ('off', 'full'):
+                for quantum in (1000, 7):
+                    expected = snapshot(*run(code, False, engine, tracking, quantum))
+                    interp, runtime, io = run(code, True, engine, tracking, quantum)
+                    actual = snapshot(interp, runtime, io)
+                    assert actual == expected, \
+                        f"{name} ({engine}, {tracking}, quantum {quantum}): results differ\n{actual}\n!=\n{expected}"
+                    assert interp.state.jit_loops_compiled > 0, f"{name}: no loop compiled"
+    print("✓ Compiled loops match the interpreter (output, counts, variables, tracking)")
+
+
+def test_statistics():
+    interp, runtime, io = run("10 FOR I=1 TO 1000: S=S+I: NEXT I\n20 PRINT S\n", True)
+    state = interp.state
+    assert io.text == " 500500 \n", f"Unexpected output {io.text!r}"
+    assert state.jit_loops_compiled == 1, f"Loops compiled: {state.jit_loops_compiled}"
+    assert state.jit_bailouts == 0, f"Bailouts: {state.jit_bailouts}"
+    assert 1900 < state.jit_statements < state.statements_executed == 2002, \
+        f"Statements in compiled loops: {state.jit_statements} of {state.statements_executed}"
+
+    interp, runtime, io = run("10 FOR I=1 TO 1000: S=S+I: NEXT I\n", False)
+    assert (interp.loop_jit, interp.state.jit_loops_compiled, interp.state.jit_statements) == (None, 0, 0), \
+        "JIT active without jit=True"
+    print("✓ InterpreterState reports loops compiled, statements and bailouts")
+
+
+def test_errors():
+    code = ("10 ON ERROR GOTO 100\n"
+            "20 FOR I=1 TO 100: X=10/(50-I): S=S+1: NEXT I\n"
+            "30 PRINT S; I: END\n"
+            "100 PRINT \"ERROR\"; ERR; ERL; I: RESUME NEXT\n")
+    expected = snapshot(*run(code, False))
+    interp, runtime, io = run(code, True)
+    assert snapshot(interp, runtime, io) == expected, f"ON ERROR results differ: {io.text!r}"
+    assert io.text.startswith("ERROR1120 50 \n"), f"Unexpected output {io.text!r}"
+    assert interp.state.jit_bailouts >= 1, "Error did not count as a bailout"
+
+    interp, runtime, io = run("10 DIM A(40)\n20 FOR I=0 TO 100: A(I)=I: NEXT I\n", True)
+    assert runtime.pc == PC(20, 1) and runtime.pc.error.code == 9, f"Unexpected error PC {runtime.pc!r}"
+    assert interp.state.statements_executed == 84, f"Statements: {interp.state.statements_executed}"
+    print("✓ Errors in compiled loops are reported at the failing statement")
+
+
+def test_pause_and_breakpoints():
+    code = "10 FOR I=1 TO 100000\n20 S=S+I\n30 NEXT I\n40 PRINT S\n"
+    interp, runtime, io = make_jit_interpreter(code, True, tracking='off')
+    interp.start()
+    interp.tick(max_statements=3000)
+    assert interp.state.jit_statements > 0, "Loop not compiled"
+    runtime.set_breakpoint(30)
+    interp.tick(max_statements=3000)
+    assert runtime.pc == PC(30, 0) and runtime.pc.stop_reason == "BREAK", f"Not stopped at breakpoint: {runtime.pc!r}"
+
+    interp, runtime, io = make_jit_interpreter(code, True, tracking='off')
+    interp.start()
+    interp.tick(max_statements=3000)
+    interp.pause()
+    interp.tick(max_statements=3000)
+    assert not runtime.pc.is_running() and runtime.pc.line in (20, 30), f"Pause ignored: {runtime.pc!r}"
+    print("✓ Pause and breakpoints stop compiled loops")
+
+
+def test_input_and_guards():
+    interp, runtime, io = make_jit_interpreter("10 INPUT A: S=S+A: IF S<100 THEN 10\n", True)
+    interp.start()
+    for _ in range(60):
+        interp.tick(max_statements=1000)
+        if interp.state.input_prompt is not None:
+            interp.provide_input("5")
+    assert interp.state.jit_loops_compiled == 0, "Loop with INPUT compiled"
+
+    code = "10 FOR I=1 TO 20000: S=S+I: NEXT I\n20 PRINT S\n"
+    interp, runtime, io = make_jit_interpreter(code, True, tracking='off')
+    interp.start()
+    interp.tick(max_statements=1000)
+    runtime.set_tracking_mode('full')      # e.g. the variables window was opened
+    run_to_end(interp)
+    assert io.text == " 200010000 \n", f"Unexpected output {io.text!r}"
+    assert interp.state.jit_bailouts == 1 and interp.state.jit_loops_compiled == 2, \
+        f"Expected one bailout and a recompile: {interp.state}"
+    assert runtime._variables['s!']['last_write'] is not None, "Recompiled loop does not track"
+    print("✓ INPUT loops stay interpreted; changed state recompiles the loop")
+
+
+if __name__ == "__main__":
+    try:
+        test_same_results()
+        test_statistics()
+        test_errors()
+        test_pause_and_breakpoints()
+        test_input_and_guards()
+        print("\n✅ All tests passed")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
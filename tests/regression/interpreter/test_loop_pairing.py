@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test the static WHILE/WEND and bare NEXT/FOR pairing built at setup.
+
+Tests:
+- Runtime.setup() pairs nested WHILE/WEND and bare NEXT statements
+- Nested WHILE loops exit to the right WEND; bare NEXT closes the innermost loop
+- WHILE inside IF...THEN and jumps between loops fall back to searching
+- Editing a paused program rebuilds the tables; unmatched WHILE is an error
+"""
+
+import sys
+import os
+
+# Add project root to path (3 levels up from tests/regression/interpreter/)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from src.pc import PC
+from tests.regression.regression_common import make_interpreter, parse_line, run_program, run_to_end
+
+
+def run(code, engine='ast'):
+    return run_program(code, engine=engine)[2].text
+
+
+NESTED = ("10 I = 0\n"
+          "20 WHILE I < 3: I = I + 1: J = 0\n"
+          "30 WHILE J < I: J = J + 1: PRINT J;: WEND\n"
+          "40 PRINT: WEND\n"
+          "50 FOR A = 1 TO 2: FOR B = 1 TO 2\n"
+          "60 PRINT A * 10 + B;\n"
+          "70 NEXT: NEXT\n"
+          "80 PRINT \"END\"\n")
+
+
+def test_tables_built_at_setup():
+    interp, runtime, io = make_interpreter(NESTED, start=True)
+    assert runtime.while_wend == {PC(20, 0): PC(40, 1), PC(30, 0): PC(30, 3)}, \
+        f"Unexpected WHILE/WEND pairs {runtime.while_wend}"
+    next_for = {pc: var.name + var.type_suffix for pc, var in runtime.next_for.items()}
+    assert next_for == {PC(70, 0): 'b!', PC(70, 1): 'a!'}, f"Unexpected NEXT/FOR pairs {next_for}"
+    print("✓ WHILE/WEND and bare NEXT/FOR paired at setup")
+
+
+def test_nested_loops():
+    expected = " 1 \n 1  2 \n 1  2  3 \n 11  12  21  22 END\n"
+    for engine in ('ast', 'closure'):
+        text = run(NESTED, engine)
+        assert text == expected, f"{engine}: unexpected output {text!r}"
+    print("✓ Nested WHILE and bare NEXT loops run correctly")
+
+
+def test_fallbacks():
+    # WHILE inside IF...THEN is not statement-level: found by searching
+    text = run("10 X = 1\n"
+               "20 IF X THEN WHILE 0\n"
+               "30 PRINT \"SKIPPED\"\n"
+               "40 WEND: PRINT \"AFTER\"\n")
+    assert text == "AFTER\n", f"WHILE inside IF: {text!r}"
+
+    # Bare NEXT reached by jumping out of the loop it was paired with
+    text = run("10 FOR I = 1 TO 3\n"
+               "20 IF I = 2 THEN 50\n"
+               "30 PRINT I;\n"
+               "40 NEXT\n"
+               "45 END\n"
+               "50 PRINT \"TWO\";: NEXT\n")
+    assert text == " 1 TWO 3 ", f"Bare NEXT after jump: {text!r}"
+    print("✓ WHILE inside IF and jumps out of loops fall back to searching")
+
+
+def test_edit_and_unmatched():
+    code = ("10 WHILE N < 2\n"
+            "20 N = N + 1\n"
+            "30 PRINT N;\n")
+    interp, runtime, io = make_interpreter(code, start=True)
+    assert runtime.while_wend == {PC(10, 0): None}, f"Unmatched WHILE not recorded: {runtime.while_wend}"
+
+    # Pause, add the WEND, then continue
+    interp.tick(max_statements=2)
+    runtime.statement_table.replace_line(40, parse_line("40 WEND: PRINT \"DONE\""))
+    run_to_end(interp)
+    assert io.text == " 1  2 DONE\n", f"Edit not picked up: {io.text!r}"
+
+    interp, runtime, io = make_interpreter("10 WHILE 0\n20 PRINT \"X\"\n", start=True)
+    try:
+        run_to_end(interp)
+    except RuntimeError:
+        pass
+    assert runtime.pc.stop_reason == "ERROR", f"Expected error, got {runtime.pc}"
+    assert "WHILE without matching WEND" in str(runtime.pc.error), f"Unexpected error {runtime.pc.error}"
+    print("✓ Edits rebuild the tables; unmatched WHILE is an error")
+
+
+if __name__ == "__main__":
+    try:
+        test_tables_built_at_setup()
+        test_nested_loops()
+        test_fallbacks()
+        test_edit_and_unmatched()
+        print("\n✅ All tests passed")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test PRINT formatting plans and the PRINT USING formatter cache.
+
+Tests:
+- PRINT output (zones, TAB/SPC, number formatting, trailing separators)
+  is unchanged on both engines, to the screen and to files
+- Each PRINT statement gets one plan, kept on the node
+- Parsed PRINT USING formatters are shared per format string
+"""
+
+import sys
+import os
+import tempfile
+
+# Add project root to path (3 levels up from tests/regression/interpreter/)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from src.basic_builtins import PrintPlan, using_formatter
+from tests.regression.regression_common import run_program
+
+
+PRINT_CODE = ('10 PRINT 1, -2.5; "A", 3.0;\n'
+              '20 PRINT ,,"Z"\n'
+              '30 PRINT "X" 5\n'
+              '40 PRINT TAB(10); "T"; SPC(3); 7%; TAB(2); "B",\n'
+              '50 PRINT\n'
+              '60 PRINT ;\n'
+              '70 PRINT 1E+20; 1/3; -0.0; 123456789#\n'
+              '80 A$="ABCDEFGHIJKLMNO": PRINT A$, A$, 1\n')
+
+PRINT_OUTPUT = (' 1            -2.5 A         3 Z             X\n 5          T    7 B           \n'
+                ' 100000000000000000000  0.3333333333333333  0  123456789 \n'
+                'ABCDEFGHIJKLMNO             ABCDEFGHIJKLMNO              1 \n')
+
+USING_CODE = ('10 PRINT USING "##.## \\\\  \\\\ !"; 3.14159; "HELLO"; "WORLD"\n'
+              '20 F$="$$#,###.##-": PRINT USING F$; -1234.5\n'
+              '30 FOR I=1 TO 3: PRINT USING "+#.##^^^^"; 12345*I: NEXT\n')
+
+USING_OUTPUT = ' 3.14 HE  WO \n $1,234.50-\n+1.23E+04\n+2.47E+04\n+3.70E+04\n'
+
+
+def test_print_output():
+    for engine in ('ast', 'closure'):
+        interp, runtime, io = run_program(PRINT_CODE, engine=engine)
+        assert io.text == PRINT_OUTPUT, f"{engine}: unexpected PRINT output {io.text!r}"
+        interp, runtime, io = run_program(USING_CODE, engine=engine)
+        assert io.text == USING_OUTPUT, f"{engine}: unexpected PRINT USING output {io.text!r}"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'out.txt')
+        run_program(f'10 OPEN "O", #1, "{path}"\n20 PRINT #1, 1, "A";\n30 PRINT #1, TAB(4); 2\n'
+                    f'40 PRINT #1, USING "##.#"; 1.25\n50 CLOSE #1\n')
+        with open(path) as f:
+            text = f.read()
+    assert text == " 1            A    2 \n 1.2\n", f"Unexpected file output {text!r}"
+    print("✓ PRINT and PRINT USING output unchanged (screen and files, both engines)")
+
+
+def test_plans():
+    interp, runtime, io = run_program('10 FOR I=1 TO 3: PRINT I; "X",: NEXT\n20 PRINT\n')
+    stmt = runtime.statement_table.get_line_statements(10)[1]
+    plan = stmt.plan
+    assert isinstance(plan, PrintPlan), "No plan kept on the PRINT statement"
+    assert plan.separators == [';', ','] and not plan.newline, f"Unexpected plan {plan.separators}"
+    assert PrintPlan.for_statement(stmt) is plan, "Plan rebuilt"
+    assert runtime.statement_table.get_line_statements(20)[0].plan.newline, "Bare PRINT ends with a newline"
+    print("✓ One formatting plan per PRINT statement")
+
+
+def test_formatter_cache():
+    formatter = using_formatter("###.##")
+    assert using_formatter("###.##") is formatter, "Formatter not shared"
+    assert formatter.format_values([3.14159]) == formatter.format_values([3.14159]) == "  3.14", \
+        "Shared formatter changed its output"
+    hits = using_formatter.cache_info().hits
+    run_program('10 FOR I=1 TO 20: PRINT USING "###.##"; I: NEXT\n')
+    assert using_formatter.cache_info().hits >= hits + 20, "PRINT USING does not use the cache"
+    print("✓ PRINT USING formatters are cached per format string")
+
+
+if __name__ == "__main__":
+    try:
+        test_print_output()
+        test_plans()
+        test_formatter_cache()
+        print("\n✅ All tests passed")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
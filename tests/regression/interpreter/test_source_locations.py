@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test the cached source locations used as variable access tokens.
+
+Tests:
+- source_location() creates one immutable SourceLocation per AST node
+- Locations survive pickling (web UI session state pickles the AST)
+- NEXT reads/writes the loop variable through its slot with the location of
+  its variable, without registering another case variant
+"""
+
+import sys
+import os
+import pickle
+
+# Add project root to path (3 levels up from tests/regression/interpreter/)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from src.interpreter import Interpreter
+from src.ast_nodes import SourceLocation, source_location
+from tests.regression.regression_common import parse, run_program
+
+
+def test_cached_and_immutable():
+    var = parse("10 A(2) = 1\n").lines[0].statements[0].variable
+    location = source_location(var)
+    assert location is source_location(var), "Location not cached on the node"
+    assert (location.line, location.position) == (var.line_num, var.column), f"Wrong location {location}"
+    assert Interpreter._make_token_info(var) is location, "_make_token_info() does not share the location"
+    try:
+        location.line = 99
+        assert False, "SourceLocation is mutable"
+    except AttributeError:
+        pass
+
+    copy = pickle.loads(pickle.dumps(var))
+    assert isinstance(copy._source_location, SourceLocation), "Location lost by pickling"
+    assert copy._source_location.line == location.line, "Pickled location changed"
+    print("✓ One immutable, picklable SourceLocation per node")
+
+
+def test_next_spelling():
+    code = ("10 FOR Idx = 1 TO 3\n"
+            "20 NEXT Idx\n"
+            "30 FOR J = 1 TO 2: NEXT\n")
+    for engine in ('ast', 'closure'):
+        _, runtime, io = run_program(code, engine=engine)
+        spellings = {name: [case for case, _, _ in variants]
+                     for name, variants in runtime._variable_case_variants.items()}
+        assert len(spellings['idx']) == 1 and len(spellings['j']) == 1, \
+            f"{engine}: NEXT registered extra spellings {spellings}"
+        variables = {v['name'] + v['type_suffix']: v for v in runtime.get_all_variables()}
+        # Last increment was by NEXT Idx (line 2 of the source)
+        assert variables['idx!']['last_write']['line'] == 2, \
+            f"{engine}: unexpected last write {variables['idx!']['last_write']}"
+    print("✓ NEXT uses the loop variable's slot and location")
+
+
+if __name__ == "__main__":
+    try:
+        test_cached_and_immutable()
+        test_next_spelling()
+        print("\n✅ All tests passed")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Test StatementTable navigation index (next_pc/prev_pc) across edits.
+
+Tests:
+- Sequential order follows line numbers, statement offsets
+- replace_line/delete_line keep next_pc/prev_pc consistent
+- Lines inserted between existing lines are linked in order
+- Direct edits of table.statements (as older UI code does) are picked up
+- Unknown PCs return halted / None like before
+- order()/pc_at() return the table's own PCs and follow edits
+"""
+
+import sys
+import os
+
+# Add project root to path (3 levels up from tests/regression/interpreter/)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from src.pc import PC, StatementTable, pack_position
+
+
+class FakeLine:
+    """Stand-in for LineNode: only .statements is used by replace_line()."""
+
+    def __init__(self, *statements):
+        self.statements = list(statements)
+
+
+def walk(table):
+    """Return [(line, stmt), ...] following next_pc from first_pc."""
+    result = []
+    pc = table.first_pc()
+    while pc.is_running():
+        result.append((pc.line, pc.statement))
+        pc = table.next_pc(pc)
+    return result
+
+
+def walk_back(table, pc):
+    """Return [(line, stmt), ...] following prev_pc from pc."""
+    result = []
+    while pc is not None:
+        result.append((pc.line, pc.statement))
+        pc = table.prev_pc(pc)
+    return result
+
+
+def make_table():
+    table = StatementTable()
+    for line in (10, 20, 30):
+        table.replace_line(line, FakeLine('a', 'b'))
+    return table
+
+
+def test_sequential_order():
+    table = make_table()
+    expected = [(10, 0), (10, 1), (20, 0), (20, 1), (30, 0), (30, 1)]
+    assert walk(table) == expected, f"Unexpected order: {walk(table)}"
+    assert walk_back(table, PC(30, 1)) == list(reversed(expected)), "prev_pc order mismatch"
+    print("✓ next_pc/prev_pc follow program order")
+
+
+def test_edits_keep_links():
+    table = make_table()
+    table.replace_line(20, FakeLine('x', 'y', 'z'))
+    table.replace_line(15, FakeLine('new'))
+    table.delete_line(30)
+    table.replace_line(5, FakeLine('first'))
+    expected = [(5, 0), (10, 0), (10, 1), (15, 0), (20, 0), (20, 1), (20, 2)]
+    assert walk(table) == expected, f"Unexpected order after edits: {walk(table)}"
+    assert walk_back(table, PC(20, 2)) == list(reversed(expected)), "prev_pc broken after edits"
+    assert table.get_line_statements(20) == ['x', 'y', 'z'], "Replaced line statements wrong"
+    assert not table.line_exists(30), "Deleted line still reported"
+    assert table.next_pc(PC(30, 0)).halted(), "Deleted PC should have no successor"
+    print("✓ replace_line/delete_line keep navigation consistent")
+
+
+def test_replaced_line_keeps_position():
+    table = make_table()
+    table.replace_line(10, FakeLine('only'))
+    assert walk(table)[:2] == [(10, 0), (20, 0)], f"Line 10 moved: {walk(table)}"
+    print("✓ Replaced line keeps its position")
+
+
+def test_direct_statements_edits():
+    table = make_table()
+    table.statements.clear()
+    table.add(PC(100, 0), 'a')
+    table.add(PC(50, 0), 'b')
+    assert walk(table) == [(50, 0), (100, 0)], f"Index not rebuilt: {walk(table)}"
+    table.statements[PC(75, 0)] = 'c'
+    assert walk(table) == [(50, 0), (75, 0), (100, 0)], f"Direct insert missed: {walk(table)}"
+    version = table.version
+    del table.statements[PC(50, 0)]
+    table.statements[PC(60, 0)] = 'd'
+    assert walk(table) == [(60, 0), (75, 0), (100, 0)], f"Same-size direct edit missed: {walk(table)}"
+    assert table.version > version, "Direct edits did not change the version"
+    print("✓ Direct edits of statements dict are picked up")
+
+
+def test_unknown_pc():
+    table = make_table()
+    assert table.next_pc(PC(999, 0)).halted(), "Unknown PC should give halted"
+    assert table.prev_pc(PC(999, 0)) is None, "Unknown PC should give None"
+    assert table.prev_pc(PC(10, 0)) is None, "First PC has no predecessor"
+    assert StatementTable().first_pc().halted(), "Empty table should give halted"
+    print("✓ Unknown PCs handled")
+
+
+def test_order_and_positions():
+    table = make_table()
+    pcs, statements, index = table.order()
+    assert [(pc.line, pc.statement) for pc in pcs[:-1]] == walk(table), "order() differs from next_pc order"
+    assert statements == ['a', 'b'] * 3 + [None] and pcs[-1].halted_check(), "Missing end entry"
+    assert all(pcs[index[pc.position]] is pc for pc in pcs[:-1]), "Positions do not index the PCs"
+    assert table.pc_at(20, 1) is table.next_pc(PC(20, 0)), "pc_at() should return the table's PC"
+    assert table.pc_at(20, 2) is None and table.pc_at(99, 0) is None, "Missing statements should give None"
+    assert pack_position(20, 1) < pack_position(20, 2) < pack_position(30, 0) == PC(30, 0).position
+    assert PC.halted().position == -1, "Halted PC has no position"
+
+    table.replace_line(20, FakeLine('x', 'y', 'z'))
+    assert table.order() is not (pcs, statements, index), "order() not rebuilt after an edit"
+    assert table.pc_at(20, 2) == PC(20, 2) and table.order()[1][2:5] == ['x', 'y', 'z'], "Edit not reflected"
+    print("✓ order() and pc_at() follow the table")
+
+
+if __name__ == "__main__":
+    try:
+        test_sequential_order()
+        test_edits_keep_links()
+        test_replaced_line_keeps_position()
+        test_direct_statements_edits()
+        test_unknown_pc()
+        test_order_and_positions()
+        print("\n✅ All tests passed")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test time-budgeted ticks and the UIs' adaptive tick quantum.
+
+Tests:
+- tick(max_ms=...) ends a 'run' quantum at its time budget
+- AdaptiveQuantum grows the quantum for fast statements and shrinks it
+  for slow ones, keeping run() close to its budget
+- run() returns at INPUT, at the end of the program and in delay loops
+- gap_ms() schedules the next callback at the end of a delay loop
+"""
+
+import sys
+import os
+import time
+
+# Add project root to path (3 levels up from tests/regression/interpreter/)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from src.tick_quantum import AdaptiveQuantum
+from tests.regression.regression_common import CaptureIO, Settings, make_interpreter
+
+
+def test_tick_max_ms():
+    interp, _, _ = make_interpreter('10 X = X + 1: GOTO 10\n', start=True)
+    start = time.perf_counter()
+    state = interp.tick(mode='run', max_statements=10 ** 9, max_ms=20)
+    elapsed = time.perf_counter() - start
+    assert interp.runtime.pc.is_running() and state.statements_executed > 0, "Quantum did not run"
+    assert elapsed < 0.5, f"Quantum ran {elapsed:.3f}s with a 20 ms budget"
+
+    interp.runtime.trace_on = True          # TRON: the debug loop runs the quantum
+    start = time.perf_counter()
+    interp.tick(mode='run', max_statements=10 ** 9, max_ms=20)
+    assert time.perf_counter() - start < 0.5, "Debug loop ignored the time budget"
+    print("✓ tick(max_ms) ends the quantum at its budget")
+
+
+def test_quantum_adapts():
+    interp, _, _ = make_interpreter('10 X = X + 1: GOTO 10\n', start=True)
+    quantum = AdaptiveQuantum(target_ms=20, statements=10)
+    for _ in range(10):
+        quantum.run(interp)
+    assert quantum.statements > 100, f"Quantum did not grow ({quantum.statements})"
+
+    interp, _, _ = make_interpreter('10 PRINT "X": GOTO 10\n', io=CaptureIO(delay=0.002), start=True)
+    quantum = AdaptiveQuantum(target_ms=20, statements=1000)
+    quantum.run(interp)
+    durations = []
+    for _ in range(5):
+        start = time.perf_counter()
+        quantum.run(interp)
+        durations.append(time.perf_counter() - start)
+    assert quantum.statements < 20, f"Quantum did not shrink ({quantum.statements})"
+    assert min(durations) < 0.1, f"run() overran its budget ({min(durations):.3f}s)"
+    print("✓ AdaptiveQuantum grows for fast and shrinks for slow statements")
+
+
+def test_run_stops():
+    interp, _, _ = make_interpreter('10 FOR I=1 TO 50: NEXT\n20 INPUT A\n30 PRINT A*2\n', start=True)
+    quantum = AdaptiveQuantum()
+    state = quantum.run(interp)
+    assert state.input_prompt is not None, "run() did not stop at INPUT"
+    interp.provide_input('21')
+    state = quantum.run(interp)
+    assert not interp.runtime.pc.is_running() and state.error_info is None, "Program did not finish"
+    assert interp.io.text == "?  42 \n", f"Unexpected output {interp.io.text!r}"
+
+    interp, _, _ = make_interpreter('10 FOR I=1 TO 100000: NEXT\n20 PRINT "DONE"\n',
+                                    settings_manager=Settings(delay_loop_us=10), loop_idioms=True, start=True)
+    state = quantum.run(interp)
+    assert state.delay_until, "Delay loop not found"
+    start = time.perf_counter()
+    quantum.run(interp)
+    assert time.perf_counter() - start < 0.1, "run() spun during the 1 s delay loop"
+    print("✓ run() returns at INPUT, at the end and in delay loops")
+
+
+def test_gap_ms():
+    interp, _, _ = make_interpreter('10 FOR I=1 TO 3000: NEXT\n20 FOR I=1 TO 100000: NEXT\n',
+                                    settings_manager=Settings(delay_loop_us=10), loop_idioms=True, start=True)
+    quantum = AdaptiveQuantum()
+    state = quantum.run(interp)
+    assert AdaptiveQuantum.GAP_MS < AdaptiveQuantum.gap_ms(state) <= 30, \
+        f"30 ms delay loop: next callback in {AdaptiveQuantum.gap_ms(state)} ms"
+    time.sleep(AdaptiveQuantum.gap_ms(state) / 1000)
+    state = quantum.run(interp)
+    assert state.delay_until, "Second delay loop not found"
+    assert AdaptiveQuantum.gap_ms(state) == AdaptiveQuantum.DELAY_GAP_MS, \
+        f"1 s delay loop: next callback in {AdaptiveQuantum.gap_ms(state)} ms"
+
+    interp, _, _ = make_interpreter('10 X = X + 1: GOTO 10\n', start=True)
+    state = quantum.run(interp)
+    assert AdaptiveQuantum.gap_ms(state) == AdaptiveQuantum.GAP_MS, "Gap without a delay loop"
+    print("✓ gap_ms() waits for the end of a delay loop, at most DELAY_GAP_MS")
+
+
+if __name__ == "__main__":
+    try:
+        test_tick_max_ms()
+        test_quantum_adapts()
+        test_run_stops()
+        test_gap_ms()
+        print("\n✅ All tests passed")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
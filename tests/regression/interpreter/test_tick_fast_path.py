@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test the tick() fast path used for plain 'run' quanta.
+
+Tests:
+- Output matches the debug loop (forced by an unrelated breakpoint)
+- TRON executed mid-run traces from the next statement
+- Breakpoints added while running still stop at their line
+- Ctrl+C (break_requested) and pause requests are honoured promptly
+- An error inside an ON ERROR handler stops with the handler line recorded
+- GOSUB/RETURN, NEXT and WEND jump to the statement table's own PCs, and
+  lines edited between ticks are picked up
+"""
+
+import sys
+import os
+
+# Add project root to path (3 levels up from tests/regression/interpreter/)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from src.pc import PC
+from tests.regression.regression_common import make_interpreter, parse_line, run_to_end
+
+
+LOOP = ("10 N = 0\n"
+        "20 N = N + 1\n"
+        "30 IF N < 1000 THEN 20\n"
+        "40 PRINT \"DONE\"; N\n")
+
+
+def test_matches_debug_loop():
+    code = ("10 FOR I = 1 TO 3: GOSUB 100: NEXT I\n"
+            "20 ON ERROR GOTO 200\n"
+            "30 X = 1 / 0\n"
+            "40 PRINT \"END\": END\n"
+            "100 PRINT I;: RETURN\n"
+            "200 PRINT \"ERR\"; ERR: RESUME NEXT\n")
+    for engine in ('ast', 'closure'):
+        fast, fast_rt, fast_io = make_interpreter(code, engine=engine, start=True)
+        run_to_end(fast, quantum=7)
+        debug, debug_rt, debug_io = make_interpreter(code, engine=engine, start=True)
+        debug_rt.breakpoints.add(PC(9999, 0))
+        run_to_end(debug, quantum=7)
+        assert fast_io.text == debug_io.text, f"{engine}: {fast_io.text!r} != {debug_io.text!r}"
+        assert fast.state.statements_executed == debug.state.statements_executed, \
+            f"{engine}: statement counts differ"
+    print("✓ Fast path output matches the debug loop")
+
+
+def test_tron_mid_run():
+    code = ("10 PRINT 1\n"
+            "20 TRON\n"
+            "30 PRINT 2: PRINT 3\n"
+            "40 TROFF\n"
+            "50 PRINT 4\n")
+    interp, runtime, io = make_interpreter(code, start=True)
+    run_to_end(interp, quantum=100)
+    assert io.text == " 1 \n[30]\n 2 \n 3 \n[40]\n 4 \n", f"Unexpected trace output: {io.text!r}"
+    print("✓ TRON takes effect on the next statement")
+
+
+def test_breakpoint_added_while_running():
+    interp, runtime, io = make_interpreter(LOOP, start=True)
+    interp.tick(max_statements=10)
+    interp.set_breakpoint(40)
+    run_to_end(interp, quantum=100)
+    assert runtime.pc.stop_reason == "BREAK", f"Expected BREAK, got {runtime.pc}"
+    assert runtime.pc.line == 40 and io.text == "", f"Stopped at {runtime.pc}, output {io.text!r}"
+    print("✓ Breakpoint added mid-run stops at its line")
+
+
+def test_break_and_pause_requests():
+    interp, runtime, io = make_interpreter(LOOP, start=True)
+    runtime.break_requested = True
+    interp.tick(max_statements=1000)
+    assert runtime.pc.stop_reason == "BREAK", f"Expected BREAK, got {runtime.pc}"
+    assert "Break in" in io.text, f"Missing break message: {io.text!r}"
+    assert interp.state.statements_executed == 0, "Break should be seen before the first statement"
+
+    interp, runtime, io = make_interpreter(LOOP, start=True)
+    interp.tick(max_statements=5)
+    interp.state.pause_requested = True
+    interp.tick(max_statements=1000)
+    assert runtime.pc.stop_reason == "USER", f"Expected USER stop, got {runtime.pc}"
+    assert interp.state.statements_executed == 5, \
+        f"Pause not honoured promptly: {interp.state.statements_executed} statements"
+    print("✓ Break and pause requests are honoured")
+
+
+def test_error_in_error_handler():
+    code = ("10 ON ERROR GOTO 100\n"
+            "20 X = 1 / 0\n"
+            "100 Y = 1 / 0\n")
+    interp, runtime, io = make_interpreter(code, start=True)
+    try:
+        run_to_end(interp, quantum=100)
+    except RuntimeError:
+        pass
+    assert runtime.pc.stop_reason == "ERROR" and runtime.pc.line == 100, f"Unexpected PC {runtime.pc}"
+    assert runtime.pc.error.on_error_handler == 100, f"Handler line not recorded: {runtime.pc.error}"
+    print("✓ Error inside ON ERROR handler stops at the handler")
+
+
+def test_no_new_pcs():
+    code = ("10 FOR I = 1 TO 50: GOSUB 100: NEXT I\n"
+            "20 WHILE J < 50: J = J + 1: GOSUB 100: WEND\n"
+            "30 PRINT S: END\n"
+            "100 S = S + 1: RETURN\n")
+    for engine in ('ast', 'closure'):
+        interp, runtime, io = make_interpreter(code, engine=engine, start=True)
+        table_pcs = set(map(id, runtime.statement_table.order()[0]))
+        seen = set()
+        while runtime.pc.is_running():
+            interp.tick(max_statements=1)
+            if runtime.pc.is_running():
+                seen.add(id(runtime.pc))
+        assert io.text == " 100 \n", f"{engine}: unexpected output {io.text!r}"
+        assert seen <= table_pcs, f"{engine}: {len(seen - table_pcs)} PCs created while running"
+
+    # Lines edited between ticks are picked up
+    interp, runtime, io = make_interpreter(LOOP, start=True)
+    interp.tick(max_statements=10)
+    runtime.statement_table.replace_line(40, parse_line('40 PRINT "EDITED"'))
+    run_to_end(interp, quantum=100)
+    assert io.text == "EDITED\n", f"Edit not picked up: {io.text!r}"
+    print("✓ Jumps reuse the statement table's PCs; edits are picked up")
+
+
+if __name__ == "__main__":
+    try:
+        test_matches_debug_loop()
+        test_tron_mid_run()
+        test_breakpoint_added_while_running()
+        test_break_and_pause_requests()
+        test_error_in_error_handler()
+        test_no_new_pcs()
+        print("\n✅ All tests passed")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test variable access tracking modes (Runtime.set_tracking_mode()).
+
+Tests:
+- 'off' records no access history, 'array' records it per variable/array,
+  'full' also per array element; program output is the same in every mode
+- The mode can be switched while a program is running
+- Leaving 'full' drops per-element history; RUN keeps the mode
+- Unknown modes are rejected
+"""
+
+import sys
+import os
+
+# Add project root to path (3 levels up from tests/regression/interpreter/)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from src.runtime import Runtime
+from tests.regression.regression_common import line_table, make_interpreter, run_to_end
+
+
+PROGRAM = ("10 DIM A(3)\n"
+           "20 FOR I = 0 TO 3: A(I) = I * I: NEXT I\n"
+           "30 T = A(2) + A(3)\n"
+           "40 PRINT T\n")
+
+
+def listing(runtime):
+    return {v['name'] + v['type_suffix']: v for v in runtime.get_all_variables()}
+
+
+def test_modes():
+    for engine in ('ast', 'closure'):
+        outputs = set()
+        for mode in Runtime.TRACKING_MODES:
+            interp, runtime, io = make_interpreter(PROGRAM, tracking=mode, engine=engine, start=True)
+            run_to_end(interp)
+            outputs.add(io.text)
+            variables = listing(runtime)
+            tracked = mode != 'off'
+            assert (variables['t!']['last_write'] is not None) == tracked, f"{engine}/{mode}: scalar write"
+            assert (variables['i!']['last_read'] is not None) == tracked, f"{engine}/{mode}: scalar read"
+            assert (variables['a!']['last_write'] is not None) == tracked, f"{engine}/{mode}: array write"
+            assert variables['a!']['last_read_subscripts'] == ([3] if tracked else None), \
+                f"{engine}/{mode}: array subscripts {variables['a!']['last_read_subscripts']}"
+            elements = sorted(runtime._array_element_tracking)
+            expected = ['a![0]', 'a![1]', 'a![2]', 'a![3]'] if mode == 'full' else []
+            assert elements == expected, f"{engine}/{mode}: element tracking {elements}"
+        assert outputs == {" 13 \n"}, f"{engine}: output depends on tracking mode: {outputs}"
+    print("✓ off/array/full record the expected history without changing output")
+
+
+def test_switch_mid_run():
+    code = ("10 FOR I = 1 TO 200\n"
+            "20 X = I: A(I MOD 10) = X\n"
+            "30 NEXT I\n")
+    interp, runtime, io = make_interpreter(code, tracking='off', start=True)
+    interp.tick(max_statements=50)
+    assert listing(runtime)['x!']['last_write'] is None, "History recorded while off"
+
+    # Variables window opened while running
+    runtime.set_tracking_mode('full')
+    interp.tick(max_statements=50)
+    assert listing(runtime)['x!']['last_write'] is not None, "Switching on mid-run not honoured"
+    assert runtime._array_element_tracking, "Per-element history not recorded after switching to full"
+
+    runtime.set_tracking_mode('array')
+    assert runtime._array_element_tracking == {}, "Per-element history kept after leaving full"
+    run_to_end(interp)
+    assert runtime._array_element_tracking == {}, "Per-element history recorded in array mode"
+    print("✓ Tracking mode can be switched while running")
+
+
+def test_run_keeps_mode():
+    interp, runtime, io = make_interpreter(PROGRAM, tracking='full', start=True)
+    run_to_end(interp)
+    runtime.set_tracking_mode('array')
+    runtime.reset_for_run(line_table(PROGRAM))
+    assert runtime.tracking_mode == 'array', f"RUN changed tracking mode to {runtime.tracking_mode}"
+
+    runtime.set_tracking_mode('full')
+    interp.start()
+    run_to_end(interp)
+    runtime.reset_for_run(line_table(PROGRAM))
+    assert runtime._array_element_tracking == {}, "Per-element history survived RUN"
+
+    try:
+        runtime.set_tracking_mode('sampled')
+        assert False, "Unknown mode accepted"
+    except ValueError:
+        pass
+    assert runtime.tracking_mode == 'full', "Rejected mode changed the setting"
+    print("✓ RUN keeps the mode and clears per-element history; unknown modes rejected")
+
+
+if __name__ == "__main__":
+    try:
+        test_modes()
+        test_switch_mid_run()
+        test_run_keeps_mode()
+        print("\n✅ All tests passed")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Test typed array storage and subscripting.
+
+Tests:
+- INTEGER arrays use 16-bit array.array buffers, SINGLE/DOUBLE 'd' buffers,
+  string arrays lists; elements start as 0 / ""
+- SINGLE/DOUBLE elements read back ints as ints (never assigned: 0, copies
+  of ints) and floats as floats, with and without the loop JIT
+- Row-major layout for 1-D, 2-D and 3-D arrays, with OPTION BASE 0 and 1
+- Every subscript is range checked (error 9), strings in numeric arrays
+  are error 13
+- INTEGER elements outside 16 bits are kept, like INTEGER scalars: the
+  buffer widens to 'q', then to a list
+- Arrays passed with get_all_variables()/update_variables() are recreated
+- serialize_arrays() output survives a JSON round trip
+"""
+
+import sys
+import os
+import json
+
+# Add project root to path (3 levels up from tests/regression/interpreter/)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from src.runtime import Runtime
+from tests.regression.regression_common import run_program
+
+
+def test_storage_types():
+    _, runtime, io = run_program("10 DEFINT I: DIM A%(5), B!(5), C#(5), D(5), S$(5), I(5)\n"
+                                 "20 A%(1) = 7.6: B!(1) = 1.5: C#(1) = 2.25: S$(1) = \"X\": I(1) = -3.9\n"
+                                 "30 PRINT A%(1); B!(1); C#(1); S$(1); I(1); A%(2); B!(2); \"[\"; S$(2); \"]\"\n")
+    assert io.text == "7 1.5  2.25 X-300[]\n", f"Unexpected output {io.text!r}"
+    typecodes = {name: getattr(info['data'], 'typecode', 'list') for name, info in runtime._arrays.items()}
+    assert typecodes == {'a%': 'h', 'b!': 'd', 'c#': 'd', 'd!': 'd', 's$': 'list', 'i%': 'h'}, \
+        f"Unexpected storage {typecodes}"
+    print("✓ Numeric arrays use typed buffers, string arrays lists")
+
+
+def test_int_elements():
+    code = ("10 DIM A(3), B#(2,2), C(3), D(2)\n"
+            "20 A(1) = 0: U = C(1): C(2) = U: C(3) = LEN(\"ABC\") / 2\n"
+            "30 FOR I = 1 TO 201: X = A(2): Y = B#(1,2): Z = A(1)\n"
+            "40 C(0) = C(3 - I MOD 2): D(1) = C(2 + I MOD 2): NEXT I\n"
+            "50 PRINT STR$(A(3)); LEN(STR$(A(3))); STR$(X); STR$(Y); STR$(Z); STR$(C(0)); STR$(C(2)); STR$(D(1))\n")
+    for jit in (False, True):
+        _, runtime, io = run_program(code, tracking='off', jit=jit, loop_idioms=False)
+        assert io.text == " 02 0 0 0.0 0 0 1.5\n", f"Unexpected output {io.text!r} (jit={jit})"
+        assert runtime._arrays['c!']['data'].typecode == 'd', "SINGLE array not typed"
+    print("✓ SINGLE/DOUBLE elements holding ints (never assigned or copied) read as ints")
+
+
+def test_layout():
+    for base in (0, 1):
+        _, runtime, io = run_program(f"10 OPTION BASE {base}\n"
+                                     "20 DIM A%(3), B%(2,3), C%(2,2,2)\n"
+                                     "30 A%(3) = 1: B%(2,1) = 2: C%(2,1,2) = 3\n")
+        arrays = runtime._arrays
+        a, b, c = arrays['a%']['data'], arrays['b%']['data'], arrays['c%']['data']
+        assert len(a) == 4 - base and len(b) == (3 - base) * (4 - base) and len(c) == (3 - base) ** 3, \
+            f"base {base}: wrong sizes {len(a)}, {len(b)}, {len(c)}"
+        assert a.index(1) == 3 - base, f"base {base}: 1-D index {a.index(1)}"
+        assert b.index(2) == (2 - base) * (4 - base) + (1 - base), f"base {base}: 2-D index {b.index(2)}"
+        e = 3 - base
+        assert c.index(3) == (2 - base) * e * e + (1 - base) * e + (2 - base), f"base {base}: 3-D index {c.index(3)}"
+    print("✓ Row-major layout with precomputed strides (OPTION BASE 0 and 1)")
+
+
+def test_errors():
+    code = ("10 ON ERROR GOTO 100\n"
+            "20 DIM A%(3), B(2,3), C(1,1,1)\n"
+            "30 A%(1) = 32767: A%(2) = -32768: A%(3) = 32768\n"
+            "40 X = B(0,4): B(3,0) = 1: X = C(0,2,0): X = A%(-1)\n"
+            "60 PRINT A%(1); A%(2); A%(3); B(1,0): END\n"
+            "100 PRINT \"E\"; ERR; \"L\"; ERL; \" \";: RESUME NEXT\n")
+    for engine in ('ast', 'closure'):
+        _, runtime, io = run_program(code, engine=engine)
+        expected = "E9L40 E9L40 E9L40 E9L40 32767-32768327680\n"
+        assert io.text == expected, f"{engine}: unexpected output {io.text!r}"
+    try:
+        runtime.set_array_element('b', None, [1, 1], "S")
+        assert False, "String stored in numeric array"
+    except TypeError as e:
+        assert str(e) == "Type mismatch", f"Unexpected error {e}"
+    print("✓ Per-dimension subscript range and type mismatch errors")
+
+
+def test_integer_widening():
+    _, runtime, io = run_program("10 DIM A%(3): A%(1) = 32767: A%(2) = A%(1) + 1: A%(3) = 7.6\n"
+                                 "20 B% = 32768: PRINT A%(1); A%(2); A%(3); B%\n")
+    assert runtime._arrays['a%']['data'].typecode == 'q', "INTEGER array not widened to 'q'"
+    assert io.text == "3276732768732768\n", f"Unexpected output {io.text!r}"
+    _, runtime, io = run_program("10 DIM A%(2): A%(1) = 2 ^ 70: A%(2) = 5\n"
+                                 "20 B% = 2 ^ 70: PRINT A%(1) = B%; A%(2)\n")
+    assert isinstance(runtime._arrays['a%']['data'], list), "INTEGER array not widened to a list"
+    assert io.text == "-15\n", f"Unexpected output {io.text!r}"
+    print("✓ INTEGER elements outside 16 bits widen the buffer")
+
+
+def test_update_variables():
+    _, source, _ = run_program("10 DIM A%(4), B$(2,2): A%(4) = 9: X = 1\n")
+    target = Runtime({})
+    target.update_variables(source.get_all_variables())
+    assert target.get_array_element('a', '%', [4]) == 0, "Recreated array not zeroed"
+    assert target.get_array_element('b', '$', [2, 2]) == "", "Recreated string array not empty"
+    assert target._arrays['a%']['data'].typecode == 'h', "Recreated array not typed"
+    print("✓ update_variables() recreates arrays")
+
+
+def test_serialize_arrays():
+    _, source, _ = run_program("10 DIM A%(3), B(2,2), S$(2), W%(1)\n"
+                               "20 A%(1) = -5: B(1,2) = 2.5: B(2,1) = 4: S$(2) = \"X\": W%(1) = 40000\n")
+    target = Runtime({})
+    target.restore_arrays(json.loads(json.dumps(source.serialize_arrays())))
+    for name, info in source._arrays.items():
+        restored = target._arrays[name]
+        assert type(restored['data']) is type(info['data']) and restored == info, f"{name} not restored"
+    assert target.get_array_element('b', '!', [2, 1]) == 4 and target.get_array_element('b', '!', [1, 2]) == 2.5, \
+        "SINGLE elements changed"
+    assert target._arrays['w%']['data'].typecode == 'q', "Widened array not restored"
+    print("✓ serialize_arrays() round-trips through JSON")
+
+
+if __name__ == "__main__":
+    try:
+        test_storage_types()
+        test_int_elements()
+        test_layout()
+        test_errors()
+        test_integer_widening()
+        test_update_variables()
+        test_serialize_arrays()
+        print("\n✅ All tests passed")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test slot-based scalar variable storage.
+
+Tests:
+- Runtime.setup() binds every scalar VariableNode to a slot (one slot per name)
+- DEFINT/DEFSTR typing decides the slot; get_all_variables() lists created variables only
+- CLEAR empties the store but keeps nodes bound
+- Debugger reads/writes and the _variables snapshot see the same storage
+- Nodes shared between runtimes (RUN twice) and restored sessions are rebound
+"""
+
+import sys
+import os
+
+# Add project root to path (3 levels up from tests/regression/interpreter/)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from src.runtime import Runtime
+from src.interpreter import Interpreter
+from tests.regression.regression_common import line_table, make_interpreter, run_program
+
+
+def scalar_nodes(runtime):
+    nodes = []
+    for stmt in runtime.statement_table.statements.values():
+        nodes.extend(Runtime._scalar_variable_nodes(stmt))
+    return nodes
+
+
+def variables(runtime):
+    return {v['name'] + v['type_suffix']: v['value'] for v in runtime.get_all_variables() if not v['is_array']}
+
+
+def test_nodes_bound_at_setup():
+    runtime = Runtime(line_table("10 A = 1: B = A + 2\n20 IF A < B THEN A = A + B: PRINT A\n30 C(A) = B\n"))
+    runtime.setup()
+    nodes = scalar_nodes(runtime)
+    assert len(nodes) == 11, f"Expected 11 scalar references, found {len(nodes)}"
+    for node in nodes:
+        assert node.slot_store is runtime._variable_store, f"{node.name} not bound at setup"
+        assert runtime._slot_names[node.slot] == node.name + '!', f"{node.name} bound to wrong slot"
+    assert len({node.slot for node in nodes}) == 2, "Each name should map to exactly one slot"
+    assert variables(runtime) == {'err%': 0, 'erl%': 0}, "Binding must not create variables"
+    print("✓ Scalar references are bound to slots at setup")
+
+
+def test_deftype_and_listing():
+    _, runtime, io = run_program("10 DEFINT I-N: DEFSTR S\n20 S = \"HI\": I = 7.6: X = I / 2\n30 PRINT S; I; X\n")
+    assert io.text == "HI7 3.5 \n", f"Unexpected output {io.text!r}"
+    assert variables(runtime) == {'err%': 0, 'erl%': 0, 's$': 'HI', 'i%': 7, 'x!': 3.5}, \
+        f"Unexpected variables {variables(runtime)}"
+    listed = [v['name'] for v in runtime.get_all_variables()]
+    assert listed == ['err', 'erl', 's', 'i', 'x'], f"Variables not in creation order: {listed}"
+    print("✓ DEFINT/DEFSTR typing applied; variables listed in creation order")
+
+
+def test_clear_keeps_binding():
+    _, runtime, io = run_program("10 A = 5: CLEAR: IF A = 0 THEN A = A + 1: PRINT A\n")
+    assert io.text == " 1 \n", f"Unexpected output {io.text!r}"
+    assert variables(runtime) == {'a!': 1}, f"Unexpected variables {variables(runtime)}"
+    print("✓ CLEAR resets values without rebinding")
+
+
+def test_debugger_access():
+    interp, runtime, io = make_interpreter("10 PRINT A + 1\n", start=True)
+    runtime.set_variable('a', None, 41, debugger_set=True)
+    assert runtime.get_variable_for_debugger('a') == 41, "Debugger write not visible to debugger read"
+    assert runtime._variables['a!']['last_write']['line'] == -1, "Debugger write should record line -1"
+    interp.run()
+    assert io.text == " 42 \n", f"Program did not see debugger write: {io.text!r}"
+    assert runtime._variables['a!']['last_read'] is not None, "Program read not tracked"
+    print("✓ Debugger APIs and program share the same slots")
+
+
+def test_rebinding():
+    lines = line_table("10 N = N + 1: PRINT N\n")
+    _, first, io1 = run_program(lines)
+    _, second, io2 = run_program(lines, engine='closure')
+    assert io1.text == io2.text == " 1 \n", f"Shared nodes leaked state: {io1.text!r} {io2.text!r}"
+
+    # Restoring a saved session replaces the store; bound nodes must follow
+    saved = first._variables
+    second._variables = saved
+    second.pc = second.statement_table.first_pc()
+    interp = Interpreter(second, io2)
+    while second.pc.is_running():
+        interp.tick()
+    assert io2.text == " 1 \n 2 \n", f"Restored value not used: {io2.text!r}"
+    print("✓ Nodes are rebound for new runtimes and restored sessions")
+
+
+if __name__ == "__main__":
+    try:
+        test_nodes_bound_at_setup()
+        test_deftype_and_listing()
+        test_clear_keeps_binding()
+        test_debugger_access()
+        test_rebinding()
+        print("\n✅ All tests passed")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,115 @@
+"""
+Shared helpers for the regression tests that run BASIC programs.
+
+Not a test_*.py file, so the regression runner does not pick it up. Tests
+import it from the project root they already put on sys.path:
+
+    from tests.regression.regression_common import CaptureIO, make_interpreter, run_program
+"""
+
+import time
+
+from src.lexer import Lexer
+from src.parser import Parser
+from src.runtime import Runtime
+from src.interpreter import Interpreter
+from src.filesystem import RealFileSystemProvider
+
+
+class CaptureIO:
+    """Minimal IO handler collecting output text, optionally slow."""
+
+    def __init__(self, delay=0.0):
+        self.text = ""
+        self.delay = delay
+
+    def output(self, text, end='\n'):
+        if self.delay:
+            time.sleep(self.delay)
+        self.text += str(text) + end
+
+
+class Settings:
+    """Settings manager stand-in with fixed values."""
+
+    def __init__(self, **values):
+        self.values = values
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+
+class CountingFileSystem(RealFileSystemProvider):
+    """Real filesystem counting read() calls on the handles it opens."""
+
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+
+    def open(self, filename, mode, binary=False, buffer_size=None):
+        handle = super().open(filename, mode, binary, buffer_size)
+        read = handle.read
+
+        def counting_read(size=-1):
+            self.reads += 1
+            return read(size)
+
+        handle.read = counting_read
+        return handle
+
+
+def parse(code):
+    """Parse source into a ProgramNode."""
+    return Parser(Lexer(code).tokenize()).parse()
+
+
+def line_table(code):
+    """Parse source into the {line number: LineNode} table Runtime takes."""
+    return {line.line_number: line for line in parse(code).lines}
+
+
+def parse_line(code):
+    """Parse one line of source into a LineNode, e.g. for StatementTable.replace_line()."""
+    return parse(code + "\n").lines[0]
+
+
+def make_interpreter(code, io=None, tracking=None, start=False, **interpreter_kwargs):
+    """Interpreter for a program, writing to a CaptureIO unless io is given.
+
+    Args:
+        code: BASIC source, or a line table from line_table()
+        io: IO handler (default: a new CaptureIO)
+        tracking: Runtime tracking mode to set (default: the runtime's)
+        start: Call interpreter.start() before returning
+        **interpreter_kwargs: Passed to Interpreter (engine, limits, ...)
+
+    Returns:
+        (interpreter, runtime, io)
+    """
+    runtime = Runtime(line_table(code) if isinstance(code, str) else code)
+    if tracking is not None:
+        runtime.set_tracking_mode(tracking)
+    io = io or CaptureIO()
+    interp = Interpreter(runtime, io, **interpreter_kwargs)
+    if start:
+        interp.start()
+    return interp, runtime, io
+
+
+def run_to_end(interp, quantum=1000):
+    """Tick a started program until it ends or waits for INPUT."""
+    while interp.runtime.pc.is_running() and not interp.state.input_prompt:
+        interp.tick(max_statements=quantum)
+
+
+def run_program(code, **kwargs):
+    """Run a program to completion with Interpreter.run().
+
+    Program errors raise RuntimeError, as from run().
+
+    Returns:
+        (interpreter, runtime, io), as from make_interpreter()
+    """
+    interp, runtime, io = make_interpreter(code, **kwargs)
+    interp.run()
+    return interp, runtime, io
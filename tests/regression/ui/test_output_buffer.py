@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test the web output pane's line ring buffer and delta messages.
+
+Tests:
+- OutputRingBuffer keeps the last max_lines lines (split on newlines,
+  unfinished last line included) for any way the text is chunked
+- The truncation marker is added once, and kept from restored text
+- append_script() sends only the new text
+"""
+
+import sys
+import os
+import json
+import random
+
+# Add project root to path (3 levels up from tests/regression/ui/)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from src.output_buffer import OutputRingBuffer, TRUNCATED_MARKER, append_script
+
+
+def expected_text(text, max_lines):
+    """The whole-text truncation the ring buffer replaces."""
+    lines = text.split('\n')
+    if len(lines) <= max_lines:
+        return text
+    return TRUNCATED_MARKER + '\n'.join(lines[-max_lines:])
+
+
+def test_ring_buffer():
+    rng = random.Random(7)
+    for _ in range(500):
+        max_lines = rng.randint(1, 8)
+        chunks = [''.join(rng.choice('ab\n') for _ in range(rng.randint(0, 12)))
+                  for _ in range(rng.randint(0, 8))]
+        buffer = OutputRingBuffer(max_lines)
+        text = ''
+        for chunk in chunks:
+            buffer.append(chunk)
+            text += chunk
+            want = expected_text(text, max_lines)
+            if buffer.truncated and not want.startswith(TRUNCATED_MARKER):
+                want = TRUNCATED_MARKER + want      # Lines were dropped earlier
+            assert buffer.text() == want, f"{max_lines} lines, chunks {chunks!r}: {buffer.text()!r} != {want!r}"
+
+    buffer = OutputRingBuffer(3, 'ONE\nTWO\nTHREE\nFOUR')
+    assert buffer.text() == TRUNCATED_MARKER + 'TWO\nTHREE\nFOUR', f"Unexpected text {buffer.text()!r}"
+    buffer.clear()
+    assert buffer.text() == '' and not buffer.truncated, "clear() left text"
+    print("✓ Ring buffer keeps the last max_lines lines")
+
+
+def test_restored_text():
+    buffer = OutputRingBuffer(3, TRUNCATED_MARKER + 'B\nC')
+    assert buffer.truncated and buffer.text() == TRUNCATED_MARKER + 'B\nC', "Marker lost on restore"
+    buffer.append('\nD\n')
+    assert buffer.text() == TRUNCATED_MARKER + 'C\nD\n', f"Unexpected text {buffer.text()!r}"
+    assert buffer.text().count(TRUNCATED_MARKER) == 1, "Marker added twice"
+    print("✓ Truncation marker added once and kept from restored text")
+
+
+def test_append_script():
+    script = append_script('c12', 'LINE "1"\n', 1000)
+    assert script == 'mbasicAppendOutput("c12", ' + json.dumps('LINE "1"\n') + ', 1000)', \
+        f"Unexpected script {script!r}"
+    assert len(append_script('c12', 'X' * 100, 1000)) < 150, "Delta message carries more than the new text"
+    print("✓ append_script() sends only the new text")
+
+
+if __name__ == "__main__":
+    try:
+        test_ring_buffer()
+        test_restored_text()
+        test_append_script()
+        print("\n✅ All tests passed")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
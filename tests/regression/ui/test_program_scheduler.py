@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Test ProgramScheduler, which shares the CPU between web sessions' programs.
+
+Tests:
+- Busy programs get equal turns (round robin), without UI round trips
+- ResourceLimits.max_cpu_share throttles one session's program
+- Web UI sessions (create_web_session_limits()) get a CPU budget
+- The global CPU budget caps all programs together
+- Programs in hidden tabs get fewer slices but are not starved
+- stats() reports the queue, latency and CPU shares; stop() is prompt
+  for a throttled program
+- The CPU history stays within STATS_WINDOW when stats() is never called
+"""
+
+import sys
+import os
+import asyncio
+import time
+
+# Add project root to path (3 levels up from tests/regression/ui/)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from src.resource_limits import create_local_limits, create_web_session_limits
+from src.program_scheduler import ProgramScheduler
+from src.program_worker import ProgramWorker
+from tests.regression.regression_common import make_interpreter
+
+BUSY = '10 X = X + SQR(I): I = I + 1\n20 GOTO 10\n'
+
+
+def make_session(scheduler, max_cpu_share=1.0, background=False, limits=None):
+    if limits is None:
+        limits = create_local_limits()
+        limits.max_cpu_share = max_cpu_share
+    interp, _, _ = make_interpreter(BUSY, limits=limits, start=True)
+    worker = ProgramWorker(scheduler)
+    worker.background = background
+    return interp, worker
+
+
+def run_sessions(sessions, seconds):
+    """Run the sessions' programs for seconds; returns the statements each executed."""
+    async def run():
+        for interp, worker in sessions:
+            worker.start(interp)
+        await asyncio.sleep(seconds)
+        for interp, worker in sessions:
+            worker.stop()
+        for interp, worker in sessions:
+            await worker.wait()
+            worker.result()
+    asyncio.run(run())
+    return [interp.state.statements_executed for interp, worker in sessions]
+
+
+def test_round_robin():
+    scheduler = ProgramScheduler(threads=1)
+    executed = run_sessions([make_session(scheduler) for _ in range(3)], 0.6)
+    assert min(executed) > 0.6 * max(executed), f"Unequal turns: {executed}"
+    print(f"✓ Busy programs take equal turns ({executed})")
+
+
+def charged_cpu(scheduler, worker):
+    """CPU seconds the scheduler charged to the worker's session."""
+    return scheduler.stats()['sessions'][scheduler._sessions[worker].id]['cpu_seconds']
+
+
+def test_session_budget():
+    scheduler = ProgramScheduler(threads=1)
+    limited = make_session(scheduler, max_cpu_share=0.25)
+    full = make_session(scheduler)
+    start = time.monotonic()
+    run_sessions([limited, full], 1.0)
+    elapsed = time.monotonic() - start
+    assert scheduler._sessions[full[1]].budget is None, "Unlimited session got a budget"
+    cpu = charged_cpu(scheduler, limited[1])
+    allowed = 0.25 * elapsed + ProgramScheduler.BURST + ProgramWorker.TIME_SLICE
+    assert cpu <= allowed, f"max_cpu_share not enforced: {cpu:.3f} s CPU, budget {allowed:.3f} s"
+    print(f"✓ max_cpu_share throttles a session ({cpu:.2f} s CPU in {elapsed:.2f} s)")
+
+
+def test_web_session_budget():
+    limits = create_web_session_limits()
+    assert 0 < limits.max_cpu_share < 1.0, f"Web sessions get no CPU budget ({limits.max_cpu_share})"
+    scheduler = ProgramScheduler(threads=1)
+    start = time.monotonic()
+    session = make_session(scheduler, limits=limits)
+    run_sessions([session], 1.0)
+    elapsed = time.monotonic() - start
+    cpu = charged_cpu(scheduler, session[1])
+    allowed = limits.max_cpu_share * elapsed + ProgramScheduler.BURST + ProgramWorker.TIME_SLICE
+    assert cpu <= allowed, f"Web session charged {cpu:.3f} s CPU, budget {allowed:.3f} s"
+    print(f"✓ Web sessions get a CPU budget ({limits.max_cpu_share} CPU, {cpu:.2f} s in {elapsed:.2f} s)")
+
+
+def test_global_budget():
+    scheduler = ProgramScheduler(threads=2, max_cpu=0.3)
+    run_sessions([make_session(scheduler) for _ in range(2)], 1.0)
+    cpu = sum(session['cpu_seconds'] for session in scheduler.stats()['sessions'].values())
+    assert cpu < 0.6, f"Programs used {cpu:.2f} s CPU in 1 s with a 0.3 CPU budget"
+    print(f"✓ Global CPU budget caps all programs ({cpu:.2f} s CPU in 1 s)")
+
+
+def test_background():
+    scheduler = ProgramScheduler(threads=1)
+    sessions = [make_session(scheduler), make_session(scheduler), make_session(scheduler, background=True)]
+    executed = run_sessions(sessions, 0.8)
+    assert 0 < executed[2] < 0.5 * min(executed[:2]), f"Hidden tab not deprioritized: {executed}"
+    print(f"✓ Hidden tabs get fewer slices but are not starved ({executed})")
+
+
+def test_stats_and_stop():
+    scheduler = ProgramScheduler(threads=1)
+    sessions = [make_session(scheduler, max_cpu_share=0.1) for _ in range(2)]
+
+    async def run():
+        for interp, worker in sessions:
+            worker.start(interp)
+        await asyncio.sleep(0.5)
+        stats = scheduler.stats()
+        start = time.perf_counter()
+        for interp, worker in sessions:
+            worker.stop()
+        for interp, worker in sessions:
+            await worker.wait()
+            worker.result()
+        return stats, time.perf_counter() - start
+
+    stats, stop_time = asyncio.run(run())
+    for key in ('threads', 'running', 'queue_length', 'throttled', 'background',
+                'slice_latency_ms', 'cpu_percent', 'max_cpu_percent', 'sessions'):
+        assert key in stats, f"stats() has no {key!r}"
+    assert stats['throttled'] >= 1, f"Throttled sessions not reported: {stats}"
+    shares = [session['cpu_share'] for session in stats['sessions'].values()]
+    assert len(shares) == 2 and abs(sum(shares) - 1.0) < 0.01, f"Unexpected CPU shares {shares}"
+    assert stop_time < 0.2, f"stop() of a throttled program took {stop_time:.3f}s"
+    print("✓ stats() reports the queue and CPU shares; stop() is prompt")
+
+
+def test_history_bounded():
+    scheduler = ProgramScheduler(threads=1)
+    scheduler.STATS_WINDOW = 0.1
+    interp, worker = make_session(scheduler)
+    worker.TIME_SLICE = 0.005
+    run_sessions([(interp, worker)], 1.0)
+    slices = scheduler._dispatched
+    assert slices > 50, f"Only {slices} slices run"
+    assert len(scheduler._history) < slices / 4, \
+        f"History holds {len(scheduler._history)} entries after {slices} slices"
+    print(f"✓ CPU history stays bounded without stats() ({len(scheduler._history)} of {slices} slices)")
+
+
+if __name__ == "__main__":
+    try:
+        test_round_robin()
+        test_session_budget()
+        test_web_session_budget()
+        test_global_budget()
+        test_background()
+        test_stats_and_stop()
+        test_history_bounded()
+        print("\n✅ All tests passed")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Test ProgramWorker, which runs web UI programs off the event loop.
+
+Tests:
+- Output written by the worker is queued and drained in order
+- INPUT ends the time slice; provide_input() and a new slice resume it
+- stop() ends a running program's time slice after its quantum
+- A program polling INKEY$ for a key ends its slice with waiting_for_key;
+  a busy program that calls INKEY$ or prints does not
+- A bounded INKEY$ timeout loop resumed every KEY_WAIT_INTERVAL (as the
+  web UI does) still times out without a key
+- The event loop keeps running while a CPU-heavy program runs
+"""
+
+import sys
+import os
+import asyncio
+import time
+
+# Add project root to path (3 levels up from tests/regression/ui/)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from src.program_worker import ProgramWorker
+from tests.regression.regression_common import make_interpreter
+
+
+class CallbackIO:
+    """Minimal IO handler passing output text to a callback."""
+
+    def __init__(self, output_callback):
+        self.output_callback = output_callback
+
+    def output(self, text, end='\n'):
+        self.output_callback(str(text) + end)
+
+
+def make_session(code):
+    """Interpreter and worker of one session; output collects in the returned list."""
+    worker = ProgramWorker()
+    output = []
+    interp, _, _ = make_interpreter(code, io=CallbackIO(worker.wrap_output(output.append)), start=True)
+    return interp, worker, output
+
+
+async def run_slices(interp, worker, output):
+    """Run time slices the way the web UI's timer does, until the program stops or needs input."""
+    while True:
+        worker.start(interp)
+        while worker.busy:
+            await asyncio.sleep(0.005)
+        output.append(worker.drain_output())
+        state = worker.result()
+        if state.error_info or state.input_prompt or not interp.runtime.pc.is_running():
+            return state
+
+
+def test_output():
+    interp, worker, output = make_session('10 FOR I=1 TO 3000: PRINT I;: NEXT\n20 PRINT "DONE"\n')
+    state = asyncio.run(run_slices(interp, worker, output))
+    assert state.error_info is None, f"Program failed: {state.error_info}"
+    text = ''.join(output)
+    assert text == ''.join(f" {i} " for i in range(1, 3001)) + "DONE\n", "Output lost or out of order"
+    assert worker.drain_output() == '', "Output left in the queue"
+    print("✓ Worker output is queued and drained in order")
+
+
+def test_input_round_trip():
+    interp, worker, output = make_session('10 INPUT "N"; N\n20 PRINT N * 2\n')
+
+    async def session():
+        state = await run_slices(interp, worker, output)
+        assert state.input_prompt == "N? ", f"Unexpected prompt {state.input_prompt!r}"
+        interp.provide_input('21')
+        return await run_slices(interp, worker, output)
+
+    state = asyncio.run(session())
+    assert state.error_info is None and not interp.runtime.pc.is_running(), "Program did not finish"
+    assert ''.join(output) == "N?  42 \n", f"Unexpected output {''.join(output)!r}"
+    print("✓ INPUT round trip through the worker")
+
+
+def test_stop():
+    interp, worker, output = make_session('10 X = X + 1: GOTO 10\n')
+
+    async def session():
+        worker.start(interp)
+        await asyncio.sleep(0.02)
+        worker.stop()
+        await worker.wait()
+        return worker.result()
+
+    state = asyncio.run(session())
+    assert state.error_info is None and interp.runtime.pc.is_running(), "Program should be stopped mid-run"
+    executed = state.statements_executed
+    time.sleep(0.05)
+    assert interp.state.statements_executed == executed, "Program kept running after stop()"
+    assert not worker.busy and worker.result() is None, "Worker still has a time slice"
+    print("✓ stop() ends the time slice")
+
+
+def test_waiting_for_key():
+    interp, worker, output = make_session('10 K$ = INKEY$: IF K$ = "" THEN 10\n20 PRINT "KEY "; K$\n')
+    keys = []
+    interp.builtins.key_source = lambda: keys.pop(0) if keys else ''
+
+    async def session():
+        worker.start(interp)
+        await worker.wait()
+        state = worker.result()
+        assert worker.waiting_for_key and interp.runtime.pc.is_running(), "Key wait not detected"
+        assert interp.builtins.inkey_misses >= ProgramWorker.INKEY_IDLE_POLLS, "INKEY$ misses not counted"
+        keys.append('Q')
+        return await run_slices(interp, worker, output)
+
+    state = asyncio.run(session())
+    assert not interp.runtime.pc.is_running() and ''.join(output) == "KEY Q\n", \
+        f"Unexpected output {''.join(output)!r}"
+    assert interp.builtins.inkey_misses == 0, "Key did not reset the miss count"
+
+    for code in ('10 K$ = INKEY$: FOR I = 1 TO 20: NEXT: GOTO 10\n',
+                 '10 K$ = INKEY$: PRINT ".";: GOTO 10\n'):
+        interp, worker, output = make_session(code)
+        interp.builtins.key_source = lambda: ''
+
+        async def busy_session():
+            worker.start(interp)
+            await asyncio.sleep(0.2)
+            waiting = worker.waiting_for_key or not worker.busy
+            worker.stop()
+            await worker.wait()
+            worker.result()
+            return waiting
+
+        assert not asyncio.run(busy_session()), f"Busy program taken for a key wait: {code!r}"
+    print("✓ Worker detects programs waiting for a key")
+
+
+def test_inkey_timeout_loop():
+    interp, worker, output = make_session('10 FOR I=1 TO 1000: K$=INKEY$: IF K$<>"" THEN 100\n'
+                                          '20 NEXT I: PRINT "TIMEOUT": END\n'
+                                          '100 PRINT "KEY "; K$\n')
+    interp.builtins.key_source = lambda: ''
+
+    async def session():
+        waits = 0
+        while interp.runtime.pc.is_running():
+            worker.start(interp)
+            await worker.wait()
+            output.append(worker.drain_output())
+            worker.result()
+            if worker.waiting_for_key:
+                waits += 1
+                await asyncio.sleep(0.01)   # KEY_WAIT_INTERVAL in the web UI
+        return waits
+
+    waits = asyncio.run(asyncio.wait_for(session(), 10))
+    assert waits > 1, "Key wait not detected"
+    assert ''.join(output) == "TIMEOUT\n", f"Unexpected output {''.join(output)!r}"
+    print(f"✓ INKEY$ timeout loop times out while waiting for a key ({waits} slow slices)")
+
+
+def test_event_loop_responsive():
+    interp, worker, output = make_session('10 FOR I=1 TO 300000: X=SQR(I)*2: NEXT\n')
+
+    async def session():
+        task = asyncio.ensure_future(run_slices(interp, worker, output))
+        worst = 0.0
+        while not task.done():
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            worst = max(worst, time.perf_counter() - start - 0.01)
+        return task.result(), worst
+
+    state, worst = asyncio.run(session())
+    assert state.error_info is None and not interp.runtime.pc.is_running(), "Program did not finish"
+    assert worst < 0.5, f"Event loop blocked for {worst:.3f}s"
+    print(f"✓ Event loop stays responsive (worst delay {worst * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    try:
+        test_output()
+        test_input_round_trip()
+        test_stop()
+        test_waiting_for_key()
+        test_inkey_timeout_loop()
+        test_event_loop_responsive()
+        print("\n✅ All tests passed")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)